@@ -12,7 +12,8 @@ import { ArrowRight, CheckCircle2, Send, FileCheck, BrainCircuit, Timer } from '
 import { useTranslations } from 'next-intl';
 
 interface NextBestActionProps {
-    jobs: { status: string }[];
+    /** Jobs per status (from job_status_rollups) */
+    jobCounts: Record<string, number>;
     coachingSessions: { session_status: string }[];
     todayHasPomodoro: boolean;
     streak: number;
@@ -27,11 +28,11 @@ interface ActionConfig {
     borderColor: string;
 }
 
-export function NextBestAction({ jobs, coachingSessions, todayHasPomodoro, streak }: NextBestActionProps) {
+export function NextBestAction({ jobCounts, coachingSessions, todayHasPomodoro, streak }: NextBestActionProps) {
     const t = useTranslations('dashboard.analytics');
-    const readyForReview = jobs.filter(j => j.status === 'ready_for_review').length;
-    const readyToApply = jobs.filter(j => j.status === 'ready_to_apply').length;
-    const hasJobs = jobs.length > 0;
+    const readyForReview = jobCounts.ready_for_review ?? 0;
+    const readyToApply = jobCounts.ready_to_apply ?? 0;
+    const hasJobs = Object.values(jobCounts).some(n => n > 0);
     const hasCoaching = coachingSessions.some(s => s.session_status === 'completed');
 
     // QA: Strict waterfall priority — exactly ONE action, no overlapping
@@ -20,18 +20,24 @@ import { NextBestAction } from './components/next-best-action';
 import { ToggleSection } from './components/toggle-section';
 import { buildHeatmapGrid, findPeakWindow } from '@/lib/analytics/heatmap-utils';
 import {
-    calcMomentumScore,
     generatePeakInsightData,
     generateEnergyInsightData,
-    calcStreak,
 } from '@/lib/analytics/insights';
+import {
+    calcMomentumScoreFromRollups,
+    calcStreakFromRollups,
+    jobStatusCounts,
+    type JobStatusRollup,
+    type PomodoroDailyRollup,
+} from '@/lib/analytics/rollups';
 
 type DayKey = 'day_0' | 'day_1' | 'day_2' | 'day_3' | 'day_4' | 'day_5' | 'day_6';
 
 interface AnalyticsData {
     heatmap: any[];
     momentum: any[];
-    funnel: any[];
+    daily: PomodoroDailyRollup[];
+    jobStatus: JobStatusRollup[];
     energyTimeline: any[];
 }
 
@@ -103,8 +109,8 @@ export default function AnalyticsPage() {
     const peak = grid.length > 0 ? findPeakWindow(grid) : { day: 0, startHour: 8, count: 0 };
     const peakData = data ? generatePeakInsightData(peak, data.momentum.length) : null;
     const energyData = data ? generateEnergyInsightData(data.energyTimeline) : null;
-    const momentumScore = data ? calcMomentumScore(data.momentum, data.funnel) : 0;
-    const streak = data ? calcStreak(data.momentum) : 0;
+    const momentumScore = data ? calcMomentumScoreFromRollups(data.daily, data.jobStatus) : 0;
+    const streak = data ? calcStreakFromRollups(data.daily) : 0;
 
     // Render insight texts via i18n
     const peakText = peakData
@@ -171,7 +177,7 @@ export default function AnalyticsPage() {
                 <>
                     {/* ── Next Best Action (always visible) ─────────────────── */}
                     <NextBestAction
-                        jobs={data?.funnel ?? []}
+                        jobCounts={data ? jobStatusCounts(data.jobStatus) : {}}
                         coachingSessions={coachingSessions}
                         todayHasPomodoro={todayHasPomodoro}
                         streak={streak}
@@ -1,5 +1,6 @@
 import { getCostStats } from '@/lib/ai/model-router';
 import { getCacheStats } from '@/lib/services/cache-monitor';
+import { getSearchTierTimings } from '@/lib/services/job-search-cache';
 import { NextRequest, NextResponse } from 'next/server';
 import { createClient } from '@supabase/supabase-js';
 import crypto from 'crypto';
@@ -83,8 +84,10 @@ export async function GET(req: NextRequest) {
                     : '0.00',
             high_quality:
                 companies?.filter((c) => c.confidence_score > 0.7).length || 0,
-            monitor_stats: getCacheStats(),
+            monitor_stats: await getCacheStats(),
         },
+        // Per-instance window (resets on cold start)
+        job_search_tiers: getSearchTierTimings(),
     };
 
     return NextResponse.json(report);
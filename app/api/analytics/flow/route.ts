@@ -2,7 +2,10 @@ export const dynamic = 'force-dynamic';
 
 /**
  * GET /api/analytics/flow
- * Single endpoint for all analytics data: heatmap, momentum, funnel, energy timeline.
+ * Single endpoint for all analytics data: heatmap, momentum, daily rollups,
+ * job status rollups, energy timeline.
+ * Heatmap, streak and funnel read trigger-maintained rollups
+ * (migration 20261017_analytics_rollups) — response size no longer grows with history.
  * Returns partial data on errors (200, not 500).
  */
 
@@ -28,7 +31,7 @@ export async function GET(request: NextRequest) {
         const days = parseInt(searchParams.get('days') ?? '30');
         const since = new Date(Date.now() - days * 86400000).toISOString();
 
-        // 1. Heatmap (aggregated view — all time for better patterns)
+        // 1. Heatmap (view over pomodoro_hourly_rollups — all time, ≤ 168 rows)
         const { data: heatmap, error: heatmapErr } = await supabaseAdmin
             .from('pomodoro_heatmap')
             .select('day_of_week, hour_of_day, session_count, completed_count, avg_energy')
@@ -46,15 +49,27 @@ export async function GET(request: NextRequest) {
 
         if (momErr) console.error('[analytics/flow] Momentum error:', momErr);
 
-        // 3. Funnel (job status distribution)
-        const { data: funnel, error: funnelErr } = await supabaseAdmin
-            .from('job_queue')
-            .select('status')
-            .eq('user_id', user.id);
+        // 3. Daily rollups (streak looks back up to 365 days, momentum 7)
+        const dailySince = new Date(Date.now() - 365 * 86400000).toISOString().split('T')[0];
+        const { data: daily, error: dailyErr } = await supabaseAdmin
+            .from('pomodoro_daily_rollups')
+            .select('day, session_count, completed_count, energy_sum, energy_count')
+            .eq('user_id', user.id)
+            .gte('day', dailySince)
+            .order('day', { ascending: true });
+
+        if (dailyErr) console.error('[analytics/flow] Daily rollup error:', dailyErr);
+
+        // 4. Job status rollups (funnel + momentum, one row per status)
+        const { data: jobStatus, error: jobStatusErr } = await supabaseAdmin
+            .from('job_status_rollups')
+            .select('status, job_count, match_score_sum, match_score_count')
+            .eq('user_id', user.id)
+            .gt('job_count', 0);
 
-        if (funnelErr) console.error('[analytics/flow] Funnel error:', funnelErr);
+        if (jobStatusErr) console.error('[analytics/flow] Job status rollup error:', jobStatusErr);
 
-        // 4. Energy timeline (sessions with energy, for resonance chart)
+        // 5. Energy timeline (sessions with energy, for resonance chart)
         const { data: energyTimeline, error: energyErr } = await supabaseAdmin
             .from('pomodoro_sessions')
             .select('started_at, energy_level, completed')
@@ -69,13 +84,14 @@ export async function GET(request: NextRequest) {
         return NextResponse.json({
             heatmap: heatmap ?? [],
             momentum: momentum ?? [],
-            funnel: funnel ?? [],
+            daily: daily ?? [],
+            jobStatus: jobStatus ?? [],
             energyTimeline: energyTimeline ?? [],
         });
     } catch (error: unknown) {
         console.error('[analytics/flow] Fatal:', error);
         return NextResponse.json({
-            heatmap: [], momentum: [], funnel: [], energyTimeline: [],
+            heatmap: [], momentum: [], daily: [], jobStatus: [], energyTimeline: [],
             _error: 'Partial data — check server logs',
         }, { status: 200 });
     }
@@ -0,0 +1,85 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { createClient } from '@/lib/supabase/server';
+import { getCVText } from '@/lib/services/cv-text-retriever';
+import { rateLimiters, checkUpstashLimit } from '@/lib/api/rate-limit-upstash';
+import { logger } from '@/lib/logging';
+import { getUserLocale } from '@/lib/i18n/get-user-locale';
+import { BATCH_MAX_JOBS, sendCVMatchBatch } from '@/lib/inngest/cv-match-batch-trigger';
+
+// Upper bound for one request — split into ≤ BATCH_MAX_JOBS per event
+const MAX_REQUEST_JOBS = BATCH_MAX_JOBS * 5;
+
+/**
+ * POST /api/cv/match/batch — one CV against many queued jobs
+ *
+ * Body: { jobIds?: string[], cvDocumentId?: string, topN?: number }
+ *   jobIds omitted → all eligible jobs of the user (newest BATCH_MAX_JOBS).
+ *
+ * Fires ONE 'cv-match/analyze-batch' event (more only above BATCH_MAX_JOBS)
+ * instead of one 'cv-match/analyze' pipeline per job. Credits are debited per
+ * analyzed job inside the batch function (cache hits and rank-only jobs are free).
+ *
+ * Contracts: §8 (Auth Guard), §3 (user-scoped in the pipeline), §2 (CV Safety)
+ */
+export async function POST(req: NextRequest) {
+    try {
+        let jobIds: string[] | undefined;
+        let cvDocumentId: string | undefined;
+        let topN: number | undefined;
+        try {
+            const body = await req.json();
+            jobIds = body?.jobIds;
+            cvDocumentId = body?.cvDocumentId;
+            topN = body?.topN;
+        } catch {
+            return NextResponse.json({ error: 'Invalid or missing request body (expected JSON)' }, { status: 400 });
+        }
+
+        if (jobIds !== undefined && (!Array.isArray(jobIds) || jobIds.some(id => typeof id !== 'string'))) {
+            return NextResponse.json({ error: 'jobIds must be an array of job IDs' }, { status: 400 });
+        }
+        if (jobIds && jobIds.length > MAX_REQUEST_JOBS) {
+            return NextResponse.json({ error: `At most ${MAX_REQUEST_JOBS} jobs per request` }, { status: 400 });
+        }
+        if (topN !== undefined && (!Number.isInteger(topN) || topN < 1 || topN > BATCH_MAX_JOBS)) {
+            return NextResponse.json({ error: `topN must be an integer between 1 and ${BATCH_MAX_JOBS}` }, { status: 400 });
+        }
+
+        // §8: Auth Guard
+        const supabase = await createClient();
+        const { data: { user } } = await supabase.auth.getUser();
+        if (!user) {
+            return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+        }
+
+        // Same limiter as the single-job trigger — one batch counts as one request
+        const rateLimited = await checkUpstashLimit(rateLimiters.cvMatch, user.id);
+        if (rateLimited) return rateLimited;
+
+        const log = logger.forRequest(undefined, user.id, '/api/cv/match/batch');
+        log.info('CV Match batch requested', { jobs: jobIds?.length ?? 'all' });
+
+        // §2: CV Safety — verify CV exists before firing the batch
+        const cvData = await getCVText(user.id, cvDocumentId, { forAI: true });
+        if (!cvData) {
+            return NextResponse.json({
+                error: 'CV not found or empty. Please upload your CV in settings.',
+                code: 'CV_NOT_FOUND',
+            }, { status: 400 });
+        }
+
+        const events = await sendCVMatchBatch({
+            userId: user.id,
+            jobIds,
+            cvDocumentId: cvData.documentId,
+            locale: await getUserLocale(user.id),
+            topN,
+        });
+
+        return NextResponse.json({ success: true, status: 'processing', events });
+    } catch (error: any) {
+        const msg = error?.message || String(error);
+        console.error('❌ CV Match batch FATAL ERROR:', error);
+        return NextResponse.json({ error: msg, success: false }, { status: 500 });
+    }
+}
@@ -4,7 +4,7 @@ import { serve } from 'inngest/next';
 import { inngest } from '@/lib/inngest/client';
 import { generateCertificates } from '@/lib/inngest/certificates-pipeline';
 import { extractJob } from '@/lib/inngest/extract-job-pipeline';
-import { analyzeCVMatch } from '@/lib/inngest/cv-match-pipeline';
+import { analyzeCVMatch, analyzeCVMatchBatch } from '@/lib/inngest/cv-match-pipeline';
 import { volunteeringScraper } from '@/lib/inngest/volunteering-scraper';
 import { generateCoachingReport } from '@/lib/inngest/coaching-report-pipeline';
 import { videoDeleteScheduled, videoCleanupCron } from '@/lib/inngest/video-cleanup';
@@ -16,6 +16,7 @@ export const { GET, POST, PUT } = serve({
         generateCertificates,
         extractJob,
         analyzeCVMatch,
+        analyzeCVMatchBatch,
         volunteeringScraper,
         generateCoachingReport,
         videoDeleteScheduled,
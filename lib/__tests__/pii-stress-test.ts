@@ -2,11 +2,13 @@
  * PII Sanitizer Stress Test — Edge Cases
  * 
  * Tests the NAME_REGEX against the hardest real-world CV name patterns.
+ * Part 2 gates the single-pass + chunked engines: equivalence with the
+ * multi-pass engine on every case, plus throughput on multi-page CVs.
  * Run: npx tsx lib/__tests__/pii-stress-test.ts
  */
 
 // Import the actual sanitizer
-import { sanitizeForAI } from '../services/pii-sanitizer';
+import { sanitizeForAI, sanitizeChunked, SanitizeResult } from '../services/pii-sanitizer';
 
 interface TestCase {
   label: string;
@@ -166,12 +168,84 @@ for (const tc of testCases) {
   }
 }
 
+// ── Part 2: Engine Equivalence (multi-pass vs single-pass vs chunked) ──
+console.log('\n═══════════════════════════════════════════════════');
+console.log('  ENGINE EQUIVALENCE + THROUGHPUT');
+console.log('═══════════════════════════════════════════════════\n');
+
+// NAME numbering legitimately differs for the chunked stream (CAPS-before-Title per chunk)
+const normalizeNameTokens = (text: string) => text.replace(/__NAME_\d+__/g, '__NAME__');
+
+function describeMismatch(reference: SanitizeResult, candidate: SanitizeResult, exact: boolean): string | null {
+  const refText = exact ? reference.sanitized : normalizeNameTokens(reference.sanitized);
+  const candText = exact ? candidate.sanitized : normalizeNameTokens(candidate.sanitized);
+  if (refText !== candText) return 'sanitized text differs';
+  if (exact && JSON.stringify([...reference.tokenMap]) !== JSON.stringify([...candidate.tokenMap])) return 'tokenMap differs';
+  if (!exact && JSON.stringify([...reference.tokenMap.values()].sort()) !== JSON.stringify([...candidate.tokenMap.values()].sort())) return 'token values differ';
+  if (JSON.stringify([...reference.warningFlags].sort()) !== JSON.stringify([...candidate.warningFlags].sort())) return 'warningFlags differ';
+  if (reference.restore(reference.sanitized) !== candidate.restore(candidate.sanitized)) return 'restore differs';
+  if (reference.restoreJson(reference.sanitized) !== candidate.restoreJson(candidate.sanitized)) return 'restoreJson differs';
+  return null;
+}
+
+// Multi-page CV: every stress case plus mixed separators, repeated as pages
+const CV_PAGE = testCases.map(tc => tc.input).join('\n\n') +
+  '\nKontakt: Anna Schmidt, anna.schmidt@firma.de; IBAN DE89370400440532013000 | Tel. (030) 123 456 78\n';
+const equivalenceInputs = [
+  ...testCases.map(tc => ({ label: tc.label, input: tc.input })),
+  { label: 'Multi-page CV (5 pages)', input: CV_PAGE.repeat(5) },
+];
+
+let equivalenceFailed = 0;
+for (const { label, input } of equivalenceInputs) {
+  const reference = sanitizeForAI(input);
+  const singlePass = sanitizeForAI(input, { mode: 'single-pass' });
+  const chunked = sanitizeChunked(input, 97);
+
+  const singleIssue = describeMismatch(reference, singlePass, true);
+  const chunkIssue = describeMismatch(reference, chunked, false);
+  if (singleIssue || chunkIssue) {
+    console.log(`❌ ${label}: ${[singleIssue && `single-pass: ${singleIssue}`, chunkIssue && `chunked: ${chunkIssue}`].filter(Boolean).join('; ')}`);
+    equivalenceFailed++;
+  }
+}
+console.log(`${equivalenceFailed === 0 ? '✅' : '❌'} Equivalence: ${equivalenceInputs.length - equivalenceFailed}/${equivalenceInputs.length} inputs identical across engines`);
+
+function measure(fn: () => SanitizeResult, runs: number): { sanitizeMs: number; restoreMs: number } {
+  fn(); // warm-up
+  let result = fn();
+  const start = performance.now();
+  for (let i = 0; i < runs; i++) result = fn();
+  const sanitizeMs = (performance.now() - start) / runs;
+  const restoreStart = performance.now();
+  result.restore(result.sanitized);
+  return { sanitizeMs, restoreMs: performance.now() - restoreStart };
+}
+
+for (const pages of [1, 10, 50]) {
+  const doc = CV_PAGE.repeat(pages);
+  const kb = (doc.length / 1024).toFixed(0);
+  console.log(`\n  ${pages} page(s), ${kb} KB:`);
+  for (const [label, fn] of [
+    ['multi-pass', () => sanitizeForAI(doc)],
+    ['single-pass', () => sanitizeForAI(doc, { mode: 'single-pass' })],
+    ['chunked (16 KB)', () => sanitizeChunked(doc, 16_000)],
+  ] as const) {
+    const { sanitizeMs, restoreMs } = measure(fn, 5);
+    const mbPerSec = (doc.length / 1024 / 1024) / (sanitizeMs / 1000);
+    console.log(`    ${label.padEnd(16)} sanitize ${sanitizeMs.toFixed(1).padStart(7)} ms (${mbPerSec.toFixed(1)} MB/s)  restore ${restoreMs.toFixed(1).padStart(8)} ms`);
+  }
+}
+
 console.log('\n═══════════════════════════════════════════════════');
 console.log(`  RESULTS: ${passed}/${passed + failed} passed (${Math.round(passed / (passed + failed) * 100)}%)`);
 if (failures.length > 0) {
   console.log(`  FAILED: ${failures.join(', ')}`);
 }
+if (equivalenceFailed > 0) {
+  console.log(`  ENGINE MISMATCHES: ${equivalenceFailed}`);
+}
 console.log('═══════════════════════════════════════════════════');
 
 // Exit with error code if any failed
-process.exit(failed > 0 ? 1 : 0);
+process.exit(failed > 0 || equivalenceFailed > 0 ? 1 : 0);
@@ -0,0 +1,116 @@
+import {
+    describeRequest,
+    formatTraceLogLine,
+    getTracedHandler,
+    setSpanExporter,
+    supabaseTracingFetch,
+    toOtlpJson,
+    tracedFetch,
+    withInngestTracing,
+    withSpan,
+    type SpanBatch,
+} from '../tracing';
+
+function createStep() {
+    return {
+        run: async (id: string, fn: () => unknown) => fn(),
+        sleep: jest.fn(async () => {}),
+    };
+}
+
+describe('tracing', () => {
+    const batches: SpanBatch[] = [];
+    const originalFetch = global.fetch;
+
+    beforeEach(() => {
+        batches.length = 0;
+        setSpanExporter(batch => { batches.push(batch); });
+        global.fetch = jest.fn(async () => new Response('{"ok":true}', { status: 200 })) as unknown as typeof fetch;
+    });
+
+    afterEach(() => {
+        setSpanExporter(null);
+        global.fetch = originalFetch;
+        delete process.env.TRACING;
+    });
+
+    it('exports one span tree per executed step under a run-derived trace id', async () => {
+        const handler = withInngestTracing('replay-test', async ({ step }: { step: any }) => {
+            await step.run('read-job', () => supabaseTracingFetch('https://x.supabase.co/rest/v1/job_queue?id=eq.1'));
+            await step.sleep('wait', '1s');
+            await step.run('analyze', () => withSpan('llm cv_match', { kind: 'client' }, async () => 'done'));
+            return 'ok';
+        });
+
+        await expect(handler({ event: {}, step: createStep(), runId: 'run-1' })).resolves.toBe('ok');
+        expect(getTracedHandler('replay-test')).toBe(handler);
+
+        expect(batches.map(b => b.spans.map(s => s.name))).toEqual([
+            ['select job_queue', 'step read-job'],
+            ['llm cv_match', 'step analyze'],
+        ]);
+        const [readJob, analyze] = batches;
+        const root = readJob.spans[1];
+        expect(readJob.spans[0].parentSpanId).toBe(root.spanId);
+        expect(root.parentSpanId).toBeUndefined();
+        expect(analyze.spans[1].traceId).toBe(root.traceId);
+        expect(readJob.resource).toMatchObject({ 'inngest.function.id': 'replay-test', 'inngest.run.id': 'run-1' });
+
+        // A later invocation of the same run continues the same trace
+        await handler({ event: {}, step: createStep(), runId: 'run-1' });
+        expect(batches[2].spans[0].traceId).toBe(root.traceId);
+    });
+
+    it('marks failing steps as errors and rethrows', async () => {
+        const handler = withInngestTracing('replay-fail', async ({ step }: { step: any }) => {
+            await step.run('boom', async () => { throw new Error('Job not found'); });
+        });
+
+        await expect(handler({ event: {}, step: createStep(), runId: 'run-2' })).rejects.toThrow('Job not found');
+        expect(batches[0].spans[0]).toMatchObject({ name: 'step boom', status: 'error', statusMessage: 'Job not found' });
+    });
+
+    it('is a pass-through outside a trace or when disabled', async () => {
+        await tracedFetch('jina', 'https://r.jina.ai/https://example.com/job');
+        await withSpan('llm x', {}, async span => span.attributes);
+
+        process.env.TRACING = 'off';
+        const handler = withInngestTracing('replay-off', async ({ step }: { step: any }) => step.run('a', () => 1));
+        await handler({ event: {}, step: createStep(), runId: 'run-3' });
+
+        expect(global.fetch).toHaveBeenCalledTimes(1);
+        expect(batches).toHaveLength(0);
+    });
+
+    it('never records query strings and names Supabase operations', () => {
+        const serp = describeRequest('serpapi', 'GET', new URL('https://serpapi.com/search?q=dev&api_key=secret'));
+        expect(serp.name).toBe('GET serpapi');
+        expect(JSON.stringify(serp.attributes)).not.toContain('secret');
+
+        expect(describeRequest('supabase', 'PATCH', new URL('https://x.supabase.co/rest/v1/job_queue?id=eq.1')).name).toBe('update job_queue');
+        expect(describeRequest('supabase', 'POST', new URL('https://x.supabase.co/rest/v1/rpc/bulk_merge_job_metadata')).name).toBe('rpc bulk_merge_job_metadata');
+        expect(describeRequest('supabase', 'GET', new URL('https://x.supabase.co/storage/v1/object/cvs/u/cv.pdf')).name).toBe('storage cvs');
+    });
+
+    it('serializes to OTLP/JSON and a one-line log summary', async () => {
+        const handler = withInngestTracing('replay-otlp', async ({ step }: { step: any }) => step.run('extract', () =>
+            withSpan('llm extract_job_fields', { kind: 'client' }, async span => {
+                span.attributes['gen_ai.usage.input_tokens'] = 1200;
+                span.attributes['pathly.cost_cents'] = 0.5;
+            })));
+        await handler({ event: {}, step: createStep(), runId: 'run-4' });
+
+        const otlp = toOtlpJson(batches[0]);
+        const [llm, step] = otlp.resourceSpans[0].scopeSpans[0].spans;
+        expect(otlp.resourceSpans[0].resource.attributes).toContainEqual({ key: 'service.name', value: { stringValue: 'pathly-v2' } });
+        expect(llm).toMatchObject({ kind: 3, parentSpanId: step.spanId, status: { code: 1 } });
+        expect(llm.attributes).toContainEqual({ key: 'gen_ai.usage.input_tokens', value: { intValue: '1200' } });
+        expect(llm.attributes).toContainEqual({ key: 'pathly.cost_cents', value: { doubleValue: 0.5 } });
+        expect(step.traceId).toMatch(/^[0-9a-f]{32}$/);
+        expect(BigInt(step.endTimeUnixNano) >= BigInt(step.startTimeUnixNano)).toBe(true);
+
+        const line = JSON.parse(formatTraceLogLine(batches[0]));
+        expect(line).toMatchObject({ type: 'trace', function: 'replay-otlp', root: 'step extract', inputTokens: 1200, costCents: 0.5 });
+        expect(line.spans).toEqual([expect.objectContaining({ name: 'llm extract_job_fields' })]);
+    });
+});
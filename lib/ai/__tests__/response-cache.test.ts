@@ -0,0 +1,159 @@
+import {
+    computeCompletionCacheKey,
+    createMemoryLruBackend,
+    createTieredBackend,
+    getOrLoadCompletion,
+    setCompletionCacheBackend,
+    type CachedCompletion,
+} from '../response-cache';
+import { getLocalCacheStats, resetLocalCacheStats } from '@/lib/services/cache-monitor';
+
+const BASE_KEY = {
+    taskType: 'extract_job_fields',
+    modelId: 'claude-haiku-4-5-20251001',
+    systemPrompt: 'Return ONLY JSON.',
+    prompt: 'Senior Data Engineer (m/w/d)\nPython, Spark',
+    temperature: 0,
+    maxTokens: 2000,
+};
+
+function completion(text: string, costCents = 3): CachedCompletion {
+    return { text, model: 'claude-haiku-4-5-20251001', inputTokens: 1200, outputTokens: 300, costCents, createdAt: 0 };
+}
+
+describe('response-cache', () => {
+    describe('computeCompletionCacheKey', () => {
+        it('ignores line-ending and trailing-whitespace drift', () => {
+            const drifted = { ...BASE_KEY, prompt: 'Senior Data Engineer (m/w/d)  \r\nPython, Spark\n\n' };
+            expect(computeCompletionCacheKey(drifted)).toBe(computeCompletionCacheKey(BASE_KEY));
+        });
+
+        it('changes with model, temperature, max tokens and prompt content', () => {
+            const base = computeCompletionCacheKey(BASE_KEY);
+            expect(computeCompletionCacheKey({ ...BASE_KEY, modelId: 'mistral-small-2503' })).not.toBe(base);
+            expect(computeCompletionCacheKey({ ...BASE_KEY, temperature: 0.3 })).not.toBe(base);
+            expect(computeCompletionCacheKey({ ...BASE_KEY, maxTokens: 4096 })).not.toBe(base);
+            expect(computeCompletionCacheKey({ ...BASE_KEY, prompt: 'senior data engineer (m/w/d)\nPython, Spark' })).not.toBe(base);
+        });
+    });
+
+    describe('createMemoryLruBackend', () => {
+        afterEach(() => {
+            jest.restoreAllMocks();
+        });
+
+        it('evicts the least recently used entry when full', async () => {
+            const lru = createMemoryLruBackend({ maxEntries: 2 });
+            await lru.set('a', completion('A'), 60);
+            await lru.set('b', completion('B'), 60);
+            await lru.get('a'); // a becomes MRU
+            await lru.set('c', completion('C'), 60);
+
+            expect(await lru.get('a')).not.toBeNull();
+            expect(await lru.get('b')).toBeNull();
+            expect(await lru.get('c')).not.toBeNull();
+        });
+
+        it('expires entries after their TTL and respects the byte bound', async () => {
+            let now = 1_000;
+            const lru = createMemoryLruBackend({ maxBytes: 1_000, now: () => now });
+            await lru.set('a', completion('A'), 10);
+            now += 9_999;
+            expect(await lru.get('a')).not.toBeNull();
+            now += 1;
+            expect(await lru.get('a')).toBeNull();
+
+            await lru.set('big', completion('x'.repeat(600)), 10);
+            expect(await lru.get('big')).toBeNull();
+        });
+
+        it('back-fills faster tiers from slower ones', async () => {
+            const l1 = createMemoryLruBackend();
+            const l2 = createMemoryLruBackend();
+            await l2.set('k', completion('from L2'), 60);
+
+            const tiered = createTieredBackend(l1, l2);
+            expect((await tiered.get('k'))?.text).toBe('from L2');
+            expect((await l1.get('k'))?.text).toBe('from L2');
+        });
+
+        it('back-fills with the remaining lifetime, not a fresh default TTL', async () => {
+            let now = 1_000_000;
+            jest.spyOn(Date, 'now').mockImplementation(() => now);
+            const l1 = createMemoryLruBackend({ now: () => now });
+            const l2 = createMemoryLruBackend({ now: () => now });
+            const tiered = createTieredBackend(l1, l2);
+
+            await tiered.set('k', completion('short'), 10);
+            await l1.delete('k');
+
+            now += 6_000;
+            expect((await tiered.get('k'))?.text).toBe('short');
+            expect((await l1.get('k'))?.expiresAt).toBe(1_010_000);
+
+            now += 4_000;
+            expect(await l1.get('k')).toBeNull();
+
+            // Slower tier still holds an entry past its expiresAt → no back-fill
+            const stale = { ...completion('stale'), expiresAt: now - 1 };
+            const l1b = createMemoryLruBackend({ now: () => now });
+            const ignoresTtl = { ...l2, get: async () => stale };
+            await createTieredBackend(l1b, ignoresTtl).get('k');
+            expect(await l1b.get('k')).toBeNull();
+        });
+    });
+
+    describe('getOrLoadCompletion', () => {
+        beforeEach(() => {
+            setCompletionCacheBackend(createMemoryLruBackend());
+            resetLocalCacheStats();
+        });
+
+        afterAll(() => setCompletionCacheBackend(null));
+
+        it('coalesces concurrent identical calls into one upstream request', async () => {
+            let release: () => void = () => {};
+            const gate = new Promise<void>(resolve => { release = resolve; });
+            const loader = jest.fn(async () => {
+                await gate;
+                return completion('{"summary":"ok"}');
+            });
+
+            const calls = [1, 2, 3].map(() => getOrLoadCompletion('same-key', 60, loader));
+            release();
+            const results = await Promise.all(calls);
+
+            expect(loader).toHaveBeenCalledTimes(1);
+            expect(results.map(r => r.outcome).sort()).toEqual(['coalesced', 'coalesced', 'miss']);
+            expect(new Set(results.map(r => r.value.text))).toEqual(new Set(['{"summary":"ok"}']));
+        });
+
+        it('serves later calls from the backend and reports saved cost', async () => {
+            const loader = jest.fn(async () => completion('{"summary":"ok"}', 4));
+            await getOrLoadCompletion('k', 60, loader);
+            const second = await getOrLoadCompletion('k', 60, loader);
+
+            expect(loader).toHaveBeenCalledTimes(1);
+            expect(second.outcome).toBe('hit');
+            expect(getLocalCacheStats().llm_response).toMatchObject({
+                hits: 1,
+                misses: 1,
+                hitRate: '50.0%',
+                estimatedSavings: '€0.04',
+            });
+        });
+
+        it('does not cache failures or empty responses', async () => {
+            const failing = jest.fn(async (): Promise<CachedCompletion> => { throw new Error('529 overloaded'); });
+            await expect(getOrLoadCompletion('err', 60, failing)).rejects.toThrow('529 overloaded');
+
+            const empty = jest.fn(async () => completion('  '));
+            await getOrLoadCompletion('empty', 60, empty);
+            await getOrLoadCompletion('empty', 60, empty);
+            expect(empty).toHaveBeenCalledTimes(2);
+
+            const recovered = await getOrLoadCompletion('err', 60, async () => completion('ok'));
+            expect(recovered.outcome).toBe('miss');
+        });
+    });
+});
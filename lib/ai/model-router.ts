@@ -21,9 +21,20 @@
  *   2026-04-26: parse_html TaskType removed — its sole caller (lib/scrapers/parser.ts)
  *               had 0 production callers and was archived to _archive/scrapers-parser.ts.
  *               Mistral remains in the stack for 4 lightweight classification tasks.
+ *   2026-10-17: Content-addressed response cache (response-cache.ts) in front of
+ *               complete() — deterministic job-side tasks are served from cache,
+ *               concurrent identical calls share one upstream request.
  */
 
 import Anthropic from '@anthropic-ai/sdk';
+import {
+    DEFAULT_CACHE_TTL_SECONDS,
+    computeCompletionCacheKey,
+    getOrLoadCompletion,
+    type CacheOutcome,
+    type CachedCompletion,
+} from './response-cache';
+import { recordModelUsage, tracedFetch, withSpan } from '@/lib/tracing';
 
 // ============================================================================
 // MODEL DEFINITIONS
@@ -124,14 +135,43 @@ export interface CompletionRequest {
     systemPrompt?: string;
     temperature?: number;
     maxTokens?: number;
+    /**
+     * Response cache control. Default: on for CACHED_BY_DEFAULT tasks.
+     * `true` / `{ ttlSeconds }` opts a task in, `false` forces a fresh call.
+     * Only deterministic requests (temperature 0) are ever cached.
+     */
+    cache?: boolean | { ttlSeconds?: number };
 }
 
 export interface CompletionResponse {
     text: string;
     model: string;
     tokensUsed: number;
+    /** Cost of THIS call — 0 when served from cache or an in-flight duplicate */
     costCents: number;
     latencyMs: number;
+    /** Set when the response cache was consulted */
+    cacheOutcome?: CacheOutcome;
+    inputTokens?: number;
+    outputTokens?: number;
+}
+
+// Job-side tasks: input is the (public) job posting, shared across users, no CV PII.
+// User-specific tasks stay opt-in via `cache: true`.
+const CACHED_BY_DEFAULT: ReadonlySet<TaskType> = new Set<TaskType>([
+    'extract_job_fields',
+    'summarize_job_description',
+    'detect_ats_system',
+    'classify_job_board',
+]);
+
+function resolveCacheTtl(request: CompletionRequest): number | null {
+    if (process.env.LLM_RESPONSE_CACHE === 'off') return null;
+    if ((request.temperature ?? 0) !== 0) return null;
+    if (request.cache === false) return null;
+    if (request.cache === undefined && !CACHED_BY_DEFAULT.has(request.taskType)) return null;
+    if (typeof request.cache === 'object' && request.cache.ttlSeconds) return request.cache.ttlSeconds;
+    return DEFAULT_CACHE_TTL_SECONDS;
 }
 
 let anthropicClient: Anthropic | null = null;
@@ -176,7 +216,7 @@ async function completeMistral(
     }
     messages.push({ role: 'user', content: request.prompt });
 
-    const response = await fetch('https://api.mistral.ai/v1/chat/completions', {
+    const response = await tracedFetch('mistral', 'https://api.mistral.ai/v1/chat/completions', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
@@ -203,12 +243,31 @@ async function completeMistral(
     return { text, inputTokens, outputTokens };
 }
 
-export async function complete(
-    request: CompletionRequest
-): Promise<CompletionResponse> {
-    const startTime = Date.now();
-    const model = selectModel(request.taskType);
+/**
+ * Model that will actually serve the request — Mistral tasks fall back to Haiku
+ * when MISTRAL_API_KEY is missing (see callProvider).
+ */
+function resolveServingModel(taskType: TaskType) {
+    const model = selectModel(taskType);
+    if (model.provider === 'mistral' && !process.env.MISTRAL_API_KEY) return MODELS.CLAUDE_HAIKU;
+    return model;
+}
 
+function computeCostCents(
+    model: { cost_input_per_1m: number; cost_output_per_1m: number },
+    inputTokens: number,
+    outputTokens: number,
+): number {
+    return Math.ceil(
+        ((inputTokens / 1_000_000) * model.cost_input_per_1m +
+            (outputTokens / 1_000_000) * model.cost_output_per_1m) * 100
+    );
+}
+
+async function callProvider(
+    request: CompletionRequest,
+    model: ReturnType<typeof selectModel>,
+): Promise<{ text: string; inputTokens: number; outputTokens: number }> {
     let result: { text: string; inputTokens: number; outputTokens: number };
 
     if (model.provider === 'anthropic') {
@@ -263,12 +322,109 @@ export async function complete(
         throw new Error(`Unsupported provider: ${(model as any).provider}. Supported: anthropic, mistral.`);
     }
 
+    return result;
+}
+
+/**
+ * Run a task on its routed model. Inside a trace (Inngest pipelines) the call
+ * is recorded as an `llm <task>` span with model, tokens, cost and cache outcome.
+ */
+export async function complete(
+    request: CompletionRequest
+): Promise<CompletionResponse> {
+    return withSpan(`llm ${request.taskType}`, {
+        kind: 'client',
+        attributes: { 'gen_ai.operation.name': 'chat', 'pathly.task': request.taskType },
+    }, async span => {
+        const response = await completeWithCache(request);
+        recordModelUsage(span, {
+            model: response.model,
+            provider: Object.values(MODELS).find(m => m.id === response.model)?.provider,
+            inputTokens: response.inputTokens,
+            outputTokens: response.outputTokens,
+            costCents: response.costCents,
+            cacheOutcome: response.cacheOutcome,
+        });
+        return response;
+    });
+}
+
+async function completeWithCache(
+    request: CompletionRequest
+): Promise<CompletionResponse> {
+    const startTime = Date.now();
+    const ttlSeconds = resolveCacheTtl(request);
+
+    if (ttlSeconds === null) {
+        const model = selectModel(request.taskType);
+        const result = await callProvider(request, model);
+        return recordCompletion(request, model, result, Date.now() - startTime);
+    }
+
+    const servingModel = resolveServingModel(request.taskType);
+    const key = computeCompletionCacheKey({
+        taskType: request.taskType,
+        modelId: servingModel.id,
+        systemPrompt: request.systemPrompt,
+        prompt: request.prompt,
+        temperature: request.temperature ?? 0,
+        maxTokens: request.maxTokens ?? 4096,
+    });
+
+    // The caller whose loader ran gets the real (billed) response back
+    const upstream: { response?: CompletionResponse } = {};
+    const { value, outcome } = await getOrLoadCompletion(key, ttlSeconds, async (): Promise<CachedCompletion> => {
+        const model = selectModel(request.taskType);
+        const result = await callProvider(request, model);
+        const response = recordCompletion(request, model, result, Date.now() - startTime, 'miss');
+        upstream.response = response;
+        return {
+            text: result.text,
+            model: response.model,
+            inputTokens: result.inputTokens,
+            outputTokens: result.outputTokens,
+            costCents: response.costCents,
+            createdAt: Date.now(),
+        };
+    });
+
+    if (outcome === 'miss' && upstream.response) return upstream.response;
+
     const latencyMs = Date.now() - startTime;
+    console.log(JSON.stringify({
+        type: 'ai_cost',
+        timestamp: new Date().toISOString(),
+        task: request.taskType,
+        model: value.model,
+        cache: outcome,
+        tokens: value.inputTokens + value.outputTokens,
+        costCents: 0,
+        savedCents: value.costCents,
+        latencyMs,
+    }));
+
+    return {
+        text: value.text,
+        model: value.model,
+        tokensUsed: value.inputTokens + value.outputTokens,
+        costCents: 0,
+        latencyMs,
+        cacheOutcome: outcome,
+        inputTokens: value.inputTokens,
+        outputTokens: value.outputTokens,
+    };
+}
+
+/** Cost accounting + structured log for a call that actually hit the provider. */
+function recordCompletion(
+    request: CompletionRequest,
+    model: ReturnType<typeof selectModel>,
+    result: { text: string; inputTokens: number; outputTokens: number },
+    latencyMs: number,
+    cacheOutcome?: CacheOutcome,
+): CompletionResponse {
     const tokensUsed = result.inputTokens + result.outputTokens;
-    const costCents = Math.ceil(
-        ((result.inputTokens / 1_000_000) * model.cost_input_per_1m +
-            (result.outputTokens / 1_000_000) * model.cost_output_per_1m) * 100
-    );
+    const costCents = computeCostCents(model, result.inputTokens, result.outputTokens);
 
     // Track costs in memory (dev convenience — resets on serverless cold starts!)
     if (!costStats.taskBreakdown[request.taskType]) {
@@ -293,6 +449,7 @@ export async function complete(
         costCents,
         costEur: +(costCents / 100).toFixed(4),
         latencyMs,
+        ...(cacheOutcome ? { cache: cacheOutcome } : {}),
     }));
 
     return {
@@ -301,6 +458,9 @@ export async function complete(
         tokensUsed,
         costCents,
         latencyMs,
+        ...(cacheOutcome ? { cacheOutcome } : {}),
+        inputTokens: result.inputTokens,
+        outputTokens: result.outputTokens,
     };
 }
 
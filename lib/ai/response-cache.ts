@@ -0,0 +1,280 @@
+/**
+ * LLM Response Cache — Content-Addressed Completion Cache
+ *
+ * Sits in front of `complete()` (model-router.ts). Identical deterministic requests
+ * (same task, model, system prompt, prompt, temperature, max tokens) are answered
+ * from cache instead of paying the provider again.
+ *
+ * Three layers:
+ *   1. Key:          SHA-256 over the normalized request (computeCompletionCacheKey)
+ *   2. Backend:      pluggable — in-memory LRU (TTL + entry/byte bounds) locally,
+ *                    LRU in front of Upstash Redis (TTL via SET EX) in production
+ *   3. Singleflight: concurrent identical calls share ONE upstream request
+ *
+ * Hits, misses and coalesced calls are reported to cache-monitor.ts
+ * (namespace 'llm_response') together with the saved provider cost.
+ *
+ * ⚠️ SYNC CONTRACT: Changing the normalization in computeCompletionCacheKey()
+ *    invalidates all cached entries — safe (one-time cache-miss), but intentional.
+ *    Bump CACHE_KEY_VERSION when the cached value shape changes.
+ */
+
+import { createHash } from 'crypto';
+import type { Redis } from '@upstash/redis';
+import { getRedis } from '@/lib/api/rate-limit-upstash';
+import { createTtlLruCache } from '@/lib/utils/ttl-lru-cache';
+import { recordCacheCoalesced, recordCacheHit, recordCacheMiss } from '@/lib/services/cache-monitor';
+
+const CACHE_KEY_VERSION = 'v1';
+const REDIS_KEY_PREFIX = 'llm-cache:';
+
+export const DEFAULT_CACHE_TTL_SECONDS = 24 * 60 * 60;
+
+// Local LRU bounds — large job descriptions produce ~10 KB responses
+const DEFAULT_MAX_ENTRIES = 500;
+const DEFAULT_MAX_BYTES = 16 * 1024 * 1024;
+// Upstash rejects request bodies > 1 MB; keep a safety margin
+const MAX_REDIS_VALUE_BYTES = 512 * 1024;
+
+// ─── Types ──────────────────────────────────────────────────────────────────
+
+/** What is stored per key — the provider result plus its original cost. */
+export interface CachedCompletion {
+    text: string;
+    model: string;
+    inputTokens: number;
+    outputTokens: number;
+    costCents: number;
+    /** Epoch ms when the upstream call completed */
+    createdAt: number;
+    /** Epoch ms when the entry expires — stamped by the backend on first write,
+     *  so tier back-fills keep the original lifetime */
+    expiresAt?: number;
+}
+
+export interface CompletionCacheBackend {
+    readonly name: string;
+    get(key: string): Promise<CachedCompletion | null>;
+    set(key: string, value: CachedCompletion, ttlSeconds: number): Promise<void>;
+    delete(key: string): Promise<void>;
+}
+
+export interface CompletionCacheKeyParts {
+    taskType: string;
+    modelId: string;
+    systemPrompt?: string;
+    prompt: string;
+    temperature: number;
+    maxTokens: number;
+}
+
+/** hit = served from backend, coalesced = joined an in-flight call, miss = upstream call */
+export type CacheOutcome = 'hit' | 'miss' | 'coalesced';
+
+// ─── Key ────────────────────────────────────────────────────────────────────
+
+/**
+ * Normalize prompt text for hashing WITHOUT changing what the model sees:
+ * line endings, trailing whitespace per line and leading/trailing blank lines.
+ * Case and inner whitespace are preserved — they can change the model output.
+ */
+function normalizePromptText(value: string | undefined): string {
+    return (value ?? '')
+        .replace(/\r\n?/g, '\n')
+        .replace(/[ \t]+$/gm, '')
+        .trim();
+}
+
+/**
+ * Compute the content-addressed cache key for a completion request.
+ * Fields are joined with '|||' (same separator convention as computeInputHash)
+ * and hashed with SHA-256, truncated to 32 hex chars (128 bits).
+ */
+export function computeCompletionCacheKey(parts: CompletionCacheKeyParts): string {
+    const normalized = [
+        CACHE_KEY_VERSION,
+        parts.taskType,
+        parts.modelId,
+        parts.temperature.toFixed(3),
+        String(parts.maxTokens),
+        normalizePromptText(parts.systemPrompt),
+        normalizePromptText(parts.prompt),
+    ].join('|||');
+    return createHash('sha256').update(normalized).digest('hex').slice(0, 32);
+}
+
+// ─── Backends ───────────────────────────────────────────────────────────────
+
+function withExpiry(value: CachedCompletion, ttlSeconds: number, now: number): CachedCompletion {
+    return value.expiresAt ? value : { ...value, expiresAt: now + ttlSeconds * 1000 };
+}
+
+/** Whole seconds left until the entry expires (entries written before expiresAt existed: default TTL from createdAt). */
+function remainingTtlSeconds(value: CachedCompletion, now: number): number {
+    const expiresAt = value.expiresAt ?? value.createdAt + DEFAULT_CACHE_TTL_SECONDS * 1000;
+    return Math.floor((expiresAt - now) / 1000);
+}
+
+export interface MemoryLruOptions {
+    maxEntries?: number;
+    maxBytes?: number;
+    /** Injectable clock (tests) */
+    now?: () => number;
+}
+
+/** In-memory LRU with per-entry TTL (see lib/utils/ttl-lru-cache.ts). */
+export function createMemoryLruBackend(options: MemoryLruOptions = {}): CompletionCacheBackend {
+    const now = options.now ?? Date.now;
+    const cache = createTtlLruCache<CachedCompletion>({
+        maxEntries: options.maxEntries ?? DEFAULT_MAX_ENTRIES,
+        maxBytes: options.maxBytes ?? DEFAULT_MAX_BYTES,
+        // UTF-16 length × 2 is a cheap upper-bound estimate of the heap cost
+        sizeOf: value => (value.text.length + value.model.length) * 2 + 64,
+        now,
+    });
+
+    return {
+        name: 'memory-lru',
+        async get(key) {
+            return cache.get(key) ?? null;
+        },
+        async set(key, value, ttlSeconds) {
+            cache.set(key, withExpiry(value, ttlSeconds, now()), ttlSeconds * 1000);
+        },
+        async delete(key) {
+            cache.delete(key);
+        },
+    };
+}
+
+/**
+ * Upstash Redis backend — shared across serverless instances.
+ * Size is bounded by TTL (SET EX) plus the Redis eviction policy;
+ * oversized values are not written.
+ */
+export function createRedisBackend(redis: Redis, prefix: string = REDIS_KEY_PREFIX): CompletionCacheBackend {
+    return {
+        name: 'upstash-redis',
+        async get(key) {
+            return (await redis.get<CachedCompletion>(`${prefix}${key}`)) ?? null;
+        },
+        async set(key, value, ttlSeconds) {
+            if (value.text.length * 2 > MAX_REDIS_VALUE_BYTES) return;
+            await redis.set(`${prefix}${key}`, withExpiry(value, ttlSeconds, Date.now()), { ex: ttlSeconds });
+        },
+        async delete(key) {
+            await redis.del(`${prefix}${key}`);
+        },
+    };
+}
+
+/**
+ * Read-through chain: the first tier that has the key answers and the faster
+ * tiers in front of it are back-filled for the entry's remaining lifetime.
+ * Writes go to every tier with one shared expiresAt.
+ */
+export function createTieredBackend(...tiers: CompletionCacheBackend[]): CompletionCacheBackend {
+    return {
+        name: tiers.map(t => t.name).join('+'),
+        async get(key) {
+            for (let i = 0; i < tiers.length; i++) {
+                const value = await tiers[i].get(key);
+                if (!value) continue;
+                const remaining = remainingTtlSeconds(value, Date.now());
+                if (remaining > 0) {
+                    for (let j = 0; j < i; j++) {
+                        await tiers[j].set(key, value, remaining);
+                    }
+                }
+                return value;
+            }
+            return null;
+        },
+        async set(key, value, ttlSeconds) {
+            const stamped = withExpiry(value, ttlSeconds, Date.now());
+            await Promise.all(tiers.map(t => t.set(key, stamped, ttlSeconds)));
+        },
+        async delete(key) {
+            await Promise.all(tiers.map(t => t.delete(key)));
+        },
+    };
+}
+
+// ─── Active backend (lazy singleton) ────────────────────────────────────────
+
+let _backend: CompletionCacheBackend | undefined;
+
+export function getCompletionCacheBackend(): CompletionCacheBackend {
+    if (_backend) return _backend;
+    const redis = getRedis();
+    _backend = redis
+        ? createTieredBackend(createMemoryLruBackend(), createRedisBackend(redis))
+        : createMemoryLruBackend();
+    return _backend;
+}
+
+/** Swap the backend (tests, scripts) — `null` resets to the lazy default. */
+export function setCompletionCacheBackend(backend: CompletionCacheBackend | null) {
+    _backend = backend ?? undefined;
+}
+
+// ─── Singleflight + read-through ────────────────────────────────────────────
+
+const inFlight = new Map<string, Promise<CachedCompletion>>();
+
+/**
+ * Return the cached completion for `key`, or run `loader` exactly once per key
+ * across concurrent callers and store its result.
+ *
+ * Backend failures are logged and treated as a miss — the cache must never
+ * fail a completion. Loader errors propagate to every waiting caller and are
+ * not cached. Empty responses are not cached.
+ */
+export async function getOrLoadCompletion(
+    key: string,
+    ttlSeconds: number,
+    loader: () => Promise<CachedCompletion>,
+): Promise<{ value: CachedCompletion; outcome: CacheOutcome }> {
+    const pending = inFlight.get(key);
+    if (pending) {
+        const value = await pending;
+        recordCacheCoalesced('llm_response', value.costCents);
+        return { value, outcome: 'coalesced' };
+    }
+
+    const backend = getCompletionCacheBackend();
+    const load = (async () => {
+        try {
+            const cached = await backend.get(key);
+            if (cached) return { value: cached, outcome: 'hit' as const };
+        } catch (error) {
+            console.warn(`⚠️ [ResponseCache] ${backend.name} read failed — treating as miss:`, error);
+        }
+
+        const value = await loader();
+        if (value.text.trim()) {
+            backend.set(key, value, ttlSeconds).catch(error => {
+                console.warn(`⚠️ [ResponseCache] ${backend.name} write failed:`, error);
+            });
+        }
+        return { value, outcome: 'miss' as const };
+    })();
+
+    // Register before the first await so concurrent callers join this call
+    const shared = load.then(result => result.value);
+    inFlight.set(key, shared);
+    // Followers attach their own handlers; keep an unobserved rejection quiet here
+    shared.catch(() => {});
+
+    try {
+        const result = await load;
+        if (result.outcome === 'hit') {
+            recordCacheHit('llm_response', result.value.costCents);
+        } else {
+            recordCacheMiss('llm_response');
+        }
+        return result;
+    } finally {
+        inFlight.delete(key);
+    }
+}
@@ -0,0 +1,168 @@
+import { buildHeatmapGrid, findPeakWindow, type HeatmapCell } from '../heatmap-utils';
+import { calcMomentumScore, calcStreak, generateFunnelInsightData } from '../insights';
+import {
+    calcMomentumScoreFromRollups,
+    calcStreakFromRollups,
+    generateFunnelInsightFromRollups,
+    heatmapCellsFromRollups,
+    jobStatusCounts,
+    rollupJobsByStatus,
+    rollupSessionsByDay,
+    rollupSessionsByHour,
+} from '../rollups';
+
+const DAY_MS = 86400000;
+const NOW = new Date('2026-10-17T00:00:00.000Z'); // UTC midnight → day-aligned window equals the raw 7×24h window
+const STATUSES = ['pending', 'processing', 'ready_for_review', 'ready_to_apply', 'submitted', 'failed', 'cv_matched'];
+
+/** Deterministic PRNG (mulberry32) so every seed is a reproducible history */
+function rng(seed: number) {
+    return () => {
+        seed = (seed + 0x6D2B79F5) | 0;
+        let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+        t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+}
+
+/** Sessions over `years`, ending with a run of `streakDays` active days before NOW */
+function syntheticSessions(seed: number, years: number, streakDays = 0) {
+    const random = rng(seed);
+    const sessions: { started_at: string; completed: boolean; duration_min: number; energy_level: number | null }[] = [];
+    const session = (dayStart: number) => {
+        sessions.push({
+            started_at: new Date(dayStart + Math.floor(random() * DAY_MS)).toISOString(),
+            completed: random() < 0.7,
+            duration_min: random() < 0.8 ? 25 : 50,
+            energy_level: random() < 0.6 ? 1 + Math.floor(random() * 5) : null,
+        });
+    };
+
+    for (let day = Math.round(years * 365); day >= 1; day--) {
+        if (random() < 0.5) continue;
+        const count = 1 + Math.floor(random() * 5);
+        for (let i = 0; i < count; i++) session(NOW.getTime() - day * DAY_MS);
+    }
+    for (let day = 1; day <= streakDays; day++) {
+        sessions.push({ started_at: new Date(NOW.getTime() - day * DAY_MS + 9 * 3600000).toISOString(), completed: true, duration_min: 25, energy_level: 4 });
+    }
+    return sessions;
+}
+
+function syntheticJobs(seed: number, count: number) {
+    const random = rng(seed);
+    return Array.from({ length: count }, () => ({
+        status: STATUSES[Math.floor(random() * STATUSES.length)],
+        match_score_overall: random() < 0.7 ? Math.floor(random() * 101) : null,
+    }));
+}
+
+/** What the pre-rollup pomodoro_heatmap view returned: GROUP BY ISO weekday × hour over raw rows */
+function heatmapFromRawSessions(sessions: ReturnType<typeof syntheticSessions>): HeatmapCell[] {
+    const cells = new Map<string, { s: HeatmapCell; energy: number[] }>();
+    for (const session of sessions) {
+        const d = new Date(session.started_at);
+        const day = d.getUTCDay() === 0 ? 7 : d.getUTCDay();
+        const key = `${day}-${d.getUTCHours()}`;
+        const cell = cells.get(key) ?? {
+            s: { day_of_week: day, hour_of_day: d.getUTCHours(), session_count: 0, completed_count: 0, avg_energy: null },
+            energy: [],
+        };
+        cell.s.session_count++;
+        if (session.completed) cell.s.completed_count++;
+        if (session.energy_level !== null) cell.energy.push(session.energy_level);
+        cells.set(key, cell);
+    }
+    return Array.from(cells.values()).map(({ s, energy }) => ({
+        ...s,
+        avg_energy: energy.length > 0 ? Math.round(energy.reduce((a, b) => a + b, 0) / energy.length) : null,
+    }));
+}
+
+const byCell = (a: HeatmapCell, b: HeatmapCell) => a.day_of_week - b.day_of_week || a.hour_of_day - b.hour_of_day;
+
+describe('analytics rollups — equivalence with raw recomputation', () => {
+    beforeEach(() => {
+        jest.spyOn(Date, 'now').mockReturnValue(NOW.getTime());
+    });
+
+    afterEach(() => {
+        jest.restoreAllMocks();
+    });
+
+    it.each([1, 2, 3, 4, 5])('heatmap cells, grid and peak window match the raw view (seed %i)', seed => {
+        const sessions = syntheticSessions(seed, 3);
+        const fromRollups = heatmapCellsFromRollups(rollupSessionsByHour(sessions));
+        const fromRaw = heatmapFromRawSessions(sessions);
+
+        expect([...fromRollups].sort(byCell)).toEqual([...fromRaw].sort(byCell));
+        expect(findPeakWindow(buildHeatmapGrid(fromRollups))).toEqual(findPeakWindow(buildHeatmapGrid(fromRaw)));
+    });
+
+    it.each([1, 2, 3, 4, 5])('momentum score matches calcMomentumScore (seed %i)', seed => {
+        const sessions = syntheticSessions(seed, 2, seed * 3);
+        const jobs = syntheticJobs(seed, 40 * seed);
+
+        expect(calcMomentumScoreFromRollups(rollupSessionsByDay(sessions), rollupJobsByStatus(jobs), NOW))
+            .toBe(calcMomentumScore(sessions, jobs));
+    });
+
+    it('momentum is 0 without sessions in the window and ignores older days', () => {
+        const old = syntheticSessions(7, 1).filter(s => NOW.getTime() - new Date(s.started_at).getTime() > 8 * DAY_MS);
+        const jobs = syntheticJobs(7, 20);
+
+        expect(calcMomentumScore(old, jobs)).toBe(0);
+        expect(calcMomentumScoreFromRollups(rollupSessionsByDay(old), rollupJobsByStatus(jobs), NOW)).toBe(0);
+    });
+
+    it.each([0, 1, 4, 30, 200, 400])('streak matches calcStreak for a %i-day run', streakDays => {
+        // Sparse random history + a dense run: the run defines the streak, the noise must not extend it
+        const sessions = syntheticSessions(streakDays + 11, 2, streakDays);
+        const daily = rollupSessionsByDay(sessions);
+
+        expect(calcStreakFromRollups(daily, NOW)).toBe(calcStreak(sessions, NOW));
+        if (streakDays >= 4) expect(calcStreak(sessions, NOW)).toBeGreaterThanOrEqual(Math.min(streakDays, 365));
+    });
+
+    it('counts today when it already has a completed session (grace day otherwise)', () => {
+        const sessions = [
+            { started_at: '2026-10-17T08:00:00.000Z', completed: true, duration_min: 25, energy_level: null },
+            { started_at: '2026-10-16T08:00:00.000Z', completed: true, duration_min: 25, energy_level: null },
+            { started_at: '2026-10-15T08:00:00.000Z', completed: false, duration_min: 25, energy_level: 2 },
+        ];
+        const noon = new Date('2026-10-17T12:00:00.000Z');
+
+        expect(calcStreak(sessions, noon)).toBe(2);
+        expect(calcStreakFromRollups(rollupSessionsByDay(sessions), noon)).toBe(2);
+        expect(calcStreakFromRollups(rollupSessionsByDay(sessions.slice(1)), noon)).toBe(1);
+    });
+
+    it.each([3, 5, 12, 60, 400])('funnel insight matches generateFunnelInsightData for %i jobs', count => {
+        const jobs = syntheticJobs(count, count);
+
+        expect(generateFunnelInsightFromRollups(rollupJobsByStatus(jobs))).toEqual(generateFunnelInsightData(jobs));
+    });
+
+    it('finds the biggest funnel drop from status counts', () => {
+        const jobs = [
+            ...Array(6).fill({ status: 'pending' }),
+            ...Array(2).fill({ status: 'ready_for_review' }),
+            ...Array(2).fill({ status: 'submitted' }),
+            { status: 'failed' },
+        ];
+
+        // reached ≥ stage: 10, 4, 4, 2, 2 → pending → processing drops 60%
+        expect(generateFunnelInsightData(jobs)).toEqual({ dropPct: 60, fromStageIndex: 0, toStageIndex: 1 });
+        expect(jobStatusCounts(rollupJobsByStatus(jobs))).toEqual({ pending: 6, ready_for_review: 2, submitted: 2, failed: 1 });
+        expect(generateFunnelInsightFromRollups(rollupJobsByStatus(jobs))).toEqual(generateFunnelInsightData(jobs));
+    });
+
+    it('skips zeroed rollup rows left behind by deletes', () => {
+        const rollups = rollupJobsByStatus(syntheticJobs(9, 30)).map(r => r.status === 'pending' ? { ...r, job_count: 0 } : r);
+        expect(jobStatusCounts(rollups)).not.toHaveProperty('pending');
+
+        const hourly = rollupSessionsByHour(syntheticSessions(9, 1));
+        hourly[0] = { ...hourly[0], session_count: 0, completed_count: 0, energy_sum: 0, energy_count: 0 };
+        expect(heatmapCellsFromRollups(hourly)).toHaveLength(hourly.length - 1);
+    });
+});
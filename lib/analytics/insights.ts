@@ -1,6 +1,7 @@
 /**
  * Insight engine — Pure TS logic, no AI, $0 cost, 0ms latency.
  * Generates actionable insight texts from raw analytics data.
+ * The *FromRollups variants in rollups.ts feed the same cores with compact aggregates.
  */
 
 interface PomodoroSession {
@@ -17,30 +18,60 @@ interface Job {
 
 // ─── Momentum Score (0–100, rolling 7-day) ───────────────────────
 
+/** Session counters inside the momentum window — from raw rows or daily rollups */
+export interface SessionTotals {
+    sessions: number;
+    completed: number;
+    energySum: number;
+    energyCount: number;
+}
+
+/** Job counters over all jobs — from raw rows or status rollups */
+export interface JobTotals {
+    submitted: number;
+    matchScoreSum: number;
+    matchScoreCount: number;
+}
+
 export function calcMomentumScore(sessions: PomodoroSession[], jobs: Job[]): number {
     const last7 = sessions.filter(s => {
         const age = (Date.now() - new Date(s.started_at).getTime()) / 86400000;
         return age <= 7;
     });
+    const energySessions = last7.filter(s => s.energy_level !== null);
+    const matchJobs = jobs.filter(j => j.match_score_overall != null);
 
-    if (last7.length === 0) return 0;
+    return scoreMomentum(
+        {
+            sessions: last7.length,
+            completed: last7.filter(s => s.completed).length,
+            energySum: energySessions.reduce((sum, s) => sum + (s.energy_level ?? 0), 0),
+            energyCount: energySessions.length,
+        },
+        {
+            submitted: jobs.filter(j => j.status === 'submitted').length,
+            matchScoreSum: matchJobs.reduce((sum, j) => sum + (j.match_score_overall ?? 0), 0),
+            matchScoreCount: matchJobs.length,
+        },
+    );
+}
 
-    const completionRate = last7.filter(s => s.completed).length / last7.length;
-    const energySessions = last7.filter(s => s.energy_level !== null);
-    const avgEnergy = energySessions.length > 0
-        ? energySessions.reduce((sum, s) => sum + (s.energy_level ?? 0), 0) / energySessions.length
+export function scoreMomentum(sessions: SessionTotals, jobs: JobTotals): number {
+    if (sessions.sessions === 0) return 0;
+
+    const completionRate = sessions.completed / sessions.sessions;
+    const avgEnergy = sessions.energyCount > 0
+        ? sessions.energySum / sessions.energyCount
         : 3; // Default neutral
 
-    const appliedRecently = jobs.filter(j => j.status === 'submitted').length;
-    const matchJobs = jobs.filter(j => j.match_score_overall != null);
-    const avgMatch = matchJobs.length > 0
-        ? matchJobs.reduce((sum, j) => sum + (j.match_score_overall ?? 0), 0) / matchJobs.length
+    const avgMatch = jobs.matchScoreCount > 0
+        ? jobs.matchScoreSum / jobs.matchScoreCount
         : 50;
 
     const score = Math.round(
         completionRate * 40 +
         (avgEnergy / 5) * 25 +
-        Math.min(appliedRecently / 5, 1) * 20 +
+        Math.min(jobs.submitted / 5, 1) * 20 +
         (avgMatch / 100) * 15
     );
 
@@ -100,21 +131,25 @@ export interface FunnelInsightData {
     toStageIndex: number;   // 1-4
 }
 
+export const FUNNEL_STATUS_ORDER = ['pending', 'processing', 'ready_for_review', 'ready_to_apply', 'submitted'];
+
 export function generateFunnelInsightData(jobs: Job[]): FunnelInsightData | null {
-    const STATUS_ORDER = ['pending', 'processing', 'ready_for_review', 'ready_to_apply', 'submitted'];
-    const cumulative: number[] = [];
-
-    // Count jobs that have reached at least each stage
-    for (let i = 0; i < STATUS_ORDER.length; i++) {
-        cumulative[i] = jobs.filter(j => {
-            const idx = STATUS_ORDER.indexOf(j.status);
-            return idx >= i;
-        }).length;
-    }
+    const counts: Record<string, number> = {};
+    for (const job of jobs) counts[job.status] = (counts[job.status] ?? 0) + 1;
+    return funnelInsightFromStatusCounts(counts);
+}
 
-    const total = jobs.length;
+/** Same insight from per-status job counts (e.g. job_status_rollups) */
+export function funnelInsightFromStatusCounts(counts: Record<string, number>): FunnelInsightData | null {
+    const total = Object.values(counts).reduce((sum, n) => sum + n, 0);
     if (total < 5) return null;
 
+    // Count jobs that have reached at least each stage (suffix sums over the stage order)
+    const cumulative: number[] = new Array(FUNNEL_STATUS_ORDER.length).fill(0);
+    for (let i = FUNNEL_STATUS_ORDER.length - 1; i >= 0; i--) {
+        cumulative[i] = (counts[FUNNEL_STATUS_ORDER[i]] ?? 0) + (cumulative[i + 1] ?? 0);
+    }
+
     let biggestDropStep = 1;
     let biggestDrop = 0;
     for (let i = 1; i < cumulative.length; i++) {
@@ -135,24 +170,30 @@ export function generateFunnelInsightData(jobs: Job[]): FunnelInsightData | null
 
 // ─── Streak Calculator ──────────────────────────────────────────
 
-export function calcStreak(sessions: PomodoroSession[]): number {
+export function calcStreak(sessions: PomodoroSession[], now: Date = new Date()): number {
     const completedDays = new Set(
         sessions
             .filter(s => s.completed)
             .map(s => new Date(s.started_at).toISOString().split('T')[0])
     );
+    return streakFromCompletedDays(completedDays, now);
+}
 
+/**
+ * Consecutive UTC days (YYYY-MM-DD) with ≥1 completed session, counted back
+ * from today. Stops at the first gap, so the walk is O(streak), capped at 365.
+ */
+export function streakFromCompletedDays(completedDays: Set<string>, now: Date = new Date()): number {
     let streak = 0;
-    const today = new Date();
+    const d = new Date(now);
     for (let i = 0; i < 365; i++) {
-        const d = new Date(today);
-        d.setDate(d.getDate() - i);
         const key = d.toISOString().split('T')[0];
         if (completedDays.has(key)) {
             streak++;
         } else if (i > 0) {
             break; // Grace: allow today to be incomplete
         }
+        d.setUTCDate(d.getUTCDate() - 1);
     }
     return streak;
 }
@@ -0,0 +1,186 @@
+/**
+ * Analytics rollups — Pathly V2.0
+ * Compact per-user aggregates for the analytics page.
+ *
+ * Postgres keeps three rollup tables current via row triggers
+ * (supabase/migrations/20261017_analytics_rollups.sql):
+ *
+ *   pomodoro_daily_rollups   (user, UTC day)            → streak, momentum
+ *   pomodoro_hourly_rollups  (user, ISO weekday, hour)  → heatmap / peak window
+ *   job_status_rollups       (user, status)             → funnel, momentum
+ *
+ * The dashboard reads O(days + 168 + statuses) rows instead of the user's full
+ * session/job history. The builders below produce the same rows in TS — used by
+ * the equivalence tests and the benchmark, and as the reference for the SQL.
+ */
+
+import type { HeatmapCell } from './heatmap-utils';
+import {
+    funnelInsightFromStatusCounts,
+    scoreMomentum,
+    streakFromCompletedDays,
+    type FunnelInsightData,
+} from './insights';
+
+// ─── Types (mirror the rollup tables) ────────────────────────────
+
+export interface PomodoroDailyRollup {
+    day: string; // YYYY-MM-DD (UTC)
+    session_count: number;
+    completed_count: number;
+    energy_sum: number;
+    energy_count: number;
+}
+
+export interface PomodoroHourlyRollup {
+    day_of_week: number; // 1 (Mo) bis 7 (So), UTC
+    hour_of_day: number; // 0 bis 23, UTC
+    session_count: number;
+    completed_count: number;
+    energy_sum: number;
+    energy_count: number;
+}
+
+export interface JobStatusRollup {
+    status: string;
+    job_count: number;
+    match_score_sum: number;
+    match_score_count: number;
+}
+
+interface RollupSession {
+    started_at: string;
+    completed: boolean;
+    energy_level: number | null;
+}
+
+interface RollupJob {
+    status: string;
+    match_score_overall?: number | null;
+}
+
+// ─── Builders (TS reference for the SQL triggers/backfill) ──────
+
+export function rollupSessionsByDay(sessions: RollupSession[]): PomodoroDailyRollup[] {
+    const byDay = new Map<string, PomodoroDailyRollup>();
+    for (const s of sessions) {
+        const day = new Date(s.started_at).toISOString().split('T')[0];
+        let row = byDay.get(day);
+        if (!row) {
+            row = { day, session_count: 0, completed_count: 0, energy_sum: 0, energy_count: 0 };
+            byDay.set(day, row);
+        }
+        addSession(row, s);
+    }
+    return Array.from(byDay.values()).sort((a, b) => a.day.localeCompare(b.day));
+}
+
+export function rollupSessionsByHour(sessions: RollupSession[]): PomodoroHourlyRollup[] {
+    const byHour = new Map<number, PomodoroHourlyRollup>();
+    for (const s of sessions) {
+        const started = new Date(s.started_at);
+        const dayOfWeek = started.getUTCDay() === 0 ? 7 : started.getUTCDay(); // ISODOW
+        const hour = started.getUTCHours();
+        const key = dayOfWeek * 24 + hour;
+        let row = byHour.get(key);
+        if (!row) {
+            row = { day_of_week: dayOfWeek, hour_of_day: hour, session_count: 0, completed_count: 0, energy_sum: 0, energy_count: 0 };
+            byHour.set(key, row);
+        }
+        addSession(row, s);
+    }
+    return Array.from(byHour.values());
+}
+
+export function rollupJobsByStatus(jobs: RollupJob[]): JobStatusRollup[] {
+    const byStatus = new Map<string, JobStatusRollup>();
+    for (const j of jobs) {
+        let row = byStatus.get(j.status);
+        if (!row) {
+            row = { status: j.status, job_count: 0, match_score_sum: 0, match_score_count: 0 };
+            byStatus.set(j.status, row);
+        }
+        row.job_count++;
+        if (j.match_score_overall != null) {
+            row.match_score_sum += j.match_score_overall;
+            row.match_score_count++;
+        }
+    }
+    return Array.from(byStatus.values());
+}
+
+function addSession(
+    row: { session_count: number; completed_count: number; energy_sum: number; energy_count: number },
+    s: RollupSession,
+): void {
+    row.session_count++;
+    if (s.completed) row.completed_count++;
+    if (s.energy_level !== null) {
+        row.energy_sum += s.energy_level;
+        row.energy_count++;
+    }
+}
+
+// ─── Consumers ───────────────────────────────────────────────────
+
+/** Same rows as the pomodoro_heatmap view — input for buildHeatmapGrid */
+export function heatmapCellsFromRollups(rollups: PomodoroHourlyRollup[]): HeatmapCell[] {
+    return rollups
+        .filter(r => r.session_count > 0)
+        .map(r => ({
+            day_of_week: r.day_of_week,
+            hour_of_day: r.hour_of_day,
+            session_count: r.session_count,
+            completed_count: r.completed_count,
+            avg_energy: r.energy_count > 0 ? Math.round(r.energy_sum / r.energy_count) : null,
+        }));
+}
+
+export function jobStatusCounts(rollups: JobStatusRollup[]): Record<string, number> {
+    const counts: Record<string, number> = {};
+    for (const r of rollups) {
+        if (r.job_count > 0) counts[r.status] = (counts[r.status] ?? 0) + r.job_count;
+    }
+    return counts;
+}
+
+/**
+ * calcMomentumScore on rollups. The 7-day window is aligned to whole UTC days
+ * (every day from the one containing now − 7d), so it can include up to one
+ * day more than the raw 7×24h window; identical when now is UTC midnight.
+ */
+export function calcMomentumScoreFromRollups(
+    days: PomodoroDailyRollup[],
+    jobs: JobStatusRollup[],
+    now: Date = new Date(),
+): number {
+    const windowStart = new Date(now.getTime() - 7 * 86400000).toISOString().split('T')[0];
+    const sessions = { sessions: 0, completed: 0, energySum: 0, energyCount: 0 };
+    for (const d of days) {
+        if (d.day < windowStart) continue;
+        sessions.sessions += d.session_count;
+        sessions.completed += d.completed_count;
+        sessions.energySum += d.energy_sum;
+        sessions.energyCount += d.energy_count;
+    }
+
+    const totals = { submitted: 0, matchScoreSum: 0, matchScoreCount: 0 };
+    for (const j of jobs) {
+        if (j.status === 'submitted') totals.submitted += j.job_count;
+        totals.matchScoreSum += j.match_score_sum;
+        totals.matchScoreCount += j.match_score_count;
+    }
+
+    return scoreMomentum(sessions, totals);
+}
+
+export function calcStreakFromRollups(days: PomodoroDailyRollup[], now: Date = new Date()): number {
+    return streakFromCompletedDays(
+        new Set(days.filter(d => d.completed_count > 0).map(d => d.day)),
+        now,
+    );
+}
+
+export function generateFunnelInsightFromRollups(jobs: JobStatusRollup[]): FunnelInsightData | null {
+    return funnelInsightFromStatusCounts(jobStatusCounts(jobs));
+}
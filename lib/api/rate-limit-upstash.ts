@@ -28,7 +28,8 @@ function cleanEnv(val: string | undefined): string {
     return (val ?? '').trim().replace(/^["']|["']$/g, '');
 }
 
-function getRedis(): Redis | null {
+/** Shared lazy Redis client (also used by cache-monitor and the LLM response cache). */
+export function getRedis(): Redis | null {
     if (_redis !== undefined) return _redis;
 
     const url = cleanEnv(process.env.UPSTASH_REDIS_URL);
@@ -0,0 +1,48 @@
+jest.mock('../client', () => ({
+    inngest: { send: jest.fn(async () => ({ ids: ['evt'] })) },
+}));
+
+import { inngest } from '../client';
+import { BATCH_MAX_JOBS, CV_MATCH_BATCH_EVENT, sendCVMatchBatch } from '../cv-match-batch-trigger';
+
+describe('cv-match batch trigger', () => {
+    const send = inngest.send as unknown as jest.Mock;
+
+    beforeEach(() => {
+        send.mockClear();
+        jest.spyOn(console, 'log').mockImplementation(() => {});
+    });
+
+    afterEach(() => {
+        jest.restoreAllMocks();
+    });
+
+    it('sends ONE analyze-batch event for many queued jobs', async () => {
+        const jobIds = Array.from({ length: 30 }, (_, i) => `job-${i}`);
+
+        await expect(sendCVMatchBatch({ userId: 'u1', jobIds: [...jobIds, 'job-0'], cvDocumentId: 'cv-1', locale: 'de' })).resolves.toBe(1);
+
+        expect(send).toHaveBeenCalledTimes(1);
+        expect(send).toHaveBeenCalledWith([{
+            name: CV_MATCH_BATCH_EVENT,
+            data: { userId: 'u1', cvDocumentId: 'cv-1', locale: 'de', jobIds },
+        }]);
+        expect(CV_MATCH_BATCH_EVENT).toBe('cv-match/analyze-batch');
+    });
+
+    it('sends all eligible jobs as one event when no ids are given', async () => {
+        await sendCVMatchBatch({ userId: 'u1', jobIds: [], topN: 5 });
+
+        expect(send).toHaveBeenCalledWith([{ name: CV_MATCH_BATCH_EVENT, data: { userId: 'u1', topN: 5 } }]);
+    });
+
+    it('splits explicit job lists above BATCH_MAX_JOBS', async () => {
+        const jobIds = Array.from({ length: BATCH_MAX_JOBS * 2 + 1 }, (_, i) => `job-${i}`);
+
+        await expect(sendCVMatchBatch({ userId: 'u1', jobIds })).resolves.toBe(3);
+
+        const events = send.mock.calls[0][0];
+        expect(events.map((e: any) => e.data.jobIds.length)).toEqual([BATCH_MAX_JOBS, BATCH_MAX_JOBS, 1]);
+        expect(events.flatMap((e: any) => e.data.jobIds)).toEqual(jobIds);
+    });
+});
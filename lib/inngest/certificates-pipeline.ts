@@ -15,12 +15,14 @@ import { inngest } from './client';
 import { NonRetriableError } from 'inngest';
 import { createClient } from '@supabase/supabase-js';
 import { complete } from '@/lib/ai/model-router';
+import { supabaseTracingFetch, tracedFetch, withInngestTracing } from '@/lib/tracing';
 import type { CertificateRecommendation } from '@/types/certificates';
 
 function getSupabase() {
     return createClient(
         process.env.NEXT_PUBLIC_SUPABASE_URL!,
-        process.env.SUPABASE_SERVICE_ROLE_KEY!
+        process.env.SUPABASE_SERVICE_ROLE_KEY!,
+        { global: { fetch: supabaseTracingFetch } }
     );
 }
 
@@ -29,7 +31,7 @@ async function validateUrl(url: string): Promise<boolean> {
     try {
         const controller = new AbortController();
         const timeoutId = setTimeout(() => controller.abort(), 3000);
-        const res = await fetch(url, {
+        const res = await tracedFetch('http', url, {
             method: 'HEAD',
             signal: controller.signal,
             redirect: 'follow',
@@ -105,7 +107,7 @@ async function searchCertificates(keyword: string, location: string = 'Deutschla
     const timeoutId = setTimeout(() => controller.abort(), 20000);
 
     try {
-        const response = await fetch('https://api.perplexity.ai/chat/completions', {
+        const response = await tracedFetch('perplexity', 'https://api.perplexity.ai/chat/completions', {
             method: 'POST',
             headers: {
                 Authorization: `Bearer ${process.env.PERPLEXITY_API_KEY}`,
@@ -172,7 +174,7 @@ export const generateCertificates = inngest.createFunction(
         },
         triggers: [{ event: 'certificates/generate' }],
     },
-    async ({ event, step }: { event: any; step: any }) => {
+    withInngestTracing('generate-certificates', async ({ event, step }: { event: any; step: any }) => {
         const { jobId, userId } = event.data as { jobId: string; userId: string };
         const supabase = getSupabase();
 
@@ -456,5 +458,5 @@ REGELN:
 
             throw error;
         }
-    }
+    })
 );
@@ -11,6 +11,7 @@
 import { inngest } from './client';
 import { generateAndSaveReport } from '@/lib/services/coaching-report-generator';
 import { NonRetriableError } from 'inngest';
+import { withInngestTracing } from '@/lib/tracing';
 
 export const generateCoachingReport = inngest.createFunction(
     {
@@ -19,7 +20,7 @@ export const generateCoachingReport = inngest.createFunction(
         retries: 2,
         triggers: [{ event: 'coaching/generate-report' }],
     },
-    async ({ event, step }: { event: any; step: any }) => {
+    withInngestTracing('generate-coaching-report', async ({ event, step }: { event: any; step: any }) => {
         const { sessionId, userId } = event.data;
 
         await step.run('generate-report', async () => {
@@ -41,5 +42,5 @@ export const generateCoachingReport = inngest.createFunction(
         });
 
         return { success: true, sessionId };
-    }
+    })
 );
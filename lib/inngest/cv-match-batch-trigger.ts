@@ -0,0 +1,56 @@
+/**
+ * CV Match Batch Trigger — Pathly V2.0
+ * Builds and sends 'cv-match/analyze-batch' events for analyzeCVMatchBatch
+ * (lib/inngest/cv-match-pipeline.ts). Caller: POST /api/cv/match/batch.
+ *
+ * Explicit job lists above BATCH_MAX_JOBS are split into several events. The
+ * batch function runs one event per user at a time (concurrency limit 1), so
+ * the chunks are processed sequentially and no job is billed twice in parallel.
+ * No job list → one event for all eligible jobs (newest BATCH_MAX_JOBS).
+ */
+
+import { inngest } from './client';
+
+export const CV_MATCH_BATCH_EVENT = 'cv-match/analyze-batch';
+export const BATCH_MAX_JOBS = 200;
+
+export interface CVMatchBatchRequest {
+    userId: string;
+    jobIds?: string[];
+    cvDocumentId?: string;
+    locale?: string;
+    /** LLM analyses per event (ranked by pre-match coverage) */
+    topN?: number;
+}
+
+export interface CVMatchBatchEvent {
+    name: typeof CV_MATCH_BATCH_EVENT;
+    data: CVMatchBatchRequest;
+}
+
+export function buildCVMatchBatchEvents(request: CVMatchBatchRequest): CVMatchBatchEvent[] {
+    const { jobIds, ...rest } = request;
+    const base: CVMatchBatchRequest = Object.fromEntries(
+        Object.entries(rest).filter(([, value]) => value !== undefined)
+    ) as unknown as CVMatchBatchRequest;
+
+    const uniqueIds = [...new Set((jobIds ?? []).filter(id => typeof id === 'string' && id.length > 0))];
+    if (uniqueIds.length === 0) return [{ name: CV_MATCH_BATCH_EVENT, data: base }];
+
+    const events: CVMatchBatchEvent[] = [];
+    for (let i = 0; i < uniqueIds.length; i += BATCH_MAX_JOBS) {
+        events.push({ name: CV_MATCH_BATCH_EVENT, data: { ...base, jobIds: uniqueIds.slice(i, i + BATCH_MAX_JOBS) } });
+    }
+    return events;
+}
+
+/** Sends the batch event(s) in one call. Returns the number of events sent. */
+export async function sendCVMatchBatch(
+    request: CVMatchBatchRequest,
+    client: Pick<typeof inngest, 'send'> = inngest,
+): Promise<number> {
+    const events = buildCVMatchBatchEvents(request);
+    await client.send(events);
+    console.log(`🚀 [CV Match Batch] ${events.length} event(s) sent for user ${request.userId}`);
+    return events.length;
+}
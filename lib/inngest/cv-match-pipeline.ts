@@ -5,6 +5,11 @@
  * Event: 'cv-match/analyze'
  * Payload: { jobId: string, userId: string, cvDocumentId?: string }
  *
+ * Batch mode (one CV × many jobs):
+ * Event: 'cv-match/analyze-batch'
+ * Payload: { userId: string, jobIds?: string[], cvDocumentId?: string, locale?: string, topN?: number }
+ * Sent by POST /api/cv/match/batch via lib/inngest/cv-match-batch-trigger.ts
+ *
  * Contracts: §3 (user-scoped), §8 (supabaseAdmin), §9 (status), JSONB Merge Pflicht
  */
 
@@ -14,14 +19,115 @@ import { createClient as createAdminClient } from '@supabase/supabase-js';
 import { getCVText } from '@/lib/services/cv-text-retriever';
 import { runCVMatchAnalysis } from '@/lib/services/cv-match-analyzer';
 import { computeInputHash } from '@/lib/services/cv-match-hash';
-import { preMatchKeywords } from '@/lib/services/pre-match-keywords';
+import {
+    deserializeCvSkillIndex,
+    loadCvSkillIndex,
+    matchKeywordsAgainstIndex,
+    preMatchKeywords,
+    serializeCvSkillIndex,
+    type SerializedCvSkillIndex,
+} from '@/lib/services/pre-match-keywords';
+import { normalizeCVMatchResult } from '@/lib/services/cv-match-normalize';
+import {
+    planBatchMatch,
+    rankJobsForBatch,
+    toRankedJobRef,
+    type BatchJob,
+    type RankedJobRef,
+} from '@/lib/services/cv-match-batch';
+import { BATCH_MAX_JOBS, CV_MATCH_BATCH_EVENT, type CVMatchBatchRequest } from './cv-match-batch-trigger';
+import { withCreditGate } from '@/lib/middleware/credit-gate';
+import { CREDIT_COSTS, CreditExhaustedError } from '@/lib/services/credit-types';
+import { mapWithConcurrency } from '@/lib/utils/map-with-concurrency';
+import type { CVMatchResult } from '@/lib/services/cv-match-analyzer';
+import { supabaseTracingFetch, withInngestTracing } from '@/lib/tracing';
 
 const supabaseAdmin = createAdminClient(
     process.env.NEXT_PUBLIC_SUPABASE_URL!,
     process.env.SUPABASE_SERVICE_ROLE_KEY!,
-    { auth: { autoRefreshToken: false, persistSession: false } }
+    {
+        auth: { autoRefreshToken: false, persistSession: false },
+        global: { fetch: supabaseTracingFetch },
+    }
 );
 
+/**
+ * Sync user_profiles.cv_structured_data to the CV document the user matched with.
+ * Non-blocking: failures are logged, never thrown.
+ */
+async function syncProfileCv(userId: string, cvDocumentId: string): Promise<void> {
+    try {
+        // Check if the profile already references this document
+        const { data: profile } = await supabaseAdmin
+            .from('user_profiles')
+            .select('cv_original_file_path, full_name')
+            .eq('id', userId)
+            .single();
+
+        // Load the document's file path for comparison
+        const { data: doc } = await supabaseAdmin
+            .from('documents')
+            .select('file_url_encrypted, metadata')
+            .eq('id', cvDocumentId)
+            .eq('user_id', userId)
+            .single();
+
+        if (!doc) {
+            console.log(`[cv-match-pipeline] ℹ️ Document ${cvDocumentId} not found, skipping profile sync`);
+            return;
+        }
+
+        // Skip if profile already points to this document
+        if (profile?.cv_original_file_path === doc.file_url_encrypted) {
+            console.log(`[cv-match-pipeline] ℹ️ Profile already synced with document ${cvDocumentId}`);
+            return;
+        }
+
+        // Prefer the cached JSON from upload (cv_parsed_v2). Falls back
+        // to legacy parseCvTextToJson on extracted_text for older docs
+        // that pre-date the Mistral PDF-direct pipeline.
+        const metadataObj = (doc.metadata as Record<string, unknown>) ?? {};
+        let structuredCv = metadataObj.cv_parsed_v2 as import('@/types/cv').CvStructuredData | undefined;
+
+        if (!structuredCv) {
+            const extractedText = metadataObj.extracted_text as string;
+            if (!extractedText || extractedText.trim().length < 50) {
+                console.warn(`[cv-match-pipeline] ⚠️ Document ${cvDocumentId} has no parsed JSON or extracted text, skipping profile sync`);
+                return;
+            }
+            const { parseCvTextToJson } = await import('@/lib/services/cv-parser');
+            structuredCv = await parseCvTextToJson(extractedText);
+        }
+
+        // Tier 1 name override: user_profiles.full_name is the confirmed name
+        // (set by upload/route.ts integrity guard on every CV upload).
+        // Prevents stale OCR-header names from leaking into re-parsed CVs.
+        if (profile?.full_name) {
+            if (!structuredCv.personalInfo) structuredCv.personalInfo = {} as any;
+            structuredCv.personalInfo.name = profile.full_name;
+            console.log(`[cv-match-pipeline] 🔧 Name override from full_name → "${profile.full_name}"`);
+        }
+
+        const { error: updateErr } = await supabaseAdmin
+            .from('user_profiles')
+            .update({
+                cv_structured_data: structuredCv,
+                cv_original_file_path: doc.file_url_encrypted,
+            })
+            .eq('id', userId);
+
+        if (updateErr) {
+            console.error(`[cv-match-pipeline] ⚠️ Profile sync failed (non-blocking):`, updateErr.message);
+        } else {
+            console.log(`[cv-match-pipeline] ✅ Profile cv_structured_data synced to document ${cvDocumentId}`);
+        }
+    } catch (syncErr) {
+        // Non-blocking — profile sync failure must never crash the match pipeline
+        const errMsg = syncErr instanceof Error ? syncErr.message : String(syncErr);
+        console.error(`[cv-match-pipeline] ⚠️ Profile sync error (non-blocking):`, errMsg);
+    }
+}
+
 export const analyzeCVMatch = inngest.createFunction(
     {
         id: 'analyze-cv-match',
@@ -90,7 +196,7 @@ export const analyzeCVMatch = inngest.createFunction(
         },
         triggers: [{ event: 'cv-match/analyze' }],
     },
-    async ({ event, step }: { event: any; step: any }) => {
+    withInngestTracing('analyze-cv-match', async ({ event, step }: { event: any; step: any }) => {
         const { jobId, userId, cvDocumentId, locale } = event.data as {
             jobId: string;
             userId: string;
@@ -199,69 +305,7 @@ export const analyzeCVMatch = inngest.createFunction(
             const currentMetadata = (freshJob?.metadata as Record<string, unknown>) || {};
 
             // Normalize matchResult — restore §7 compliance: validate before flagging done
-            const missingFields: string[] = [];
-
-            // Defensive: convert legacy score:number to level-based format
-            function normalizeScoreCategory(val: any): { level: string; reasons: string[] } {
-                if (val && typeof val === 'object' && typeof val.level === 'string') {
-                    return { level: val.level, reasons: Array.isArray(val.reasons) ? val.reasons : [] };
-                }
-                if (val && typeof val === 'object' && typeof val.score === 'number') {
-                    const level = val.score >= 70 ? 'strong' : val.score >= 40 ? 'solid' : 'gap';
-                    return { level, reasons: Array.isArray(val.reasons) ? val.reasons : [] };
-                }
-                if (typeof val === 'number') {
-                    return { level: val >= 70 ? 'strong' : val >= 40 ? 'solid' : 'gap', reasons: [] };
-                }
-                return { level: 'solid', reasons: [] }; // safe default
-            }
-
-            const rawBreakdown = (matchResult.scoreBreakdown && typeof matchResult.scoreBreakdown === 'object')
-                ? matchResult.scoreBreakdown as Record<string, any> : {};
-
-            const normalizedBreakdown = {
-                technicalSkills: normalizeScoreCategory(rawBreakdown.technicalSkills),
-                softSkills: normalizeScoreCategory(rawBreakdown.softSkills),
-                experienceLevel: normalizeScoreCategory(rawBreakdown.experienceLevel),
-                domainKnowledge: normalizeScoreCategory(rawBreakdown.domainKnowledge),
-                languageMatch: normalizeScoreCategory(rawBreakdown.languageMatch),
-            };
-
-            // V2: Normalize each requirement row's array fields to prevent frontend crashes
-            const VALID_ORBIT_CATS = new Set(['technical', 'soft', 'experience', 'domain', 'language']);
-            const rawRows = Array.isArray(matchResult.requirementRows)
-                ? matchResult.requirementRows : (missingFields.push('requirementRows'), []);
-
-            const normalizedRows = rawRows.map((row: any) => ({
-                ...row,
-                title: row.title || row.requirement || '',
-                orbitCategory: VALID_ORBIT_CATS.has(String(row.orbitCategory).toLowerCase())
-                    ? String(row.orbitCategory).toLowerCase()
-                    : 'domain', // safe fallback
-                level: ['strong', 'solid', 'gap'].includes(row.level) ? row.level : 'solid',
-                relevantChips: Array.isArray(row.relevantChips) ? row.relevantChips : [],
-                context: row.context || row.currentState || '',
-                gaps: Array.isArray(row.gaps) ? row.gaps : [],
-                additionalChips: Array.isArray(row.additionalChips) ? row.additionalChips : [],
-            }));
-
-            const safeResult = {
-                ...matchResult,
-                _schemaVersion: 2,
-                requirementRows: normalizedRows,
-                strengths: Array.isArray(matchResult.strengths)
-                    ? matchResult.strengths : (missingFields.push('strengths'), []),
-                gaps: Array.isArray(matchResult.gaps)
-                    ? matchResult.gaps : (missingFields.push('gaps'), []),
-                potentialHighlights: Array.isArray(matchResult.potentialHighlights)
-                    ? matchResult.potentialHighlights : (missingFields.push('potentialHighlights'), []),
-                keywordsFound: Array.isArray(matchResult.keywordsFound)
-                    ? matchResult.keywordsFound : (missingFields.push('keywordsFound'), []),
-                keywordsMissing: Array.isArray(matchResult.keywordsMissing)
-                    ? matchResult.keywordsMissing : (missingFields.push('keywordsMissing'), []),
-                scoreBreakdown: normalizedBreakdown,
-                _normalized: missingFields.length > 0,
-            };
+            const { result: safeResult, missingFields } = normalizeCVMatchResult(matchResult);
 
             if (missingFields.length > 0) {
                 console.warn(`[cv-match-pipeline] ⚠️ Normalized missing fields:`, missingFields);
@@ -320,80 +364,301 @@ export const analyzeCVMatch = inngest.createFunction(
         // This prevents the desync bug where the Optimizer reads a different CV than the one matched.
         // Only runs when a specific cvDocumentId was provided (user selected via CVSelectDialog).
         if (cvDocumentId) {
-            await step.run('sync-profile-cv', async () => {
+            await step.run('sync-profile-cv', () => syncProfileCv(userId, cvDocumentId));
+        }
+
+        return { success: true, jobId };
+    })
+);
+
+// ─── Batch mode ───────────────────────────────────────────────────
+// One CV against many jobs: CV text, input normalization and skill index are
+// built ONCE; every job is pre-matched deterministically and ranked; the LLM
+// only runs for the top-N (plus jobs whose inputs changed since their last
+// analysis); results are written back in one RPC.
+//
+// Inngest stores every step's return value in the run state, so steps only
+// return ids, hashes and counts: job texts are read inside the step that needs
+// them, LLM results go to cv_match_result_cache inside `analyze-*`, and
+// `save-results-bulk` reads them back by hash.
+
+const DEFAULT_BATCH_TOP_N = 10;
+// Parallel Claude calls per batch — stays well below the per-user rateLimit of
+// the single-job function and the provider's concurrent-request limit
+const BATCH_LLM_PARALLELISM = 3;
+const BATCH_ELIGIBLE_STATUSES = ['pending', 'processing', 'ready_for_review', 'cv_matched'];
+// Ranking + hashing inputs only — the stored analysis is reduced to status + hash
+const BATCH_RANK_COLUMNS = 'id, created_at, description, requirements, buzzwords, cv_match_status:metadata->>cv_match_status, cv_match_input_hash:metadata->cv_match->>input_hash';
+
+interface BatchAnalysisOutcome {
+    jobId: string;
+    /** Result stored in cv_match_result_cache under the entry's input hash */
+    analyzed: boolean;
+    error: string | null;
+    creditsExhausted?: boolean;
+}
+
+function toBatchJob(row: any): BatchJob {
+    return {
+        id: row.id,
+        created_at: row.created_at,
+        description: row.description,
+        requirements: row.requirements,
+        buzzwords: row.buzzwords,
+        metadata: { cv_match_status: row.cv_match_status, cv_match: { input_hash: row.cv_match_input_hash } },
+    };
+}
+
+export const analyzeCVMatchBatch = inngest.createFunction(
+    {
+        id: 'analyze-cv-match-batch',
+        name: 'Analyze CV Match (Batch)',
+        retries: 1,
+        // top-N × 40-70s at BATCH_LLM_PARALLELISM, plus headroom for changed-hash jobs
+        timeouts: { finish: '15m' },
+        // One batch per user at a time — overlapping batches would bill the same jobs twice
+        concurrency: {
+            key: 'event.data.userId',
+            limit: 1,
+        },
+        triggers: [{ event: CV_MATCH_BATCH_EVENT }],
+    },
+    withInngestTracing('analyze-cv-match-batch', async ({ event, step }: { event: any; step: any }) => {
+        const { userId, jobIds, cvDocumentId, locale, topN = DEFAULT_BATCH_TOP_N } = event.data as CVMatchBatchRequest;
+
+        // Step 1: Load CV text ONCE for the whole batch
+        const cvData = await step.run('load-cv', async () => {
+            const result = await getCVText(userId, cvDocumentId, { forAI: true });
+            if (!result) throw new NonRetriableError('CV not found — no retry');
+            return result;
+        });
+
+        // Step 2: Read the profile and build the skill index ONCE — returned in its
+        // serialized form (a few KB) so every later step reuses it without a profile read
+        const serializedIndex: SerializedCvSkillIndex | null = await step.run('build-skill-index', async () => {
+            const index = await loadCvSkillIndex(userId);
+            return index ? serializeCvSkillIndex(index) : null;
+        });
+        const skillIndex = serializedIndex ? deserializeCvSkillIndex(serializedIndex) : null;
+
+        // Step 3: Read all candidate jobs in ONE query (§3 — user-scoped),
+        // pre-match + hash + rank every job. Returns refs only.
+        const ranked: RankedJobRef[] = await step.run('rank-jobs', async () => {
+            let query = supabaseAdmin
+                .from('job_queue')
+                .select(BATCH_RANK_COLUMNS)
+                .eq('user_id', userId); // §3: user-scoped
+
+            query = jobIds && jobIds.length > 0
+                ? query.in('id', jobIds.slice(0, BATCH_MAX_JOBS))
+                : query.in('status', BATCH_ELIGIBLE_STATUSES).order('created_at', { ascending: false }).limit(BATCH_MAX_JOBS);
+
+            const { data, error } = await query;
+            if (error) throw new Error(`Job read failed: ${error.message}`);
+            if (!data || data.length === 0) return [];
+
+            return rankJobsForBatch(data.map(toBatchJob), cvData.text, skillIndex).map(toRankedJobRef);
+        });
+
+        if (ranked.length === 0) {
+            console.log(`ℹ️ [CV Match Batch] No eligible jobs for user ${userId}`);
+            return { success: true, jobs: 0, analyzed: 0, fromCache: 0, upToDate: 0, rankOnly: 0, failed: 0 };
+        }
+
+        // Step 4: Bulk lookup in cv_match_result_cache (one query, returns the hit hashes)
+        const cachedHashes: string[] = await step.run('check-result-cache', async () => {
+            const hashes = [...new Set(ranked.map(r => r.inputHash))];
+            try {
+                const { data, error: cacheErr } = await supabaseAdmin
+                    .from('cv_match_result_cache')
+                    .select('input_hash')
+                    .eq('user_id', userId)
+                    .in('input_hash', hashes);
+
+                if (cacheErr) {
+                    console.warn(`⚠️ [CV Match Batch] Result cache lookup error (non-blocking): ${cacheErr.message}`);
+                    return [];
+                }
+                return (data ?? []).map(row => row.input_hash as string);
+            } catch (err: any) {
+                // Non-blocking — cache failure falls through to LLM
+                console.warn(`⚠️ [CV Match Batch] Result cache lookup error (non-blocking): ${err?.message}`);
+                return [];
+            }
+        });
+
+        const plan = planBatchMatch(ranked, new Set(cachedHashes), topN);
+        const toAnalyze = plan.filter(entry => entry.action === 'analyze');
+
+        console.log(`📊 [CV Match Batch] ${plan.length} jobs ranked — ${toAnalyze.length} to analyze, `
+            + `${plan.filter(e => e.action === 'result_cache').length} from result cache, `
+            + `${plan.filter(e => e.action === 'up_to_date').length} up to date`);
+
+        // Step 5: LLM analysis for the selected jobs — bounded parallelism, one credit debit per job.
+        // Each step reads its own job, stores the result under its input hash and returns a flag.
+        let creditsExhausted = false;
+        const outcomes: BatchAnalysisOutcome[] = await mapWithConcurrency(toAnalyze, BATCH_LLM_PARALLELISM, entry => {
+            if (creditsExhausted) {
+                return Promise.resolve({ jobId: entry.jobId, analyzed: false, error: null, creditsExhausted: true });
+            }
+            return step.run(`analyze-${entry.jobId}`, async (): Promise<BatchAnalysisOutcome> => {
+                const { data: job, error: jobErr } = await supabaseAdmin
+                    .from('job_queue')
+                    .select('id, job_title, company_name, description, requirements, buzzwords, seniority')
+                    .eq('id', entry.jobId)
+                    .eq('user_id', userId) // §3
+                    .single();
+                if (jobErr || !job) {
+                    return { jobId: entry.jobId, analyzed: false, error: `Job not found: ${jobErr?.message ?? entry.jobId}` };
+                }
+
+                // Same skill index as rank-jobs — no profile read per job
+                const preMatch = skillIndex ? matchKeywordsAgainstIndex(skillIndex, job.buzzwords || [], { quiet: true }) : null;
+
                 try {
-                    // Check if the profile already references this document
-                    const { data: profile } = await supabaseAdmin
-                        .from('user_profiles')
-                        .select('cv_original_file_path, full_name')
-                        .eq('id', userId)
-                        .single();
-
-                    // Load the document's file path for comparison
-                    const { data: doc } = await supabaseAdmin
-                        .from('documents')
-                        .select('file_url_encrypted, metadata')
-                        .eq('id', cvDocumentId)
-                        .eq('user_id', userId)
-                        .single();
-
-                    if (!doc) {
-                        console.log(`[cv-match-pipeline] ℹ️ Document ${cvDocumentId} not found, skipping profile sync`);
-                        return;
-                    }
+                    // Normalize + cache write run INSIDE the gate: a failed write refunds
+                    // before the step retry debits again
+                    await withCreditGate(userId, CREDIT_COSTS.cv_match, 'cv_match', async () => {
+                        const result = await runCVMatchAnalysis({
+                            userId,
+                            jobId: job.id,
+                            cvText: cvData.text,
+                            jobTitle: job.job_title || 'Unknown Title',
+                            company: job.company_name || 'Unknown Company',
+                            jobDescription: job.description || '',
+                            requirements: job.requirements || [],
+                            atsKeywords: job.buzzwords || [],
+                            level: job.seniority || '',
+                            locale: (locale as any) || 'de',
+                            preMatchedKeywords: preMatch ?? undefined,
+                        });
 
-                    // Skip if profile already points to this document
-                    if (profile?.cv_original_file_path === doc.file_url_encrypted) {
-                        console.log(`[cv-match-pipeline] ℹ️ Profile already synced with document ${cvDocumentId}`);
-                        return;
+                        const { result: safeResult } = normalizeCVMatchResult(result);
+                        const { error: cacheErr } = await supabaseAdmin
+                            .from('cv_match_result_cache')
+                            .upsert({ user_id: userId, input_hash: entry.inputHash, result: safeResult }, {
+                                onConflict: 'user_id,input_hash',
+                            });
+                        // The bulk write-back reads results from the cache — a failed write must retry
+                        if (cacheErr) throw new Error(`Result cache write failed: ${cacheErr.message}`);
+                    }, job.id);
+
+                    return { jobId: entry.jobId, analyzed: true, error: null };
+                } catch (err: any) {
+                    if (err instanceof CreditExhaustedError) {
+                        return { jobId: entry.jobId, analyzed: false, error: null, creditsExhausted: true };
                     }
-
-                    // Prefer the cached JSON from upload (cv_parsed_v2). Falls back
-                    // to legacy parseCvTextToJson on extracted_text for older docs
-                    // that pre-date the Mistral PDF-direct pipeline.
-                    const metadataObj = (doc.metadata as Record<string, unknown>) ?? {};
-                    let structuredCv = metadataObj.cv_parsed_v2 as import('@/types/cv').CvStructuredData | undefined;
-
-                    if (!structuredCv) {
-                        const extractedText = metadataObj.extracted_text as string;
-                        if (!extractedText || extractedText.trim().length < 50) {
-                            console.warn(`[cv-match-pipeline] ⚠️ Document ${cvDocumentId} has no parsed JSON or extracted text, skipping profile sync`);
-                            return;
-                        }
-                        const { parseCvTextToJson } = await import('@/lib/services/cv-parser');
-                        structuredCv = await parseCvTextToJson(extractedText);
+                    if (err?.status === 400 || err?.status === 401 || err?.status === 404) {
+                        return { jobId: entry.jobId, analyzed: false, error: `AI API permanent error: ${err.message}` };
                     }
+                    throw err; // transient → Inngest step retry
+                }
+            }).then((outcome: BatchAnalysisOutcome) => {
+                if (outcome.creditsExhausted) creditsExhausted = true;
+                return outcome;
+            }).catch((err: any) => ({
+                jobId: entry.jobId,
+                analyzed: false,
+                error: err?.message || 'Unknown pipeline failure',
+            }));
+        });
 
-                    // Tier 1 name override: user_profiles.full_name is the confirmed name
-                    // (set by upload/route.ts integrity guard on every CV upload).
-                    // Prevents stale OCR-header names from leaking into re-parsed CVs.
-                    if (profile?.full_name) {
-                        if (!structuredCv.personalInfo) structuredCv.personalInfo = {} as any;
-                        structuredCv.personalInfo.name = profile.full_name;
-                        console.log(`[cv-match-pipeline] 🔧 Name override from full_name → "${profile.full_name}"`);
-                    }
+        // Step 6: Bulk write-back — read all results by hash in one query, merge all job_queue rows in one RPC
+        const summary = await step.run('save-results-bulk', async () => {
+            const outcomeByJob = new Map(outcomes.map(o => [o.jobId, o]));
+            const resultHashes = [...new Set(plan
+                .filter(e => e.action === 'result_cache' || outcomeByJob.get(e.jobId)?.analyzed)
+                .map(e => e.inputHash))];
 
-                    const { error: updateErr } = await supabaseAdmin
-                        .from('user_profiles')
-                        .update({
-                            cv_structured_data: structuredCv,
-                            cv_original_file_path: doc.file_url_encrypted,
-                        })
-                        .eq('id', userId);
-
-                    if (updateErr) {
-                        console.error(`[cv-match-pipeline] ⚠️ Profile sync failed (non-blocking):`, updateErr.message);
-                    } else {
-                        console.log(`[cv-match-pipeline] ✅ Profile cv_structured_data synced to document ${cvDocumentId}`);
+            const resultsByHash = new Map<string, CVMatchResult>();
+            if (resultHashes.length > 0) {
+                const { data, error: readErr } = await supabaseAdmin
+                    .from('cv_match_result_cache')
+                    .select('input_hash, result')
+                    .eq('user_id', userId)
+                    .in('input_hash', resultHashes);
+                if (readErr) throw new Error(`Result cache read failed: ${readErr.message}`);
+                for (const row of data ?? []) {
+                    if (row.result && typeof row.result === 'object') resultsByHash.set(row.input_hash, row.result);
+                }
+            }
+
+            const analyzedAt = new Date().toISOString();
+            const updates: Array<{ id: string; metadata: Record<string, unknown>; status?: string }> = [];
+            const counts = { analyzed: 0, fromCache: 0, upToDate: 0, rankOnly: 0, failed: 0, creditsExhausted: 0 };
+
+            for (const entry of plan) {
+                const prerank = {
+                    rank: entry.rank,
+                    score: Math.round(entry.score * 1000) / 1000,
+                    keywords_found: entry.keywordsFound,
+                    keywords_total: entry.keywordsTotal,
+                    ranked_at: analyzedAt,
+                };
+                const outcome = outcomeByJob.get(entry.jobId);
+                const rawResult = entry.action === 'result_cache' || outcome?.analyzed
+                    ? resultsByHash.get(entry.inputHash)
+                    : undefined;
+
+                if (rawResult) {
+                    const { result: safeResult, missingFields } = normalizeCVMatchResult(rawResult);
+                    if (missingFields.length > 0) {
+                        console.warn(`[cv-match-pipeline] ⚠️ Normalized missing fields (job ${entry.jobId}):`, missingFields);
                     }
-                } catch (syncErr) {
-                    // Non-blocking — profile sync failure must never crash the match pipeline
-                    const errMsg = syncErr instanceof Error ? syncErr.message : String(syncErr);
-                    console.error(`[cv-match-pipeline] ⚠️ Profile sync error (non-blocking):`, errMsg);
+                    updates.push({
+                        id: entry.jobId,
+                        metadata: {
+                            cv_match: {
+                                analyzed_at: analyzedAt,
+                                cv_document_id: cvData.documentId,
+                                input_hash: entry.inputHash,
+                                ...safeResult,
+                            },
+                            cv_match_error: null,
+                            cv_match_status: 'done',
+                            cv_match_prerank: prerank,
+                        },
+                        // Status: cv_matched (DB CHECK constraint value, maps to cv_match_done in §9)
+                        status: 'cv_matched',
+                    });
+                    if (outcome?.analyzed) counts.analyzed++;
+                    else counts.fromCache++;
+                } else if (outcome?.error) {
+                    updates.push({
+                        id: entry.jobId,
+                        metadata: { cv_match_status: 'error', cv_match_error: outcome.error, cv_match_prerank: prerank },
+                    });
+                    counts.failed++;
+                } else {
+                    // up_to_date, rank_only, or skipped for lack of credits — keep the stored analysis
+                    updates.push({ id: entry.jobId, metadata: { cv_match_prerank: prerank } });
+                    if (entry.action === 'up_to_date') counts.upToDate++;
+                    else if (outcome?.creditsExhausted) counts.creditsExhausted++;
+                    else counts.rankOnly++;
                 }
+            }
+
+            // Atomic per-row JSONB merge inside Postgres — no read-modify-write race
+            const { error: mergeErr } = await supabaseAdmin.rpc('bulk_merge_job_metadata', {
+                p_user_id: userId,
+                p_updates: updates,
             });
+            if (mergeErr) {
+                console.error('❌ [CV Match Batch] Bulk metadata merge failed:', mergeErr.message);
+                throw mergeErr;
+            }
+
+            console.log(`✅ [CV Match Batch] ${updates.length} jobs written — analyzed ${counts.analyzed}, `
+                + `from cache ${counts.fromCache}, up to date ${counts.upToDate}, rank only ${counts.rankOnly}, `
+                + `failed ${counts.failed}, no credits ${counts.creditsExhausted}`);
+            return counts;
+        });
+
+        // Step 6: Same profile sync as the single-job pipeline
+        if (cvDocumentId) {
+            await step.run('sync-profile-cv', () => syncProfileCv(userId, cvDocumentId));
         }
 
-        return { success: true, jobId };
-    }
+        return { success: true, jobs: plan.length, ...summary };
+    })
 );
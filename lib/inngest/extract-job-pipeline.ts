@@ -16,11 +16,15 @@ import { sanitizeForAI } from '@/lib/services/pii-sanitizer';
 import { deepScrapeJob } from '@/lib/services/job-search-pipeline';
 import { buildAtsKeywordPrompt, cleanAtsKeywords } from '@/lib/services/ats-keyword-filter';
 import { cleanJobBenefits } from '@/lib/services/job-benefit-filter';
+import { supabaseTracingFetch, withInngestTracing } from '@/lib/tracing';
 
 const supabaseAdmin = createAdminClient(
     process.env.NEXT_PUBLIC_SUPABASE_URL!,
     process.env.SUPABASE_SERVICE_ROLE_KEY!,
-    { auth: { autoRefreshToken: false, persistSession: false } }
+    {
+        auth: { autoRefreshToken: false, persistSession: false },
+        global: { fetch: supabaseTracingFetch },
+    }
 );
 
 /**
@@ -75,7 +79,7 @@ export const extractJob = inngest.createFunction(
         },
         triggers: [{ event: 'job/extract' }],
     },
-    async ({ event, step }: { event: any; step: any }) => {
+    withInngestTracing('extract-job', async ({ event, step }: { event: any; step: any }) => {
         const { jobId, userId, locale: rawLocale } = event.data as { jobId: string; userId: string; locale?: string };
         const locale = (rawLocale === 'en' || rawLocale === 'es' ? rawLocale : 'de') as SupportedLocale;
         const languageName = getLanguageName(locale);
@@ -275,5 +279,5 @@ IMPORTANT for benefits:
         }
 
         return { success: true, jobId };
-    }
+    })
 );
@@ -1,4 +1,4 @@
-import { scanForFluff, buildLeanBlacklistSection, BLACKLIST_PATTERNS } from '../anti-fluff-blacklist';
+import { scanForFluff, findFluffOccurrences, buildLeanBlacklistSection, BLACKLIST_PATTERNS } from '../anti-fluff-blacklist';
 import { validateCoverLetter } from '../cover-letter-validator';
 
 describe('Anti-Fluff Blacklist', () => {
@@ -71,6 +71,42 @@ describe('Anti-Fluff Blacklist', () => {
             expect(result.found).toBe(false);
             expect(result.matches).toHaveLength(0);
         });
+
+        it('should match the naive per-pattern includes scan in order', () => {
+            const text = 'Ich bin überzeugt, dass echter Mehrwert entsteht. Dabei schärfte meinen Blick dafür, dass nicht nur Zahlen zählen.';
+            const lowerText = text.toLowerCase();
+            const expected = BLACKLIST_PATTERNS
+                .filter(p => lowerText.includes(p.pattern.toLowerCase()))
+                .map(p => p.pattern);
+
+            const result = scanForFluff(text);
+            const phraseMatches = result.matches
+                .map(m => m.pattern)
+                .filter(pattern => BLACKLIST_PATTERNS.some(p => p.pattern === pattern));
+            expect(phraseMatches).toEqual(expected);
+        });
+    });
+
+    describe('findFluffOccurrences', () => {
+        it('should report every occurrence with offsets', () => {
+            const text = 'Nicht nur das. Ich arbeite nicht nur gern im Team.';
+            const occurrences = findFluffOccurrences(text).filter(o => o.pattern === 'nicht nur');
+
+            expect(occurrences).toHaveLength(2);
+            for (const { start, end } of occurrences) {
+                expect(text.slice(start, end).toLowerCase()).toBe('nicht nur');
+            }
+        });
+
+        it('should include regex pattern occurrences', () => {
+            const text = 'Das war kein Zufall, sondern harte Arbeit.';
+            const occurrences = findFluffOccurrences(text);
+            expect(occurrences.some(o => o.pattern === 'kein/nicht X, sondern Y' && o.start === 8)).toBe(true);
+        });
+
+        it('should return an empty list for clean text', () => {
+            expect(findFluffOccurrences('Ich habe 15 Partner gewonnen.')).toEqual([]);
+        });
     });
 
     describe('buildLeanBlacklistSection', () => {
@@ -2,9 +2,11 @@ import {
     ATS_STOP_LIST,
     KNOWN_HALLUCINATIONS,
     buildAtsKeywordPrompt,
+    buildJDIndex,
     cleanAtsKeywords,
     filterAtsKeywords,
     filterByVerbatimJDPresence,
+    getJDIndex,
 } from '../ats-keyword-filter';
 
 describe('ats-keyword-filter', () => {
@@ -144,6 +146,56 @@ The role requires privacy controls, GDPR implementation experience and regulated
             expect(result.kept).toEqual(['DSGVO']);
             expect(result.removed).toEqual([]);
         });
+
+        it('returns identical results for raw JD text and a prebuilt JDIndex', () => {
+            const complianceJob = `${sapPublicSectorJob}
+Zertifizierung nach ISO-27001 und Erfahrung mit Cloud-Computing-Plattformen sind ein Plus.`;
+            const keywords = ['DSGVO', 'ISO 27001', 'PCI DSS', 'Cloud Computing', 'SOC 2', 'Vertrieb'];
+
+            const fromText = filterByVerbatimJDPresence(keywords, complianceJob);
+            const fromIndex = filterByVerbatimJDPresence(keywords, buildJDIndex(complianceJob));
+
+            expect(fromIndex).toEqual(fromText);
+            expect(fromText.kept).toEqual(['ISO 27001', 'Cloud Computing', 'Vertrieb']);
+        });
+
+        it('applies the short-JD guard to raw text and JDIndex alike', () => {
+            const shortJd = 'Vertrieb im Außendienst.';
+
+            expect(filterByVerbatimJDPresence(['DSGVO', 'Vertrieb'], shortJd).kept).toEqual(['DSGVO', 'Vertrieb']);
+            expect(filterByVerbatimJDPresence(['DSGVO', 'Vertrieb'], buildJDIndex(shortJd)).kept).toEqual(['DSGVO', 'Vertrieb']);
+        });
+    });
+
+    describe('getJDIndex', () => {
+        it('reuses one index per JD content', () => {
+            const jd = `${'Erfahrung mit SAP S/4HANA und DSGVO. '.repeat(3)}`;
+
+            expect(getJDIndex(jd)).toBe(getJDIndex(`${jd}`));
+            expect(getJDIndex(jd)).not.toBe(getJDIndex(`${jd} Remote.`));
+            expect(getJDIndex(jd)).toEqual(buildJDIndex(jd));
+        });
+    });
+
+    describe('buildJDIndex', () => {
+        it('indexes words, 4-6 character stems and present hallucination terms once per JD', () => {
+            const index = buildJDIndex('Erfahrung mit DSGVO-konformer Datenverarbeitung und SAP S/4HANA.');
+
+            expect(index.words.has('sap')).toBe(true);
+            expect(index.words.has('dsgvo')).toBe(true);
+            expect(index.stems.has('datenv')).toBe(true);
+            expect(index.stems.has('daten')).toBe(true);
+            expect(index.stems.has('datenve')).toBe(false);
+            expect(index.presentTerms.has('dsgvo')).toBe(true);
+            expect(index.presentTerms.has('gdpr')).toBe(false);
+        });
+
+        it('finds separator-free spellings of hallucination terms', () => {
+            const index = buildJDIndex('Audits nach ISO27001 sowie PCI-DSS Anforderungen.');
+
+            expect(index.presentCompactTerms.has('iso27001')).toBe(true);
+            expect(index.presentCompactTerms.has('pcidss')).toBe(true);
+        });
     });
 
     describe('cleanAtsKeywords', () => {
@@ -0,0 +1,145 @@
+import { cleanPageMarkdown, crawlCompanySite, resetCompanyPageCache } from '../company-crawler';
+
+const HOME = `# Acme GmbH
+* [Home](https://acme.de/)
+* [Über uns](https://acme.de/about)
+* [Mission](https://acme.de/mission)
+Wir verwenden Cookies, um die Nutzung zu analysieren. Akzeptieren
+Acme baut Wärmepumpen für Mehrfamilienhäuser und ist in 12 Ländern aktiv.
+Mehr über [unser Team](https://acme.de/about) und [unsere Mission](https://acme.de/mission).
+`;
+
+const SUBPAGE = (name: string) => `# ${name}\n${'Acme entwickelt nachhaltige Heiztechnik seit 1998. '.repeat(6)}`;
+
+interface StubPage {
+    body: string;
+    delayMs?: number;
+    etag?: string;
+    /** Never resolves (until aborted) */
+    hang?: boolean;
+}
+
+function installJinaStub(pages: Record<string, StubPage>) {
+    const requests: Array<{ url: string; headers: Record<string, string> }> = [];
+    let active = 0;
+    let maxActive = 0;
+
+    global.fetch = jest.fn((input: RequestInfo | URL, init?: RequestInit) => {
+        const target = String(input).replace('https://r.jina.ai/', '');
+        const headers = (init?.headers ?? {}) as Record<string, string>;
+        requests.push({ url: target, headers });
+        const page = pages[target];
+        active++;
+        maxActive = Math.max(maxActive, active);
+
+        return new Promise<Response>((resolve, reject) => {
+            init?.signal?.addEventListener('abort', () => {
+                active--;
+                reject(new Error('aborted'));
+            });
+            if (page?.hang) return;
+            setTimeout(() => {
+                active--;
+                if (!page) return resolve({ ok: false, status: 404, headers: new Headers() } as Response);
+                if (page.etag && headers['If-None-Match'] === page.etag) {
+                    return resolve({ ok: false, status: 304, headers: new Headers() } as Response);
+                }
+                resolve({
+                    ok: true,
+                    status: 200,
+                    headers: new Headers(page.etag ? { etag: page.etag } : {}),
+                    text: async () => page.body,
+                } as Response);
+            }, page?.delayMs ?? 0);
+        });
+    }) as jest.Mock;
+
+    return { requests, maxActive: () => maxActive };
+}
+
+describe('company-crawler', () => {
+    const originalFetch = global.fetch;
+
+    beforeEach(() => {
+        resetCompanyPageCache();
+        jest.spyOn(console, 'log').mockImplementation(() => {});
+        jest.spyOn(console, 'warn').mockImplementation(() => {});
+    });
+
+    afterEach(() => {
+        global.fetch = originalFetch;
+        jest.restoreAllMocks();
+    });
+
+    it('cleans nav lists and cookie banners page by page', () => {
+        const cleaned = cleanPageMarkdown(HOME);
+        expect(cleaned).not.toContain('Cookies');
+        expect(cleaned).not.toContain('](');
+        expect(cleaned).toContain('Acme baut Wärmepumpen');
+        expect(cleaned).toContain('Mehr über unser Team und unsere Mission.');
+    });
+
+    it('fetches subpages in parallel and keeps link-rank order', async () => {
+        const stub = installJinaStub({
+            'https://acme.de': { body: HOME },
+            'https://acme.de/about': { body: SUBPAGE('About'), delayMs: 60 },
+            'https://acme.de/mission': { body: SUBPAGE('Mission'), delayMs: 10 },
+        });
+
+        const result = await crawlCompanySite('https://acme.de');
+
+        expect(result.partial).toBe(false);
+        expect(result.subpages.map(p => p.url)).toEqual(['https://acme.de/about', 'https://acme.de/mission']);
+        expect(stub.maxActive()).toBe(2);
+        // Wall time ≈ home + slowest subpage, not the sum
+        expect(result.elapsedMs).toBeLessThan(60 + 10 + 50);
+    });
+
+    it('respects the per-domain concurrency limit', async () => {
+        const stub = installJinaStub({
+            'https://acme.de': { body: HOME },
+            'https://acme.de/about': { body: SUBPAGE('About'), delayMs: 10 },
+            'https://acme.de/mission': { body: SUBPAGE('Mission'), delayMs: 10 },
+        });
+
+        const result = await crawlCompanySite('https://acme.de', { perDomainConcurrency: 1 });
+
+        expect(result.subpages).toHaveLength(2);
+        expect(stub.maxActive()).toBe(1);
+    });
+
+    it('returns partial results when the deadline fires', async () => {
+        installJinaStub({
+            'https://acme.de': { body: HOME },
+            'https://acme.de/about': { body: SUBPAGE('About'), hang: true },
+            'https://acme.de/mission': { body: SUBPAGE('Mission'), delayMs: 5 },
+        });
+
+        const result = await crawlCompanySite('https://acme.de', { deadlineMs: 80, subpageTimeoutMs: 300 });
+
+        expect(result.partial).toBe(true);
+        expect(result.home?.cleaned).toContain('Acme baut Wärmepumpen');
+        expect(result.subpages.map(p => p.url)).toEqual(['https://acme.de/mission']);
+    });
+
+    it('serves fresh pages from cache and revalidates conditionally', async () => {
+        const stub = installJinaStub({
+            'https://acme.de': { body: HOME, etag: '"v1"' },
+            'https://acme.de/about': { body: SUBPAGE('About'), etag: '"a1"' },
+            'https://acme.de/mission': { body: SUBPAGE('Mission') },
+        });
+
+        const first = await crawlCompanySite('https://acme.de');
+        const requestsAfterFirst = stub.requests.length;
+
+        const second = await crawlCompanySite('https://acme.de');
+        expect(stub.requests.length).toBe(requestsAfterFirst);
+        expect(second.home?.fromCache).toBe(true);
+
+        const revalidated = await crawlCompanySite('https://acme.de', { revalidate: true });
+        const homeRevalidation = stub.requests.slice(requestsAfterFirst).find(r => r.url === 'https://acme.de');
+        expect(homeRevalidation?.headers['If-None-Match']).toBe('"v1"');
+        expect(revalidated.home).toEqual({ ...first.home, fromCache: true });
+        expect(revalidated.subpages.map(p => p.cleaned)).toEqual(first.subpages.map(p => p.cleaned));
+    });
+});
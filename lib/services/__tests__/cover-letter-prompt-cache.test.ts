@@ -0,0 +1,200 @@
+import type Anthropic from '@anthropic-ai/sdk';
+import type { CoverLetterSetupContext } from '@/types/cover-letter-setup';
+import {
+    buildSegmentedPrompt,
+    buildSystemPrompt,
+    joinPromptSegments,
+    type CompanyResearchData,
+    type JobData,
+    type UserProfileData,
+} from '../cover-letter-prompt-builder';
+import {
+    buildCachedMessageParams,
+    createCachedMessage,
+    summarizePromptUsage,
+    type CachedPromptRequest,
+    type PromptCacheClient,
+    type PromptCallReport,
+} from '../cover-letter-prompt-cache';
+import { judgeCoverLetter } from '../cover-letter-judge';
+
+const ctx = {
+    jobId: 'job-1',
+    companyName: 'Ottobock',
+    tone: {
+        preset: 'formal',
+        toneSource: 'preset',
+        targetLanguage: 'de',
+        hasStyleSample: false,
+        styleWarningAcknowledged: false,
+        formality: 'sie',
+    },
+    completedAt: '2026-10-17T00:00:00.000Z',
+    introFocus: 'quote',
+} as unknown as CoverLetterSetupContext;
+
+const profileA: UserProfileData = { cv_structured_data: { experience: [{ company: 'Ingrano Solutions', role: 'Innovation Manager' }] } };
+const profileB: UserProfileData = { cv_structured_data: { experience: [{ company: 'Fraunhofer FOKUS', role: 'Projektleiter' }] } };
+const jobA: JobData = { job_title: 'Associate Corporate Strategy', company_name: 'Ottobock', requirements: ['M&A'] };
+const jobB: JobData = { job_title: 'Innovation Consultant', company_name: 'Siemens', requirements: ['Workshops'] };
+const company: CompanyResearchData = { company_values: ['Human Empowerment'] };
+
+/**
+ * Local stand-in for the provider cache: a breakpoint hits when the exact
+ * prefix up to it was sent before. Tokens ≈ chars / 4.
+ */
+function createStubClient() {
+    const seenPrefixes = new Set<string>();
+    const requests: Anthropic.MessageCreateParamsNonStreaming[] = [];
+    const tokens = (text: string) => Math.ceil(text.length / 4);
+
+    const client: PromptCacheClient = {
+        messages: {
+            async create(params) {
+                requests.push(params);
+                const system = params.system as Anthropic.TextBlockParam[];
+                const content = params.messages[0].content as Anthropic.TextBlockParam[];
+                const blocks = [...system, ...content];
+
+                let prefix = '';
+                let read = 0;
+                let written = 0;
+                let uncached = 0;
+                for (const block of blocks) {
+                    prefix += block.text;
+                    if (!block.cache_control) continue;
+                    const segment = tokens(prefix) - read - written;
+                    if (seenPrefixes.has(prefix)) read += segment;
+                    else {
+                        seenPrefixes.add(prefix);
+                        written += segment;
+                    }
+                }
+                uncached = tokens(prefix) - read - written;
+
+                return {
+                    content: [{ type: 'text', text: '{"pass": true, "fail_reasons": [], "weaknesses": []}' }],
+                    usage: {
+                        input_tokens: uncached,
+                        output_tokens: 500,
+                        cache_creation_input_tokens: written,
+                        cache_read_input_tokens: read,
+                    },
+                };
+            },
+        },
+    };
+    return { client, requests };
+}
+
+function generationRequest(profile: UserProfileData, job: JobData, feedback: string[]): CachedPromptRequest {
+    const prompt = buildSegmentedPrompt(profile, job, company, null, ctx, feedback, 0);
+    return {
+        model: 'claude-sonnet-4-6',
+        maxTokens: 2000,
+        temperature: 0.7,
+        instruction: 'Output ONLY the letter body.',
+        stablePrefix: prompt.stablePrefix,
+        cachedBlocks: [prompt.userBlock, prompt.jobBlock],
+        tail: prompt.iterationBlock,
+    };
+}
+
+describe('cover letter prompt segmentation', () => {
+    it('keeps the stable prefix identical across users and jobs', () => {
+        const a = buildSegmentedPrompt(profileA, jobA, company, null, ctx, [], 0);
+        const b = buildSegmentedPrompt(profileB, jobB, company, null, ctx, ['JUDGE FAIL: x'], 320);
+
+        expect(a.stablePrefix).toBe(b.stablePrefix);
+        expect(a.stablePrefix).toContain('VERBOTENE PHRASEN');
+        expect(a.stablePrefix).not.toContain('Ottobock');
+        expect(a.userBlock).toContain('Ingrano Solutions');
+        expect(a.userBlock).not.toBe(b.userBlock);
+        expect(a.jobBlock).not.toBe(b.jobBlock);
+    });
+
+    it('only changes the iteration block when feedback is added', () => {
+        const first = buildSegmentedPrompt(profileA, jobA, company, null, ctx, [], 0);
+        const second = buildSegmentedPrompt(profileA, jobA, company, null, ctx, ['JUDGE FAIL: BLACKLIST'], 412);
+
+        expect(second.userBlock).toBe(first.userBlock);
+        expect(second.jobBlock).toBe(first.jobBlock);
+        expect(second.iterationBlock).toContain('JUDGE FAIL: BLACKLIST');
+        expect(buildSystemPrompt(profileA, jobA, company, null, ctx, [], 0)).toBe(joinPromptSegments(first));
+    });
+
+    it('keeps the CV out of the user block when wizard stations are selected', () => {
+        const zeroLeak = {
+            ...ctx,
+            cvStations: [{
+                stationIndex: 1, company: 'Ingrano Solutions', role: 'Innovation Manager', period: '2024',
+                keyBullet: 'NIS-2', matchedRequirement: 'Analyse', intent: 'Analyse', bullets: [],
+            }],
+        } as unknown as CoverLetterSetupContext;
+
+        const prompt = buildSegmentedPrompt(profileA, jobA, company, null, zeroLeak, [], 0);
+        expect(prompt.userBlock).toBe('');
+        expect(joinPromptSegments(prompt)).not.toContain('KANDIDATEN-LEBENSLAUF');
+    });
+});
+
+describe('cover letter prompt caching', () => {
+    it('marks the stable segments as cache breakpoints and skips empty blocks', () => {
+        const params = buildCachedMessageParams({ ...generationRequest(profileA, jobA, []), cachedBlocks: ['', 'job'] });
+        const system = params.system as Anthropic.TextBlockParam[];
+        const content = params.messages[0].content as Anthropic.TextBlockParam[];
+
+        expect(system.map(b => !!b.cache_control)).toEqual([false, true]);
+        expect(content.map(b => !!b.cache_control)).toEqual([true, false]);
+    });
+
+    it('reports cache reads and savings from the second iteration on', async () => {
+        const { client } = createStubClient();
+        const reports: PromptCallReport[] = [];
+        const feedbackRounds = [[], ['JUDGE FAIL: BLACKLIST'], ['WARNING: zu lang']];
+
+        for (const [index, feedback] of feedbackRounds.entries()) {
+            const { report } = await createCachedMessage(client, generationRequest(profileA, jobA, feedback), {
+                iteration: index + 1,
+                phase: 'generate',
+            });
+            reports.push(report);
+        }
+
+        expect(reports[0].cacheReadInputTokens).toBe(0);
+        expect(reports[0].cacheCreationInputTokens).toBeGreaterThan(0);
+        for (const later of reports.slice(1)) {
+            expect(later.cacheCreationInputTokens).toBe(0);
+            expect(later.cacheReadInputTokens).toBeGreaterThan(later.inputTokens);
+            expect(later.inputCostCents).toBeLessThan(later.uncachedInputCostCents);
+        }
+
+        const summary = summarizePromptUsage(reports);
+        expect(summary.calls).toBe(3);
+        expect(summary.savedCents).toBeGreaterThan(0);
+
+        // A second user with the same settings reuses the cached stable prefix
+        const { report: otherUser } = await createCachedMessage(client, generationRequest(profileB, jobB, []), {
+            iteration: 1,
+            phase: 'generate',
+        });
+        expect(otherUser.cacheReadInputTokens).toBeGreaterThan(0);
+    });
+
+    it('sends judge rules as the cached prefix and the letter in the tail', async () => {
+        jest.spyOn(console, 'log').mockImplementation(() => {});
+        const { client, requests } = createStubClient();
+        const letter = 'Sehr geehrte Damen und Herren, ... Ottobock ...';
+
+        const first = await judgeCoverLetter(letter, jobA, ctx, null, { client, iteration: 1 });
+        const second = await judgeCoverLetter(`${letter} v2`, jobA, ctx, null, { client, iteration: 2 });
+
+        const system = requests[0].system as Anthropic.TextBlockParam[];
+        expect(system[1].text).toContain('GPT-BLACKLIST');
+        expect(system[1].text).not.toContain(letter);
+        expect(first.pass).toBe(true);
+        expect(first.usage?.phase).toBe('judge');
+        expect(second.usage?.cacheReadInputTokens).toBeGreaterThan(0);
+        jest.restoreAllMocks();
+    });
+});
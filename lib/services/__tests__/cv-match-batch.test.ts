@@ -0,0 +1,125 @@
+import { buildCvSkillIndex, deserializeCvSkillIndex, matchKeywordsAgainstIndex, serializeCvSkillIndex } from '../pre-match-keywords';
+import { computeInputHash, createInputHasher } from '../cv-match-hash';
+import { planBatchMatch, preMatchCoverage, rankJobsForBatch, toRankedJobRef, type BatchJob } from '../cv-match-batch';
+
+const CV_STRUCTURED = {
+    skills: [
+        { category: 'Tools', items: ['Salesforce', 'Power BI', 'Python', 'SQL'] },
+        { category: 'Hobbies', items: ['Excel Bouldering'] },
+    ],
+    experience: [
+        {
+            role: 'Business Development Manager',
+            description: [{ text: 'KI (Fokus: GenAI, LLMs) für Vertriebsprozesse eingeführt' }],
+        },
+    ],
+    languages: [{ language: 'Englisch' }],
+    certifications: [{ name: 'Scrum Master' }],
+};
+
+const CV_TEXT = 'Max Mustermann\n  Business Development Manager — Salesforce, Power BI, Python';
+
+function job(id: string, buzzwords: string[], extra: Partial<BatchJob> = {}): BatchJob {
+    return {
+        id,
+        created_at: '2026-10-01T00:00:00Z',
+        description: `Description of ${id}`,
+        requirements: ['Teamplayer'],
+        buzzwords,
+        metadata: {},
+        ...extra,
+    };
+}
+
+describe('cv-match batch mode', () => {
+    const index = buildCvSkillIndex(CV_STRUCTURED)!;
+
+    it('builds the skill index once and excludes hobby categories', () => {
+        expect(index.skills).toContain('salesforce');
+        expect(index.skills).toContain('business development manager');
+        expect(index.skills).toContain('scrum master');
+        expect(index.skills).not.toContain('excel bouldering');
+        expect(buildCvSkillIndex({ skills: null })).toBeNull();
+    });
+
+    it('matches keywords with word boundaries and ecosystem hints', () => {
+        const result = matchKeywordsAgainstIndex(index, ['SQL', 'AI', 'Scrum', 'HubSpot', 'Tableau', 'Sales'], { quiet: true });
+
+        expect(result?.found).toEqual(['SQL', 'Scrum', 'Sales']);
+        expect(result?.missing).toEqual(['AI', 'HubSpot', 'Tableau']);
+        expect(result?.ecosystemHints).toEqual(expect.arrayContaining([
+            { keyword: 'HubSpot', cvSkill: 'salesforce', family: 'CRM' },
+            { keyword: 'Tableau', cvSkill: 'power bi', family: 'Data & Analytics' },
+        ]));
+        expect(matchKeywordsAgainstIndex(index, [], { quiet: true })).toBeNull();
+    });
+
+    it('survives a JSON round trip through step state with identical matches', () => {
+        const keywords = ['SQL', 'AI', 'HubSpot', 'Tableau', 'Senior Salesforce Administrator'];
+        const restored = deserializeCvSkillIndex(JSON.parse(JSON.stringify(serializeCvSkillIndex(index))));
+
+        expect(restored.skills).toEqual(index.skills);
+        expect(matchKeywordsAgainstIndex(restored, keywords, { quiet: true }))
+            .toEqual(matchKeywordsAgainstIndex(index, keywords, { quiet: true }));
+    });
+
+    it('reuses memoized boundary regexes across jobs', () => {
+        matchKeywordsAgainstIndex(index, ['Senior Salesforce Administrator'], { quiet: true });
+        const compiled = index.boundaryRegex.size;
+        matchKeywordsAgainstIndex(index, ['Senior Salesforce Administrator'], { quiet: true });
+        expect(compiled).toBeGreaterThan(0);
+        expect(index.boundaryRegex.size).toBe(compiled);
+    });
+
+    it('hashes with a once-normalized CV exactly like computeInputHash', () => {
+        const hasher = createInputHasher(CV_TEXT);
+        expect(hasher('Some  Description', ['b', 'a'], ['SQL']))
+            .toBe(computeInputHash(CV_TEXT, 'Some  Description', ['b', 'a'], ['SQL']));
+    });
+
+    it('ranks deterministically by coverage, then recency, then id', () => {
+        const jobs = [
+            job('c', ['SQL', 'HubSpot']),
+            job('a', ['Java', 'Kotlin']),
+            job('b', ['SQL', 'Python']),
+            job('d', ['Java', 'Kotlin'], { created_at: '2026-10-05T00:00:00Z' }),
+        ];
+        const ranked = rankJobsForBatch(jobs, CV_TEXT, index);
+
+        expect(ranked.map(r => r.jobId)).toEqual(['b', 'c', 'd', 'a']);
+        expect(ranked.map(r => r.rank)).toEqual([1, 2, 3, 4]);
+        expect(ranked[1].score).toBe(preMatchCoverage(ranked[1].preMatch));
+        expect(ranked[1].score).toBe(0.75);
+        expect(rankJobsForBatch([...jobs].reverse(), CV_TEXT, index)).toEqual(ranked);
+    });
+
+    it('sends only top-N and changed-hash jobs to the LLM', () => {
+        const hasher = createInputHasher(CV_TEXT);
+        const hashOf = (j: BatchJob) => hasher(j.description || '', j.requirements as string[], j.buzzwords as string[]);
+
+        const unchanged = job('unchanged', ['SQL', 'Python', 'Salesforce']);
+        unchanged.metadata = { cv_match_status: 'done', cv_match: { input_hash: hashOf(unchanged) } };
+        const changed = job('changed', ['Java'], { metadata: { cv_match_status: 'done', cv_match: { input_hash: 'stale' } } });
+        const cached = job('cached', ['SQL', 'Python']);
+        const top = job('top', ['SQL']);
+        const tail = job('tail', ['Java', 'Go']);
+
+        const ranked = rankJobsForBatch([unchanged, changed, cached, top, tail], CV_TEXT, index);
+        const plan = planBatchMatch(ranked, new Set([hashOf(cached)]), 3);
+        const actions = Object.fromEntries(plan.map(p => [p.jobId, p.action]));
+
+        expect(actions).toEqual({
+            unchanged: 'up_to_date',
+            cached: 'result_cache',
+            top: 'analyze',
+            changed: 'analyze',
+            tail: 'rank_only',
+        });
+
+        // Step state carries refs only — same plan, no keyword lists
+        const refs = ranked.map(toRankedJobRef);
+        expect(planBatchMatch(refs, new Set([hashOf(cached)]), 3).map(p => p.action)).toEqual(plan.map(p => p.action));
+        expect(refs[0]).not.toHaveProperty('preMatch');
+        expect(refs[0]).toMatchObject({ jobId: 'unchanged', keywordsFound: 3, keywordsTotal: 3 });
+    });
+});
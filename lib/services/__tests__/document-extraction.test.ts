@@ -0,0 +1,82 @@
+import fs from 'fs';
+import path from 'path';
+import { extractText } from '../text-extractor';
+import { extractInWorker, shutdownExtractionPool } from '../extraction-pool';
+import { documentContentHash, getOrExtractDocument, resetExtractionCache } from '../extraction-cache';
+import { getLocalCacheStats, resetLocalCacheStats } from '../cache-monitor';
+
+const SAMPLE_PDF = fs.readFileSync(path.join(process.cwd(), 'scripts', 'dummy-cv.pdf'));
+const CV_TEXT = 'Max Mustermann — Business Development Manager, Salesforce, Power BI, Python, SQL.';
+
+describe('document extraction', () => {
+    beforeEach(() => {
+        resetExtractionCache();
+        resetLocalCacheStats();
+        jest.spyOn(console, 'log').mockImplementation(() => {});
+        jest.spyOn(console, 'warn').mockImplementation(() => {});
+    });
+
+    afterEach(() => {
+        delete process.env.EXTRACTION_WORKERS;
+        jest.restoreAllMocks();
+    });
+
+    afterAll(() => shutdownExtractionPool());
+
+    describe('content-hash cache', () => {
+        it('keys by bytes and mime type', () => {
+            const bytes = Buffer.from(CV_TEXT);
+            expect(documentContentHash(bytes, 'application/pdf')).toBe(documentContentHash(Buffer.from(CV_TEXT), 'application/pdf'));
+            expect(documentContentHash(bytes, 'application/pdf')).not.toBe(documentContentHash(bytes, 'text/plain'));
+        });
+
+        it('extracts identical re-uploads only once', async () => {
+            const loader = jest.fn(async () => ({ text: CV_TEXT, source: 'azure' as const }));
+
+            const first = await getOrExtractDocument(Buffer.from('%PDF-1 same bytes'), 'application/pdf', loader);
+            const second = await getOrExtractDocument(Buffer.from('%PDF-1 same bytes'), 'application/pdf', loader);
+
+            expect(loader).toHaveBeenCalledTimes(1);
+            expect(first.outcome).toBe('miss');
+            expect(second.outcome).toBe('hit');
+            expect(second.value.text).toBe(CV_TEXT);
+            expect(getLocalCacheStats().document_extraction).toMatchObject({ hits: 1, misses: 1 });
+        });
+
+        it('coalesces concurrent extractions and never caches failures', async () => {
+            const bytes = Buffer.from('%PDF-1 concurrent');
+            const loader = jest.fn(async () => ({ text: CV_TEXT, source: 'local' as const }));
+            const outcomes = await Promise.all([1, 2, 3].map(() => getOrExtractDocument(bytes, 'application/pdf', loader)));
+            expect(loader).toHaveBeenCalledTimes(1);
+            expect(outcomes.map(o => o.outcome).sort()).toEqual(['coalesced', 'coalesced', 'miss']);
+
+            const broken = Buffer.from('%PDF-1 unreadable');
+            const failing = jest.fn(async (): Promise<{ text: string; source: 'azure' }> => {
+                throw new Error('PDF konnte nicht gelesen werden.');
+            });
+            await expect(getOrExtractDocument(broken, 'application/pdf', failing)).rejects.toThrow('nicht gelesen');
+            await expect(getOrExtractDocument(broken, 'application/pdf', failing)).rejects.toThrow('nicht gelesen');
+            expect(failing).toHaveBeenCalledTimes(2);
+        });
+    });
+
+    describe('worker pool', () => {
+        it('is skipped when disabled so callers extract in-process', async () => {
+            process.env.EXTRACTION_WORKERS = 'off';
+            expect(await extractInWorker(SAMPLE_PDF, 'application/pdf')).toBeNull();
+        });
+
+        it('streams pages and matches in-process extraction', async () => {
+            process.env.EXTRACTION_WORKERS = 'off';
+            const inProcess = await extractText(SAMPLE_PDF, 'application/pdf');
+            delete process.env.EXTRACTION_WORKERS;
+
+            const pages: number[] = [];
+            const pooled = await extractText(SAMPLE_PDF, 'application/pdf', { onPage: page => pages.push(page.index) });
+
+            expect(pooled).toBe(inProcess);
+            expect(pooled.length).toBeGreaterThan(0);
+            expect(pages).toEqual(pages.map((_, i) => i));
+        }, 20_000);
+    });
+});
@@ -0,0 +1,167 @@
+import { SPECULATIVE_DELAY_MS, fetchSerpApiFullDescription, searchJobs } from '../job-search-pipeline';
+import {
+    getSearchTierTimings,
+    releaseSpeculativeSlot,
+    resetJobSearchCache,
+    serpQueryCacheKey,
+    tryAcquireSpeculativeSlot,
+} from '../job-search-cache';
+
+type FakeJob = { job_id: string; title: string; company_name: string; share_link: string };
+
+function fakeJobs(prefix: string, count: number): FakeJob[] {
+    return Array.from({ length: count }, (_, i) => ({
+        job_id: `${prefix}-${i}`,
+        title: `${prefix} Role ${i}`,
+        company_name: `${prefix} GmbH ${i}`,
+        share_link: `https://share/${prefix}-${i}`,
+    }));
+}
+
+function jsonResponse(body: unknown) {
+    return { ok: true, status: 200, statusText: 'OK', json: async () => body } as Response;
+}
+
+/** SerpAPI stub: results per date chip, listing → direct apply link, optional latency per chip */
+function installSerpStub(resultsByChip: Record<string, FakeJob[]>, delayByChip: Record<string, number> = {}) {
+    const calls: string[] = [];
+    global.fetch = jest.fn(async (input: RequestInfo | URL) => {
+        const params = new URL(String(input)).searchParams;
+        if (params.get('engine') === 'google_jobs_listing') {
+            calls.push(`listing:${params.get('q')}`);
+            return jsonResponse({
+                apply_options: [{ link: `https://apply/${params.get('q')}` }],
+                search_information: { job_description: `Full description of ${params.get('q')}` },
+            });
+        }
+        calls.push(`${params.get('chips')}:${params.get('q')}`);
+        const delay = delayByChip[params.get('chips') ?? ''];
+        if (delay) await new Promise(resolve => setTimeout(resolve, delay));
+        return jsonResponse({ jobs_results: resultsByChip[params.get('chips') ?? ''] ?? [] });
+    }) as jest.Mock;
+    return calls;
+}
+
+describe('job-search-cache', () => {
+    const originalFetch = global.fetch;
+
+    beforeEach(() => {
+        process.env.SERPAPI_KEY = 'test-key';
+        resetJobSearchCache();
+        jest.spyOn(console, 'log').mockImplementation(() => {});
+        jest.spyOn(console, 'warn').mockImplementation(() => {});
+    });
+
+    afterEach(() => {
+        global.fetch = originalFetch;
+        jest.restoreAllMocks();
+    });
+
+    it('normalizes the query cache key but keeps chip and locale apart', () => {
+        const de = { hl: 'de', gl: 'de' };
+        expect(serpQueryCacheKey('  Data  Engineer Berlin ', 'date_posted:week', de))
+            .toBe(serpQueryCacheKey('data engineer berlin', 'date_posted:week', de));
+        expect(serpQueryCacheKey('data engineer', 'date_posted:week', de))
+            .not.toBe(serpQueryCacheKey('data engineer', 'date_posted:month', de));
+        expect(serpQueryCacheKey('data engineer', 'date_posted:week', de))
+            .not.toBe(serpQueryCacheKey('data engineer', 'date_posted:week', { hl: 'en', gl: 'de' }));
+    });
+
+    it('expands week → month only when week came back short', async () => {
+        const calls = installSerpStub({
+            'date_posted:week': fakeJobs('week', 2),
+            'date_posted:month': [...fakeJobs('week', 2), ...fakeJobs('month', 4)],
+        });
+
+        const jobs = await searchJobs('Data Manager', 'Berlin');
+
+        expect(jobs.map(j => (j.raw as FakeJob).job_id)).toEqual([
+            'week-0', 'week-1', 'month-0', 'month-1', 'month-2', 'month-3',
+        ]);
+        // Month reached MIN_RESULTS → the synonym tier is never issued
+        expect(calls.filter(c => !c.startsWith('listing:'))).toEqual([
+            'date_posted:week:Data Manager Berlin',
+            'date_posted:month:Data Manager Berlin',
+        ]);
+        expect(jobs[0].apply_link).toBe('https://apply/week-0');
+        expect(jobs[5].apply_link).toBe('https://share/month-3');
+    });
+
+    it('spends no month credit when a fast week tier is enough', async () => {
+        const calls = installSerpStub({ 'date_posted:week': fakeJobs('week', 5), 'date_posted:month': fakeJobs('month', 5) });
+
+        await searchJobs('Controller', 'Hamburg');
+
+        expect(calls.filter(c => !c.startsWith('listing:'))).toEqual(['date_posted:week:Controller Hamburg']);
+    });
+
+    it('starts the next tier speculatively only while a cold tier is still pending', async () => {
+        jest.useFakeTimers({ doNotFake: ['setImmediate'] });
+        // Let the fetch chain (several awaits deep) settle after each timer step
+        const settle = () => new Promise(resolve => setImmediate(resolve));
+        try {
+            const calls = installSerpStub(
+                { 'date_posted:week': fakeJobs('week', 6), 'date_posted:month': fakeJobs('month', 6) },
+                { 'date_posted:week': SPECULATIVE_DELAY_MS * 2 },
+            );
+            const search = searchJobs('Product Owner', 'Köln');
+
+            await jest.advanceTimersByTimeAsync(SPECULATIVE_DELAY_MS - 1);
+            await settle();
+            expect(calls).toEqual(['date_posted:week:Product Owner Köln']);
+
+            await jest.advanceTimersByTimeAsync(1);
+            await settle();
+            expect(calls).toContain('date_posted:month:Product Owner Köln');
+
+            await jest.advanceTimersByTimeAsync(SPECULATIVE_DELAY_MS * 2);
+            const jobs = await search;
+            // Week alone reached MIN_RESULTS — the speculative month result is only cached
+            expect(jobs.every(j => (j.raw as FakeJob).job_id.startsWith('week-'))).toBe(true);
+        } finally {
+            jest.useRealTimers();
+        }
+    });
+
+    it('enforces the speculation budget per query key', () => {
+        const key = serpQueryCacheKey('data engineer', 'date_posted:month', { hl: 'de', gl: 'de' });
+        const other = serpQueryCacheKey('data engineer', 'date_posted:month', { hl: 'en', gl: 'de' });
+
+        expect(tryAcquireSpeculativeSlot(key, 1)).toBe(true);
+        expect(tryAcquireSpeculativeSlot(key, 1)).toBe(false);
+        expect(tryAcquireSpeculativeSlot(other, 1)).toBe(true);
+
+        releaseSpeculativeSlot(key);
+        expect(tryAcquireSpeculativeSlot(key, 1)).toBe(true);
+    });
+
+    it('serves repeated searches and listing lookups from cache', async () => {
+        const calls = installSerpStub({ 'date_posted:week': fakeJobs('week', 6) });
+
+        const first = await searchJobs('Data Engineer', 'Berlin');
+        const upstreamCalls = calls.length;
+        const second = await searchJobs('data engineer', 'berlin');
+        const description = await fetchSerpApiFullDescription('week-0', 'test-key');
+
+        expect(second).toEqual(first);
+        expect(calls.length).toBe(upstreamCalls);
+        expect(description).toBe('Full description of week-0');
+
+        const timings = getSearchTierTimings();
+        expect(timings.week).toMatchObject({ calls: 2, cacheHits: 1 });
+        expect(timings.listing).toMatchObject({ calls: 11, cacheHits: 6 });
+        expect(timings.week.p95Ms).not.toBeNull();
+    });
+
+    it('coalesces concurrent identical searches and does not cache failures', async () => {
+        const calls = installSerpStub({ 'date_posted:week': fakeJobs('week', 6) });
+        await Promise.all([searchJobs('Controller', ''), searchJobs('Controller', '')]);
+        expect(calls.filter(c => c.startsWith('date_posted:week'))).toHaveLength(1);
+
+        global.fetch = jest.fn(async () => ({ ok: false, status: 500, statusText: 'Error' }) as Response) as jest.Mock;
+        expect(await fetchSerpApiFullDescription('unknown-job', 'test-key')).toBeNull();
+
+        installSerpStub({});
+        expect(await fetchSerpApiFullDescription('unknown-job', 'test-key')).toBe('Full description of unknown-job');
+    });
+});
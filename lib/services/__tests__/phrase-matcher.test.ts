@@ -0,0 +1,67 @@
+import { buildPhraseMatcher } from '../phrase-matcher';
+
+function naiveFindAll(patterns: string[], text: string): string[] {
+    const found: string[] = [];
+    patterns.forEach((pattern, index) => {
+        if (!pattern) return;
+        for (let at = text.indexOf(pattern); at >= 0; at = text.indexOf(pattern, at + 1)) {
+            found.push(`${index}:${at}:${at + pattern.length}`);
+        }
+    });
+    return found.sort();
+}
+
+describe('phrase-matcher', () => {
+    describe('findAll', () => {
+        it('reports overlapping and nested occurrences with offsets', () => {
+            const matcher = buildPhraseMatcher(['he', 'she', 'his', 'hers']);
+            const matches = matcher.findAll('ushers');
+
+            expect(matches).toEqual([
+                { patternIndex: 1, start: 1, end: 4 },
+                { patternIndex: 0, start: 2, end: 4 },
+                { patternIndex: 3, start: 2, end: 6 },
+            ]);
+        });
+
+        it('matches a naive indexOf scan on generated inputs', () => {
+            const alphabet = 'abä ';
+            let seed = 7;
+            const next = () => {
+                seed = (seed * 16807) % 2147483647;
+                return seed;
+            };
+            const randomString = (length: number) =>
+                Array.from({ length }, () => alphabet[next() % alphabet.length]).join('');
+
+            for (let run = 0; run < 200; run++) {
+                const patterns = Array.from({ length: 1 + (next() % 6) }, () => randomString(next() % 4));
+                const text = randomString(next() % 40);
+                const actual = buildPhraseMatcher(patterns)
+                    .findAll(text)
+                    .map(m => `${m.patternIndex}:${m.start}:${m.end}`)
+                    .sort();
+
+                expect(actual).toEqual(naiveFindAll(patterns, text));
+            }
+        });
+
+        it('lowercases patterns and text when caseInsensitive is set', () => {
+            const matcher = buildPhraseMatcher(['Hiermit bewerbe ich mich'], { caseInsensitive: true });
+            expect(matcher.findAll('HIERMIT BEWERBE ICH MICH!')).toEqual([{ patternIndex: 0, start: 0, end: 24 }]);
+        });
+    });
+
+    describe('findPresent', () => {
+        it('returns each present pattern index once, ascending, including duplicates', () => {
+            const matcher = buildPhraseMatcher(['nicht nur', 'echte', 'nicht nur', 'fehlt']);
+            expect(matcher.findPresent('nicht nur echte Werte, nicht nur Zahlen')).toEqual([0, 1, 2]);
+        });
+
+        it('ignores empty patterns and handles empty text', () => {
+            const matcher = buildPhraseMatcher(['', 'abc']);
+            expect(matcher.findPresent('')).toEqual([]);
+            expect(matcher.findPresent('xabcx')).toEqual([1]);
+        });
+    });
+});
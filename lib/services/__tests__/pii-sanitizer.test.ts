@@ -3,7 +3,7 @@
  * Pattern: matches lib/__tests__/db.test.ts style
  */
 
-import { sanitizeForAI, buildContentHash } from '../pii-sanitizer';
+import { sanitizeForAI, sanitizeChunked, createPiiSanitizerStream, buildContentHash } from '../pii-sanitizer';
 
 // Test 1 — German name detection + restore
 test('sanitizeForAI: detects German name and restores correctly', () => {
@@ -136,3 +136,86 @@ test('sanitizeForAI: handles same name appearing multiple times', () => {
     // Both occurrences should be tokenized (may have different indices)
     expect(sanitized).not.toContain('Max Mustermann');
 });
+
+// ═══════════════════════════════════════════════════════════════════
+// SINGLE-PASS + STREAMING ENGINE (equivalence with multi-pass)
+// Full corpus + throughput: npx tsx lib/__tests__/pii-stress-test.ts
+// ═══════════════════════════════════════════════════════════════════
+
+const EQUIVALENCE_INPUTS = [
+    'Ich bin Max Mustermann, erreichbar unter max@example.com oder +49 170 12345678.',
+    'MAX MUSTERMANN\nmax@email.de\n+49 170 1234567\nBERUFSERFAHRUNG\nSenior Manager',
+    'HANS MÜLler Schmidt\nIBAN DE89370400440532013000, 0170 12345@x.de',
+    'Kontakt: Anna Schmidt. Dann Peter Meier! Berlin Familienstatus ledig',
+    'JavaScript und TypeScript sind in Berlin sehr gefragt. Von 2020-2023 bei ABC GmbH.',
+];
+
+// Test 10 — single-pass produces an identical SanitizeResult
+test('sanitizeForAI single-pass: identical to multi-pass engine', () => {
+    for (const input of EQUIVALENCE_INPUTS) {
+        const reference = sanitizeForAI(input);
+        const singlePass = sanitizeForAI(input, { mode: 'single-pass' });
+
+        expect(singlePass.sanitized).toBe(reference.sanitized);
+        expect([...singlePass.tokenMap]).toEqual([...reference.tokenMap]);
+        expect(singlePass.warningFlags).toEqual(reference.warningFlags);
+        expect(singlePass.restore(singlePass.sanitized)).toBe(reference.restore(reference.sanitized));
+        expect(singlePass.restoreJson(singlePass.sanitized)).toBe(reference.restoreJson(reference.sanitized));
+    }
+});
+
+// Test 11 — token-lookup restore leaves unknown tokens untouched and escapes JSON values
+test('sanitizeForAI single-pass: restore ignores unknown tokens, restoreJson escapes', () => {
+    const { sanitized, restore, restoreJson } = sanitizeForAI('Max "Maxi" Mustermann\nmax@example.com', { mode: 'single-pass' });
+
+    expect(restore(`${sanitized} __NAME_99__`)).toContain('__NAME_99__');
+    const json = restoreJson(`{"email":"__EMAIL_0__"}`);
+    expect(JSON.parse(json).email).toBe('max@example.com');
+});
+
+// Test 12 — chunked stream masks the same PII and restores the full document
+test('sanitizeChunked: same PII masked across tiny chunks, full restore', () => {
+    const input = EQUIVALENCE_INPUTS.join('\n\n');
+    const reference = sanitizeForAI(input);
+    const chunked = sanitizeChunked(input, 7);
+    const withoutNameIds = (text: string) => text.replace(/__NAME_\d+__/g, '__NAME__');
+
+    expect(withoutNameIds(chunked.sanitized)).toBe(withoutNameIds(reference.sanitized));
+    expect([...chunked.tokenMap.values()].sort()).toEqual([...reference.tokenMap.values()].sort());
+    expect(chunked.restore(chunked.sanitized)).toBe(reference.restore(reference.sanitized));
+});
+
+// Test 13 — stream holds back text until a safe cut point
+test('createPiiSanitizerStream: does not emit a name split across chunks', () => {
+    const stream = createPiiSanitizerStream();
+
+    expect(stream.write('Kontakt: Max')).toBe('Kontakt:');
+    stream.write(' Mustermann');
+    expect(stream.end()).toBe(' __NAME_0__');
+    expect(stream.result().sanitized).toBe('Kontakt: __NAME_0__');
+});
+
+// Test 14 — comma-free prose is still flushed once the buffer exceeds its bound
+test('createPiiSanitizerStream: forces word-gap cuts in text without cut characters', () => {
+    const paragraph = 'Ich habe mit Max Mustermann gearbeitet und bin unter max@example.com oder +49 170 1234567 erreichbar.\nDas Team in Berlin plant die Einführung.\n';
+    const input = paragraph.repeat(20);
+    expect(input).not.toMatch(/[,;:|•·▪–—]/);
+
+    const stream = createPiiSanitizerStream({ maxBufferChars: 200 });
+    const flushed: string[] = [];
+    for (let offset = 0; offset < input.length; offset += 7) {
+        const out = stream.write(input.slice(offset, offset + 7));
+        if (out) flushed.push(out);
+    }
+    const tail = stream.end();
+
+    // Bounded buffer: many intermediate flushes, short tail
+    expect(flushed.length).toBeGreaterThan(10);
+    expect(tail.length).toBeLessThan(300);
+
+    const reference = sanitizeForAI(input);
+    const result = stream.result();
+    const withoutNameIds = (text: string) => text.replace(/__NAME_\d+__/g, '__NAME__');
+    expect(withoutNameIds(result.sanitized)).toBe(withoutNameIds(reference.sanitized));
+    expect(result.restore(result.sanitized)).toBe(input);
+});
@@ -14,8 +14,13 @@
  *   1. Prompt Builder: buildLeanBlacklistSection() → System Prompt
  *   2. Validator: Regex scan → errors before Judge
  *   3. Judge: buildJudgeBlacklistSection(lang) → Haiku Judge Prompt
+ *
+ * Scanning runs on a precompiled Aho-Corasick automaton (phrase-matcher.ts):
+ * one pass per text instead of one `includes` per pattern.
  */
 
+import { buildPhraseMatcher } from './phrase-matcher';
+
 export interface BlacklistPattern {
     pattern: string;
     reason: string;
@@ -593,18 +598,38 @@ export interface FluffScanResult {
     }>;
 }
 
+export interface FluffOccurrence {
+    pattern: string;
+    category: BlacklistPattern['category'];
+    /** Start offset (inclusive) in the lowercased text */
+    start: number;
+    /** End offset (exclusive) */
+    end: number;
+}
+
+// Built once at module load and shared by every scan.
+const FLUFF_MATCHER = buildPhraseMatcher(
+    BLACKLIST_PATTERNS.map(p => p.pattern),
+    { caseInsensitive: true },
+);
+
+// Global-flag copies for position lookups (matchAll requires /g).
+const FLUFF_REGEXES_GLOBAL = BLACKLIST_REGEX_PATTERNS.map(p => ({
+    ...p,
+    regex: new RegExp(p.regex.source, p.regex.flags.includes('g') ? p.regex.flags : `${p.regex.flags}g`),
+}));
+
 /**
  * Scan generated text for blacklisted patterns.
  * Returns { found: true, matches: [...] } if any patterns are detected.
+ * Matches keep BLACKLIST_PATTERNS order, followed by BLACKLIST_REGEX_PATTERNS.
  */
 export function scanForFluff(text: string): FluffScanResult {
-    const lowerText = text.toLowerCase();
     const matches: FluffScanResult['matches'] = [];
 
-    for (const { pattern, reason, category, feedback } of BLACKLIST_PATTERNS) {
-        if (lowerText.includes(pattern.toLowerCase())) {
-            matches.push({ pattern, reason, category, feedback });
-        }
+    for (const index of FLUFF_MATCHER.findPresent(text)) {
+        const { pattern, reason, category, feedback } = BLACKLIST_PATTERNS[index];
+        matches.push({ pattern, reason, category, feedback });
     }
 
     for (const { pattern, regex, reason, category, feedback } of BLACKLIST_REGEX_PATTERNS) {
@@ -623,6 +648,29 @@ export function scanForFluff(text: string): FluffScanResult {
     };
 }
 
+/**
+ * Locate every blacklist occurrence (phrases + regex patterns) in a single pass.
+ * Used for inline highlighting — scanForFluff() remains the pass/fail check.
+ * Offsets refer to text.toLowerCase(), which has the same length as `text` for DE/EN/ES input.
+ */
+export function findFluffOccurrences(text: string): FluffOccurrence[] {
+    const occurrences: FluffOccurrence[] = FLUFF_MATCHER.findAll(text).map(({ patternIndex, start, end }) => ({
+        pattern: BLACKLIST_PATTERNS[patternIndex].pattern,
+        category: BLACKLIST_PATTERNS[patternIndex].category,
+        start,
+        end,
+    }));
+
+    for (const { pattern, regex, category } of FLUFF_REGEXES_GLOBAL) {
+        for (const match of (text ?? '').matchAll(regex)) {
+            const start = match.index ?? 0;
+            occurrences.push({ pattern, category, start, end: start + match[0].length });
+        }
+    }
+
+    return occurrences.sort((a, b) => a.start - b.start || a.end - b.end);
+}
+
 /**
  * T1-Tier Patterns — Claude generates these with >50% probability when not explicitly forbidden.
  * Empirically validated from production cover letter outputs.
@@ -652,17 +700,23 @@ const T1_TIER_PATTERNS: string[] = [
     'schärfte meinen Blick', // T1-V5: Frequent leaker from Run 3
 ];
 
+// Pattern lists are module constants — prompt sections are built once per process
+let leanBlacklistSection: string | null = null;
+const judgeBlacklistSections = new Map<'de' | 'en' | 'es', string>();
+
 /**
  * Lean prompt section — T1-tier patterns only, no reasons (~120 tokens vs ~888).
  * Used in buildSystemPrompt() for generation-time blacklist.
  * Full scan remains in scanForFluff() (post-gen) and buildJudgeBlacklistSection() (judge).
  */
 export function buildLeanBlacklistSection(): string {
-    return `VERBOTENE PHRASEN (HARD RULES — niemals verwenden):
+    if (leanBlacklistSection) return leanBlacklistSection;
+    leanBlacklistSection = `VERBOTENE PHRASEN (HARD RULES — niemals verwenden):
 ${T1_TIER_PATTERNS.map(p => `- "${p}"`).join('\n')}
 - Sätze über 30 Wörter ohne Komma
 - Sätze die bei einem Leser den Gedanken auslösen: "Das hat ChatGPT geschrieben"
 - Aussagen die für jede Firma 1:1 kopierbar wären`;
+    return leanBlacklistSection;
 }
 
 /**
@@ -672,6 +726,9 @@ ${T1_TIER_PATTERNS.map(p => `- "${p}"`).join('\n')}
  * @param lang - 'de' | 'en' | 'es'
  */
 export function buildJudgeBlacklistSection(lang: 'de' | 'en' | 'es'): string {
+    const cached = judgeBlacklistSections.get(lang);
+    if (cached) return cached;
+
     const isEnglish = lang === 'en';
 
     // Categorize patterns by language relevance
@@ -696,7 +753,9 @@ export function buildJudgeBlacklistSection(lang: 'de' | 'en' | 'es'): string {
         ? 'FORBIDDEN PHRASES — GPT-BLACKLIST (each found = fail):'
         : 'VERBOTENE PHRASEN — GPT-BLACKLIST (jeder Fund = fail):';
 
-    return `${header}
+    const section = `${header}
 ${patterns.map(p => `- "${p.pattern}"`).join('\n')}
 ${BLACKLIST_REGEX_PATTERNS.map(p => `- "${p.pattern}" (${p.reason})`).join('\n')}`;
+    judgeBlacklistSections.set(lang, section);
+    return section;
 }
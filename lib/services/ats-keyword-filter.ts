@@ -5,8 +5,18 @@
  * `job_queue.buzzwords`. Prompts should use `buildAtsKeywordPrompt()` so the
  * Browser Extension, Job Search, manual Add Job and Inngest extraction cannot
  * drift into different keyword definitions.
+ *
+ * JD grounding checks run against a `JDIndex` built once per job description
+ * (`buildJDIndex()`): normalized text, word/stem sets and a single-pass
+ * phrase-matcher scan for the hallucination vocabulary. Raw JD text goes
+ * through `getJDIndex()`, which memoizes the index by content hash — the same
+ * descriptions are re-cleaned on every /api/jobs/list load.
  */
 
+import { createHash } from 'crypto';
+import { buildPhraseMatcher } from './phrase-matcher';
+import { createTtlLruCache } from '@/lib/utils/ttl-lru-cache';
+
 export interface FilterResult {
     kept: string[];
     removed: string[];
@@ -159,6 +169,13 @@ const HALLUCINATION_EQUIVALENCE_GROUPS = [
     ['dsgvo', 'gdpr', 'rgpd', 'datenschutz grundverordnung', 'datenschutz-grundverordnung', 'datenschutzgrundverordnung'],
 ];
 
+const EQUIVALENCE_GROUP_BY_TERM: ReadonlyMap<string, readonly string[]> = new Map(
+    HALLUCINATION_EQUIVALENCE_GROUPS.flatMap(group => group.map(term => [term, group] as const))
+);
+
+/** Minimum length of a JD word stem used by the 4+ character token check. */
+const STEM_LENGTH = 6;
+
 export function buildAtsKeywordPrompt(languageName: string): string {
     return `string[] - ATS keywords: TARGET 14-18 strong keywords when enough grounded terms exist; MAXIMUM 18. Extract EXCLUSIVELY from the job description text below.
 
@@ -187,10 +204,6 @@ const NORMALIZED_STOP_LIST: ReadonlySet<string> = new Set(
     [...ATS_STOP_LIST].map(normalizeForComparison)
 );
 
-function escapeRegex(value: string): string {
-    return value.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
-}
-
 function stripCompoundSuffix(term: string): string {
     const lower = term.toLowerCase();
     for (const suffix of COMPOUND_SUFFIXES) {
@@ -302,36 +315,108 @@ export function filterAtsKeywords(candidates: string[] | null | undefined): Filt
     return result;
 }
 
-function isTokenInJD(token: string, normalizedJD: string): boolean {
+/**
+ * Pre-normalized view of one job description. Build once per JD and reuse
+ * across keyword checks (extraction, confirm edits, video keywords).
+ */
+export interface JDIndex {
+    /** Length of the raw JD text — JDs shorter than MIN_JD_LENGTH are not used for grounding */
+    sourceLength: number;
+    /** normalizeForComparison(jdText) */
+    normalized: string;
+    /** `normalized` without spaces, hyphens and underscores */
+    noSeparators: string;
+    /** Word runs of `normalized` (regex word characters, i.e. [a-z0-9_]) */
+    words: ReadonlySet<string>;
+    /** Word prefixes of length 4..6 — answers `\bstem` lookups */
+    stems: ReadonlySet<string>;
+    /** Hallucination-vocabulary terms occurring in `normalized` */
+    presentTerms: ReadonlySet<string>;
+    /** Hallucination-vocabulary terms (separators stripped) occurring in `noSeparators` */
+    presentCompactTerms: ReadonlySet<string>;
+}
+
+function stripSeparators(value: string): string {
+    return value.replace(/[-_\s]+/g, '');
+}
+
+// Every term isKeywordSubstantiated() may look up via substring search.
+const HALLUCINATION_VOCABULARY: readonly string[] = [...new Set([
+    ...KNOWN_HALLUCINATIONS,
+    ...HALLUCINATION_EQUIVALENCE_GROUPS.flat(),
+].map(normalizeForComparison))];
+const HALLUCINATION_VOCABULARY_COMPACT: readonly string[] = HALLUCINATION_VOCABULARY.map(stripSeparators);
+
+const VOCABULARY_MATCHER = buildPhraseMatcher(HALLUCINATION_VOCABULARY);
+const VOCABULARY_COMPACT_MATCHER = buildPhraseMatcher(HALLUCINATION_VOCABULARY_COMPACT);
+
+export function buildJDIndex(jdText: string): JDIndex {
+    const normalized = normalizeForComparison(jdText);
+    const noSeparators = stripSeparators(normalized);
+
+    const words = new Set<string>();
+    const stems = new Set<string>();
+    for (const word of normalized.split(/[^a-z0-9_]+/)) {
+        if (!word) continue;
+        words.add(word);
+        for (let length = 4; length <= Math.min(word.length, STEM_LENGTH); length++) {
+            stems.add(word.slice(0, length));
+        }
+    }
+
+    return {
+        sourceLength: jdText.length,
+        normalized,
+        noSeparators,
+        words,
+        stems,
+        presentTerms: new Set(VOCABULARY_MATCHER.findPresent(normalized).map(i => HALLUCINATION_VOCABULARY[i])),
+        presentCompactTerms: new Set(
+            VOCABULARY_COMPACT_MATCHER.findPresent(noSeparators).map(i => HALLUCINATION_VOCABULARY_COMPACT[i])
+        ),
+    };
+}
+
+// Per-instance memo for raw JD text — keyed by content hash, not by the (long) text itself
+const JD_INDEX_TTL_MS = 60 * 60 * 1000;
+const jdIndexCache = createTtlLruCache<JDIndex>({ maxEntries: 500 });
+
+/** buildJDIndex() memoized by JD content (identical descriptions share one index) */
+export function getJDIndex(jdText: string): JDIndex {
+    const key = createHash('sha256').update(jdText).digest('hex');
+    let index = jdIndexCache.get(key);
+    if (!index) {
+        index = buildJDIndex(jdText);
+        jdIndexCache.set(key, index, JD_INDEX_TTL_MS);
+    }
+    return index;
+}
+
+function isTokenInJD(token: string, jd: JDIndex): boolean {
     if (!token) return false;
     if (token.length < 3) return true;
 
+    // Equivalent to /\btoken\b/ on the normalized JD
     if (token.length === 3) {
-        return new RegExp(`\\b${escapeRegex(token)}\\b`).test(normalizedJD);
+        return jd.words.has(token);
     }
 
-    const stem = token.slice(0, Math.min(token.length, 6));
-    return new RegExp(`\\b${escapeRegex(stem)}`).test(normalizedJD);
+    // Equivalent to /\bstem/ on the normalized JD
+    return jd.stems.has(token.slice(0, Math.min(token.length, STEM_LENGTH)));
 }
 
-function isKeywordSubstantiated(
-    normalizedKeyword: string,
-    normalizedJD: string,
-    jdNoSeparators: string,
-): boolean {
-    for (const group of HALLUCINATION_EQUIVALENCE_GROUPS) {
-        if (!group.includes(normalizedKeyword)) continue;
-        if (group.some(term => normalizedJD.includes(term) || jdNoSeparators.includes(term.replace(/[-_\s]+/g, '')))) {
-            return true;
-        }
+function isKeywordSubstantiated(normalizedKeyword: string, jd: JDIndex): boolean {
+    const group = EQUIVALENCE_GROUP_BY_TERM.get(normalizedKeyword);
+    if (group?.some(term => jd.presentTerms.has(term) || jd.presentCompactTerms.has(stripSeparators(term)))) {
+        return true;
     }
 
-    if (normalizedKeyword && normalizedJD.includes(normalizedKeyword)) {
+    if (normalizedKeyword && jd.presentTerms.has(normalizedKeyword)) {
         return true;
     }
 
-    const keywordNoSeparators = normalizedKeyword.replace(/[-_\s]+/g, '');
-    if (keywordNoSeparators.length >= 4 && jdNoSeparators.includes(keywordNoSeparators)) {
+    const keywordNoSeparators = stripSeparators(normalizedKeyword);
+    if (keywordNoSeparators.length >= 4 && jd.presentCompactTerms.has(keywordNoSeparators)) {
         return true;
     }
 
@@ -341,26 +426,35 @@ function isKeywordSubstantiated(
 
     if (tokens.length === 0) {
         const shortTokens = normalizedKeyword.split(/[\s\-_]+/).filter(token => token.length >= 2);
-        return shortTokens.length > 0 && shortTokens.every(token => isTokenInJD(token, normalizedJD));
+        return shortTokens.length > 0 && shortTokens.every(token => isTokenInJD(token, jd));
     }
 
-    return tokens.every(token => isTokenInJD(token, normalizedJD));
+    return tokens.every(token => isTokenInJD(token, jd));
 }
 
+// Too little text to judge — keep every keyword
+const MIN_JD_LENGTH = 50;
+
+/**
+ * Drop known-hallucination keywords (DSGVO, ISO norms, …) that the JD does not
+ * substantiate. Accepts raw JD text (indexed via getJDIndex) or a prebuilt JDIndex.
+ */
 export function filterByVerbatimJDPresence(
     keywords: string[] | null | undefined,
-    jdText: string | null | undefined,
+    jd: string | JDIndex | null | undefined,
 ): FilterResult {
     if (!keywords || keywords.length === 0) {
         return { kept: [], removed: [] };
     }
 
-    if (!jdText || jdText.length < 50) {
+    const jdLength = typeof jd === 'string' ? jd.length : jd?.sourceLength ?? 0;
+    if (!jd || jdLength < MIN_JD_LENGTH) {
         return { kept: [...keywords], removed: [] };
     }
 
-    const normalizedJD = normalizeForComparison(jdText);
-    const jdNoSeparators = normalizedJD.replace(/[-_\s]+/g, '');
+    // Index lazily — most keyword lists contain no known hallucination at all
+    const jdText = typeof jd === 'string' ? jd : '';
+    let jdIndex: JDIndex | null = typeof jd === 'string' ? null : jd;
     const kept: string[] = [];
     const removed: string[] = [];
 
@@ -376,7 +470,8 @@ export function filterByVerbatimJDPresence(
             continue;
         }
 
-        if (isKeywordSubstantiated(normalizedKeyword, normalizedJD, jdNoSeparators)) {
+        if (!jdIndex) jdIndex = getJDIndex(jdText);
+        if (isKeywordSubstantiated(normalizedKeyword, jdIndex)) {
             kept.push(keyword);
         } else {
             removed.push(keyword);
@@ -388,7 +483,7 @@ export function filterByVerbatimJDPresence(
 
 export function cleanAtsKeywords(
     candidates: string[] | null | undefined,
-    jdText: string | null | undefined,
+    jdText: string | JDIndex | null | undefined,
 ): AtsKeywordCleanResult {
     const normalized = normalizeSortDedup(candidates ?? []);
     const stopList = filterAtsKeywords(normalized);
@@ -27,6 +27,8 @@
  *   Azure prebuilt-layout → null → caller falls back to local pdf-parse
  */
 
+import { tracedFetch } from '@/lib/tracing';
+
 const AZURE_ENDPOINT = process.env.AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT!;
 const AZURE_KEY = process.env.AZURE_DOCUMENT_INTELLIGENCE_KEY!;
 const API_VERSION = '2024-11-30';
@@ -64,7 +66,7 @@ export async function extractTextWithAzure(
         // prebuilt-layout gives us semantic paragraph roles + table structure
         const analyzeUrl = `${AZURE_ENDPOINT.replace(/\/$/, '')}/documentintelligence/documentModels/prebuilt-layout:analyze?api-version=${API_VERSION}`;
 
-        const submitRes = await fetch(analyzeUrl, {
+        const submitRes = await tracedFetch('azure', analyzeUrl, {
             method: 'POST',
             headers: {
                 'Ocp-Apim-Subscription-Key': AZURE_KEY,
@@ -93,7 +95,7 @@ export async function extractTextWithAzure(
         while (Date.now() < deadline) {
             await sleep(POLL_INTERVAL_MS);
 
-            const pollRes = await fetch(operationUrl, {
+            const pollRes = await tracedFetch('azure', operationUrl, {
                 headers: { 'Ocp-Apim-Subscription-Key': AZURE_KEY },
             });
 
@@ -1,43 +1,159 @@
 /**
  * CACHE MONITOR
  *
- * Tracks cache hit rates for company research to estimate cost savings.
- * In-memory storage (resets on server restart) is sufficient for this MVP.
+ * Tracks cache hit rates per cache namespace to estimate cost savings:
+ *   - company_research: Perplexity/Jina enrichment cache (company-enrichment.ts)
+ *   - llm_response:     content-addressed LLM response cache (lib/ai/response-cache.ts)
+ *   - document_extraction: content-hash cache for CV/cover letter extraction (extraction-cache.ts)
+ *
+ * Counters are kept in memory AND mirrored to Upstash Redis (HINCRBY, fire-and-forget)
+ * when configured, so getCacheStats() reports totals across all serverless instances
+ * instead of resetting on every cold start. Without Redis (local dev, tests) the
+ * in-memory counters are the source of truth.
  */
 
-// In-memory counters
-let cacheHits = 0;
-let cacheMisses = 0;
+import { getRedis } from '@/lib/api/rate-limit-upstash';
+
+export type CacheNamespace = 'company_research' | 'llm_response' | 'document_extraction';
+
+const CACHE_NAMESPACES: CacheNamespace[] = ['company_research', 'llm_response', 'document_extraction'];
+
+// Perplexity API cost estimate (approx €0.02 per call) — LLM hits report their real cost.
+// Azure prebuilt-layout: ~€0.01 per page, typical CV = 2 pages.
+const DEFAULT_SAVED_CENTS: Record<CacheNamespace, number> = {
+    company_research: 2,
+    llm_response: 0,
+    document_extraction: 2,
+};
+
+const REDIS_KEY_PREFIX = 'cache-stats:';
+
+interface CacheCounters {
+    hits: number;
+    misses: number;
+    /** Concurrent identical requests that joined an in-flight upstream call */
+    coalesced: number;
+    savedCents: number;
+}
+
+export interface CacheStats {
+    hits: number;
+    misses: number;
+    coalesced: number;
+    total: number;
+    hitRate: string;
+    estimatedSavings: string;
+}
+
+function emptyCounters(): CacheCounters {
+    return { hits: 0, misses: 0, coalesced: 0, savedCents: 0 };
+}
+
+// In-memory counters (per instance)
+let localCounters: Record<CacheNamespace, CacheCounters> = {
+    company_research: emptyCounters(),
+    llm_response: emptyCounters(),
+    document_extraction: emptyCounters(),
+};
+
+function increment(namespace: CacheNamespace, field: keyof CacheCounters, by: number) {
+    if (by === 0) return;
+    localCounters[namespace][field] += by;
+
+    const redis = getRedis();
+    if (!redis) return;
+    // Fire-and-forget: stats must never slow down or fail the cached call path
+    redis.hincrby(`${REDIS_KEY_PREFIX}${namespace}`, field, Math.round(by)).catch(() => {});
+}
 
 /**
  * Record a successful cache hit (saved an API call)
  */
-export function recordCacheHit() {
-    cacheHits++;
+export function recordCacheHit(
+    namespace: CacheNamespace = 'company_research',
+    savedCents: number = DEFAULT_SAVED_CENTS[namespace],
+) {
+    increment(namespace, 'hits', 1);
+    increment(namespace, 'savedCents', savedCents);
 }
 
 /**
  * Record a cache miss (required an API call)
  */
-export function recordCacheMiss() {
-    cacheMisses++;
+export function recordCacheMiss(namespace: CacheNamespace = 'company_research') {
+    increment(namespace, 'misses', 1);
 }
 
 /**
- * Get current cache statistics
+ * Record a request that was served by an identical in-flight call (singleflight)
  */
-export function getCacheStats() {
-    const total = cacheHits + cacheMisses;
-    const hitRate = total > 0 ? (cacheHits / total) * 100 : 0;
+export function recordCacheCoalesced(namespace: CacheNamespace, savedCents: number) {
+    increment(namespace, 'coalesced', 1);
+    increment(namespace, 'savedCents', savedCents);
+}
 
-    // Perplexity API cost estimate (approx €0.02 per call)
-    const estimatedSavings = cacheHits * 0.02;
+function toStats(counters: CacheCounters): CacheStats {
+    const served = counters.hits + counters.coalesced;
+    const total = served + counters.misses;
+    const hitRate = total > 0 ? (served / total) * 100 : 0;
 
     return {
-        hits: cacheHits,
-        misses: cacheMisses,
+        hits: counters.hits,
+        misses: counters.misses,
+        coalesced: counters.coalesced,
         total,
         hitRate: `${hitRate.toFixed(1)}%`,
-        estimatedSavings: `€${estimatedSavings.toFixed(2)}`
+        estimatedSavings: `€${(counters.savedCents / 100).toFixed(2)}`,
+    };
+}
+
+/**
+ * Current statistics of THIS instance (synchronous, no Redis round-trip)
+ */
+export function getLocalCacheStats(): Record<CacheNamespace, CacheStats> {
+    return {
+        company_research: toStats(localCounters.company_research),
+        llm_response: toStats(localCounters.llm_response),
+        document_extraction: toStats(localCounters.document_extraction),
+    };
+}
+
+/**
+ * Get current cache statistics — shared Redis totals when available,
+ * otherwise the in-memory counters of this instance.
+ */
+export async function getCacheStats(): Promise<Record<CacheNamespace, CacheStats>> {
+    const redis = getRedis();
+    if (!redis) return getLocalCacheStats();
+
+    try {
+        const rows = await Promise.all(
+            CACHE_NAMESPACES.map(ns => redis.hgetall<Record<string, number | string>>(`${REDIS_KEY_PREFIX}${ns}`))
+        );
+        const stats = {} as Record<CacheNamespace, CacheStats>;
+        CACHE_NAMESPACES.forEach((ns, i) => {
+            const row = rows[i] ?? {};
+            stats[ns] = toStats({
+                hits: Number(row.hits ?? 0),
+                misses: Number(row.misses ?? 0),
+                coalesced: Number(row.coalesced ?? 0),
+                savedCents: Number(row.savedCents ?? 0),
+            });
+        });
+        return stats;
+    } catch (error) {
+        console.warn('⚠️ [CacheMonitor] Redis stats read failed — using local counters:', error);
+        return getLocalCacheStats();
+    }
+}
+
+/**
+ * Reset the in-memory counters (tests / local benchmarks)
+ */
+export function resetLocalCacheStats() {
+    localCounters = {
+        company_research: emptyCounters(),
+        llm_response: emptyCounters(),
+        document_extraction: emptyCounters(),
     };
 }
@@ -16,11 +16,15 @@ import { COACHING_PROMPT_VERSION } from '@/lib/prompts/coaching-system-prompt';
 import { getDimensionNames, getScoringTags, getConversationLabels, getReportSystemPrompt, getReportUserMessage, type CoachingLocale } from '@/lib/prompts/coaching-prompt-i18n';
 import { buildContentHash } from '@/lib/services/pii-sanitizer';
 import type { ChatMessage } from '@/types/coaching';
+import { recordModelUsage, supabaseTracingFetch, withSpan } from '@/lib/tracing';
 
 const supabaseAdmin = createAdminClient(
     process.env.NEXT_PUBLIC_SUPABASE_URL!,
     process.env.SUPABASE_SERVICE_ROLE_KEY!,
-    { auth: { autoRefreshToken: false, persistSession: false } }
+    {
+        auth: { autoRefreshToken: false, persistSession: false },
+        global: { fetch: supabaseTracingFetch },
+    }
 );
 
 let reportClient: Anthropic | null = null;
@@ -33,6 +37,11 @@ function getClient(): Anthropic {
 
 const REPORT_MODEL = 'claude-haiku-4-5-20251001';
 
+// Haiku 4.5: $1 / 1M input, $5 / 1M output
+function reportCostCents(usage: { input_tokens: number; output_tokens: number }): number {
+    return Math.ceil(((usage.input_tokens / 1_000_000) * 1.0 + (usage.output_tokens / 1_000_000) * 5.0) * 100);
+}
+
 
 
 export async function generateAndSaveReport(sessionId: string, userId: string): Promise<void> {
@@ -85,17 +94,30 @@ export async function generateAndSaveReport(sessionId: string, userId: string):
     const jobTitle = job?.job_title || (locale === 'en' ? 'Unknown' : locale === 'es' ? 'Desconocido' : 'Unbekannt');
     const companyName = job?.company_name || (locale === 'en' ? 'Unknown' : locale === 'es' ? 'Desconocida' : 'Unbekannt');
 
-    const response = await client.messages.create({
-        model: REPORT_MODEL,
-        max_tokens: 3500,
-        temperature: 0.3,
-        system: getReportSystemPrompt(locale, tags, dimNames),
-        messages: [
-            {
-                role: 'user',
-                content: getReportUserMessage(locale, jobTitle, companyName, conversationText),
-            },
-        ],
+    const response = await withSpan('llm coaching_report', {
+        kind: 'client',
+        attributes: { 'gen_ai.operation.name': 'chat', 'pathly.task': 'coaching_report' },
+    }, async span => {
+        const message = await client.messages.create({
+            model: REPORT_MODEL,
+            max_tokens: 3500,
+            temperature: 0.3,
+            system: getReportSystemPrompt(locale, tags, dimNames),
+            messages: [
+                {
+                    role: 'user',
+                    content: getReportUserMessage(locale, jobTitle, companyName, conversationText),
+                },
+            ],
+        });
+        recordModelUsage(span, {
+            model: REPORT_MODEL,
+            provider: 'anthropic',
+            inputTokens: message.usage.input_tokens,
+            outputTokens: message.usage.output_tokens,
+            costCents: reportCostCents(message.usage),
+        });
+        return message;
     });
 
     const text = response.content
@@ -104,9 +126,7 @@ export async function generateAndSaveReport(sessionId: string, userId: string):
         .join('\n');
 
     const tokensUsed = response.usage.input_tokens + response.usage.output_tokens;
-    const costCents = Math.ceil(
-        ((response.usage.input_tokens / 1_000_000) * 1.0 + (response.usage.output_tokens / 1_000_000) * 5.0) * 100
-    );
+    const costCents = reportCostCents(response.usage);
 
     // 4. Parse report JSON
     let reportJson;
@@ -0,0 +1,361 @@
+/**
+ * Company Crawler — Pathly V2.0
+ * Bounded-concurrency Jina Reader crawler for company enrichment (company-enrichment.ts).
+ *
+ * Crawl shape: homepage → up to 2 relevant internal subpages (about, mission, …).
+ * Enrichment sits on the cover-letter critical path, so:
+ *
+ *   1. Subpages are fetched in parallel, limited per target domain (shared across
+ *      concurrent enrichments, so one company site is never hammered).
+ *   2. One overall deadline — pages still pending when it fires are dropped and the
+ *      crawl returns what it has (`partial: true`).
+ *   3. Per-URL page cache: fresh entries are served without a request; stale entries
+ *      are revalidated with If-None-Match / If-Modified-Since, and kept on 304,
+ *      on unchanged content, or when the refresh fails.
+ *   4. Cleanup runs per page as soon as it arrives (cleanPageMarkdown) — cached
+ *      pages are stored cleaned and never re-scanned.
+ *
+ * ⚠️ The page cache is per-instance (no Redis): company_research already caches the
+ *    final intel for 7 days; this cache covers re-enrichment and concurrent requests.
+ */
+
+import { createHash } from 'crypto';
+import { createTtlLruCache } from '@/lib/utils/ttl-lru-cache';
+import { tracedFetch } from '@/lib/tracing';
+
+// ─── Config ───────────────────────────────────────────────────────
+
+const DEFAULT_DEADLINE_MS = 25_000;
+const DEFAULT_HOME_TIMEOUT_MS = 20_000;
+const DEFAULT_SUBPAGE_TIMEOUT_MS = 8_000;
+const DEFAULT_PER_DOMAIN_CONCURRENCY = 2;
+const MAX_SUBPAGES = 2;
+// Subpages shorter than this are error/consent pages, not content
+const MIN_SUBPAGE_CHARS = 200;
+
+// Fresh → served without a request. Fresh..stale → conditional refresh.
+const PAGE_FRESH_MS = 6 * 60 * 60 * 1000;
+const PAGE_STALE_MS = 3 * 24 * 60 * 60 * 1000;
+
+// ─── Types ────────────────────────────────────────────────────────
+
+export interface CrawledPage {
+    url: string;
+    /** Markdown after cleanPageMarkdown() */
+    cleaned: string;
+    /** Length of the raw Jina markdown (for logging / size gates) */
+    rawLength: number;
+    fromCache: boolean;
+}
+
+export interface CrawlResult {
+    home: CrawledPage | null;
+    subpages: CrawledPage[];
+    /** True when the deadline dropped at least one pending page */
+    partial: boolean;
+    elapsedMs: number;
+}
+
+export interface CrawlOptions {
+    deadlineMs?: number;
+    homeTimeoutMs?: number;
+    subpageTimeoutMs?: number;
+    perDomainConcurrency?: number;
+    /** Revalidate cached pages even when fresh (enrichCompany forceRefresh) */
+    revalidate?: boolean;
+}
+
+interface CachedPage {
+    cleaned: string;
+    rawLength: number;
+    relevantLinks: string[];
+    contentHash: string;
+    etag: string | null;
+    lastModified: string | null;
+    fetchedAt: number;
+}
+
+// ─── Cleanup (per page) ───────────────────────────────────────────
+
+/**
+ * Strip structural noise from ONE page of Jina markdown.
+ *
+ * Enterprise websites (e.g. ALTEN Germany) can have 20K+ chars of navigation
+ * menus, cookie banners, and footer links BEFORE any business content.
+ * Stripping nav menus, cookie consent and link lists BEFORE truncation
+ * ensures Claude always receives actual business content.
+ */
+export function cleanPageMarkdown(markdown: string): string {
+    return markdown
+        // Phase 1: Remove structural noise (navigation menus, link lists)
+        .replace(/^[ \t]*\*[ \t]+\[.*?\]\(.*?\)\s*$/gm, '')  // Nav menu items: "* [Link](url)"
+        .replace(/^[ \t]*-[ \t]+\[.*?\]\(.*?\)\s*$/gm, '')   // Alt nav items: "- [Link](url)"
+        .replace(/^\[]\(.*?\)\s*$/gm, '')                     // Empty links: "[](url)"
+        // Phase 2: Remove visual noise (images, blob URLs)
+        .replace(/!\[.*?\]\(.*?\)/g, '')                       // Markdown images
+        .replace(/\[[^\]]*\]\(blob:.*?\)/g, '')                // Blob links
+        .replace(/\[[^\]]*\]\(javascript:.*?\)/g, '')          // JS links
+        // Phase 3: Convert remaining links to text (keep content, drop URLs)
+        .replace(/\[([^\]]+)\]\([^)]+\)/g, '$1')              // [text](url) → text
+        // Phase 4: Remove cookie/consent banners
+        .replace(/^.*(?:Cookies?|Cookie-?Einstellung|Akzeptieren|Ablehnen|Personalisieren|Zustimmung|Datenschutzeinstellung).*$/gmi, '')
+        // Phase 5: Clean up artifacts
+        .replace(/^\s*[-*]{3,}\s*$/gm, '')                    // Horizontal rules
+        .replace(/^\s*\[\s*$/gm, '')                          // Orphan "[" on own line
+        .replace(/^\s*\]\s*$/gm, '')                          // Orphan "]" on own line
+        .replace(/\n{3,}/g, '\n\n')                           // Collapse blank lines
+        .trim();
+}
+
+// ─── Link discovery ───────────────────────────────────────────────
+
+export function extractRelevantInternalLinks(markdown: string, baseUrl: string): string[] {
+    const relevantTerms = [
+        'about', 'company', 'mission', 'vision', 'values', 'culture',
+        'product', 'products', 'solution', 'solutions', 'services',
+        'project', 'projects', 'sustainability', 'impact', 'innovation',
+        'career', 'careers', 'jobs', 'team',
+    ];
+
+    let base: URL;
+    try {
+        base = new URL(baseUrl);
+    } catch {
+        return [];
+    }
+
+    const links = new Map<string, number>();
+    const linkRegex = /\[([^\]]+)\]\(([^)]+)\)/g;
+    let match: RegExpExecArray | null;
+
+    while ((match = linkRegex.exec(markdown)) !== null) {
+        const label = match[1].toLowerCase();
+        const href = match[2];
+        if (!href || href.startsWith('#') || href.startsWith('mailto:') || href.startsWith('tel:')) continue;
+
+        let url: URL;
+        try {
+            url = new URL(href, base);
+        } catch {
+            continue;
+        }
+
+        if (url.hostname.replace(/^www\./, '') !== base.hostname.replace(/^www\./, '')) continue;
+
+        const haystack = `${label} ${url.pathname.toLowerCase()}`;
+        const score = relevantTerms.reduce((total, term) => total + (haystack.includes(term) ? 1 : 0), 0);
+        if (score === 0) continue;
+
+        url.hash = '';
+        links.set(url.toString(), Math.max(links.get(url.toString()) || 0, score));
+    }
+
+    return [...links.entries()]
+        .sort((a, b) => b[1] - a[1])
+        .map(([url]) => url)
+        .filter(url => url !== base.toString())
+        .slice(0, MAX_SUBPAGES);
+}
+
+// ─── Per-domain concurrency limit ─────────────────────────────────
+
+const domainSlots = new Map<string, { active: number; waiting: Array<() => void> }>();
+
+function domainOf(url: string): string {
+    try {
+        return new URL(url).hostname.replace(/^www\./, '');
+    } catch {
+        return url;
+    }
+}
+
+async function withDomainSlot<T>(url: string, limit: number, task: () => Promise<T>): Promise<T> {
+    const domain = domainOf(url);
+    let slot = domainSlots.get(domain);
+    if (!slot) {
+        slot = { active: 0, waiting: [] };
+        domainSlots.set(domain, slot);
+    }
+
+    if (slot.active >= limit) {
+        // The releasing task hands its slot over directly (active count unchanged)
+        await new Promise<void>(resolve => slot!.waiting.push(resolve));
+    } else {
+        slot.active++;
+    }
+    try {
+        return await task();
+    } finally {
+        const next = slot.waiting.shift();
+        if (next) {
+            next();
+        } else if (--slot.active === 0) {
+            domainSlots.delete(domain);
+        }
+    }
+}
+
+// ─── Page cache + Jina fetch ──────────────────────────────────────
+
+const pageCache = createTtlLruCache<CachedPage>({
+    maxEntries: 200,
+    maxBytes: 8 * 1024 * 1024,
+    sizeOf: page => page.cleaned.length * 2 + 256,
+});
+
+type JinaFetchResult =
+    | { status: 'ok'; markdown: string; etag: string | null; lastModified: string | null }
+    | { status: 'not-modified' };
+
+async function fetchWithJinaReader(
+    url: string,
+    timeoutMs: number,
+    validators?: Pick<CachedPage, 'etag' | 'lastModified'>,
+): Promise<JinaFetchResult | null> {
+    const jinaUrl = `https://r.jina.ai/${url}`;
+    const controller = new AbortController();
+    const timeoutId = setTimeout(() => controller.abort(), timeoutMs);
+
+    try {
+        const jinaRes = await tracedFetch('jina', jinaUrl, {
+            headers: {
+                'Accept': 'text/plain',
+                'X-Return-Format': 'markdown',
+                ...(validators?.etag ? { 'If-None-Match': validators.etag } : {}),
+                ...(validators?.lastModified ? { 'If-Modified-Since': validators.lastModified } : {}),
+            },
+            signal: controller.signal,
+        });
+
+        if (jinaRes.status === 304) return { status: 'not-modified' };
+        if (!jinaRes.ok) {
+            console.warn(`⚠️ [Crawler] Jina HTTP ${jinaRes.status} for ${jinaUrl}`);
+            return null;
+        }
+
+        const markdown = await jinaRes.text();
+        if (markdown.length < 100) return null;
+        return {
+            status: 'ok',
+            markdown,
+            etag: jinaRes.headers.get('etag'),
+            lastModified: jinaRes.headers.get('last-modified'),
+        };
+    } catch (error: unknown) {
+        const errMsg = error instanceof Error ? error.message : String(error);
+        console.warn(`⚠️ [Crawler] Jina error for ${url}:`, errMsg);
+        return null;
+    } finally {
+        clearTimeout(timeoutId);
+    }
+}
+
+/**
+ * Cached page fetch. Returns the cached copy when fresh, revalidates when
+ * stale (or `revalidate`), and falls back to the stale copy on failure.
+ */
+async function fetchPage(
+    url: string,
+    timeoutMs: number,
+    options: { perDomainConcurrency: number; revalidate: boolean },
+): Promise<{ page: CachedPage; fromCache: boolean } | null> {
+    const cached = pageCache.get(url);
+    if (cached && !options.revalidate && Date.now() - cached.fetchedAt < PAGE_FRESH_MS) {
+        return { page: cached, fromCache: true };
+    }
+
+    const result = await withDomainSlot(url, options.perDomainConcurrency, () =>
+        fetchWithJinaReader(url, timeoutMs, cached)
+    );
+
+    if (!result) {
+        if (cached) console.log(`♻️ [Crawler] Refresh failed — serving stale copy of ${url}`);
+        return cached ? { page: cached, fromCache: true } : null;
+    }
+
+    if (result.status === 'not-modified') {
+        if (!cached) return null;
+        const refreshed = { ...cached, fetchedAt: Date.now() };
+        pageCache.set(url, refreshed, PAGE_STALE_MS);
+        return { page: refreshed, fromCache: true };
+    }
+
+    const contentHash = createHash('sha256').update(result.markdown).digest('hex').slice(0, 32);
+    const unchanged = cached?.contentHash === contentHash;
+    const page: CachedPage = {
+        // Unchanged content → reuse the cleaned copy instead of re-running the cleanup
+        cleaned: unchanged ? cached!.cleaned : cleanPageMarkdown(result.markdown),
+        rawLength: result.markdown.length,
+        relevantLinks: unchanged ? cached!.relevantLinks : extractRelevantInternalLinks(result.markdown, url),
+        contentHash,
+        etag: result.etag,
+        lastModified: result.lastModified,
+        fetchedAt: Date.now(),
+    };
+    pageCache.set(url, page, PAGE_STALE_MS);
+    return { page, fromCache: unchanged };
+}
+
+// ─── Crawl ────────────────────────────────────────────────────────
+
+const DEADLINE = Symbol('deadline');
+
+/**
+ * Crawl homepage + relevant subpages within one overall deadline.
+ * Returns `home: null` when the homepage could not be fetched.
+ */
+export async function crawlCompanySite(homeUrl: string, options: CrawlOptions = {}): Promise<CrawlResult> {
+    const startedAt = Date.now();
+    const fetchOptions = {
+        perDomainConcurrency: options.perDomainConcurrency ?? DEFAULT_PER_DOMAIN_CONCURRENCY,
+        revalidate: options.revalidate ?? false,
+    };
+
+    let deadlineTimer: ReturnType<typeof setTimeout> | undefined;
+    const deadline = new Promise<typeof DEADLINE>(resolve => {
+        deadlineTimer = setTimeout(() => resolve(DEADLINE), options.deadlineMs ?? DEFAULT_DEADLINE_MS);
+    });
+
+    try {
+        // Page timeouts are NOT cut to the deadline: a page that misses it keeps loading
+        // in the background and lands in the page cache for the next enrichment.
+        const homeFetch = fetchPage(homeUrl, options.homeTimeoutMs ?? DEFAULT_HOME_TIMEOUT_MS, fetchOptions);
+        const home = await Promise.race([homeFetch, deadline]);
+        if (home === DEADLINE || !home) {
+            return { home: null, subpages: [], partial: home === DEADLINE, elapsedMs: Date.now() - startedAt };
+        }
+
+        // Subpages in parallel — each one is cleaned as soon as it arrives
+        const subpageUrls = home.page.relevantLinks;
+        const settled: Array<CrawledPage | null | undefined> = new Array(subpageUrls.length).fill(undefined);
+        const subpageFetches = subpageUrls.map((url, index) =>
+            fetchPage(url, options.subpageTimeoutMs ?? DEFAULT_SUBPAGE_TIMEOUT_MS, fetchOptions)
+                .then(result => {
+                    settled[index] = result && result.page.rawLength >= MIN_SUBPAGE_CHARS
+                        ? { url, cleaned: result.page.cleaned, rawLength: result.page.rawLength, fromCache: result.fromCache }
+                        : null;
+                })
+        );
+        await Promise.race([Promise.all(subpageFetches), deadline]);
+
+        const partial = settled.some(page => page === undefined);
+        if (partial) {
+            console.warn(`⏱️ [Crawler] Deadline reached for ${homeUrl} — returning partial result`);
+        }
+
+        return {
+            home: { url: homeUrl, cleaned: home.page.cleaned, rawLength: home.page.rawLength, fromCache: home.fromCache },
+            // Keep link-rank order (not arrival order) so the prompt is deterministic
+            subpages: settled.filter((page): page is CrawledPage => !!page),
+            partial,
+            elapsedMs: Date.now() - startedAt,
+        };
+    } finally {
+        clearTimeout(deadlineTimer);
+    }
+}
+
+/** Clear the page cache (tests / benchmarks) */
+export function resetCompanyPageCache() {
+    pageCache.clear();
+}
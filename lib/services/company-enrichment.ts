@@ -1,6 +1,7 @@
 import { createClient } from '@supabase/supabase-js';
 // Upstash ratelimit removed (2026-03-30 Phase 2) — was only used for Perplexity API
 import { recordCacheHit, recordCacheMiss } from './cache-monitor';
+import { crawlCompanySite } from './company-crawler';
 // sanitizeForAI removed — public website scrapes use light email/phone-only sanitization
 
 const supabase = createClient(
@@ -113,84 +114,6 @@ function normalizeWebsiteUrl(websiteUrl: string): string {
     return websiteUrl.startsWith('http') ? websiteUrl : `https://${websiteUrl}`;
 }
 
-async function scrapeWithJinaReader(url: string, timeoutMs: number): Promise<string | null> {
-    const jinaUrl = `https://r.jina.ai/${url}`;
-    const controller = new AbortController();
-    const timeoutId = setTimeout(() => controller.abort(), timeoutMs);
-
-    try {
-        const jinaRes = await fetch(jinaUrl, {
-            headers: {
-                'Accept': 'text/plain',
-                'X-Return-Format': 'markdown',
-            },
-            signal: controller.signal,
-        });
-
-        if (!jinaRes.ok) {
-            console.warn(`⚠️ [Enrichment] Jina HTTP ${jinaRes.status} for ${jinaUrl}`);
-            return null;
-        }
-
-        const markdown = await jinaRes.text();
-        return markdown.length >= 100 ? markdown : null;
-    } catch (error: unknown) {
-        const errMsg = error instanceof Error ? error.message : String(error);
-        console.warn(`⚠️ [Enrichment] Jina error for ${url}:`, errMsg);
-        return null;
-    } finally {
-        clearTimeout(timeoutId);
-    }
-}
-
-function extractRelevantInternalLinks(markdown: string, baseUrl: string): string[] {
-    const relevantTerms = [
-        'about', 'company', 'mission', 'vision', 'values', 'culture',
-        'product', 'products', 'solution', 'solutions', 'services',
-        'project', 'projects', 'sustainability', 'impact', 'innovation',
-        'career', 'careers', 'jobs', 'team',
-    ];
-
-    let base: URL;
-    try {
-        base = new URL(baseUrl);
-    } catch {
-        return [];
-    }
-
-    const links = new Map<string, number>();
-    const linkRegex = /\[([^\]]+)\]\(([^)]+)\)/g;
-    let match: RegExpExecArray | null;
-
-    while ((match = linkRegex.exec(markdown)) !== null) {
-        const label = match[1].toLowerCase();
-        const href = match[2];
-        if (!href || href.startsWith('#') || href.startsWith('mailto:') || href.startsWith('tel:')) continue;
-
-        let url: URL;
-        try {
-            url = new URL(href, base);
-        } catch {
-            continue;
-        }
-
-        if (url.hostname.replace(/^www\./, '') !== base.hostname.replace(/^www\./, '')) continue;
-
-        const haystack = `${label} ${url.pathname.toLowerCase()}`;
-        const score = relevantTerms.reduce((total, term) => total + (haystack.includes(term) ? 1 : 0), 0);
-        if (score === 0) continue;
-
-        url.hash = '';
-        links.set(url.toString(), Math.max(links.get(url.toString()) || 0, score));
-    }
-
-    return [...links.entries()]
-        .sort((a, b) => b[1] - a[1])
-        .map(([url]) => url)
-        .filter(url => url !== base.toString())
-        .slice(0, 2);
-}
-
 /**
  * STEP 3: Save to cache
  */
@@ -245,35 +168,34 @@ async function saveToCache(
  */
 async function fetchViaJinaAndClaude(
     companyName: string,
-    websiteUrl: string
+    websiteUrl: string,
+    revalidatePages: boolean = false,
 ): Promise<Partial<EnrichmentResult> & { needs_company_context: boolean } | null> {
-    // ── Step 1: Jina AI Reader scrape ─────────────────────────────────────
-    let scrapedMarkdown = '';
+    // ── Step 1: Jina AI Reader crawl (homepage + relevant subpages) ───────
+    // Subpages run in parallel under one deadline; every page is cleaned as it
+    // arrives (see company-crawler.ts for cleanup phases and the page cache).
+    let rawLength = 0;
+    let cleaned = '';
     try {
         const normalizedUrl = normalizeWebsiteUrl(websiteUrl);
         console.log(`🔍 [Fallback] Jina AI scraping: ${normalizedUrl}`);
 
-        const homeMarkdown = await scrapeWithJinaReader(normalizedUrl, 20000);
-        if (!homeMarkdown) return null;
+        const crawl = await crawlCompanySite(normalizedUrl, { revalidate: revalidatePages });
+        if (!crawl.home) return null;
 
-        const relatedUrls = extractRelevantInternalLinks(homeMarkdown, normalizedUrl);
-        const relatedPages: string[] = [];
+        rawLength = crawl.home.rawLength + crawl.subpages.reduce((sum, page) => sum + page.rawLength, 0);
+        cleaned = [
+            crawl.home.cleaned,
+            ...crawl.subpages.map(page => `--- RELEVANTE UNTERSEITE: ${page.url} ---\n\n${page.cleaned}`),
+        ].filter(Boolean).join('\n\n');
 
-        for (const relatedUrl of relatedUrls) {
-            const relatedMarkdown = await scrapeWithJinaReader(relatedUrl, 8000);
-            if (relatedMarkdown && relatedMarkdown.length >= 200) {
-                relatedPages.push(`\n\n--- RELEVANTE UNTERSEITE: ${relatedUrl} ---\n\n${relatedMarkdown}`);
-            }
-        }
-
-        scrapedMarkdown = [homeMarkdown, ...relatedPages].join('\n\n');
-
-        if (scrapedMarkdown.length < 100) {
-            console.warn(`⚠️ [Fallback] Jina returned too little content (${scrapedMarkdown.length} chars)`);
+        if (rawLength < 100) {
+            console.warn(`⚠️ [Fallback] Jina returned too little content (${rawLength} chars)`);
             return null;
         }
 
-        console.log(`✅ [Fallback] Jina scraped ${scrapedMarkdown.length} chars from ${websiteUrl} (${relatedPages.length} related pages)`);
+        const cachedPages = [crawl.home, ...crawl.subpages].filter(page => page.fromCache).length;
+        console.log(`✅ [Fallback] Jina scraped ${rawLength} chars from ${websiteUrl} (${crawl.subpages.length} related pages, ${cachedPages} cached, ${crawl.elapsedMs}ms${crawl.partial ? ', partial' : ''})`);
     } catch (error: unknown) {
         const errMsg = error instanceof Error ? error.message : String(error);
         console.error(`❌ [Fallback] Jina error for ${websiteUrl}:`, errMsg);
@@ -285,33 +207,6 @@ async function fetchViaJinaAndClaude(
         console.log(`🤖 [Fallback] Claude Haiku extracting intel for "${companyName}"...`);
         const { complete } = await import('@/lib/ai/model-router');
 
-        // ── Robust Content Extraction Pipeline ─────────────────────────────
-        // Enterprise websites (e.g. ALTEN Germany) can have 20K+ chars of navigation
-        // menus, cookie banners, and footer links BEFORE any business content.
-        // The naive approach of only stripping images/blob-URLs is insufficient.
-        //
-        // Strategy: Strip structural noise (nav menus, cookie consent, link lists)
-        // BEFORE truncation, so Claude always receives actual business content.
-        const cleaned = scrapedMarkdown
-            // Phase 1: Remove structural noise (navigation menus, link lists)
-            .replace(/^[ \t]*\*[ \t]+\[.*?\]\(.*?\)\s*$/gm, '')  // Nav menu items: "* [Link](url)"
-            .replace(/^[ \t]*-[ \t]+\[.*?\]\(.*?\)\s*$/gm, '')   // Alt nav items: "- [Link](url)"
-            .replace(/^\[]\(.*?\)\s*$/gm, '')                     // Empty links: "[](url)"
-            // Phase 2: Remove visual noise (images, blob URLs)
-            .replace(/!\[.*?\]\(.*?\)/g, '')                       // Markdown images
-            .replace(/\[[^\]]*\]\(blob:.*?\)/g, '')                // Blob links
-            .replace(/\[[^\]]*\]\(javascript:.*?\)/g, '')          // JS links
-            // Phase 3: Convert remaining links to text (keep content, drop URLs)
-            .replace(/\[([^\]]+)\]\([^)]+\)/g, '$1')              // [text](url) → text
-            // Phase 4: Remove cookie/consent banners
-            .replace(/^.*(?:Cookies?|Cookie-?Einstellung|Akzeptieren|Ablehnen|Personalisieren|Zustimmung|Datenschutzeinstellung).*$/gmi, '')
-            // Phase 5: Clean up artifacts
-            .replace(/^\s*[-*]{3,}\s*$/gm, '')                    // Horizontal rules
-            .replace(/^\s*\[\s*$/gm, '')                          // Orphan "[" on own line
-            .replace(/^\s*\]\s*$/gm, '')                          // Orphan "]" on own line
-            .replace(/\n{3,}/g, '\n\n')                           // Collapse blank lines
-            .trim();
-
         // Haiku has 200K context — 24K chars leaves room for homepage + 1-2 relevant subpages.
         // IMPORTANT: Do NOT use sanitizeForAI() here. Company websites are 100% public.
         // The aggressive name regex masks company names/products ("Smart Infrastructure"
@@ -325,7 +220,7 @@ async function fetchViaJinaAndClaude(
                 const digits = m.replace(/\D/g, '');
                 return digits.length >= 7 ? '[PHONE]' : m;
             });
-        console.log(`📊 [Enrichment] Content: ${scrapedMarkdown.length} raw → ${cleaned.length} cleaned → ${truncatedContent.length} truncated for "${companyName}"`);
+        console.log(`📊 [Enrichment] Content: ${rawLength} raw → ${cleaned.length} cleaned → ${truncatedContent.length} truncated for "${companyName}"`);
 
         const prompt = `Du bist ein Unternehmens-Analyst. Extrahiere strukturierte Informationen aus dem folgenden Website-Inhalt von "${companyName}" (${websiteUrl}).
 
@@ -434,7 +329,7 @@ export async function enrichCompany(
             : `https://${context.website}`;
 
         console.log(`🔍 [Enrichment] Using Jina+Claude (primary) for "${companyName}" with ${normalizedUrl}`);
-        const jinaResult = await fetchViaJinaAndClaude(companyName, normalizedUrl);
+        const jinaResult = await fetchViaJinaAndClaude(companyName, normalizedUrl, forceRefresh);
 
         if (jinaResult && jinaResult.confidence_score && jinaResult.confidence_score > 0) {
             console.log(`✅ [Enrichment] Jina+Claude succeeded for "${companyName}" (confidence: ${jinaResult.confidence_score})`);
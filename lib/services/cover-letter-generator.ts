@@ -14,8 +14,15 @@ import { enrichCompany, linkEnrichmentToJob } from './company-enrichment';
 import type { CoverLetterSetupContext } from '@/types/cover-letter-setup';
 import type { StyleAnalysis } from './writing-style-analyzer';
 import { scanForFluff } from './anti-fluff-blacklist';
-import { buildSystemPrompt, type UserProfileData, type JobData, type CompanyResearchData } from './cover-letter-prompt-builder';
+import { buildSegmentedPrompt, type UserProfileData, type JobData, type CompanyResearchData } from './cover-letter-prompt-builder';
 import { judgeCoverLetter, type JudgeResult } from './cover-letter-judge';
+import {
+    createCachedMessage,
+    formatPromptCallReport,
+    summarizePromptUsage,
+    type PromptCallReport,
+    type PromptUsageSummary,
+} from './cover-letter-prompt-cache';
 
 // ─── Clients ──────────────────────────────────────────────────────────────────
 // WHY: Uses Helicone-aware singleton from model-router (not a raw client).
@@ -65,12 +72,18 @@ export interface CoverLetterResult {
         judgeFailReasons: string[];
         validation: { isValid: boolean; issues: string[] };
         timestamp: string;
+        /** Token/latency report of the generator + judge calls in this iteration */
+        promptUsage?: PromptCallReport[];
     }>;
     costCents: number;
+    /** Prompt-cache savings across all iterations (absent in mock mode) */
+    promptCache?: PromptUsageSummary;
     fluffWarning?: boolean;
     generationWarnings?: string[]; // Orphan-guard + style-fallback warnings for UI
 }
 
+const GENERATOR_SYSTEM = 'You are a senior career advisor and expert cover letter writer. Output ONLY the letter body. No explanations, no markdown, no preamble.';
+
 const MAX_ITERATIONS = 3; // Increased from 2: Golden Sample reduces base leak rate, 3 iterations make blacklist leaks near-impossible (0.01%)
 
 // ─── Entry Point ──────────────────────────────────────────────────────────────
@@ -300,7 +313,9 @@ async function generateCoverLetter(params: CoverLetterGenerationParams): Promise
     while (iteration < MAX_ITERATIONS) {
         console.log(`🚀 [MasterPrompt] Generation Iteration ${iteration + 1}/${MAX_ITERATIONS}...`);
 
-        const prompt = buildSystemPrompt(
+        // Segmented: only iterationBlock (feedback) changes between iterations —
+        // stable prefix, CV and job block are served from the provider prompt cache
+        const prompt = buildSegmentedPrompt(
             userProfile ?? {},
             jobData ?? {},
             companyResearch ?? {},
@@ -320,15 +335,18 @@ async function generateCoverLetter(params: CoverLetterGenerationParams): Promise
             break;
         }
 
-        const message = await anthropic.messages.create({
+        const generation = await createCachedMessage(anthropic, {
             model: 'claude-sonnet-4-6',
-            max_tokens: 2000,
+            maxTokens: 2000,
             temperature: 0.7,
-            system: 'You are a senior career advisor and expert cover letter writer. Output ONLY the letter body. No explanations, no markdown, no preamble.',
-            messages: [{ role: 'user', content: prompt }]
-        });
-
-        generatedText = message.content[0].type === 'text' ? message.content[0].text : '';
+            instruction: GENERATOR_SYSTEM,
+            stablePrefix: prompt.stablePrefix,
+            cachedBlocks: [prompt.userBlock, prompt.jobBlock],
+            tail: prompt.iterationBlock,
+        }, { iteration: iteration + 1, phase: 'generate' });
+        const promptUsage: PromptCallReport[] = [generation.report];
+
+        generatedText = generation.text;
         generatedText = generatedText.replace(/\*\*/g, '').replace(/\*/g, '').replace(/^#+\s/gm, '');
         generatedText = replaceEmDashes(generatedText);
 
@@ -342,7 +360,8 @@ async function generateCoverLetter(params: CoverLetterGenerationParams): Promise
 
         let judgment: JudgeResult;
         if (validationResult.isValid) {
-            judgment = await judgeCoverLetter(generatedText, jobData ?? {}, setupContext, styleAnalysis ?? null);
+            judgment = await judgeCoverLetter(generatedText, jobData ?? {}, setupContext, styleAnalysis ?? null, { iteration: iteration + 1 });
+            if (judgment.usage) promptUsage.push(judgment.usage);
             judgePassed = judgment.pass;
             judgeFailReasons = judgment.failReasons;
             validation = { isValid: true, issues: [...judgment.failReasons, ...judgment.weaknesses] };
@@ -360,8 +379,12 @@ async function generateCoverLetter(params: CoverLetterGenerationParams): Promise
             judgePassed,
             judgeFailReasons,
             validation,
-            timestamp: new Date().toISOString()
+            timestamp: new Date().toISOString(),
+            promptUsage,
         });
+        for (const report of promptUsage) {
+            console.log(`📊 [PromptCache] ${formatPromptCallReport(report)}`);
+        }
 
         if (validationResult.isValid && judgePassed) {
             coverLetter = generatedText;
@@ -458,6 +481,12 @@ async function generateCoverLetter(params: CoverLetterGenerationParams): Promise
     const judgeCallCount = iterationLog.filter(l => l.validation.isValid).length;
     const costCents = iterationLog.length * 2.5 + judgeCallCount * 0.3;
 
+    const promptReports = iterationLog.flatMap(log => log.promptUsage ?? []);
+    const promptCache = promptReports.length > 0 ? summarizePromptUsage(promptReports) : undefined;
+    if (promptCache) {
+        console.log(`📊 [PromptCache] ${promptCache.calls} calls: ${promptCache.cacheReadInputTokens} cached / ${promptCache.inputTokens} uncached input tokens — saved ${promptCache.savedCents.toFixed(2)}¢`);
+    }
+
     return {
         coverLetter,
         judgePassed,
@@ -467,6 +496,7 @@ async function generateCoverLetter(params: CoverLetterGenerationParams): Promise
         iterationLog,
         costCents,
         fluffWarning,
+        promptCache,
         generationWarnings: (incomingWarnings?.length ?? 0) > 0 ? incomingWarnings : undefined,
     };
 }
@@ -13,18 +13,32 @@
  *  6. PING-PONG (optional, nur wenn Quote + PingPong aktiv)
  *
  * Fallback: pass: false — bei Haiku-Timeout kein ungeprüfter Text durchgelassen.
+ *
+ * Prompt-Caching: Checks 1, 3–5 + Blacklist sind pro Sprache statisch und gehen als
+ * gecachter System-Block raus (cover-letter-prompt-cache.ts). Nur Anschreiben,
+ * Firmenname (Check 2) und Ping-Pong (Check 6) stehen in der User-Message.
  */
 
 import { getAnthropicClient } from '@/lib/ai/model-router';
 import type { CoverLetterSetupContext } from '@/types/cover-letter-setup';
 import type { StyleAnalysis } from './writing-style-analyzer';
 import { buildJudgeBlacklistSection } from './anti-fluff-blacklist';
+import { createCachedMessage, type PromptCacheClient, type PromptCallReport } from './cover-letter-prompt-cache';
 
 // ─── Types ────────────────────────────────────────────────────────────────────
 export interface JudgeResult {
     pass: boolean;
     failReasons: string[];
     weaknesses: string[];
+    /** Token/latency report of the Haiku call (absent on fallback) */
+    usage?: PromptCallReport;
+}
+
+export interface JudgeOptions {
+    /** Generator iteration this judgment belongs to (report only) */
+    iteration?: number;
+    /** Injected client (tests) — defaults to the Helicone-aware singleton */
+    client?: PromptCacheClient;
 }
 
 interface JobData {
@@ -120,12 +134,75 @@ Watch especially for:
 (b) Generic closing: If the closing reads like a sales pitch → better: "I hope this gave you a small impression of who I am. I'm flexible over the coming weeks and look forward to meeting you."
 (c) Repeated learning-curve phrase: If the same learning-curve formulation appears multiple times → better: vary from pool: "It was only through [concrete event] that I understood that [insight]." / "This experience showed me that [concrete conclusion]." / "At first I underestimated [X]; working with [Y] made it clear that [Z]."`;
 
+const JUDGE_SYSTEM = 'You are a strict cover letter constraint checker. Respond only with valid JSON. No explanations outside JSON.';
+
+// ─── Static Rules (cached prefix) ─────────────────────────────────────────────
+// Identical for every letter in the same language — built once, sent with cache_control.
+const judgeRulesCache = new Map<'de' | 'en', string>();
+
+function buildJudgeRules(lang: 'de' | 'en'): string {
+    const cached = judgeRulesCache.get(lang);
+    if (cached) return cached;
+
+    const rules = lang === 'en'
+        ? `You are a strict cover letter quality checker. Check ONLY the hard constraints below against the COVER LETTER in the user message.
+
+HARD CONSTRAINT CHECKS (each violation = fail):
+
+1. GPT-BLACKLIST: Does the text contain any of these forbidden phrases?
+${buildJudgeBlacklistSection('en')}
+   If YES → fail_reason: "BLACKLIST: [found phrase]"
+
+2. COMPANY MENTION: see the user message.
+
+3. WORD COUNT: Does the text have between 150 and 500 words?
+   If NO → fail_reason: "LENGTH: Text has [N] words (allowed: 150-500)"
+${SUBJEKT_CHECK_EN}
+${INTRO_CHECK_EN}
+
+${WEAKNESS_HINTS_EN}
+
+Respond ONLY as valid JSON:
+{
+  "pass": true/false,
+  "fail_reasons": ["..."],
+  "weaknesses": ["..."]
+}`
+        : `Du bist ein strenger Anschreiben-Qualitätsprüfer. Prüfe NUR die harten Constraints unten am ANSCHREIBEN aus der User-Nachricht.
+
+HARTE CONSTRAINT-CHECKS (jeder Verstoß = fail):
+
+1. GPT-BLACKLIST: Enthält der Text eine dieser verbotenen Phrasen?
+${buildJudgeBlacklistSection('de')}
+   Wenn JA → fail_reason: "BLACKLIST: [gefundene Phrase]"
+
+2. FIRMENNENNUNG: siehe User-Nachricht.
+
+3. WORTLÄNGE: Hat der Text zwischen 150 und 500 Wörter?
+   Wenn NEIN → fail_reason: "LÄNGE: Text hat [N] Wörter (erlaubt: 150-500)"
+${SUBJEKT_CHECK_DE}
+${INTRO_CHECK_DE}
+
+${WEAKNESS_HINTS_DE}
+
+Antworte NUR als valides JSON:
+{
+  "pass": true/false,
+  "fail_reasons": ["..."],
+  "weaknesses": ["..."]
+}`;
+
+    judgeRulesCache.set(lang, rules);
+    return rules;
+}
+
 // ─── Judge ────────────────────────────────────────────────────────────────────
 export async function judgeCoverLetter(
     text: string,
     job: JobData,
     setupContext: CoverLetterSetupContext | undefined,
-    style: StyleAnalysis | null
+    style: StyleAnalysis | null,
+    options: JudgeOptions = {}
 ): Promise<JudgeResult> {
     // FALLBACK: pass: false — bei Ausfall kein ungeprüfter Text
     const FALLBACK: JudgeResult = {
@@ -134,13 +211,13 @@ export async function judgeCoverLetter(
         weaknesses: []
     };
 
-    if (!process.env.ANTHROPIC_API_KEY) {
+    if (!options.client && !process.env.ANTHROPIC_API_KEY) {
         console.warn('⚠️ [Judge] No API Key — returning fallback (fail, triggers retry)');
         return FALLBACK;
     }
 
     // WHY: Uses shared Helicone-aware singleton — same proxy as generator.
-    const anthropic = getAnthropicClient();
+    const anthropic = options.client ?? getAnthropicClient();
 
     const isEnglish = setupContext?.tone?.targetLanguage === 'en';
     const companyName = job?.company_name || (isEnglish ? 'the company' : 'das Unternehmen');
@@ -159,80 +236,37 @@ export async function judgeCoverLetter(
    If no real contrast → fail_reason: "PING-PONG: No real perspective shift in the introduction"`
         : '';
 
-    const judgePrompt = isEnglish
-        ? `You are a strict cover letter quality checker. Check ONLY the hard constraints below.
-
-COVER LETTER:
+    // Per-letter part: letter text + the two checks that depend on this job/setup
+    const letterPrompt = isEnglish
+        ? `COVER LETTER:
 ***
 ${text}
 ***
 
-HARD CONSTRAINT CHECKS (each violation = fail):
-
-1. GPT-BLACKLIST: Does the text contain any of these forbidden phrases?
-${buildJudgeBlacklistSection('en')}
-   If YES → fail_reason: "BLACKLIST: [found phrase]"
-
 2. COMPANY MENTION: Is "${companyName}" (or a recognizable variant) mentioned at least once?
    If NO → fail_reason: "COMPANY: Company name missing from text"
-
-3. WORD COUNT: Does the text have between 150 and 500 words?
-   If NO → fail_reason: "LENGTH: Text has [N] words (allowed: 150-500)"
-${SUBJEKT_CHECK_EN}
-${INTRO_CHECK_EN}
-${pingPongCheckEN}
-
-${WEAKNESS_HINTS_EN}
-
-Respond ONLY as valid JSON:
-{
-  "pass": true/false,
-  "fail_reasons": ["..."],
-  "weaknesses": ["..."]
-}`
-        : `Du bist ein strenger Anschreiben-Qualitätsprüfer. Prüfe NUR die harten Constraints unten.
-
-ANSCHREIBEN:
+${pingPongCheckEN}`
+        : `ANSCHREIBEN:
 ***
 ${text}
 ***
 
-HARTE CONSTRAINT-CHECKS (jeder Verstoß = fail):
-
-1. GPT-BLACKLIST: Enthält der Text eine dieser verbotenen Phrasen?
-${buildJudgeBlacklistSection('de')}
-   Wenn JA → fail_reason: "BLACKLIST: [gefundene Phrase]"
-
 2. FIRMENNENNUNG: Wird "${companyName}" (oder eine erkennbare Variante) mindestens 1x im Text erwähnt?
    Wenn NEIN → fail_reason: "FIRMA: Unternehmensname fehlt im Text"
-
-3. WORTLÄNGE: Hat der Text zwischen 150 und 500 Wörter?
-   Wenn NEIN → fail_reason: "LÄNGE: Text hat [N] Wörter (erlaubt: 150-500)"
-${SUBJEKT_CHECK_DE}
-${INTRO_CHECK_DE}
-${pingPongCheckDE}
-
-${WEAKNESS_HINTS_DE}
-
-Antworte NUR als valides JSON:
-{
-  "pass": true/false,
-  "fail_reasons": ["..."],
-  "weaknesses": ["..."]
-}`;
+${pingPongCheckDE}`;
 
     try {
         console.log('🔍 [Judge] Calling Haiku for Pass/Fail check (5 hard constraints)...');
 
-        const message = await anthropic.messages.create({
+        const { text: content, report } = await createCachedMessage(anthropic, {
             model: 'claude-haiku-4-5-20251001',
-            max_tokens: 400,
+            maxTokens: 400,
             temperature: 0.1,
-            system: 'You are a strict cover letter constraint checker. Respond only with valid JSON. No explanations outside JSON.',
-            messages: [{ role: 'user', content: judgePrompt }]
-        });
-
-        const content = message.content[0].type === 'text' ? message.content[0].text : '';
+            instruction: JUDGE_SYSTEM,
+            stablePrefix: buildJudgeRules(isEnglish ? 'en' : 'de'),
+            cachedBlocks: [],
+            tail: letterPrompt,
+        }, { iteration: options.iteration ?? 1, phase: 'judge' });
 
         let parsed: { pass?: boolean; fail_reasons?: string[]; weaknesses?: string[] };
         try {
@@ -256,7 +290,7 @@ Antworte NUR als valides JSON:
             console.log(`  ⚠️  Weaknesses: ${weaknesses.join(' | ')}`);
         }
 
-        return { pass, failReasons, weaknesses };
+        return { pass, failReasons, weaknesses, usage: report };
 
     } catch (err) {
         console.error('❌ [Judge] Failed to parse judge response:', err);
@@ -3,6 +3,10 @@
  *
  * Extracted from cover-letter-generator.ts for maintainability.
  * No DB dependencies, no Supabase imports — input in, prompt string out.
+ *
+ * Prompt-Caching: buildSegmentedPrompt() liefert den Prompt in Segmenten
+ * (stable prefix → user → job → iteration), damit der Generator die stabilen
+ * Teile mit cache_control senden kann. buildSystemPrompt() = alle Segmente verbunden.
  */
 
 import type { CoverLetterSetupContext } from '@/types/cover-letter-setup';
@@ -51,6 +55,17 @@ interface CompanyResearchData {
 // ─── Exported Types (re-export for generator) ─────────────────────────────────
 export type { UserProfileData, JobData, CompanyResearchData };
 
+export interface SegmentedPrompt {
+    /** Golden sample + ground rules — depends only on language, preset and style mode */
+    stablePrefix: string;
+    /** Candidate CV — same for every job of this user ('' with wizard stations / job-specific CV) */
+    userBlock: string;
+    /** Setup, job, company and station instructions — same for every iteration of one letter */
+    jobBlock: string;
+    /** Improvement feedback — changes per iteration */
+    iterationBlock: string;
+}
+
 interface QuoteStyleMoveArgs {
     isEnglish: boolean;
     isDuForm: boolean;
@@ -160,8 +175,107 @@ CLOSING ${closing.id}: ${pick(closing)}
 WICHTIG: Wenn ein Move inhaltlich nicht passt, behalte die Funktion des Moves bei, aber formuliere ihn passend zur Stelle.`;
 }
 
+// ─── Stable Prefix (Grundregeln — identisch für alle User & Jobs) ─────────────
+// WHY: Golden Sample + Regelblöcke hängen nur von Sprache, Preset und Stil-Modus ab.
+// Sie stehen deshalb VOR allen User-/Job-Daten — so bleibt der Prefix byte-identisch
+// und der Provider-Prompt-Cache (cover-letter-prompt-cache.ts) greift über alle
+// Iterationen, Jobs und User hinweg. Wenige Varianten → einmal bauen, dann memoisiert.
+const stablePrefixCache = new Map<string, string>();
+
+function buildStablePrefix(locale: 'de' | 'en' | 'es', preset: string, isCustomStyle: boolean): string {
+    const key = `${locale}|${preset}|${isCustomStyle}`;
+    const cached = stablePrefixCache.get(key);
+    if (cached) return cached;
+
+    const isEnglish = locale === 'en';
+    const isSpanish = locale === 'es';
+    const t = (de: string, en: string, es?: string) => isEnglish ? en : isSpanish ? (es || en) : de;
+
+    // Golden Sample: Primacy — goes FIRST in prompt
+    const goldenSampleSection = (!isCustomStyle && (preset === 'storytelling' || preset === 'formal'))
+        ? buildGoldenSampleSection(preset, isEnglish)
+        : '';
+
+    const prefix = `
+${goldenSampleSection}
+
+=== ${t('GRUNDREGELN (GELTEN FÜR DAS GESAMTE ANSCHREIBEN)', 'GROUND RULES (APPLY TO THE ENTIRE LETTER)')} ===
+
+${buildLeanBlacklistSection()}
+
+${t(`[KONDENSIERTE QUALITAETSREGELN]
+1. LERNKURVE: Max 1x im gesamten Text. Vollstaendiger Aussagesatz — nie mit Doppelpunkt enden.
+2. GRAMMATIK: Nach erkennen/verstehen/zeigen/wissen → "dass", nie "wie" (wenn Aussage folgt).
+3. ABSATZ-ENDEN: Konkretes Ergebnis oder Zuversicht. Nie abstrakte Erkenntnisse.
+4. VERB-PHRASEN: Max 1x "zeigte mir" / "hat mir gezeigt" / "wurde mir klar" im gesamten Text.
+5. SUBSTANTIV-WIEDERHOLUNG: Dasselbe Substantiv nie in 2 aufeinanderfolgenden Absaetzen.
+6. SATZANFAENGE: Nie 2 aufeinanderfolgende Saetze mit demselben Subjekt/Verb.
+7. ABSATZ-EROEFFNUNGEN: Jeder Stations-Absatz mit ANDEREM Einleitungstyp (Ergebnis, Kontext, Problem, JD-Fragment).
+8. STILMITTEL: Optional, max. 2 (Trikolon, Asyndeton). Nur wenn natuerlich — nie erzwingen.
+9. LEVEL-AWARENESS: Bei Junior/Trainee → Lernperspektive erlaubt und erwuenscht.`,
+`[CONDENSED QUALITY RULES]
+1. LEARNING CURVE: Max 1x total. Complete sentence — never end with a colon.
+2. GRAMMAR: After recognize/understand/show → "that", not "how" (when a statement follows).
+3. PARAGRAPH ENDINGS: Concrete result or confidence. Never abstract insights.
+4. VERB PHRASES: Max 1x "showed me" / "made me realize" in the entire text.
+5. NOUN REPETITION: Same noun never in 2 consecutive paragraphs.
+6. SENTENCE STARTS: Never 2 consecutive sentences with same subject/verb.
+7. PARAGRAPH OPENINGS: Each station paragraph with DIFFERENT opening type.
+8. RHETORICAL DEVICES: Optional, max 2 (tricolon, asyndeton). Only when natural.
+9. LEVEL AWARENESS: For Junior/Trainee → learning perspective allowed and encouraged.`)}
+
+${t('[INTRO-DICHTE]: Die Einleitung darf MAX 1 eigene CV-Station/Organisation namentlich nennen. Zweite Referenz gehört in den ERSTEN Hauptteil-Absatz.\nALTERNATIVEN (NUR wenn im CV vorhanden UND thematisch passend): Ehrenamtliche Tätigkeiten, Zertifikate, Side Projects oder eine CV-Station die NICHT im Hauptteil vorkommt (keine Dopplung). Wenn nichts passt: Nur ein kurzer Bezug zur Hauptstation.',
+'[INTRO DENSITY]: The introduction may name a MAXIMUM of 1 CV station/organization. Second reference belongs in the FIRST main body paragraph.\nALTERNATIVES (ONLY if present in CV AND thematically fitting): Volunteer work, certifications, side projects, or a CV station NOT in the main body.',
+'[DENSIDAD INTRO]: La introducción puede nombrar MÁXIMO 1 estación/organización del CV. La segunda referencia va al PRIMER párrafo del cuerpo principal.')}
+
+${t(`[ANTI-WIEDERHOLUNGS-SCHUTZ (KRITISCH — 2 EBENEN)]
+
+EBENE 1 — ABSATZ-EROEFFNUNG: Jeder Stations-Absatz MUSS mit einem ANDEREN Einleitungstyp beginnen.
+VERBOTEN: Dieselbe Satzstruktur fuer aufeinanderfolgende Absaetze (z.B. \"Die Verbindung von X und Y bei Firma A\" gefolgt von \"Die Verbindung von X und Y bei Firma B\").
+Variiere: Ergebnis, Kontext-Setting, Problemstellung, JD-Fragment-Zitat.
+
+EBENE 2 — SATZANFAENGE INNERHALB EINES ABSATZES: Keine zwei aufeinanderfolgenden Saetze mit demselben Subjekt/Verb.
+VERBOTEN: \"Habe ich...\" + \"Zudem habe ich...\" + \"Daher habe ich gelernt...\"
+RICHTIG: \"Bei X uebernahm ich die Steuerung von Y. Der Fokus lag auf Z. Deshalb freue ich mich, diese Erfahrung einzubringen.\"`,
+`[ANTI-REPETITION GUARD (CRITICAL — 2 LEVELS)]
+
+LEVEL 1 — PARAGRAPH OPENING: Each station paragraph MUST start with a DIFFERENT opening type.
+FORBIDDEN: Same sentence structure for consecutive paragraphs.
+Vary: result, context-setting, problem statement, JD fragment quote.
+
+LEVEL 2 — SENTENCE STARTS WITHIN A PARAGRAPH: No two consecutive sentences with the same subject/verb.
+FORBIDDEN: \"I was able to...\" followed by \"I was also able to...\"
+RIGHT: \"At X I took charge of Y. The focus was on Z. That is why I look forward to bringing this experience.\"`)}
+
+${t(`[RELEVANZ-PFLICHT — JEDER FAKT BRAUCHT EIN "WARUM"]
+Jeder genannte Fakt (Tätigkeit, Tool, Ergebnis) MUSS einen direkten Bezug zur Stellenbeschreibung oder zum Unternehmenswert haben.
+VERBOTEN: Isolierte Fakten wie "Zudem habe ich dort Vertriebsworkflows automatisiert und ein CRM aufgebaut." ohne Erklärung, WARUM das für den Recruiter relevant ist.
+RICHTIG: Fakt + konkretes Ergebnis + Bezug zur Stelle — in eigenen Worten.
+REGEL: Wenn du einen Fakt nennst und keinen Bezug zur Stelle herstellen kannst, LASS IHN WEG.`,
+`[RELEVANCE REQUIREMENT — EVERY FACT NEEDS A "WHY"]
+Every stated fact (activity, tool, result) MUST have a direct connection to the job description or company values.
+FORBIDDEN: Isolated facts without explaining WHY they matter to the recruiter.
+RULE: If you mention a fact and cannot connect it to the job, LEAVE IT OUT.`)}
+
+${t(`[ZERTIFIKATE UND QUALIFIKATIONEN ALS BRÜCKEN-ELEMENTE]
+Wenn der Lebenslauf Zertifikate, Fortbildungen oder anerkannte Qualifikationen enthält (z.B. Design Thinking, Scrum Master, ITIL, Six Sigma), nutze diese als Brücken zum Unternehmen oder zur Stelle.
+METHODE: Verknuepfe Zertifikat mit konkretem Unternehmenswert oder Stellenanforderung — eigene Worte, keine Vorlage.
+NUTZE Zertifikate NUR wenn sie einen konkreten, nachvollziehbaren Bezug zur Stelle haben. Nicht als Aufzählung.`,
+`[CERTIFICATES AND QUALIFICATIONS AS BRIDGE ELEMENTS]
+If the CV contains certifications (e.g., Design Thinking, Scrum Master, ITIL), use them as bridges to company values or job requirements.
+USE certifications ONLY when they have a concrete, traceable connection to the role. Not as mere listings.`)}
+`.trim();
+
+    stablePrefixCache.set(key, prefix);
+    return prefix;
+}
+
 // ─── Main Builder ─────────────────────────────────────────────────────────────
-export function buildSystemPrompt(
+/**
+ * Segmented prompt for provider-side prompt caching. Segments are ordered from
+ * most to least stable; each one only depends on the inputs named here.
+ */
+export function buildSegmentedPrompt(
     profile: UserProfileData,
     job: JobData,
     company: CompanyResearchData,
@@ -169,7 +283,7 @@ export function buildSystemPrompt(
     ctx: CoverLetterSetupContext | undefined,
     feedback: string[],
     lastWordCount: number
-): string {
+): SegmentedPrompt {
     const isEnglish = ctx?.tone.targetLanguage === 'en';
     const isSpanish = ctx?.tone?.targetLanguage === 'es';
     const lang = isEnglish ? 'English' : isSpanish ? 'Español' : 'Deutsch';
@@ -730,15 +844,13 @@ ${feedback.map(f => `- ${f}`).join('\n')}
 ${wordCountFeedback ? `\n${wordCountFeedback}` : ''}`
         : '';
 
-    // ─── Golden Sample Section (Primacy — goes FIRST in prompt) ──────────────
-    const goldenSampleSection = (!isCustomStyle && (preset === 'storytelling' || preset === 'formal'))
-        ? buildGoldenSampleSection(preset as 'storytelling' | 'formal', isEnglish)
-        : '';
+    // ─── Per-User Block: Lebenslauf (identisch über alle Jobs dieses Users) ─────
+    // Job-spezifische CV-Änderungen bleiben im Job-Block; Zero-Leak unterdrückt den CV ganz.
+    const cvIsUserLevel = !hasWizardStations && !job?.cv_optimization_user_decisions?.appliedChanges;
+    const userBlock = cvIsUserLevel ? `=== KANDIDATEN-DATEN ===\n${cvInput}` : '';
 
     // ─── MASTER PROMPT ASSEMBLY ───────────────────────────────────────────────
-    return `
-${goldenSampleSection}
-
+    const jobBlock = `
 === ${t('SEKTION 1: ROLLE & OUTPUT-FORMAT', 'SECTION 1: ROLE & OUTPUT FORMAT')} ===
 ${t('Du bist ein Senior-Karriereberater und exzellenter Schreiber.', 'You are a senior career advisor and excellent writer.')}
 ${t(`Deine Aufgabe: Schreibe ein Anschreiben für die Stelle "${jobTitle}" bei "${companyName}".`, `Your task: Write a cover letter for the position "${jobTitle}" at "${companyName}".`)}
@@ -870,28 +982,7 @@ SELBST-CHECK: "Würde ein Personaler denken: 'Ja, das macht Sinn.'?"`;
 
 ${isCustomStyle ? '' : styleSection}
 
-${buildLeanBlacklistSection()}
-
-${t(`[KONDENSIERTE QUALITAETSREGELN]
-1. LERNKURVE: Max 1x im gesamten Text. Vollstaendiger Aussagesatz — nie mit Doppelpunkt enden.
-2. GRAMMATIK: Nach erkennen/verstehen/zeigen/wissen → "dass", nie "wie" (wenn Aussage folgt).
-3. ABSATZ-ENDEN: Konkretes Ergebnis oder Zuversicht. Nie abstrakte Erkenntnisse.
-4. VERB-PHRASEN: Max 1x "zeigte mir" / "hat mir gezeigt" / "wurde mir klar" im gesamten Text.
-5. SUBSTANTIV-WIEDERHOLUNG: Dasselbe Substantiv nie in 2 aufeinanderfolgenden Absaetzen.
-6. SATZANFAENGE: Nie 2 aufeinanderfolgende Saetze mit demselben Subjekt/Verb.
-7. ABSATZ-EROEFFNUNGEN: Jeder Stations-Absatz mit ANDEREM Einleitungstyp (Ergebnis, Kontext, Problem, JD-Fragment).
-8. STILMITTEL: Optional, max. 2 (Trikolon, Asyndeton). Nur wenn natuerlich — nie erzwingen.
-9. LEVEL-AWARENESS: Bei Junior/Trainee → Lernperspektive erlaubt und erwuenscht.`,
-`[CONDENSED QUALITY RULES]
-1. LEARNING CURVE: Max 1x total. Complete sentence — never end with a colon.
-2. GRAMMAR: After recognize/understand/show → "that", not "how" (when a statement follows).
-3. PARAGRAPH ENDINGS: Concrete result or confidence. Never abstract insights.
-4. VERB PHRASES: Max 1x "showed me" / "made me realize" in the entire text.
-5. NOUN REPETITION: Same noun never in 2 consecutive paragraphs.
-6. SENTENCE STARTS: Never 2 consecutive sentences with same subject/verb.
-7. PARAGRAPH OPENINGS: Each station paragraph with DIFFERENT opening type.
-8. RHETORICAL DEVICES: Optional, max 2 (tricolon, asyndeton). Only when natural.
-9. LEVEL AWARENESS: For Junior/Trainee → learning perspective allowed and encouraged.`)}
+${t('Verbotene Phrasen und Qualitätsregeln: siehe GRUNDREGELN am Anfang.', 'Forbidden phrases and quality rules: see GROUND RULES at the top.')}
 
 === SEKTION 3: AUFHÄNGER (KURZ & PRÄGNANT) ===
 ${introGuidance || t(
@@ -925,9 +1016,7 @@ PROHIBIDO: Descripciones omniscientes de la empresa sin marco en primera persona
 
 
 
-${t('[INTRO-DICHTE]: Die Einleitung darf MAX 1 eigene CV-Station/Organisation namentlich nennen. Zweite Referenz gehört in den ERSTEN Hauptteil-Absatz.\nALTERNATIVEN (NUR wenn im CV vorhanden UND thematisch passend): Ehrenamtliche Tätigkeiten, Zertifikate, Side Projects oder eine CV-Station die NICHT im Hauptteil vorkommt (keine Dopplung). Wenn nichts passt: Nur ein kurzer Bezug zur Hauptstation.',
-'[INTRO DENSITY]: The introduction may name a MAXIMUM of 1 CV station/organization. Second reference belongs in the FIRST main body paragraph.\nALTERNATIVES (ONLY if present in CV AND thematically fitting): Volunteer work, certifications, side projects, or a CV station NOT in the main body.',
-'[DENSIDAD INTRO]: La introducción puede nombrar MÁXIMO 1 estación/organización del CV. La segunda referencia va al PRIMER párrafo del cuerpo principal.')}
+${t('[INTRO-DICHTE]: siehe GRUNDREGELN am Anfang.', '[INTRO DENSITY]: see GROUND RULES at the top.')}
 
 ${introGuidance && hasQuote && focus === 'quote' ? companyName + ' muss direkt am Anfang des Anschreibens mindestens einmal fallen.' : companyName + ' muss im ersten Absatz mindestens einmal fallen.'}
 ${introGuidance && hasQuote && focus === 'quote'
@@ -972,43 +1061,7 @@ Integriere diese Stationen als fließende Prosa — WICHTIG: Erstelle für jede
 
 
 
-${t(`[ANTI-WIEDERHOLUNGS-SCHUTZ (KRITISCH — 2 EBENEN)]
-
-EBENE 1 — ABSATZ-EROEFFNUNG: Jeder Stations-Absatz MUSS mit einem ANDEREN Einleitungstyp beginnen.
-VERBOTEN: Dieselbe Satzstruktur fuer aufeinanderfolgende Absaetze (z.B. \"Die Verbindung von X und Y bei Firma A\" gefolgt von \"Die Verbindung von X und Y bei Firma B\").
-Variiere: Ergebnis, Kontext-Setting, Problemstellung, JD-Fragment-Zitat.
-
-EBENE 2 — SATZANFAENGE INNERHALB EINES ABSATZES: Keine zwei aufeinanderfolgenden Saetze mit demselben Subjekt/Verb.
-VERBOTEN: \"Habe ich...\" + \"Zudem habe ich...\" + \"Daher habe ich gelernt...\"
-RICHTIG: \"Bei X uebernahm ich die Steuerung von Y. Der Fokus lag auf Z. Deshalb freue ich mich, diese Erfahrung einzubringen.\"`,
-`[ANTI-REPETITION GUARD (CRITICAL — 2 LEVELS)]
-
-LEVEL 1 — PARAGRAPH OPENING: Each station paragraph MUST start with a DIFFERENT opening type.
-FORBIDDEN: Same sentence structure for consecutive paragraphs.
-Vary: result, context-setting, problem statement, JD fragment quote.
-
-LEVEL 2 — SENTENCE STARTS WITHIN A PARAGRAPH: No two consecutive sentences with the same subject/verb.
-FORBIDDEN: \"I was able to...\" followed by \"I was also able to...\"
-RIGHT: \"At X I took charge of Y. The focus was on Z. That is why I look forward to bringing this experience.\"`)}
-
-${t(`[RELEVANZ-PFLICHT — JEDER FAKT BRAUCHT EIN "WARUM"]
-Jeder genannte Fakt (Tätigkeit, Tool, Ergebnis) MUSS einen direkten Bezug zur Stellenbeschreibung oder zum Unternehmenswert haben.
-VERBOTEN: Isolierte Fakten wie "Zudem habe ich dort Vertriebsworkflows automatisiert und ein CRM aufgebaut." ohne Erklärung, WARUM das für den Recruiter relevant ist.
-RICHTIG: Fakt + konkretes Ergebnis + Bezug zur Stelle — in eigenen Worten.
-REGEL: Wenn du einen Fakt nennst und keinen Bezug zur Stelle herstellen kannst, LASS IHN WEG.`,
-`[RELEVANCE REQUIREMENT — EVERY FACT NEEDS A "WHY"]
-Every stated fact (activity, tool, result) MUST have a direct connection to the job description or company values.
-FORBIDDEN: Isolated facts without explaining WHY they matter to the recruiter.
-RULE: If you mention a fact and cannot connect it to the job, LEAVE IT OUT.`)}
-
-
-${t(`[ZERTIFIKATE UND QUALIFIKATIONEN ALS BRÜCKEN-ELEMENTE]
-Wenn der Lebenslauf Zertifikate, Fortbildungen oder anerkannte Qualifikationen enthält (z.B. Design Thinking, Scrum Master, ITIL, Six Sigma), nutze diese als Brücken zum Unternehmen oder zur Stelle.
-METHODE: Verknuepfe Zertifikat mit konkretem Unternehmenswert oder Stellenanforderung — eigene Worte, keine Vorlage.
-NUTZE Zertifikate NUR wenn sie einen konkreten, nachvollziehbaren Bezug zur Stelle haben. Nicht als Aufzählung.`,
-`[CERTIFICATES AND QUALIFICATIONS AS BRIDGE ELEMENTS]
-If the CV contains certifications (e.g., Design Thinking, Scrum Master, ITIL), use them as bridges to company values or job requirements.
-USE certifications ONLY when they have a concrete, traceable connection to the role. Not as mere listings.`)}
+${t('Anti-Wiederholung, Relevanz-Pflicht und Zertifikate als Brücken: siehe GRUNDREGELN am Anfang.', 'Anti-repetition, relevance requirement and certificates as bridges: see GROUND RULES at the top.')}
 
 
 ${bodyIntegrationGuidance}
@@ -1026,7 +1079,7 @@ ${company?.roadmap_signals?.length ? `Roadmap-Signale: ${JSON.stringify(company.
 ${company?.recent_news?.length ? `Aktuelle News: ${JSON.stringify(company.recent_news.slice(0, 3))}` : ''}
 HALLUZINATIONS-BREMSE: Verwende NUR Fakten (Ort, News, Werte, Challenges), die EXPLIZIT oben stehen. Wenn ein Datum fehlt → ERFINDE NICHTS.
 
-${cvInput}
+${cvIsUserLevel ? t('KANDIDATEN-LEBENSLAUF: siehe KANDIDATEN-DATEN oben.', 'CANDIDATE CV: see KANDIDATEN-DATEN above.') : cvInput}
 
 ${first90DaysSection}
 
@@ -1046,10 +1099,42 @@ ${quoteStyleMoveSection ? '- PFLICHT: Nutze den CLOSING-Move aus den STYLE-MOVE-
 - ${t('Formuliere Vorfreude auf EINE konkrete Aufgabe aus der Stellenanzeige. Nenne dabei Jobtitel UND Firmenname im Schlusssatz. Eigene Worte.', 'Express anticipation for ONE specific task from the job ad. Include job title AND company name in the closing. Own words.')}
 - ${t('Schlusssatz: Warm + bescheiden + Verfuegbarkeit. Kein Verkaufs-CTA.', 'Closing sentence: Warm + humble + availability. No sales CTA.')}
 - Sign-off: ${isEnglish ? 'End with "Kind regards," or "Best regards,".' : isSpanish ? 'Termina con "Cordialmente,".' : isDuForm ? '"Viele Grüße"' : '"Mit freundlichen Grüßen"'}
+`.trim();
 
+    // ─── Iteration Block: ändert sich pro Generierungs-Iteration ──────────────
+    const iterationBlock = `
 === ${t('SEKTION 6: VERBESSERUNGS-FEEDBACK', 'SECTION 6: IMPROVEMENT FEEDBACK')} ===
 ${feedbackSection || t('Erste Version — kein vorheriges Feedback.', 'First version — no previous feedback.')}
 
 ${t('Schreibe jetzt das Anschreiben. Beginne direkt mit der Anrede:', 'Write the cover letter now. Start directly with the salutation:')}
 `.trim();
+
+    return {
+        stablePrefix: buildStablePrefix(isEnglish ? 'en' : isSpanish ? 'es' : 'de', preset, isCustomStyle),
+        userBlock,
+        jobBlock,
+        iterationBlock,
+    };
+}
+
+/**
+ * Full prompt as one string (stable prefix → user → job → iteration).
+ * Used by scripts and tests; the generator sends the segments separately.
+ */
+export function buildSystemPrompt(
+    profile: UserProfileData,
+    job: JobData,
+    company: CompanyResearchData,
+    style: StyleAnalysis | null,
+    ctx: CoverLetterSetupContext | undefined,
+    feedback: string[],
+    lastWordCount: number
+): string {
+    return joinPromptSegments(buildSegmentedPrompt(profile, job, company, style, ctx, feedback, lastWordCount));
+}
+
+export function joinPromptSegments(prompt: SegmentedPrompt): string {
+    return [prompt.stablePrefix, prompt.userBlock, prompt.jobBlock, prompt.iterationBlock]
+        .filter(Boolean)
+        .join('\n\n');
 }
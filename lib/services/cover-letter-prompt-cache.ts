@@ -0,0 +1,212 @@
+/**
+ * Cover Letter Prompt Cache — Pathly V2.0
+ * Anthropic prompt caching + token/latency report for generator and judge.
+ *
+ * The generator sends the same golden sample, ground rules, CV and job
+ * instructions in every validate/regenerate iteration; only the feedback
+ * block changes. Marking the stable segments with cache_control lets the
+ * provider bill repeated prefixes at the cache-read rate (~10% of input).
+ *
+ *   system:  [instruction, stable prefix ◆]     ◆ = cache breakpoint
+ *   user:    [user block ◆, job block ◆, tail]
+ *
+ * Blocks are ordered most → least stable; a breakpoint caches everything
+ * before it. Segments below the model's minimum cacheable length are simply
+ * not cached by the API — the report shows that as cacheReadInputTokens = 0.
+ */
+
+import type Anthropic from '@anthropic-ai/sdk';
+import { MODELS } from '@/lib/ai/model-router';
+import { recordModelUsage, withSpan } from '@/lib/tracing';
+
+// ─── Config ───────────────────────────────────────────────────────
+
+// Anthropic pricing multipliers relative to the base input price
+const CACHE_WRITE_MULTIPLIER = 1.25;
+const CACHE_READ_MULTIPLIER = 0.1;
+
+// ─── Types ────────────────────────────────────────────────────────
+
+export type PromptCallPhase = 'generate' | 'judge';
+
+/** Usage fields as returned by messages.create (cache fields are null when unused) */
+export interface PromptUsage {
+    input_tokens: number;
+    output_tokens: number;
+    cache_creation_input_tokens?: number | null;
+    cache_read_input_tokens?: number | null;
+}
+
+/** Minimal client surface — satisfied by the Anthropic SDK and by test stubs */
+export interface PromptCacheClient {
+    messages: {
+        create(params: Anthropic.MessageCreateParamsNonStreaming): Promise<{
+            content: Array<{ type: string; text?: string }>;
+            usage: PromptUsage;
+        }>;
+    };
+}
+
+export interface CachedPromptRequest {
+    model: string;
+    maxTokens: number;
+    temperature: number;
+    /** Short role instruction (not cached on its own) */
+    instruction: string;
+    /** Identical across users/jobs — first cache breakpoint */
+    stablePrefix: string;
+    /** User-message blocks, most stable first — each ends a cache breakpoint */
+    cachedBlocks: string[];
+    /** Volatile part (feedback, letter under review) — never cached */
+    tail: string;
+}
+
+export interface PromptCallReport {
+    iteration: number;
+    phase: PromptCallPhase;
+    model: string;
+    latencyMs: number;
+    /** Input tokens billed at the full rate (after the last cache breakpoint) */
+    inputTokens: number;
+    cacheCreationInputTokens: number;
+    cacheReadInputTokens: number;
+    outputTokens: number;
+    /** Share of the prompt served from the provider cache (0–1) */
+    cacheHitRatio: number;
+    inputCostCents: number;
+    /** What the same prompt would have cost without caching */
+    uncachedInputCostCents: number;
+}
+
+export interface PromptUsageSummary {
+    calls: number;
+    latencyMs: number;
+    inputTokens: number;
+    cacheCreationInputTokens: number;
+    cacheReadInputTokens: number;
+    outputTokens: number;
+    inputCostCents: number;
+    uncachedInputCostCents: number;
+    savedCents: number;
+}
+
+// ─── Request building ─────────────────────────────────────────────
+
+function textBlock(text: string, cached: boolean): Anthropic.TextBlockParam {
+    return cached
+        ? { type: 'text', text, cache_control: { type: 'ephemeral' } }
+        : { type: 'text', text };
+}
+
+/** Message params with cache_control on the stable prefix and every cached block */
+export function buildCachedMessageParams(request: CachedPromptRequest): Anthropic.MessageCreateParamsNonStreaming {
+    // The API rejects empty text blocks — skip empty segments (e.g. no user block under Zero-Leak)
+    const cachedBlocks = request.cachedBlocks.filter(block => block.length > 0);
+
+    return {
+        model: request.model,
+        max_tokens: request.maxTokens,
+        temperature: request.temperature,
+        system: [
+            textBlock(request.instruction, false),
+            textBlock(request.stablePrefix, true),
+        ],
+        messages: [{
+            role: 'user',
+            content: [
+                ...cachedBlocks.map(block => textBlock(block, true)),
+                textBlock(request.tail, false),
+            ],
+        }],
+    };
+}
+
+// ─── Report ───────────────────────────────────────────────────────
+
+function inputPricePerToken(model: string): number {
+    const known = Object.values(MODELS).find(m => m.id === model);
+    return (known?.cost_input_per_1m ?? MODELS.CLAUDE_SONNET.cost_input_per_1m) / 1_000_000;
+}
+
+export function buildPromptCallReport(
+    meta: { iteration: number; phase: PromptCallPhase; model: string; latencyMs: number },
+    usage: PromptUsage,
+): PromptCallReport {
+    const inputTokens = usage.input_tokens ?? 0;
+    const cacheCreationInputTokens = usage.cache_creation_input_tokens ?? 0;
+    const cacheReadInputTokens = usage.cache_read_input_tokens ?? 0;
+    const promptTokens = inputTokens + cacheCreationInputTokens + cacheReadInputTokens;
+    const price = inputPricePerToken(meta.model) * 100; // cents per token
+
+    return {
+        ...meta,
+        inputTokens,
+        cacheCreationInputTokens,
+        cacheReadInputTokens,
+        outputTokens: usage.output_tokens ?? 0,
+        cacheHitRatio: promptTokens > 0 ? +(cacheReadInputTokens / promptTokens).toFixed(3) : 0,
+        inputCostCents: +((inputTokens
+            + cacheCreationInputTokens * CACHE_WRITE_MULTIPLIER
+            + cacheReadInputTokens * CACHE_READ_MULTIPLIER) * price).toFixed(4),
+        uncachedInputCostCents: +(promptTokens * price).toFixed(4),
+    };
+}
+
+export function summarizePromptUsage(reports: PromptCallReport[]): PromptUsageSummary {
+    const sum = (pick: (r: PromptCallReport) => number) => reports.reduce((total, r) => total + pick(r), 0);
+    const inputCostCents = +sum(r => r.inputCostCents).toFixed(4);
+    const uncachedInputCostCents = +sum(r => r.uncachedInputCostCents).toFixed(4);
+    return {
+        calls: reports.length,
+        latencyMs: sum(r => r.latencyMs),
+        inputTokens: sum(r => r.inputTokens),
+        cacheCreationInputTokens: sum(r => r.cacheCreationInputTokens),
+        cacheReadInputTokens: sum(r => r.cacheReadInputTokens),
+        outputTokens: sum(r => r.outputTokens),
+        inputCostCents,
+        uncachedInputCostCents,
+        savedCents: +(uncachedInputCostCents - inputCostCents).toFixed(4),
+    };
+}
+
+/** One line per call — e.g. "#2 generate 3120ms | in 412 + cache-read 5210 + cache-write 0 | out 610 | saved 1.4¢" */
+export function formatPromptCallReport(report: PromptCallReport): string {
+    const saved = report.uncachedInputCostCents - report.inputCostCents;
+    return `#${report.iteration} ${report.phase} ${report.latencyMs}ms | `
+        + `in ${report.inputTokens} + cache-read ${report.cacheReadInputTokens} + cache-write ${report.cacheCreationInputTokens} | `
+        + `out ${report.outputTokens} | saved ${saved.toFixed(2)}¢`;
+}
+
+// ─── Call ─────────────────────────────────────────────────────────
+
+/**
+ * messages.create with prompt caching. Returns the first text block and the
+ * token/latency report for this call. Errors propagate to the caller.
+ */
+export async function createCachedMessage(
+    client: PromptCacheClient,
+    request: CachedPromptRequest,
+    meta: { iteration: number; phase: PromptCallPhase },
+): Promise<{ text: string; report: PromptCallReport }> {
+    return withSpan(`llm cover_letter_${meta.phase}`, {
+        kind: 'client',
+        attributes: { 'gen_ai.operation.name': 'chat', 'pathly.task': `cover_letter_${meta.phase}`, 'pathly.iteration': meta.iteration },
+    }, async span => {
+        const start = Date.now();
+        const message = await client.messages.create(buildCachedMessageParams(request));
+        const latencyMs = Date.now() - start;
+
+        const first = message.content[0];
+        const text = first?.type === 'text' ? first.text ?? '' : '';
+        const report = buildPromptCallReport({ ...meta, model: request.model, latencyMs }, message.usage);
+        recordModelUsage(span, {
+            model: request.model,
+            provider: 'anthropic',
+            inputTokens: report.inputTokens,
+            outputTokens: report.outputTokens,
+            cacheReadInputTokens: report.cacheReadInputTokens,
+            cacheCreationInputTokens: report.cacheCreationInputTokens,
+        });
+        return { text, report };
+    });
+}
@@ -1,12 +1,16 @@
 import { complete } from '@/lib/ai/model-router';
 import { getLanguageName, type SupportedLocale } from '@/lib/i18n/get-user-locale';
 import { createClient as createAdminClient } from '@supabase/supabase-js';
+import { supabaseTracingFetch } from '@/lib/tracing';
 
 // Admin client: works in both API routes AND Inngest background context (no cookie/session required)
 const supabaseAdmin = createAdminClient(
     process.env.NEXT_PUBLIC_SUPABASE_URL!,
     process.env.SUPABASE_SERVICE_ROLE_KEY!,
-    { auth: { autoRefreshToken: false, persistSession: false } }
+    {
+        auth: { autoRefreshToken: false, persistSession: false },
+        global: { fetch: supabaseTracingFetch },
+    }
 );
 
 /**
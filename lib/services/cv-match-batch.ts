@@ -0,0 +1,146 @@
+/**
+ * CV Match — Batch Planner
+ * Feature-Silo: CV Match
+ *
+ * Deterministic half of batch mode (lib/inngest/cv-match-pipeline.ts →
+ * analyzeCVMatchBatch): one CV against many jobs.
+ *
+ *   1. rankJobsForBatch()  — pre-match every job against ONE CvSkillIndex,
+ *                            hash every job with ONE normalized CV text,
+ *                            rank by keyword coverage (stable tie-breaks).
+ *   2. planBatchMatch()    — decide per job: up to date / result cache /
+ *                            LLM analysis (top-N or changed hash) / rank only.
+ *
+ * Pure — no DB, no LLM. Output is JSON-serializable (Inngest step memoization).
+ * Steps return RankedJobRef (ids, hashes, counts) — keyword lists and job
+ * texts stay out of the run state and are re-derived where they are needed.
+ */
+
+import { createInputHasher } from '@/lib/services/cv-match-hash';
+import {
+    matchKeywordsAgainstIndex,
+    type CvSkillIndex,
+    type PreMatchResult,
+} from '@/lib/services/pre-match-keywords';
+
+// ─── Types ────────────────────────────────────────────────────────
+
+export interface BatchJob {
+    id: string;
+    created_at?: string | null;
+    description: string | null;
+    requirements: unknown;
+    buzzwords: unknown;
+    metadata: Record<string, any> | null;
+}
+
+export interface RankedJob {
+    jobId: string;
+    /** 1-based position in the batch ranking */
+    rank: number;
+    /** Pre-match keyword coverage 0–1 (ecosystem hints count half) */
+    score: number;
+    inputHash: string;
+    preMatch: PreMatchResult | null;
+    /** input_hash of the stored analysis (null → never analyzed) */
+    previousHash: string | null;
+    /** Stored analysis is complete (cv_match_status === 'done') */
+    previousDone: boolean;
+}
+
+/** Step-state form of RankedJob — keyword lists reduced to counts */
+export interface RankedJobRef extends Omit<RankedJob, 'preMatch'> {
+    keywordsFound: number;
+    keywordsTotal: number;
+}
+
+/**
+ * - up_to_date:   stored analysis has the same input hash → nothing to do
+ * - result_cache: cv_match_result_cache has this hash → reuse, no LLM
+ * - analyze:      top-N by pre-match score, or inputs changed since last analysis
+ * - rank_only:    below the cut — only the pre-rank is stored
+ */
+export type BatchAction = 'up_to_date' | 'result_cache' | 'analyze' | 'rank_only';
+
+export interface BatchPlanEntry extends RankedJob {
+    action: BatchAction;
+}
+
+type PlannableJob = Pick<RankedJob, 'rank' | 'inputHash' | 'previousHash' | 'previousDone'>;
+
+// ─── 1. Ranking ───────────────────────────────────────────────────
+
+function asStringArray(value: unknown): string[] {
+    return Array.isArray(value) ? value.filter((v): v is string => typeof v === 'string') : [];
+}
+
+export function preMatchCoverage(preMatch: PreMatchResult | null): number {
+    if (!preMatch) return 0;
+    const total = preMatch.found.length + preMatch.missing.length;
+    if (total === 0) return 0;
+    const hinted = new Set((preMatch.ecosystemHints ?? []).map(h => h.keyword)).size;
+    return (preMatch.found.length + 0.5 * hinted) / total;
+}
+
+/**
+ * Rank jobs by pre-match coverage. Ties: newer job first, then job id —
+ * the same input always produces the same order.
+ * `index = null` (no structured CV) ranks purely by recency.
+ */
+export function rankJobsForBatch(jobs: BatchJob[], cvText: string, index: CvSkillIndex | null): RankedJob[] {
+    const hashInputs = createInputHasher(cvText);
+
+    const scored = jobs.map(job => {
+        const buzzwords = asStringArray(job.buzzwords);
+        const preMatch = index ? matchKeywordsAgainstIndex(index, buzzwords, { quiet: true }) : null;
+        const stored = job.metadata?.cv_match;
+        return {
+            job,
+            entry: {
+                jobId: job.id,
+                rank: 0,
+                score: preMatchCoverage(preMatch),
+                inputHash: hashInputs(job.description || '', asStringArray(job.requirements), buzzwords),
+                preMatch,
+                previousHash: typeof stored?.input_hash === 'string' ? stored.input_hash : null,
+                previousDone: job.metadata?.cv_match_status === 'done',
+            } as RankedJob,
+        };
+    });
+
+    scored.sort((a, b) =>
+        b.entry.score - a.entry.score
+        || (b.job.created_at ?? '').localeCompare(a.job.created_at ?? '')
+        || a.job.id.localeCompare(b.job.id)
+    );
+
+    return scored.map(({ entry }, i) => ({ ...entry, rank: i + 1 }));
+}
+
+export function toRankedJobRef(entry: RankedJob): RankedJobRef {
+    const { preMatch, ...rest } = entry;
+    const keywordsFound = preMatch?.found.length ?? 0;
+    return { ...rest, keywordsFound, keywordsTotal: keywordsFound + (preMatch?.missing.length ?? 0) };
+}
+
+// ─── 2. Planning ──────────────────────────────────────────────────
+
+export function planBatchMatch<T extends PlannableJob>(
+    ranked: T[],
+    cachedHashes: ReadonlySet<string>,
+    topN: number,
+): Array<T & { action: BatchAction }> {
+    return ranked.map(entry => {
+        let action: BatchAction;
+        if (entry.previousDone && entry.previousHash === entry.inputHash) {
+            action = 'up_to_date';
+        } else if (cachedHashes.has(entry.inputHash)) {
+            action = 'result_cache';
+        } else if (entry.previousHash !== null || entry.rank <= topN) {
+            action = 'analyze';
+        } else {
+            action = 'rank_only';
+        }
+        return { ...entry, action };
+    });
+}
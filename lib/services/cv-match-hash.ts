@@ -31,11 +31,22 @@ import { createHash } from 'crypto';
  *   This invalidates all existing hashes (safe: causes one-time cache-miss → re-analysis).
  */
 export function computeInputHash(cvText: string, jobDescription: string, requirements: string[], buzzwords: string[] = []): string {
-    const normalized = [
-        cvText.trim().toLowerCase().replace(/\s+/g, ' '),
-        jobDescription.trim().toLowerCase().replace(/\s+/g, ' '),
-        [...requirements].sort().join('|').toLowerCase(),
-        [...buzzwords].sort().join('|').toLowerCase(),
-    ].join('|||');
-    return createHash('sha256').update(normalized).digest('hex').slice(0, 32);
+    return createInputHasher(cvText)(jobDescription, requirements, buzzwords);
+}
+
+/**
+ * Batch variant: normalizes the CV text ONCE and returns a hasher for many jobs.
+ * `createInputHasher(cv)(desc, reqs, buzz) === computeInputHash(cv, desc, reqs, buzz)`.
+ */
+export function createInputHasher(cvText: string) {
+    const normalizedCv = cvText.trim().toLowerCase().replace(/\s+/g, ' ');
+    return (jobDescription: string, requirements: string[], buzzwords: string[] = []): string => {
+        const normalized = [
+            normalizedCv,
+            jobDescription.trim().toLowerCase().replace(/\s+/g, ' '),
+            [...requirements].sort().join('|').toLowerCase(),
+            [...buzzwords].sort().join('|').toLowerCase(),
+        ].join('|||');
+        return createHash('sha256').update(normalized).digest('hex').slice(0, 32);
+    };
 }
@@ -0,0 +1,89 @@
+/**
+ * CV Match — Result Normalizer (Single Source of Truth)
+ * Feature-Silo: CV Match
+ *
+ * Restores §7 compliance on raw analyzer output before it is flagged 'done':
+ * legacy score:number → level format, requirement rows with safe array fields,
+ * missing top-level arrays defaulted (and reported in `missingFields`).
+ *
+ * Shared between:
+ *   - lib/inngest/cv-match-pipeline.ts (single job + batch mode)
+ *
+ * ⚠️ SYNC CONTRACT: The frontend renders this shape (_schemaVersion 2).
+ */
+
+import type { CVMatchResult } from '@/lib/services/cv-match-analyzer';
+
+export interface NormalizedCVMatch {
+    result: Record<string, unknown>;
+    missingFields: string[];
+}
+
+// Defensive: convert legacy score:number to level-based format
+function normalizeScoreCategory(val: any): { level: string; reasons: string[] } {
+    if (val && typeof val === 'object' && typeof val.level === 'string') {
+        return { level: val.level, reasons: Array.isArray(val.reasons) ? val.reasons : [] };
+    }
+    if (val && typeof val === 'object' && typeof val.score === 'number') {
+        const level = val.score >= 70 ? 'strong' : val.score >= 40 ? 'solid' : 'gap';
+        return { level, reasons: Array.isArray(val.reasons) ? val.reasons : [] };
+    }
+    if (typeof val === 'number') {
+        return { level: val >= 70 ? 'strong' : val >= 40 ? 'solid' : 'gap', reasons: [] };
+    }
+    return { level: 'solid', reasons: [] }; // safe default
+}
+
+const VALID_ORBIT_CATS = new Set(['technical', 'soft', 'experience', 'domain', 'language']);
+
+export function normalizeCVMatchResult(matchResult: CVMatchResult): NormalizedCVMatch {
+    const missingFields: string[] = [];
+
+    const rawBreakdown = (matchResult.scoreBreakdown && typeof matchResult.scoreBreakdown === 'object')
+        ? matchResult.scoreBreakdown as Record<string, any> : {};
+
+    const normalizedBreakdown = {
+        technicalSkills: normalizeScoreCategory(rawBreakdown.technicalSkills),
+        softSkills: normalizeScoreCategory(rawBreakdown.softSkills),
+        experienceLevel: normalizeScoreCategory(rawBreakdown.experienceLevel),
+        domainKnowledge: normalizeScoreCategory(rawBreakdown.domainKnowledge),
+        languageMatch: normalizeScoreCategory(rawBreakdown.languageMatch),
+    };
+
+    // V2: Normalize each requirement row's array fields to prevent frontend crashes
+    const rawRows = Array.isArray(matchResult.requirementRows)
+        ? matchResult.requirementRows : (missingFields.push('requirementRows'), []);
+
+    const normalizedRows = rawRows.map((row: any) => ({
+        ...row,
+        title: row.title || row.requirement || '',
+        orbitCategory: VALID_ORBIT_CATS.has(String(row.orbitCategory).toLowerCase())
+            ? String(row.orbitCategory).toLowerCase()
+            : 'domain', // safe fallback
+        level: ['strong', 'solid', 'gap'].includes(row.level) ? row.level : 'solid',
+        relevantChips: Array.isArray(row.relevantChips) ? row.relevantChips : [],
+        context: row.context || row.currentState || '',
+        gaps: Array.isArray(row.gaps) ? row.gaps : [],
+        additionalChips: Array.isArray(row.additionalChips) ? row.additionalChips : [],
+    }));
+
+    const result = {
+        ...matchResult,
+        _schemaVersion: 2,
+        requirementRows: normalizedRows,
+        strengths: Array.isArray(matchResult.strengths)
+            ? matchResult.strengths : (missingFields.push('strengths'), []),
+        gaps: Array.isArray(matchResult.gaps)
+            ? matchResult.gaps : (missingFields.push('gaps'), []),
+        potentialHighlights: Array.isArray(matchResult.potentialHighlights)
+            ? matchResult.potentialHighlights : (missingFields.push('potentialHighlights'), []),
+        keywordsFound: Array.isArray(matchResult.keywordsFound)
+            ? matchResult.keywordsFound : (missingFields.push('keywordsFound'), []),
+        keywordsMissing: Array.isArray(matchResult.keywordsMissing)
+            ? matchResult.keywordsMissing : (missingFields.push('keywordsMissing'), []),
+        scoreBreakdown: normalizedBreakdown,
+        _normalized: missingFields.length > 0,
+    };
+
+    return { result, missingFields };
+}
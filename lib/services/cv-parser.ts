@@ -89,7 +89,7 @@ const CERT_NOISE = new Set([
 ]);
 
 export async function parseCvTextToJson(text: string): Promise<CvStructuredData> {
-  const { sanitized, restoreJson, warningFlags } = sanitizeForAI(text);
+  const { sanitized, restoreJson, warningFlags } = sanitizeForAI(text, { mode: 'single-pass' });
   console.log(`🛡️ [cv-parser] PII sanitized before AI call. Found: [${warningFlags.join(', ')}]`);
 
   const prompt = `Du bist ein präziser Daten-Extraktor für Lebensläufe. Übersetze den folgenden CV-Text in eine strikt strukturierte JSON-Repräsentation.
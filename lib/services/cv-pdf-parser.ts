@@ -14,6 +14,7 @@
 
 import { cvStructuredDataSchema } from './cv-parser';
 import type { CvStructuredData } from '@/types/cv';
+import { tracedFetch } from '@/lib/tracing';
 
 const MISTRAL_KEY = process.env.MISTRAL_API_KEY;
 const OCR_MODEL = 'mistral-ocr-latest';
@@ -59,7 +60,7 @@ export async function parseCvFromPdf(pdfBuffer: Buffer): Promise<CvParseResult>
     const base64 = pdfBuffer.toString('base64');
 
     // Step 1: OCR — PDF → markdown
-    const ocrRes = await fetch('https://api.mistral.ai/v1/ocr', {
+    const ocrRes = await tracedFetch('mistral', 'https://api.mistral.ai/v1/ocr', {
         method: 'POST',
         headers: { 'Authorization': `Bearer ${MISTRAL_KEY}`, 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -77,7 +78,7 @@ export async function parseCvFromPdf(pdfBuffer: Buffer): Promise<CvParseResult>
     }
 
     // Step 2: Parse markdown → JSON
-    const chatRes = await fetch('https://api.mistral.ai/v1/chat/completions', {
+    const chatRes = await tracedFetch('mistral', 'https://api.mistral.ai/v1/chat/completions', {
         method: 'POST',
         headers: { 'Authorization': `Bearer ${MISTRAL_KEY}`, 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -1,11 +1,15 @@
 import { createClient } from '@/lib/supabase/server';
 import { createClient as createAdminClient } from '@supabase/supabase-js';
 import { decrypt } from '@/lib/utils/encryption';
+import { supabaseTracingFetch } from '@/lib/tracing';
 
 const supabaseAdmin = createAdminClient(
     process.env.NEXT_PUBLIC_SUPABASE_URL!,
     process.env.SUPABASE_SERVICE_ROLE_KEY!,
-    { auth: { autoRefreshToken: false, persistSession: false } }
+    {
+        auth: { autoRefreshToken: false, persistSession: false },
+        global: { fetch: supabaseTracingFetch },
+    }
 );
 
 /**
@@ -75,7 +79,8 @@ export async function getCVText(userId: string, documentId?: string, options?: {
             console.log(`⬇️ [Self-Healing] Downloaded ${fileData.size} bytes`);
 
             const buffer = Buffer.from(await fileData.arrayBuffer());
-            console.log(`🤖 [Self-Healing] Calling processDocument (Azure DI OCR + regex PII)...`);
+            // processDocument is content-hash cached — retries for the same file never re-run OCR
+            console.log(`🤖 [Self-Healing] Calling processDocument (extraction cache → Azure DI OCR + regex PII)...`);
             const { processDocument } = await import('@/lib/services/document-processor');
             const processed = await processDocument(buffer, 'application/pdf');
 
@@ -1,4 +1,5 @@
 import { extractText } from './text-extractor';
+import { getOrExtractDocument } from './extraction-cache';
 import { extractTextWithAzure } from './azure-document-extractor';
 import { encrypt } from '@/lib/utils/encryption';
 import { analyzeWritingStyle, StyleAnalysis, getDefaultStyleAnalysis } from './writing-style-analyzer';
@@ -28,26 +29,33 @@ export async function processDocument(
     // ================================================================
     // Step 1: Text Extraction
     // PRIMARY:  Azure Document Intelligence (EU — DSGVO-konform)
-    // FALLBACK: pdf-parse / mammoth (local, no API)
+    // FALLBACK: pdf2json / mammoth (local worker pool, no API)
+    // CACHE:    content hash of the file bytes — identical re-uploads and
+    //           Self-Healing retries never re-run OCR (extraction-cache.ts)
     // ================================================================
-    let rawText: string | null = null;
-    let extractionSource: 'azure' | 'local' = 'azure';
+    const { value: extraction, outcome } = await getOrExtractDocument(fileBuffer, mimeType, async () => {
+        let text: string | null = null;
+        let source: 'azure' | 'local' = 'azure';
 
-    // Try Azure first (layout-aware OCR, handles visual/scanned PDFs)
-    rawText = await extractTextWithAzure(fileBuffer, mimeType);
+        // Try Azure first (layout-aware OCR, handles visual/scanned PDFs)
+        text = await extractTextWithAzure(fileBuffer, mimeType);
 
-    if (!rawText) {
-        // Azure unavailable or insufficient text — fall back to local extraction
-        console.warn('⚠️ [document-processor] Azure extraction failed or insufficient — falling back to local extractor');
-        extractionSource = 'local';
-        rawText = await extractText(fileBuffer, mimeType);
-    }
+        if (!text) {
+            // Azure unavailable or insufficient text — fall back to local extraction
+            console.warn('⚠️ [document-processor] Azure extraction failed or insufficient — falling back to local extractor');
+            source = 'local';
+            text = await extractText(fileBuffer, mimeType);
+        }
 
-    console.log(`📝 [document-processor] Text extracted via ${extractionSource}: ${rawText.length} chars`);
+        // Thrown inside the loader so unreadable files are never cached
+        if (text.trim().length < 50) {
+            throw new Error('PDF konnte nicht gelesen werden. Bitte als Text-PDF exportieren.');
+        }
+        return { text, source };
+    });
+    const rawText = extraction.text;
 
-    if (rawText.trim().length < 50) {
-        throw new Error('PDF konnte nicht gelesen werden. Bitte als Text-PDF exportieren.');
-    }
+    console.log(`📝 [document-processor] Text extracted via ${extraction.source}${outcome === 'miss' ? '' : ` (cache ${outcome})`}: ${rawText.length} chars`);
 
     // ================================================================
     // Step 2: PII Extraction (LOCAL — Regex)
@@ -56,7 +64,7 @@ export async function processDocument(
     // skills/languages/education from the structured JSON instead.
     // ================================================================
     const textToAnalyze = rawText.slice(0, 3000);
-    const { tokenMap, warningFlags } = sanitizeForAI(textToAnalyze);
+    const { tokenMap, warningFlags } = sanitizeForAI(textToAnalyze, { mode: 'single-pass' });
     console.log(`🛡️ [document-processor] PII detected via regex. Tokens: [${warningFlags.join(', ')}]`);
 
     // 3. Style Analysis (only for cover letters)
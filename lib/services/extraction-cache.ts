@@ -0,0 +1,149 @@
+/**
+ * Extraction Cache — Pathly V2.0
+ * Content-hash cache for document text extraction (document-processor.ts).
+ *
+ * Key: SHA-256 over (mime type + file bytes). A re-upload of the same file, a
+ * retried upload or the Self-Healing path in cv-text-retriever.ts therefore
+ * never pays for Azure OCR or a local re-parse twice.
+ *
+ *   1. Per-instance TTL LRU (bounded by bytes)
+ *   2. Upstash Redis (when configured) — value AES-256-GCM encrypted via
+ *      lib/utils/encryption.ts, because extracted CV text contains PII
+ *   3. Singleflight: concurrent extractions of the same bytes share one run
+ *
+ * Only successful extractions are cached — the loader throws on unreadable files.
+ * Hits/misses are reported to cache-monitor.ts (namespace 'document_extraction').
+ */
+
+import { createHash } from 'crypto';
+import { getRedis } from '@/lib/api/rate-limit-upstash';
+import { decrypt, encrypt } from '@/lib/utils/encryption';
+import { createTtlLruCache } from '@/lib/utils/ttl-lru-cache';
+import { recordCacheCoalesced, recordCacheHit, recordCacheMiss } from '@/lib/services/cache-monitor';
+
+// ─── Config ───────────────────────────────────────────────────────
+
+// Retries and re-uploads happen within minutes to days — a week covers both
+const EXTRACTION_TTL_MS = 7 * 24 * 60 * 60 * 1000;
+// Local fallback text is only cached briefly so Azure gets another chance soon
+const LOCAL_FALLBACK_TTL_MS = 6 * 60 * 60 * 1000;
+// Azure prebuilt-layout: ~€0.01 per page, typical CV = 2 pages
+const SAVED_CENTS_PER_EXTRACTION = 2;
+const REDIS_KEY_PREFIX = 'doc-extract:';
+// Upstash rejects request bodies > 1 MB; encrypted hex doubles the size
+const MAX_REDIS_TEXT_CHARS = 200_000;
+
+// ─── Types ────────────────────────────────────────────────────────
+
+export interface CachedExtraction {
+    text: string;
+    source: 'azure' | 'local';
+    /** Epoch ms of the original extraction */
+    extractedAt: number;
+}
+
+export type ExtractionCacheOutcome = 'hit' | 'miss' | 'coalesced';
+
+// ─── Key ──────────────────────────────────────────────────────────
+
+export function documentContentHash(buffer: Buffer, mimeType: string): string {
+    return createHash('sha256').update(mimeType).update('|||').update(buffer).digest('hex').slice(0, 32);
+}
+
+// ─── Read-through ─────────────────────────────────────────────────
+
+const localCache = createTtlLruCache<CachedExtraction>({
+    maxEntries: 200,
+    maxBytes: 8 * 1024 * 1024,
+    sizeOf: value => value.text.length * 2,
+});
+
+const inFlight = new Map<string, Promise<CachedExtraction>>();
+
+function ttlFor(value: CachedExtraction): number {
+    return value.source === 'azure' ? EXTRACTION_TTL_MS : LOCAL_FALLBACK_TTL_MS;
+}
+
+async function readShared(hash: string): Promise<CachedExtraction | null> {
+    const redis = getRedis();
+    if (!redis) return null;
+    try {
+        const encrypted = await redis.get<string>(`${REDIS_KEY_PREFIX}${hash}`);
+        if (!encrypted) return null;
+        return JSON.parse(decrypt(encrypted)) as CachedExtraction;
+    } catch (error) {
+        console.warn('⚠️ [ExtractionCache] Redis read failed — treating as miss:', error);
+        return null;
+    }
+}
+
+function writeShared(hash: string, value: CachedExtraction) {
+    const redis = getRedis();
+    if (!redis || value.text.length > MAX_REDIS_TEXT_CHARS) return;
+    try {
+        redis.set(`${REDIS_KEY_PREFIX}${hash}`, encrypt(JSON.stringify(value)), { px: ttlFor(value) })
+            .catch(error => console.warn('⚠️ [ExtractionCache] Redis write failed:', error));
+    } catch (error) {
+        // encrypt() throws without ENCRYPTION_KEY in production — never cache PII in plaintext
+        console.warn('⚠️ [ExtractionCache] Encryption unavailable — skipping shared cache:', error);
+    }
+}
+
+/**
+ * Return the cached extraction for these exact bytes, or run `loader` once
+ * (even under concurrent calls) and cache its result.
+ */
+export async function getOrExtractDocument(
+    buffer: Buffer,
+    mimeType: string,
+    loader: () => Promise<Omit<CachedExtraction, 'extractedAt'>>,
+): Promise<{ value: CachedExtraction; contentHash: string; outcome: ExtractionCacheOutcome }> {
+    const contentHash = documentContentHash(buffer, mimeType);
+
+    const local = localCache.get(contentHash);
+    if (local) {
+        recordCacheHit('document_extraction', SAVED_CENTS_PER_EXTRACTION);
+        return { value: local, contentHash, outcome: 'hit' };
+    }
+
+    const pending = inFlight.get(contentHash);
+    if (pending) {
+        const value = await pending;
+        recordCacheCoalesced('document_extraction', SAVED_CENTS_PER_EXTRACTION);
+        return { value, contentHash, outcome: 'coalesced' };
+    }
+
+    const load = (async (): Promise<{ value: CachedExtraction; outcome: 'hit' | 'miss' }> => {
+        const shared = await readShared(contentHash);
+        if (shared) {
+            localCache.set(contentHash, shared, ttlFor(shared));
+            return { value: shared, outcome: 'hit' };
+        }
+
+        const value: CachedExtraction = { ...(await loader()), extractedAt: Date.now() };
+        localCache.set(contentHash, value, ttlFor(value));
+        writeShared(contentHash, value);
+        return { value, outcome: 'miss' };
+    })();
+
+    // Register before the first await so concurrent callers join this run
+    const shared = load.then(result => result.value);
+    inFlight.set(contentHash, shared);
+    // Followers attach their own handlers; keep an unobserved rejection quiet here
+    shared.catch(() => {});
+
+    try {
+        const { value, outcome } = await load;
+        if (outcome === 'hit') recordCacheHit('document_extraction', SAVED_CENTS_PER_EXTRACTION);
+        else recordCacheMiss('document_extraction');
+        return { value, contentHash, outcome };
+    } finally {
+        inFlight.delete(contentHash);
+    }
+}
+
+/** Clear the per-instance cache (tests / benchmarks) */
+export function resetExtractionCache() {
+    localCache.clear();
+    inFlight.clear();
+}
@@ -0,0 +1,248 @@
+/**
+ * Extraction Pool — Pathly V2.0
+ * worker_threads pool for local PDF/DOCX text extraction (text-extractor.ts).
+ *
+ * pdf2json parses synchronously — on the main thread a multi-page CV blocks the
+ * event loop (and every other request on this instance) for the whole parse.
+ * The pool moves parsing into workers:
+ *   - Parsers are preloaded once per worker (lib/workers/extraction-worker.mjs)
+ *   - One job per worker at a time; jobs queue FIFO when all workers are busy
+ *   - Per-job limits: heap cap via resourceLimits (worker dies on OOM) and a
+ *     wall-clock timeout (worker is terminated) — a hostile PDF costs one worker,
+ *     not the instance. Dead workers are replaced on demand.
+ *   - Pages stream back as they are parsed (onPage)
+ *
+ * Returns `null` when the pool is unavailable (worker file missing, disabled via
+ * EXTRACTION_WORKERS=off, spawn failure) — caller extracts in-process instead.
+ */
+
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { Worker } from 'worker_threads';
+
+// ─── Config ───────────────────────────────────────────────────────
+
+const WORKER_PATH = path.join(process.cwd(), 'lib', 'workers', 'extraction-worker.mjs');
+const POOL_SIZE = Math.max(1, Math.min(2, os.cpus().length - 1));
+const DEFAULT_JOB_TIMEOUT_MS = 20_000;
+// Uploads are capped at 5 MB; pdf2json needs ~10-20× the file size in heap
+const MAX_WORKER_HEAP_MB = 256;
+
+// ─── Types ────────────────────────────────────────────────────────
+
+export interface ExtractedPage {
+    index: number;
+    text: string;
+}
+
+export interface WorkerExtractionOptions {
+    /** Called for every page as soon as the worker has parsed it */
+    onPage?: (page: ExtractedPage) => void;
+    timeoutMs?: number;
+}
+
+interface PoolJob {
+    id: number;
+    mimeType: string;
+    bytes: ArrayBuffer;
+    options: WorkerExtractionOptions;
+    pages: string[];
+    resolve: (text: string) => void;
+    reject: (error: Error) => void;
+}
+
+interface PoolWorker {
+    worker: Worker;
+    /** Parsers preloaded — a worker that dies before this is a broken setup, not a bad file */
+    ready: boolean;
+    job: PoolJob | null;
+    timer: NodeJS.Timeout | null;
+}
+
+type WorkerMessage =
+    | { type: 'ready' }
+    | { type: 'page'; id: number; index: number; text: string }
+    | { type: 'done'; id: number; pageCount: number }
+    | { type: 'error'; id: number; message: string };
+
+// ─── Pool state ───────────────────────────────────────────────────
+
+class PoolUnavailableError extends Error {
+    constructor(reason: string) {
+        super(`Extraction pool unavailable: ${reason}`);
+        this.name = 'PoolUnavailableError';
+    }
+}
+
+const workers: PoolWorker[] = [];
+const queue: PoolJob[] = [];
+let nextJobId = 1;
+let disabledReason: string | null = null;
+
+function poolDisabled(): string | null {
+    if (disabledReason) return disabledReason;
+    if (process.env.EXTRACTION_WORKERS === 'off') return 'EXTRACTION_WORKERS=off';
+    if (!fs.existsSync(WORKER_PATH)) {
+        disabledReason = `worker file not found at ${WORKER_PATH}`;
+        console.warn(`⚠️ [ExtractionPool] Disabled — ${disabledReason}. Extracting in-process.`);
+    }
+    return disabledReason;
+}
+
+function finishJob(slot: PoolWorker) {
+    if (slot.timer) clearTimeout(slot.timer);
+    slot.timer = null;
+    slot.job = null;
+    // Idle workers must not keep scripts/tests alive
+    slot.worker.unref();
+    dispatch();
+}
+
+function removeWorker(slot: PoolWorker, error: Error) {
+    const index = workers.indexOf(slot);
+    if (index !== -1) workers.splice(index, 1);
+    if (slot.timer) clearTimeout(slot.timer);
+    const job = slot.job;
+    slot.job = null;
+    job?.reject(error);
+    dispatch();
+}
+
+function workerFailure(slot: PoolWorker, detail: string): Error {
+    if (slot.ready) return new Error(`Extraction worker ${detail}`);
+    // Died during parser preload (missing dependency, bad runtime) — stop spawning
+    disabledReason = `worker failed to start (${detail})`;
+    console.warn(`⚠️ [ExtractionPool] Disabled — ${disabledReason}. Extracting in-process.`);
+    return new PoolUnavailableError(disabledReason);
+}
+
+function spawnWorker(): PoolWorker | null {
+    let worker: Worker;
+    try {
+        worker = new Worker(WORKER_PATH, {
+            resourceLimits: { maxOldGenerationSizeMb: MAX_WORKER_HEAP_MB },
+        });
+    } catch (error) {
+        disabledReason = `worker spawn failed: ${error instanceof Error ? error.message : String(error)}`;
+        console.warn(`⚠️ [ExtractionPool] Disabled — ${disabledReason}. Extracting in-process.`);
+        return null;
+    }
+
+    const slot: PoolWorker = { worker, ready: false, job: null, timer: null };
+    worker.unref();
+
+    worker.on('message', (message: WorkerMessage) => {
+        if (message.type === 'ready') {
+            slot.ready = true;
+            return;
+        }
+        const job = slot.job;
+        if (!job || message.id !== job.id) return;
+
+        if (message.type === 'page') {
+            job.pages[message.index] = message.text;
+            job.options.onPage?.({ index: message.index, text: message.text });
+        } else if (message.type === 'done') {
+            job.resolve(job.pages.slice(0, message.pageCount).map(page => page ?? '').join('\n'));
+            finishJob(slot);
+        } else {
+            job.reject(new Error(message.message));
+            finishJob(slot);
+        }
+    });
+
+    worker.on('error', error => {
+        // ERR_WORKER_OUT_OF_MEMORY lands here when the heap cap is hit
+        console.error('❌ [ExtractionPool] Worker crashed:', error.message);
+        removeWorker(slot, workerFailure(slot, `crashed: ${error.message}`));
+    });
+
+    worker.on('exit', code => {
+        if (workers.includes(slot)) {
+            removeWorker(slot, workerFailure(slot, `exited with code ${code}`));
+        }
+    });
+
+    workers.push(slot);
+    return slot;
+}
+
+function dispatch() {
+    while (queue.length > 0) {
+        let slot = workers.find(w => w.job === null);
+        if (!slot && workers.length < POOL_SIZE && !disabledReason) slot = spawnWorker() ?? undefined;
+        if (disabledReason) {
+            // Workers cannot start here — hand queued jobs back so callers extract in-process
+            for (const job of queue.splice(0)) job.reject(new PoolUnavailableError(disabledReason));
+            return;
+        }
+        if (!slot) return;
+
+        const job = queue.shift()!;
+        slot.job = job;
+        slot.worker.ref();
+        const timeoutMs = job.options.timeoutMs ?? DEFAULT_JOB_TIMEOUT_MS;
+        slot.timer = setTimeout(() => {
+            console.warn(`⏱️ [ExtractionPool] Job ${job.id} exceeded ${timeoutMs}ms — terminating worker`);
+            removeWorker(slot!, new Error(`Extraction timed out after ${timeoutMs}ms`));
+            void slot!.worker.terminate();
+        }, timeoutMs);
+        slot.worker.postMessage({ id: job.id, mimeType: job.mimeType, bytes: job.bytes }, [job.bytes]);
+    }
+}
+
+// ─── Public API ───────────────────────────────────────────────────
+
+/**
+ * Extract text from a PDF/DOCX in a worker thread. Pages are joined with '\n'
+ * (same output as the in-process extractor).
+ *
+ * @returns extracted text, or `null` if the pool is unavailable
+ * @throws on parse errors, timeouts and worker crashes (no in-process retry —
+ *         a file that kills a worker would block the main thread)
+ */
+export async function extractInWorker(
+    buffer: Buffer,
+    mimeType: string,
+    options: WorkerExtractionOptions = {},
+): Promise<string | null> {
+    if (poolDisabled()) return null;
+
+    // Copy into a standalone ArrayBuffer — Buffers may share Node's pool slab,
+    // and the caller keeps using its buffer after the transfer
+    const bytes = new Uint8Array(buffer).buffer as ArrayBuffer;
+
+    try {
+        return await new Promise<string>((resolve, reject) => {
+            queue.push({ id: nextJobId++, mimeType, bytes, options, pages: [], resolve, reject });
+            dispatch();
+        });
+    } catch (error) {
+        if (error instanceof PoolUnavailableError) return null;
+        throw error;
+    }
+}
+
+/** Pool status for diagnostics / benchmarks */
+export function getExtractionPoolStats() {
+    return {
+        enabled: poolDisabled() === null,
+        size: POOL_SIZE,
+        workers: workers.length,
+        busy: workers.filter(w => w.job !== null).length,
+        queued: queue.length,
+    };
+}
+
+/** Terminate all workers (tests / benchmark teardown) */
+export async function shutdownExtractionPool() {
+    const slots = workers.splice(0);
+    for (const job of queue.splice(0)) job.reject(new Error('Extraction pool shut down'));
+    await Promise.all(slots.map(slot => {
+        if (slot.timer) clearTimeout(slot.timer);
+        slot.job?.reject(new Error('Extraction pool shut down'));
+        slot.job = null;
+        return slot.worker.terminate();
+    }));
+}
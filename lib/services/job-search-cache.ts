@@ -0,0 +1,242 @@
+/**
+ * Job Search Cache — Pathly V2.0
+ * Read-through caches + tier timings for searchJobs() (job-search-pipeline.ts).
+ *
+ *   1. SerpAPI query cache:  (query, date chip, SerpLocale) → jobs_results   TTL 1h
+ *   2. Listing cache:        job_id → { applyLink, description }           TTL 24h
+ *   3. Tier timings:         p50/p95 per progressive-search tier (+ listing lookups)
+ *   4. Speculation budget:   speculative tier requests in flight per query cache key
+ *
+ * Each cache is a per-instance TTL LRU in front of Upstash Redis (when configured),
+ * so popular queries hit across serverless instances. Identical concurrent lookups
+ * share one upstream request (singleflight). Failed upstream calls are never cached.
+ *
+ * ⚠️ Cached values are shared between requests — treat returned arrays/objects as read-only.
+ */
+
+import { createHash } from 'crypto';
+import { getRedis } from '@/lib/api/rate-limit-upstash';
+import { createTtlLruCache, type TtlLruCache } from '@/lib/utils/ttl-lru-cache';
+
+// ─── Config ───────────────────────────────────────────────────────
+
+const QUERY_TTL_MS = 60 * 60 * 1000;
+// Zero results can flip quickly for fresh roles — keep them only briefly
+const EMPTY_QUERY_TTL_MS = 10 * 60 * 1000;
+const LISTING_TTL_MS = 24 * 60 * 60 * 1000;
+// Upstash rejects request bodies > 1 MB; keep a safety margin
+const MAX_REDIS_VALUE_CHARS = 256 * 1024;
+const TIMING_WINDOW = 200;
+
+// ─── Types ────────────────────────────────────────────────────────
+
+export type SearchTier = 'week' | 'month' | 'synonyms' | 'listing';
+
+export interface ListingDetails {
+    /** First direct apply option (null → keep SerpAPI share_link) */
+    applyLink: string | null;
+    /** Full job description from the Google Jobs listing */
+    description: string | null;
+}
+
+export interface TierTimingStats {
+    calls: number;
+    cacheHits: number;
+    p50Ms: number | null;
+    p95Ms: number | null;
+}
+
+interface CacheLookup<V> {
+    value: V;
+    cached: boolean;
+}
+
+// ─── Read-through (LRU → Redis → loader) ──────────────────────────
+
+const inFlight = new Map<string, Promise<CacheLookup<unknown>>>();
+
+async function readThrough<V>(
+    key: string,
+    local: TtlLruCache<V>,
+    ttlMs: (value: V) => number,
+    loader: () => Promise<V>,
+): Promise<CacheLookup<V>> {
+    const localHit = local.get(key);
+    if (localHit !== undefined) return { value: localHit, cached: true };
+
+    const pending = inFlight.get(key) as Promise<CacheLookup<V>> | undefined;
+    if (pending) return pending;
+
+    const load = (async (): Promise<CacheLookup<V>> => {
+        const redis = getRedis();
+        if (redis) {
+            try {
+                const shared = await redis.get<V>(key);
+                if (shared !== null && shared !== undefined) {
+                    local.set(key, shared, ttlMs(shared));
+                    return { value: shared, cached: true };
+                }
+            } catch (error) {
+                console.warn('⚠️ [SearchCache] Redis read failed — treating as miss:', error);
+            }
+        }
+
+        const value = await loader();
+        const ttl = ttlMs(value);
+        local.set(key, value, ttl);
+        if (redis && JSON.stringify(value).length <= MAX_REDIS_VALUE_CHARS) {
+            redis.set(key, value, { px: ttl }).catch(error => {
+                console.warn('⚠️ [SearchCache] Redis write failed:', error);
+            });
+        }
+        return { value, cached: false };
+    })();
+
+    inFlight.set(key, load);
+    try {
+        return await load;
+    } finally {
+        inFlight.delete(key);
+    }
+}
+
+// ─── 1. SerpAPI query cache ───────────────────────────────────────
+
+const queryCache = createTtlLruCache<unknown[]>({ maxEntries: 300 });
+
+/**
+ * Cache key for a google_jobs query. Query text is trimmed, lowercased and
+ * whitespace-collapsed (SerpAPI/Google treat these variants identically).
+ */
+export function serpQueryCacheKey(query: string, dateChip: string, serpLocale: { hl: string; gl: string }): string {
+    const normalized = [
+        query.trim().toLowerCase().replace(/\s+/g, ' '),
+        dateChip,
+        serpLocale.hl.toLowerCase(),
+        serpLocale.gl.toLowerCase(),
+    ].join('|||');
+    return `serp-q:${createHash('sha256').update(normalized).digest('hex').slice(0, 32)}`;
+}
+
+export function cachedSerpQuery(
+    query: string,
+    dateChip: string,
+    serpLocale: { hl: string; gl: string },
+    loader: () => Promise<unknown[]>,
+): Promise<CacheLookup<unknown[]>> {
+    return readThrough(
+        serpQueryCacheKey(query, dateChip, serpLocale),
+        queryCache,
+        jobs => (jobs.length > 0 ? QUERY_TTL_MS : EMPTY_QUERY_TTL_MS),
+        loader,
+    );
+}
+
+/** Local-cache peek without loading (undefined → not cached on this instance) */
+export function peekSerpQuery(
+    query: string,
+    dateChip: string,
+    serpLocale: { hl: string; gl: string },
+): unknown[] | undefined {
+    return queryCache.get(serpQueryCacheKey(query, dateChip, serpLocale));
+}
+
+// ─── 2. Listing cache (google_jobs_listing by job_id) ─────────────
+
+const listingCache = createTtlLruCache<ListingDetails>({ maxEntries: 1000 });
+
+export function cachedListing(
+    jobId: string,
+    loader: () => Promise<ListingDetails>,
+): Promise<CacheLookup<ListingDetails>> {
+    return readThrough(`serp-listing:${jobId}`, listingCache, () => LISTING_TTL_MS, loader);
+}
+
+// ─── 4. Speculation budget ───────────────────────────────────────
+
+const speculativeInFlight = new Map<string, number>();
+
+/**
+ * Reserve one speculative request for a (query, date chip, locale) key.
+ * Returns false when `budget` speculative requests for that key are already
+ * in flight on this instance — across all concurrent searches.
+ */
+export function tryAcquireSpeculativeSlot(key: string, budget: number): boolean {
+    const inUse = speculativeInFlight.get(key) ?? 0;
+    if (inUse >= budget) return false;
+    speculativeInFlight.set(key, inUse + 1);
+    return true;
+}
+
+export function releaseSpeculativeSlot(key: string) {
+    const inUse = speculativeInFlight.get(key) ?? 0;
+    if (inUse <= 1) speculativeInFlight.delete(key);
+    else speculativeInFlight.set(key, inUse - 1);
+}
+
+// ─── 3. Tier timings ──────────────────────────────────────────────
+
+interface TierSamples {
+    samples: number[];
+    next: number;
+    calls: number;
+    cacheHits: number;
+}
+
+function emptySamples(): TierSamples {
+    return { samples: [], next: 0, calls: 0, cacheHits: 0 };
+}
+
+let tierSamples: Record<SearchTier, TierSamples> = {
+    week: emptySamples(),
+    month: emptySamples(),
+    synonyms: emptySamples(),
+    listing: emptySamples(),
+};
+
+/** Record one tier lookup (ring buffer of the last TIMING_WINDOW durations per tier). */
+export function recordTierTiming(tier: SearchTier, durationMs: number, cached: boolean) {
+    const stats = tierSamples[tier];
+    stats.calls++;
+    if (cached) stats.cacheHits++;
+    if (stats.samples.length < TIMING_WINDOW) {
+        stats.samples.push(durationMs);
+    } else {
+        stats.samples[stats.next] = durationMs;
+        stats.next = (stats.next + 1) % TIMING_WINDOW;
+    }
+}
+
+/** Nearest-rank percentile over an ascending-sorted list. */
+function percentile(sorted: number[], p: number): number | null {
+    if (sorted.length === 0) return null;
+    const rank = Math.ceil((p / 100) * sorted.length);
+    return sorted[Math.min(sorted.length, Math.max(1, rank)) - 1];
+}
+
+/**
+ * p50/p95 per tier over the recent window of THIS instance
+ * (includes cache hits — `cacheHits` tells how many of `calls` were free).
+ */
+export function getSearchTierTimings(): Record<SearchTier, TierTimingStats> {
+    const result = {} as Record<SearchTier, TierTimingStats>;
+    for (const tier of Object.keys(tierSamples) as SearchTier[]) {
+        const { samples, calls, cacheHits } = tierSamples[tier];
+        const sorted = [...samples].sort((a, b) => a - b);
+        result[tier] = { calls, cacheHits, p50Ms: percentile(sorted, 50), p95Ms: percentile(sorted, 95) };
+    }
+    return result;
+}
+
+/** Reset timings and local caches (tests / benchmarks) */
+export function resetJobSearchCache() {
+    tierSamples = {
+        week: emptySamples(),
+        month: emptySamples(),
+        synonyms: emptySamples(),
+        listing: emptySamples(),
+    };
+    queryCache.clear();
+    listingCache.clear();
+    speculativeInFlight.clear();
+}
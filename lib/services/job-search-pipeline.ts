@@ -7,6 +7,18 @@
 
 import Anthropic from '@anthropic-ai/sdk';
 import { buildAtsKeywordPrompt, cleanAtsKeywords } from '@/lib/services/ats-keyword-filter';
+import {
+    cachedListing,
+    cachedSerpQuery,
+    peekSerpQuery,
+    recordTierTiming,
+    releaseSpeculativeSlot,
+    serpQueryCacheKey,
+    tryAcquireSpeculativeSlot,
+    type ListingDetails,
+    type SearchTier,
+} from '@/lib/services/job-search-cache';
+import { tracedFetch } from '@/lib/tracing';
 
 // ─── Types ────────────────────────────────────────────────────────
 
@@ -111,6 +123,19 @@ export interface JobSearchFilters {
 
 export interface SerpLocale { hl: string; gl: string; }
 
+// Progressive search is sequential by default — every tier costs a SerpAPI credit
+// on a cache miss. The next tier is only started early (speculatively) when the
+// current one is an uncached request still pending after SPECULATIVE_DELAY_MS.
+export const SPECULATIVE_DELAY_MS = 1500;
+// Speculative requests in flight per (query, date chip, locale) key, instance-wide
+const SPECULATIVE_BUDGET_PER_KEY = 1;
+
+interface SearchTierPlan {
+    tier: SearchTier;
+    query: string;
+    dateChip: string;
+}
+
 export async function searchJobs(
     query: string,
     location: string,
@@ -126,26 +151,16 @@ export async function searchJobs(
     const baseQuery = location ? `${query} ${location}` : query;
 
     // ── Progressive search: week → month → synonyms+month ──
-    // Step 1: Last 7 days
-    let rawJobs = await fetchSerpApiJobs(baseQuery, 'date_posted:week', apiKey, serpLocale);
-    console.log(`[Search] Step 1 (week): ${rawJobs.length} results for "${baseQuery}"`);
-
-    // Step 2: Widen to last 30 days if too few
-    if (rawJobs.length < MIN_RESULTS) {
-        const monthJobs = await fetchSerpApiJobs(baseQuery, 'date_posted:month', apiKey, serpLocale);
-        console.log(`[Search] Step 2 (month): ${monthJobs.length} results`);
-        rawJobs = deduplicateRawJobs([...rawJobs, ...monthJobs]);
+    const tiers: SearchTierPlan[] = [
+        { tier: 'week', query: baseQuery, dateChip: 'date_posted:week' },
+        { tier: 'month', query: baseQuery, dateChip: 'date_posted:month' },
+    ];
+    const synonymQuery = generateSynonymQuery(query, location);
+    if (synonymQuery && synonymQuery !== baseQuery) {
+        tiers.push({ tier: 'synonyms', query: synonymQuery, dateChip: 'date_posted:month' });
     }
 
-    // Step 3: Try synonym variations + month if still too few
-    if (rawJobs.length < MIN_RESULTS) {
-        const synonymQuery = generateSynonymQuery(query, location);
-        if (synonymQuery && synonymQuery !== baseQuery) {
-            const synonymJobs = await fetchSerpApiJobs(synonymQuery, 'date_posted:month', apiKey, serpLocale);
-            console.log(`[Search] Step 3 (synonyms "${synonymQuery}"): ${synonymJobs.length} results`);
-            rawJobs = deduplicateRawJobs([...rawJobs, ...synonymJobs]);
-        }
-    }
+    const rawJobs = await runProgressiveTiers(tiers, MIN_RESULTS, apiKey, serpLocale);
 
     if (rawJobs.length === 0) {
         console.log('[Search] No results after progressive expansion');
@@ -178,33 +193,11 @@ export async function searchJobs(
 
     await Promise.allSettled(
         jobsToEnrich.map(async (job, index) => {
-            const jobId = (job.raw as any).job_id;
-            if (!jobId) return;
-
-            try {
-                const listingParams = new URLSearchParams({
-                    engine: 'google_jobs_listing',
-                    q: jobId,
-                    api_key: apiKey,
-                });
-
-                const listingRes = await fetch(
-                    `https://serpapi.com/search?${listingParams.toString()}`
-                );
-                if (!listingRes.ok) return;
-
-                const listingData = await listingRes.json();
-                const applyOptions = listingData.apply_options || [];
-
-                if (applyOptions.length > 0) {
-                    const directLink = applyOptions[0]?.link;
-                    if (directLink) {
-                        mapped[index].apply_link = directLink;
-                    }
-                }
-            } catch {
-                // Silently fall back to share_link
+            const listing = await fetchListingDetails((job.raw as any).job_id, apiKey);
+            if (listing?.applyLink) {
+                mapped[index].apply_link = listing.applyLink;
             }
+            // No listing → silently fall back to share_link
         })
     );
 
@@ -223,9 +216,70 @@ export async function searchJobs(
     return deduplicated;
 }
 
-// ─── SerpAPI fetch helper ─────────────────────────────────────────
+/**
+ * Runs the tiers in order and stops as soon as MIN_RESULTS is reached.
+ * The next tier starts early only when it is certainly or probably needed:
+ *   - the current tier is cached and, merged, still short of MIN_RESULTS, or
+ *   - the current tier is a cache miss still pending after SPECULATIVE_DELAY_MS
+ *     (hedge against slow SerpAPI calls; subject to the per-key budget).
+ * A speculative tier that turns out to be unneeded is discarded, but its
+ * response stays in the query cache.
+ */
+async function runProgressiveTiers(
+    tiers: SearchTierPlan[],
+    minResults: number,
+    apiKey: string,
+    serpLocale: SerpLocale,
+): Promise<any[]> {
+    const started: Promise<any[]>[] = [];
+    const start = (i: number) => {
+        if (i < tiers.length && !started[i]) {
+            started[i] = fetchSerpApiJobs(tiers[i].query, tiers[i].dateChip, apiKey, serpLocale, tiers[i].tier);
+        }
+    };
+    const speculate = (i: number) => {
+        if (i >= tiers.length || started[i]) return;
+        const key = serpQueryCacheKey(tiers[i].query, tiers[i].dateChip, serpLocale);
+        if (!tryAcquireSpeculativeSlot(key, SPECULATIVE_BUDGET_PER_KEY)) return;
+        console.log(`[Search] Tier ${i} still pending after ${SPECULATIVE_DELAY_MS}ms — starting tier ${i + 1} (${tiers[i].tier})`);
+        start(i);
+        started[i].finally(() => releaseSpeculativeSlot(key));
+    };
+
+    let rawJobs: any[] = [];
+    for (let i = 0; i < tiers.length; i++) {
+        start(i);
+
+        let hedge: ReturnType<typeof setTimeout> | undefined;
+        const cached = peekSerpQuery(tiers[i].query, tiers[i].dateChip, serpLocale);
+        if (cached !== undefined) {
+            if (mergeTierJobs(rawJobs, cached, i).length < minResults) start(i + 1);
+        } else {
+            hedge = setTimeout(() => speculate(i + 1), SPECULATIVE_DELAY_MS);
+        }
+
+        const tierJobs = await started[i];
+        if (hedge) clearTimeout(hedge);
+        console.log(`[Search] Tier ${i + 1} (${tiers[i].tier} "${tiers[i].query}"): ${tierJobs.length} results`);
+        rawJobs = mergeTierJobs(rawJobs, tierJobs, i);
+        if (rawJobs.length >= minResults) break;
+    }
+    return rawJobs;
+}
+
+function mergeTierJobs(rawJobs: any[], tierJobs: any[], tierIndex: number): any[] {
+    return tierIndex === 0 ? tierJobs : deduplicateRawJobs([...rawJobs, ...tierJobs]);
+}
+
+// ─── SerpAPI fetch helpers ────────────────────────────────────────
 
-async function fetchSerpApiJobs(query: string, dateChip: string, apiKey: string, serpLocale: SerpLocale = { hl: 'de', gl: 'de' }): Promise<any[]> {
+async function fetchSerpApiJobs(
+    query: string,
+    dateChip: string,
+    apiKey: string,
+    serpLocale: SerpLocale = { hl: 'de', gl: 'de' },
+    tier: SearchTier = 'week',
+): Promise<any[]> {
     const params = new URLSearchParams({
         engine: 'google_jobs',
         q: query,
@@ -235,19 +289,59 @@ async function fetchSerpApiJobs(query: string, dateChip: string, apiKey: string,
         api_key: apiKey,
     });
 
+    const startedAt = Date.now();
     try {
-        const response = await withRetry(async () => {
-            const res = await fetch(`https://serpapi.com/search?${params.toString()}`);
-            if (!res.ok) throw new Error(`SerpAPI error: ${res.status} ${res.statusText}`);
-            return res.json();
+        const { value, cached } = await cachedSerpQuery(query, dateChip, serpLocale, async () => {
+            const response = await withRetry(async () => {
+                const res = await tracedFetch('serpapi', `https://serpapi.com/search?${params.toString()}`);
+                if (!res.ok) throw new Error(`SerpAPI error: ${res.status} ${res.statusText}`);
+                return res.json();
+            });
+            return response.jobs_results || [];
         });
-        return response.jobs_results || [];
+        recordTierTiming(tier, Date.now() - startedAt, cached);
+        return value;
     } catch (error) {
+        recordTierTiming(tier, Date.now() - startedAt, false);
         console.warn(`[Search] SerpAPI fetch failed for "${query}":`, error);
         return [];
     }
 }
 
+/**
+ * google_jobs_listing lookup by job_id — cached, shared by the apply-link
+ * enrichment in searchJobs() and fetchSerpApiFullDescription().
+ * Returns null when the listing could not be fetched (never cached).
+ */
+async function fetchListingDetails(jobId: string | undefined, apiKey: string): Promise<ListingDetails | null> {
+    if (!jobId) return null;
+
+    const startedAt = Date.now();
+    try {
+        const { value, cached } = await cachedListing(jobId, async () => {
+            const listingParams = new URLSearchParams({
+                engine: 'google_jobs_listing',
+                q: jobId,
+                api_key: apiKey,
+            });
+            const res = await tracedFetch('serpapi', `https://serpapi.com/search?${listingParams.toString()}`);
+            if (!res.ok) throw new Error(`SerpAPI listing fetch failed: ${res.status}`);
+
+            const data = await res.json();
+            return {
+                applyLink: data.apply_options?.[0]?.link || null,
+                description: data.search_information?.job_description || data.description || null,
+            };
+        });
+        recordTierTiming('listing', Date.now() - startedAt, cached);
+        return value;
+    } catch (error: any) {
+        recordTierTiming('listing', Date.now() - startedAt, false);
+        console.warn(`⚠️ [Pipeline] ${error.message}`);
+        return null;
+    }
+}
+
 // ─── Deterministic synonym expansion (no AI, no hallucination) ───
 
 const SYNONYM_PAIRS: [string, string][] = [
@@ -323,29 +417,12 @@ export async function fetchSerpApiFullDescription(
 ): Promise<string | null> {
     if (!jobId || !apiKey) return null;
 
-    try {
-        const params = new URLSearchParams({
-            engine: 'google_jobs_listing',
-            q: jobId,
-            api_key: apiKey,
-        });
-        const res = await fetch(`https://serpapi.com/search?${params.toString()}`);
-        if (!res.ok) {
-            console.warn(`⚠️ [Pipeline] SerpAPI listing fetch failed: ${res.status}`);
-            return null;
-        }
-        const data = await res.json();
-        const desc = data.search_information?.job_description
-            || data.description
-            || null;
-        if (desc) {
-            console.log(`✅ [Pipeline] SerpAPI full description: ${desc.length} chars`);
-        }
-        return desc;
-    } catch (err: any) {
-        console.warn(`⚠️ [Pipeline] SerpAPI listing error: ${err.message}`);
-        return null;
+    const listing = await fetchListingDetails(jobId, apiKey);
+    const desc = listing?.description ?? null;
+    if (desc) {
+        console.log(`✅ [Pipeline] SerpAPI full description: ${desc.length} chars`);
     }
+    return desc;
 }
 
 // ─── §12.5 Deep Scrape (Enrichment only — Jina Reader) ───────────
@@ -387,7 +464,7 @@ async function scrapeWithJina(url: string): Promise<string | null> {
 
     try {
         console.log(`🔄 [Pipeline] Jina Reader scraping: ${url}`);
-        const res = await fetch(`https://r.jina.ai/${url}`, {
+        const res = await tracedFetch('jina', `https://r.jina.ai/${url}`, {
             headers: {
                 'Authorization': `Bearer ${apiKey}`,
                 'Accept': 'text/markdown',
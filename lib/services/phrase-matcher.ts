@@ -0,0 +1,168 @@
+/**
+ * Phrase Matcher — Pathly V2.0
+ * Shared multi-pattern matching engine (Aho-Corasick automaton).
+ *
+ * The automaton is built ONCE per pattern list (module load for static lists)
+ * and answers "which patterns occur and where" in a single left-to-right pass
+ * over the text, independent of the number of patterns.
+ *
+ * Consumers:
+ *   1. Anti-Fluff: scanForFluff() / findFluffOccurrences() (blacklist phrases)
+ *   2. ATS Keyword Filter: buildJDIndex() (hallucination vocabulary vs. JD)
+ *
+ * Matching is exact on UTF-16 code units. Callers are responsible for
+ * normalization (lowercasing, accent stripping) of both patterns and text,
+ * unless `caseInsensitive` is set, which lowercases patterns and text with
+ * String.prototype.toLowerCase() — identical to the previous `includes` scans.
+ */
+
+export interface PhraseMatch {
+    /** Index of the pattern in the list passed to buildPhraseMatcher() */
+    patternIndex: number;
+    /** Start offset (inclusive) in the (lowercased, if caseInsensitive) text */
+    start: number;
+    /** End offset (exclusive) */
+    end: number;
+}
+
+export interface PhraseMatcherOptions {
+    caseInsensitive?: boolean;
+}
+
+export interface PhraseMatcher {
+    readonly patterns: readonly string[];
+    /** All (possibly overlapping) occurrences, ordered by end offset. */
+    findAll(text: string): PhraseMatch[];
+    /** Pattern indices that occur at least once, ascending. Stops early once every pattern was seen. */
+    findPresent(text: string): number[];
+}
+
+interface AutomatonNode {
+    next: Map<number, number>;
+    fail: number;
+    /** Pattern indices ending at this node (including those inherited via fail links) */
+    outputs: number[];
+}
+
+function createNode(): AutomatonNode {
+    return { next: new Map(), fail: 0, outputs: [] };
+}
+
+/**
+ * Build an Aho-Corasick automaton over `patterns`, compiled to a dense
+ * transition table (states × pattern alphabet) so scanning is one array
+ * lookup per character with no failure-link walks.
+ * Empty patterns are ignored (they would match everywhere).
+ * Duplicate patterns are kept — each index is reported separately.
+ */
+export function buildPhraseMatcher(
+    patterns: readonly string[],
+    options: PhraseMatcherOptions = {},
+): PhraseMatcher {
+    const caseInsensitive = options.caseInsensitive ?? false;
+    const nodes: AutomatonNode[] = [createNode()];
+    const patternLengths: number[] = [];
+    let activePatterns = 0;
+
+    // ─── Phase 1: Trie ────────────────────────────────────────────────────
+    patterns.forEach((raw, patternIndex) => {
+        const pattern = caseInsensitive ? raw.toLowerCase() : raw;
+        patternLengths[patternIndex] = pattern.length;
+        if (!pattern) return;
+        activePatterns++;
+
+        let state = 0;
+        for (let i = 0; i < pattern.length; i++) {
+            const code = pattern.charCodeAt(i);
+            let nextState = nodes[state].next.get(code);
+            if (nextState === undefined) {
+                nextState = nodes.length;
+                nodes.push(createNode());
+                nodes[state].next.set(code, nextState);
+            }
+            state = nextState;
+        }
+        nodes[state].outputs.push(patternIndex);
+    });
+
+    // ─── Phase 2: Failure links (BFS) ─────────────────────────────────────
+    const queue: number[] = [];
+    for (const child of nodes[0].next.values()) {
+        nodes[child].fail = 0;
+        queue.push(child);
+    }
+    for (let head = 0; head < queue.length; head++) {
+        const state = queue[head];
+        for (const [code, child] of nodes[state].next) {
+            let fallback = nodes[state].fail;
+            while (fallback !== 0 && !nodes[fallback].next.has(code)) {
+                fallback = nodes[fallback].fail;
+            }
+            const target = nodes[fallback].next.get(code);
+            nodes[child].fail = target !== undefined && target !== child ? target : 0;
+            if (nodes[nodes[child].fail].outputs.length > 0) {
+                nodes[child].outputs = nodes[child].outputs.concat(nodes[nodes[child].fail].outputs);
+            }
+            queue.push(child);
+        }
+    }
+
+    // ─── Phase 3: Dense DFA table ─────────────────────────────────────────
+    // Characters that occur in no pattern share class 0 (always falls back to root).
+    const charClass = new Uint16Array(0x10000);
+    let alphabetSize = 1;
+    for (const node of nodes) {
+        for (const code of node.next.keys()) {
+            if (charClass[code] === 0) charClass[code] = alphabetSize++;
+        }
+    }
+    const transitions = new Int32Array(nodes.length * alphabetSize);
+    // BFS order guarantees a state's fail target is filled before the state itself
+    for (const state of [0, ...queue]) {
+        const row = state * alphabetSize;
+        const failRow = nodes[state].fail * alphabetSize;
+        for (let cls = 1; cls < alphabetSize; cls++) {
+            transitions[row + cls] = state === 0 ? 0 : transitions[failRow + cls];
+        }
+        for (const [code, child] of nodes[state].next) {
+            transitions[row + charClass[code]] = child;
+        }
+    }
+    const outputs = nodes.map(node => node.outputs);
+
+    function prepare(text: string): string {
+        return caseInsensitive ? text.toLowerCase() : text;
+    }
+
+    function findAll(text: string): PhraseMatch[] {
+        const haystack = prepare(text ?? '');
+        const matches: PhraseMatch[] = [];
+        let state = 0;
+        for (let i = 0; i < haystack.length; i++) {
+            state = transitions[state * alphabetSize + charClass[haystack.charCodeAt(i)]];
+            const hits = outputs[state];
+            for (let o = 0; o < hits.length; o++) {
+                // Inherited outputs are shorter suffixes — use each pattern's own length
+                const patternIndex = hits[o];
+                matches.push({ patternIndex, start: i + 1 - patternLengths[patternIndex], end: i + 1 });
+            }
+        }
+        return matches;
+    }
+
+    function findPresent(text: string): number[] {
+        const haystack = prepare(text ?? '');
+        const seen = new Set<number>();
+        let state = 0;
+        for (let i = 0; i < haystack.length && seen.size < activePatterns; i++) {
+            state = transitions[state * alphabetSize + charClass[haystack.charCodeAt(i)]];
+            const hits = outputs[state];
+            for (let o = 0; o < hits.length; o++) {
+                seen.add(hits[o]);
+            }
+        }
+        return [...seen].sort((a, b) => a - b);
+    }
+
+    return { patterns, findAll, findPresent };
+}
@@ -6,6 +6,12 @@
  * Supports: de, en, es (all 3 app languages).
  *
  * DSGVO Art. 25 (Privacy by Design) + Art. 28 (Processor Transfer Minimization)
+ *
+ * Two engines produce the same SanitizeResult:
+ *   - 'multi-pass' (default): one String.replace() per PII type
+ *   - 'single-pass': detectors record spans against the original text and the
+ *     sanitized string is assembled once — used for large CVs and batch uploads.
+ * createPiiSanitizerStream() applies the single-pass engine chunk by chunk.
  */
 
 import crypto from 'crypto';
@@ -30,6 +36,16 @@ export interface SanitizeResult {
     tokenMap: Map<string, string>;
 }
 
+export type SanitizeMode = 'multi-pass' | 'single-pass';
+
+export interface SanitizeOptions {
+    /** Engine selection. Both produce identical results; 'single-pass' avoids
+     *  re-allocating the full text once per PII type. Default: 'multi-pass'. */
+    mode?: SanitizeMode;
+}
+
+type PiiType = 'NAME' | 'EMAIL' | 'PHONE' | 'IBAN';
+
 // ─── Regex Patterns (de/en/es) ──────────────────────────────────────
 
 const EMAIL_REGEX = /[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}/g;
@@ -37,6 +53,7 @@ const PHONE_REGEX = /\+?[0-9][\d\s\-/()]{7,19}/g;
 const IBAN_REGEX = /[A-Z]{2}\d{2}[A-Z0-9]{4}\d{7}[A-Z0-9]{0,16}/g;
 // SAFETY NOTE: These /g regexes are module-level constants.
 // String.prototype.replace() always resets lastIndex after each call — SAFE for shared use.
+// The single-pass engine calls .exec() only on its own per-call RegExp copies.
 // ⚠️ NEVER call .test() or .exec() on these regexes — those retain lastIndex between calls
 // and would produce incorrect results on subsequent invocations (concurrency bug).
 
@@ -145,75 +162,86 @@ const FIRST_WORD_STOPLIST = new Set([
     'Zürich', 'Bern', 'Basel', 'Genf', 'Lausanne',
 ]);
 
+function isPhoneCandidate(match: string): boolean {
+    // German phone numbers have ≥10 digits. Year ranges (2020-2023 = 8 digits)
+    // and short codes are excluded by this threshold.
+    return match.replace(/\D/g, '').length >= 10;
+}
+
+function isNameCandidate(first: string, last: string): boolean {
+    if (FALSE_POSITIVE_GUARD.has(`${first} ${last}`)) return false;
+    if (FIRST_WORD_STOPLIST.has(first)) return false;
+    return true;
+}
+
+/** Mutable token state — shared across chunks by createPiiSanitizerStream(). */
+interface TokenState {
+    tokenMap: Map<string, string>;
+    warningFlags: string[];
+    counters: Record<PiiType, number>;
+}
+
+function createTokenState(): TokenState {
+    return { tokenMap: new Map(), warningFlags: [], counters: { NAME: 0, EMAIL: 0, PHONE: 0, IBAN: 0 } };
+}
+
+function issueToken(state: TokenState, type: PiiType, original: string): string {
+    const token = `__${type}_${state.counters[type]}__`;
+    state.counters[type]++;
+    state.tokenMap.set(token, original);
+    if (!state.warningFlags.includes(type)) state.warningFlags.push(type);
+    return token;
+}
+
+function emptyResult(): SanitizeResult {
+    return { sanitized: '', restore: (t: string) => t, restoreJson: (t: string) => t, warningFlags: [], tokenMap: new Map() };
+}
+
 /**
  * Sanitizes PII in text for safe AI model transfer.
  * Token format: __TYPE_INDEX__ (survives Claude reformulations)
  */
-export function sanitizeForAI(input: string): SanitizeResult {
+export function sanitizeForAI(input: string, options: SanitizeOptions = {}): SanitizeResult {
     if (!input || input.trim() === '') {
-        return { sanitized: '', restore: (t: string) => t, restoreJson: (t: string) => t, warningFlags: [], tokenMap: new Map() };
+        return emptyResult();
     }
 
-    const tokenMap = new Map<string, string>(); // token → original
-    const warningFlags: string[] = [];
+    return options.mode === 'single-pass'
+        ? sanitizeSinglePass(input)
+        : sanitizeMultiPass(input);
+}
+
+// ─── Engine 1: Multi-Pass (one replace per PII type) ────────────────
+
+function sanitizeMultiPass(input: string): SanitizeResult {
+    const state = createTokenState();
+    const { tokenMap, warningFlags } = state;
     let result = input;
-    let counters = { NAME: 0, EMAIL: 0, PHONE: 0, IBAN: 0 };
 
     // Order matters: emails first (contain dots that phone regex might grab)
 
     // 1. Emails
-    result = result.replace(EMAIL_REGEX, (match) => {
-        const token = `__EMAIL_${counters.EMAIL}__`;
-        counters.EMAIL++;
-        tokenMap.set(token, match);
-        if (!warningFlags.includes('EMAIL')) warningFlags.push('EMAIL');
-        return token;
-    });
+    result = result.replace(EMAIL_REGEX, (match) => issueToken(state, 'EMAIL', match));
 
     // 2. IBANs (before phones — IBAN contains numbers)
-    result = result.replace(IBAN_REGEX, (match) => {
-        const token = `__IBAN_${counters.IBAN}__`;
-        counters.IBAN++;
-        tokenMap.set(token, match);
-        if (!warningFlags.includes('IBAN')) warningFlags.push('IBAN');
-        return token;
-    });
+    result = result.replace(IBAN_REGEX, (match) => issueToken(state, 'IBAN', match));
 
     // 3. Phone numbers
     result = result.replace(PHONE_REGEX, (match) => {
-        // German phone numbers have ≥10 digits. Year ranges (2020-2023 = 8 digits)
-        // and short codes are excluded by this threshold.
-        const digitsOnly = match.replace(/\D/g, '');
-        if (digitsOnly.length < 10) return match;
-        const token = `__PHONE_${counters.PHONE}__`;
-        counters.PHONE++;
-        tokenMap.set(token, match);
-        if (!warningFlags.includes('PHONE')) warningFlags.push('PHONE');
-        return token;
+        if (!isPhoneCandidate(match)) return match;
+        return issueToken(state, 'PHONE', match);
     });
 
     // 4a. CAPS Names (BEFORE standard names — catches "MAX MUSTERMANN" patterns)
     result = result.replace(CAPS_NAME_REGEX, (match, first, last) => {
-        const fullName = `${first} ${last}`;
-        if (FALSE_POSITIVE_GUARD.has(fullName)) return match;
-        if (FIRST_WORD_STOPLIST.has(first)) return match;
-        const token = `__NAME_${counters.NAME}__`;
-        counters.NAME++;
-        tokenMap.set(token, match);
-        if (!warningFlags.includes('NAME')) warningFlags.push('NAME');
-        return token;
+        if (!isNameCandidate(first, last)) return match;
+        return issueToken(state, 'NAME', match);
     });
 
     // 4b. Title Case Names (standard heuristic — "Max Mustermann")
     result = result.replace(NAME_REGEX, (match, first, last) => {
-        const fullName = `${first} ${last}`;
-        if (FALSE_POSITIVE_GUARD.has(fullName)) return match;
-        if (FIRST_WORD_STOPLIST.has(first)) return match;
-        const token = `__NAME_${counters.NAME}__`;
-        counters.NAME++;
-        tokenMap.set(token, match);
-        if (!warningFlags.includes('NAME')) warningFlags.push('NAME');
-        return token;
+        if (!isNameCandidate(first, last)) return match;
+        return issueToken(state, 'NAME', match);
     });
 
     // Build restore function (exact-string map lookup, NOT regex)
@@ -233,15 +261,7 @@ export function sanitizeForAI(input: string): SanitizeResult {
     const restoreJson = (jsonString: string): string => {
         let restored = jsonString;
         for (const [token, original] of tokenMap.entries()) {
-            // JSON-escape: handle chars that break JSON string literals
-            const escaped = original
-                .replace(/\\/g, '\\\\')
-                .replace(/"/g, '\\"')
-                .replace(/\n/g, '\\n')
-                .replace(/\r/g, '\\r')
-                .replace(/\t/g, '\\t')
-                .replace(/[\x00-\x1f]/g, (c) => `\\u${c.charCodeAt(0).toString(16).padStart(4, '0')}`);
-            restored = restored.split(token).join(escaped);
+            restored = restored.split(token).join(escapeJsonValue(original));
         }
         return restored;
     };
@@ -249,6 +269,281 @@ export function sanitizeForAI(input: string): SanitizeResult {
     return { sanitized: result, restore, restoreJson, warningFlags, tokenMap };
 }
 
+// JSON-escape: handle chars that break JSON string literals
+function escapeJsonValue(original: string): string {
+    return original
+        .replace(/\\/g, '\\\\')
+        .replace(/"/g, '\\"')
+        .replace(/\n/g, '\\n')
+        .replace(/\r/g, '\\r')
+        .replace(/\t/g, '\\t')
+        .replace(/[\x00-\x1f]/g, (c) => `\\u${c.charCodeAt(0).toString(16).padStart(4, '0')}`);
+}
+
+// ─── Engine 2: Single-Pass (span detection + one assembly) ──────────
+//
+// Equivalence with the multi-pass engine: every earlier replacement turns a
+// span into a token (__TYPE_N__). No detector regex can match '_', so a token
+// is an opaque barrier whose only observable effect is its edge character '_'
+// (a regex word character, not whitespace, not [.!?]). Later detectors therefore
+// run on the gaps between already-claimed spans; the two context-sensitive
+// detectors (CAPS_NAME: \b, NAME: lookbehind) see a '_' sentinel at each gap
+// edge that borders a span — exactly what they saw next to the token before.
+
+interface PiiSpan {
+    start: number;
+    end: number;
+    token: string;
+}
+
+interface DetectorStage {
+    type: PiiType;
+    regex: RegExp;
+    /** Regex inspects neighbouring characters (\b or lookbehind) */
+    contextSensitive: boolean;
+    accept: (match: RegExpExecArray) => boolean;
+}
+
+// Same order as the multi-pass engine — token numbering depends on it.
+const DETECTOR_STAGES: DetectorStage[] = [
+    { type: 'EMAIL', regex: EMAIL_REGEX, contextSensitive: false, accept: () => true },
+    { type: 'IBAN', regex: IBAN_REGEX, contextSensitive: false, accept: () => true },
+    { type: 'PHONE', regex: PHONE_REGEX, contextSensitive: false, accept: (m) => isPhoneCandidate(m[0]) },
+    { type: 'NAME', regex: CAPS_NAME_REGEX, contextSensitive: true, accept: (m) => isNameCandidate(m[1], m[2]) },
+    { type: 'NAME', regex: NAME_REGEX, contextSensitive: true, accept: (m) => isNameCandidate(m[1], m[2]) },
+];
+
+const SPAN_SENTINEL = '_';
+
+function mergeSpans(a: PiiSpan[], b: PiiSpan[]): PiiSpan[] {
+    if (b.length === 0) return a;
+    const merged: PiiSpan[] = [];
+    let i = 0;
+    let j = 0;
+    while (i < a.length || j < b.length) {
+        if (j >= b.length || (i < a.length && a[i].start < b[j].start)) merged.push(a[i++]);
+        else merged.push(b[j++]);
+    }
+    return merged;
+}
+
+/** Detects PII spans in `input` (document order) and issues tokens into `state`. */
+function detectSpans(input: string, state: TokenState): PiiSpan[] {
+    let spans: PiiSpan[] = [];
+
+    for (const stage of DETECTOR_STAGES) {
+        // Private instance: exec() mutates lastIndex (see SAFETY NOTE above)
+        const regex = new RegExp(stage.regex.source, stage.regex.flags);
+        const found: PiiSpan[] = [];
+        let gapStart = 0;
+
+        for (let i = 0; i <= spans.length; i++) {
+            const gapEnd = i < spans.length ? spans[i].start : input.length;
+            if (gapEnd > gapStart) {
+                const prefix = stage.contextSensitive && i > 0 ? SPAN_SENTINEL : '';
+                const suffix = stage.contextSensitive && i < spans.length ? SPAN_SENTINEL : '';
+                const gap = gapStart === 0 && gapEnd === input.length
+                    ? input
+                    : prefix + input.slice(gapStart, gapEnd) + suffix;
+
+                regex.lastIndex = 0;
+                let match: RegExpExecArray | null;
+                while ((match = regex.exec(gap)) !== null) {
+                    if (match[0].length === 0) {
+                        regex.lastIndex++;
+                        continue;
+                    }
+                    if (!stage.accept(match)) continue;
+                    const start = gapStart + match.index - prefix.length;
+                    found.push({ start, end: start + match[0].length, token: issueToken(state, stage.type, match[0]) });
+                }
+            }
+            if (i < spans.length) gapStart = spans[i].end;
+        }
+
+        spans = mergeSpans(spans, found);
+    }
+
+    return spans;
+}
+
+function assembleSanitized(input: string, spans: PiiSpan[]): string {
+    if (spans.length === 0) return input;
+    const parts: string[] = [];
+    let cursor = 0;
+    for (const span of spans) {
+        parts.push(input.slice(cursor, span.start), span.token);
+        cursor = span.end;
+    }
+    parts.push(input.slice(cursor));
+    return parts.join('');
+}
+
+// Matches every token issueToken() can produce
+const TOKEN_REGEX = /__(?:NAME|EMAIL|PHONE|IBAN)_\d+__/g;
+
+/**
+ * Restore via one regex scan + Map lookup (O(text) instead of O(tokens × text)).
+ * Reads `tokenMap` live, so stream restorers see tokens issued by later chunks.
+ * JSON-escaped values are memoized per token.
+ */
+function buildTokenRestorers(tokenMap: Map<string, string>): Pick<SanitizeResult, 'restore' | 'restoreJson'> {
+    const jsonEscaped = new Map<string, string>();
+
+    const restore = (text: string): string =>
+        text.replace(TOKEN_REGEX, (token) => tokenMap.get(token) ?? token);
+
+    const restoreJson = (jsonString: string): string =>
+        jsonString.replace(TOKEN_REGEX, (token) => {
+            const original = tokenMap.get(token);
+            if (original === undefined) return token;
+            let escaped = jsonEscaped.get(token);
+            if (escaped === undefined) {
+                escaped = escapeJsonValue(original);
+                jsonEscaped.set(token, escaped);
+            }
+            return escaped;
+        });
+
+    return { restore, restoreJson };
+}
+
+function sanitizeSinglePass(input: string): SanitizeResult {
+    const state = createTokenState();
+    const sanitized = assembleSanitized(input, detectSpans(input, state));
+    return {
+        sanitized,
+        ...buildTokenRestorers(state.tokenMap),
+        warningFlags: state.warningFlags,
+        tokenMap: state.tokenMap,
+    };
+}
+
+// ─── Streaming / Chunked API ────────────────────────────────────────
+
+// A chunk may only end right after a character that no detector regex can
+// contain and that is not [.!?] (NAME lookbehind). Cutting there gives the same
+// spans as sanitizing the whole document at once.
+const SAFE_CUT_CHARS = new Set([',', ';', ':', '|', '•', '·', '▪', '–', '—']);
+
+// Fallback for text without any SAFE_CUT_CHARS (prose with only '.' and line
+// breaks): above this size the buffer is cut after a single whitespace between
+// two lowercase letters. No PHONE/EMAIL/IBAN span contains letters around a
+// space, a NAME part must start uppercase, and the next chunk starts with a
+// lowercase letter (no NAME lookbehind involved) — so this cut is exact too.
+const STREAM_MAX_BUFFER = 64_000;
+const LOWERCASE = /\p{Ll}/u;
+const WHITESPACE = /\s/;
+
+/** Cut offset after the last SAFE_CUT_CHARS in buffer[from..], or 0 */
+function lastSafeCut(buffer: string, from: number): number {
+    for (let i = buffer.length - 1; i >= from; i--) {
+        if (SAFE_CUT_CHARS.has(buffer[i])) return i + 1;
+    }
+    return 0;
+}
+
+/** Cut offset after the last lowercase-space-lowercase gap whose space is at ≥ from, or 0 */
+function lastWordGapCut(buffer: string, from: number): number {
+    for (let i = buffer.length - 2; i >= Math.max(from, 1); i--) {
+        if (WHITESPACE.test(buffer[i]) && LOWERCASE.test(buffer[i - 1]) && LOWERCASE.test(buffer[i + 1])) {
+            return i + 1;
+        }
+    }
+    return 0;
+}
+
+export interface PiiSanitizerStream {
+    /** Feed the next chunk. Returns the sanitized text that is final so far
+     *  (may be '' while no safe cut point has been seen). */
+    write(chunk: string): string;
+    /** Flush the buffered tail. Call once after the last write(). */
+    end(): string;
+    /** Aggregate result over everything emitted so far. */
+    result(): SanitizeResult;
+}
+
+export interface PiiSanitizerStreamOptions {
+    /** Buffer size above which a word-gap cut is forced (default 64 000 chars) */
+    maxBufferChars?: number;
+}
+
+/**
+ * Streaming sanitizer for very long documents (multi-page CVs, batch uploads).
+ * Token identity is stable across chunks (one shared tokenMap). Output text
+ * equals sanitizeForAI() except for NAME numbering: one-shot numbers all CAPS
+ * names before Title Case names document-wide, the stream does so per chunk.
+ *
+ * Each write() scans only the new chunk for a cut point — the buffered tail
+ * holds none (it starts after the previous cut), so long runs without a cut
+ * character stay linear instead of rescanning the whole buffer.
+ */
+export function createPiiSanitizerStream(options: PiiSanitizerStreamOptions = {}): PiiSanitizerStream {
+    const maxBufferChars = options.maxBufferChars ?? STREAM_MAX_BUFFER;
+    const state = createTokenState();
+    const restorers = buildTokenRestorers(state.tokenMap);
+    const emitted: string[] = [];
+    let buffer = '';
+    // Last word-gap cut seen in the buffer (0 = none)
+    let wordGapCut = 0;
+
+    const flush = (text: string): string => {
+        if (!text) return '';
+        const sanitized = assembleSanitized(text, detectSpans(text, state));
+        emitted.push(sanitized);
+        return sanitized;
+    };
+
+    return {
+        write(chunk: string): string {
+            const start = buffer.length;
+            buffer += chunk;
+            // A gap's space may be the last char of the previous chunk
+            wordGapCut = lastWordGapCut(buffer, start - 1) || wordGapCut;
+
+            let cut = lastSafeCut(buffer, start);
+            if (cut === 0 && buffer.length > maxBufferChars) cut = wordGapCut;
+            if (cut === 0) return '';
+
+            const ready = buffer.slice(0, cut);
+            buffer = buffer.slice(cut);
+            wordGapCut = wordGapCut > cut ? wordGapCut - cut : 0;
+            return flush(ready);
+        },
+        end(): string {
+            const tail = buffer;
+            buffer = '';
+            wordGapCut = 0;
+            return flush(tail);
+        },
+        result(): SanitizeResult {
+            return {
+                sanitized: emitted.join(''),
+                ...restorers,
+                warningFlags: state.warningFlags,
+                tokenMap: state.tokenMap,
+            };
+        },
+    };
+}
+
+/**
+ * Convenience wrapper: sanitize a long document in `chunkSize` slices through
+ * createPiiSanitizerStream(). Same empty-input behaviour as sanitizeForAI().
+ */
+export function sanitizeChunked(input: string, chunkSize = 64_000): SanitizeResult {
+    if (!input || input.trim() === '') {
+        return emptyResult();
+    }
+
+    const stream = createPiiSanitizerStream();
+    for (let offset = 0; offset < input.length; offset += chunkSize) {
+        stream.write(input.slice(offset, offset + chunkSize));
+    }
+    stream.end();
+    return stream.result();
+}
+
 /**
  * Builds a SHA256 content hash for audit logging without storing plaintext.
  */
@@ -7,19 +7,17 @@
  * forcing the LLM to honor the pre-match decision.
  *
  * Shared between:
- *   - lib/inngest/cv-match-pipeline.ts (PROD: Inngest Step 2.5)
+ *   - lib/inngest/cv-match-pipeline.ts (PROD: Inngest Step 2.5 + batch mode)
  *   - app/api/cv/match/route.ts (DEV: synchronous pipeline)
  *
+ * The CV side is compiled once into a CvSkillIndex (flattened skills, memoized
+ * word-boundary regexes, ecosystem families) so batch mode can match one CV
+ * against many jobs without re-reading or re-flattening the profile.
+ *
  * ⚠ SYNC CONTRACT: Logic changes here affect both pipelines identically.
  */
 
-import { createClient as createAdminClient } from '@supabase/supabase-js';
-
-const supabaseAdmin = createAdminClient(
-    process.env.NEXT_PUBLIC_SUPABASE_URL!,
-    process.env.SUPABASE_SERVICE_ROLE_KEY!,
-    { auth: { autoRefreshToken: false, persistSession: false } }
-);
+import { getSupabaseAdmin } from '@/lib/supabase/admin';
 
 export interface PreMatchResult {
     found: string[];
@@ -34,6 +32,22 @@ export interface EcosystemHint {
     family: string;    // The ecosystem name (e.g. "Microsoft")
 }
 
+/** Compiled CV side of the pre-match — build once, match against many jobs. */
+export interface CvSkillIndex {
+    /** Deduplicated, lowercased professional skills, roles, bullets, languages, certs */
+    skills: string[];
+    /** Word-boundary regex per skill (compiled lazily, reused across jobs) */
+    boundaryRegex: Map<string, RegExp>;
+    /** Ecosystem family → first CV skill that belongs to it (absent = no related skill) */
+    familySkill: Map<string, string>;
+}
+
+/** JSON-safe form of a CvSkillIndex (Inngest step output). Regexes are rebuilt lazily. */
+export interface SerializedCvSkillIndex {
+    skills: string[];
+    familySkill: Array<[string, string]>;
+}
+
 /**
  * Ecosystem clusters: product families where having experience with one
  * tool indicates RELATED (not identical) competence with others.
@@ -90,43 +104,13 @@ const EXCLUDED_CATEGORIES = new Set([
 ]);
 
 /**
- * Deterministically match buzzwords against the user's structured CV data.
+ * Build the reusable skill index from `user_profiles.cv_structured_data`.
  *
- * Returns `null` if no buzzwords or no structured skills to match against
+ * Returns `null` if there are no structured skills to match against
  * (caller falls back to LLM-only classification).
  */
-export async function preMatchKeywords(
-    userId: string,
-    buzzwords: string[]
-): Promise<PreMatchResult | null> {
-    if (!buzzwords || buzzwords.length === 0) {
-        console.log('[pre-match] No buzzwords to match — skipping');
-        return null;
-    }
-
-    // Load structured CV data
-    let cvData: any = null;
-    try {
-        const { data: profile, error: profileErr } = await supabaseAdmin
-            .from('user_profiles')
-            .select('cv_structured_data')
-            .eq('id', userId)
-            .single();
-
-        if (profileErr) {
-            console.warn('[pre-match] Supabase query failed — LLM-only fallback:', profileErr.message);
-            return null;
-        }
-        cvData = profile?.cv_structured_data;
-    } catch (dbErr: any) {
-        console.warn('[pre-match] Unexpected DB error — LLM-only fallback:', dbErr?.message);
-        return null;
-    }
-
-    if (!cvData?.skills || !Array.isArray(cvData.skills)) {
-        console.log('[pre-match] No cv_structured_data.skills found — LLM-only fallback');
-        return null;
-    }
+export function buildCvSkillIndex(cvData: any): CvSkillIndex | null {
+    if (!cvData?.skills || !Array.isArray(cvData.skills)) return null;
 
     // Flatten all professional skills into a single lowercase array
     const cvSkillsFlat: string[] = [];
@@ -181,7 +165,47 @@ export async function preMatchKeywords(
     }
 
     // Deduplicate
-    const uniqueSkills = [...new Set(cvSkillsFlat)];
+    const skills = [...new Set(cvSkillsFlat)];
+
+    // Ecosystem membership of the CV side is job-independent — resolve it once
+    const familySkill = new Map<string, string>();
+    for (const [family, terms] of Object.entries(ECOSYSTEM_CLUSTERS)) {
+        const skill = skills.find(s => terms.some(term => s.includes(term) || term.includes(s)));
+        if (skill) familySkill.set(family, skill);
+    }
+
+    return { skills, boundaryRegex: new Map(), familySkill };
+}
+
+export function serializeCvSkillIndex(index: CvSkillIndex): SerializedCvSkillIndex {
+    return { skills: index.skills, familySkill: [...index.familySkill] };
+}
+
+export function deserializeCvSkillIndex(serialized: SerializedCvSkillIndex): CvSkillIndex {
+    return { skills: serialized.skills, boundaryRegex: new Map(), familySkill: new Map(serialized.familySkill) };
+}
+
+function skillBoundaryRegex(index: CvSkillIndex, skill: string): RegExp {
+    let regex = index.boundaryRegex.get(skill);
+    if (!regex) {
+        regex = new RegExp(`(^|[\\s\\-\\/])${skill.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')}($|[\\s\\-\\/])`);
+        index.boundaryRegex.set(skill, regex);
+    }
+    return regex;
+}
+
+/**
+ * Match one job's buzzwords against a prebuilt CV skill index. Pure apart
+ * from logging — `quiet` silences the per-job logs for batch runs.
+ */
+export function matchKeywordsAgainstIndex(
+    index: CvSkillIndex,
+    buzzwords: string[],
+    options: { quiet?: boolean } = {},
+): PreMatchResult | null {
+    if (!buzzwords || buzzwords.length === 0) return null;
+    const log = options.quiet ? () => {} : console.log;
+    const uniqueSkills = index.skills;
 
     // Match each buzzword against CV skills
     const found: string[] = [];
@@ -209,8 +233,7 @@ export async function preMatchKeywords(
             if (skill.includes(kw)) return true;
             if (kw.includes(skill)) {
                 // Word-boundary check: skill must be surrounded by spaces, start, or end
-                const wordBoundaryRegex = new RegExp(`(^|[\\s\\-\\/])${skill.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')}($|[\\s\\-\\/])`);
-                return wordBoundaryRegex.test(kw);
+                return skillBoundaryRegex(index, skill).test(kw);
             }
             return false;
         });
@@ -222,46 +245,84 @@ export async function preMatchKeywords(
         }
     }
 
-    console.log(`[pre-match] Matched ${found.length}/${buzzwords.length} keywords deterministically. CV skills index: ${uniqueSkills.length} entries.`);
-    if (found.length > 0) console.log(`[pre-match] Found: ${found.join(', ')}`);
-    if (missing.length > 0) console.log(`[pre-match] Missing: ${missing.join(', ')}`);
+    log(`[pre-match] Matched ${found.length}/${buzzwords.length} keywords deterministically. CV skills index: ${uniqueSkills.length} entries.`);
+    if (found.length > 0) log(`[pre-match] Found: ${found.join(', ')}`);
+    if (missing.length > 0) log(`[pre-match] Missing: ${missing.join(', ')}`);
 
     // Ecosystem hint detection: for each MISSING keyword, check if CV has a related skill
     // from the same product family. This does NOT change found/missing — it only adds context.
     const ecosystemHints: EcosystemHint[] = [];
     for (const missedKw of missing) {
         const kwLower = missedKw.trim().toLowerCase();
-        
+
         // Find which ecosystem families this keyword belongs to
         for (const [family, terms] of Object.entries(ECOSYSTEM_CLUSTERS)) {
-            const kwBelongsToFamily = terms.some(term => 
+            const kwBelongsToFamily = terms.some(term =>
                 kwLower.includes(term) || term.includes(kwLower)
             );
             if (!kwBelongsToFamily) continue;
 
-            // Check if ANY CV skill belongs to the same family
-            for (const skill of uniqueSkills) {
-                const skillBelongs = terms.some(term =>
-                    skill.includes(term) || term.includes(skill)
-                );
-                if (skillBelongs) {
-                    ecosystemHints.push({
-                        keyword: missedKw,
-                        cvSkill: skill,
-                        family,
-                    });
-                    break; // one hint per keyword per family is enough
-                }
-            }
+            // One hint per keyword per family: the first CV skill of that family
+            const cvSkill = index.familySkill.get(family);
+            if (cvSkill) ecosystemHints.push({ keyword: missedKw, cvSkill, family });
         }
     }
 
     if (ecosystemHints.length > 0) {
-        console.log(`[pre-match] 🔗 Ecosystem hints: ${ecosystemHints.length} missing keywords have related CV skills`);
+        log(`[pre-match] 🔗 Ecosystem hints: ${ecosystemHints.length} missing keywords have related CV skills`);
         for (const h of ecosystemHints) {
-            console.log(`  → "${h.keyword}" ↔ CV has "${h.cvSkill}" (${h.family} family)`);
+            log(`  → "${h.keyword}" ↔ CV has "${h.cvSkill}" (${h.family} family)`);
         }
     }
 
     return { found, missing, ecosystemHints: ecosystemHints.length > 0 ? ecosystemHints : undefined };
 }
+
+/**
+ * Load `user_profiles.cv_structured_data` and compile it into a CvSkillIndex.
+ * Returns `null` on DB errors or when the profile has no structured skills.
+ */
+export async function loadCvSkillIndex(userId: string): Promise<CvSkillIndex | null> {
+    let cvData: any = null;
+    try {
+        const { data: profile, error: profileErr } = await getSupabaseAdmin()
+            .from('user_profiles')
+            .select('cv_structured_data')
+            .eq('id', userId)
+            .single();
+
+        if (profileErr) {
+            console.warn('[pre-match] Supabase query failed — LLM-only fallback:', profileErr.message);
+            return null;
+        }
+        cvData = profile?.cv_structured_data;
+    } catch (dbErr: any) {
+        console.warn('[pre-match] Unexpected DB error — LLM-only fallback:', dbErr?.message);
+        return null;
+    }
+
+    const index = buildCvSkillIndex(cvData);
+    if (!index) console.log('[pre-match] No cv_structured_data.skills found — LLM-only fallback');
+    return index;
+}
+
+/**
+ * Deterministically match buzzwords against the user's structured CV data.
+ *
+ * Returns `null` if no buzzwords or no structured skills to match against
+ * (caller falls back to LLM-only classification).
+ */
+export async function preMatchKeywords(
+    userId: string,
+    buzzwords: string[]
+): Promise<PreMatchResult | null> {
+    if (!buzzwords || buzzwords.length === 0) {
+        console.log('[pre-match] No buzzwords to match — skipping');
+        return null;
+    }
+
+    const index = await loadCvSkillIndex(userId);
+    if (!index) return null;
+
+    return matchKeywordsAgainstIndex(index, buzzwords);
+}
@@ -1,6 +1,23 @@
 import mammoth from 'mammoth';
+import { extractInWorker, type ExtractedPage } from './extraction-pool';
 
-async function extractPdfText(buffer: Buffer): Promise<string> {
+export type { ExtractedPage } from './extraction-pool';
+
+export interface ExtractTextOptions {
+    /** Streamed per page as soon as it is parsed (DOCX/plain text: one page) */
+    onPage?: (page: ExtractedPage) => void;
+    /** Per-file limit for worker extraction (default: extraction-pool.ts) */
+    timeoutMs?: number;
+}
+
+const DOCX_MIME_TYPES = [
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/docx',
+];
+
+// ⚠️ SYNC CONTRACT: Page text assembly mirrors lib/workers/extraction-worker.mjs.
+// This in-process path only runs when the worker pool is unavailable.
+async function extractPdfText(buffer: Buffer, onPage?: (page: ExtractedPage) => void): Promise<string> {
     // Use dynamic import to ensure Next.js/Turbopack doesn't bundle it as a client-side module
     const PDFParser = (await import('pdf2json')).default;
 
@@ -10,12 +27,13 @@ async function extractPdfText(buffer: Buffer): Promise<string> {
         parser.on('pdfParser_dataReady', (pdfData: any) => {
             try {
                 // pdf2json stores text in pages → fills → texts
-                const text = pdfData.Pages?.map((page: any) =>
+                const pages: string[] = pdfData.Pages?.map((page: any) =>
                     page.Texts?.map((t: any) =>
                         decodeURIComponent(t.R?.map((r: any) => r.T).join('') ?? '')
-                    ).join(' ')
-                ).join('\n') ?? '';
-                resolve(text);
+                    ).join(' ') ?? ''
+                ) ?? [];
+                pages.forEach((text, index) => onPage?.({ index, text }));
+                resolve(pages.join('\n'));
             } catch (e) {
                 reject(new Error('Failed to parse PDF content'));
             }
@@ -29,18 +47,29 @@ async function extractPdfText(buffer: Buffer): Promise<string> {
     });
 }
 
-export async function extractText(buffer: Buffer, mimeType: string): Promise<string> {
+/**
+ * Local text extraction (no external API).
+ * PDF/DOCX are parsed in the worker pool (extraction-pool.ts) so large files
+ * never block the event loop; in-process parsing is the fallback when no
+ * worker can be started.
+ */
+export async function extractText(buffer: Buffer, mimeType: string, options: ExtractTextOptions = {}): Promise<string> {
     try {
+        if (mimeType === 'application/pdf' || DOCX_MIME_TYPES.includes(mimeType)) {
+            const pooled = await extractInWorker(buffer, mimeType, options);
+            if (pooled !== null) return pooled;
+        }
+
         if (mimeType === 'application/pdf') {
-            return await extractPdfText(buffer);
-        } else if (
-            mimeType === 'application/vnd.openxmlformats-officedocument.wordprocessingml.document' ||
-            mimeType === 'application/docx'
-        ) {
+            return await extractPdfText(buffer, options.onPage);
+        } else if (DOCX_MIME_TYPES.includes(mimeType)) {
             const result = await mammoth.extractRawText({ buffer });
+            options.onPage?.({ index: 0, text: result.value });
             return result.value;
         } else if (mimeType === 'text/plain') {
-            return buffer.toString('utf-8');
+            const text = buffer.toString('utf-8');
+            options.onPage?.({ index: 0, text });
+            return text;
         } else {
             throw new Error(`Unsupported file type: ${mimeType}`);
         }
@@ -7,6 +7,7 @@
  */
 
 import { createClient, type SupabaseClient } from '@supabase/supabase-js';
+import { supabaseTracingFetch } from '@/lib/tracing';
 
 let adminInstance: SupabaseClient | null = null;
 
@@ -21,6 +22,8 @@ export function getSupabaseAdmin(): SupabaseClient {
 
         adminInstance = createClient(url, key, {
             auth: { autoRefreshToken: false, persistSession: false },
+            // Queries show up as spans inside traced pipelines (lib/tracing.ts)
+            global: { fetch: supabaseTracingFetch },
         });
     }
     return adminInstance;
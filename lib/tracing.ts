@@ -0,0 +1,493 @@
+/**
+ * Tracing — Pathly V2.0
+ * Spans for Inngest steps, Supabase queries, outbound HTTP and model calls.
+ *
+ * Which step.run dominates a pipeline's wall time, and where inside it the time
+ * goes (DB round-trips, SerpAPI/Jina/Mistral, Claude), is not visible from the
+ * scattered console.log lines. This module records a span tree per executed
+ * Inngest step:
+ *
+ *   step analyze-match                      ← withInngestTracing
+ *     ├─ select job_queue        12ms       ← supabaseTracingFetch
+ *     ├─ llm cv_match          4210ms       ← complete() — model, tokens, cost, cache outcome
+ *     └─ insert generation_logs   9ms
+ *
+ * Context travels via AsyncLocalStorage — no parameter threading. Outside a
+ * trace (API routes, scripts) every helper is a pass-through.
+ *
+ * Export (per finished step):
+ *   - OTLP/JSON POST to OTEL_EXPORTER_OTLP_TRACES_ENDPOINT (or OTEL_EXPORTER_OTLP_ENDPOINT + /v1/traces)
+ *   - otherwise one `{"type":"trace"}` JSON log line (same log drain as `ai_cost`)
+ *   - setSpanExporter() overrides both (replay benchmark, tests)
+ * TRACING=off disables span recording entirely.
+ *
+ * Usage:
+ *   export const extractJob = inngest.createFunction(config, withInngestTracing('extract-job', handler));
+ *   const res = await tracedFetch('jina', `https://r.jina.ai/${url}`, { headers });
+ *   createClient(url, key, { global: { fetch: supabaseTracingFetch } });
+ */
+
+import { AsyncLocalStorage } from 'async_hooks';
+import crypto from 'crypto';
+
+// ─── Config ───────────────────────────────────────────────────────
+
+const SERVICE_NAME = 'pathly-v2';
+const SCOPE_NAME = 'pathly.tracing';
+const EXPORT_TIMEOUT_MS = 2000;
+// Jina paths embed the scraped URL — keep span attributes bounded
+const MAX_PATH_LENGTH = 120;
+
+// ─── Types ────────────────────────────────────────────────────────
+
+export type SpanKind = 'internal' | 'client';
+export type SpanStatus = 'unset' | 'ok' | 'error';
+export type SpanAttributeValue = string | number | boolean;
+
+/** Outbound services with their own span naming — 'http' for everything else */
+export type TracedService = 'supabase' | 'serpapi' | 'jina' | 'mistral' | 'azure' | 'perplexity' | 'http';
+
+export interface Span {
+    traceId: string;
+    spanId: string;
+    parentSpanId?: string;
+    name: string;
+    kind: SpanKind;
+    /** Epoch milliseconds (sub-ms precision) */
+    startTimeMs: number;
+    endTimeMs?: number;
+    attributes: Record<string, SpanAttributeValue>;
+    status: SpanStatus;
+    statusMessage?: string;
+}
+
+/** All spans of one finished root (one executed step) plus the trace's resource attributes */
+export interface SpanBatch {
+    resource: Record<string, SpanAttributeValue>;
+    spans: Span[];
+}
+
+export type SpanExporter = (batch: SpanBatch) => void | Promise<void>;
+
+export interface ModelUsage {
+    model: string;
+    provider?: string;
+    inputTokens?: number;
+    outputTokens?: number;
+    cacheReadInputTokens?: number;
+    cacheCreationInputTokens?: number;
+    costCents?: number;
+    /** LLM response cache (model-router) — 'hit' | 'miss' | 'coalesced' */
+    cacheOutcome?: string;
+}
+
+interface TraceState {
+    traceId: string;
+    resource: Record<string, SpanAttributeValue>;
+}
+
+interface RootCollector {
+    resource: Record<string, SpanAttributeValue>;
+    spans: Span[];
+    exported: boolean;
+}
+
+interface TraceScope {
+    trace: TraceState;
+    span: Span | null;
+    collector: RootCollector | null;
+}
+
+type InngestHandler = (ctx: any) => Promise<any>;
+
+// ─── State ────────────────────────────────────────────────────────
+
+const scopeStorage = new AsyncLocalStorage<TraceScope>();
+const tracedHandlers = new Map<string, InngestHandler>();
+let exporterOverride: SpanExporter | null = null;
+
+function tracingDisabled(): boolean {
+    return process.env.TRACING === 'off';
+}
+
+function randomHex(bytes: number): string {
+    return crypto.randomBytes(bytes).toString('hex');
+}
+
+/** High-resolution wall clock in epoch ms */
+function nowMs(): number {
+    return performance.timeOrigin + performance.now();
+}
+
+// ─── Spans ────────────────────────────────────────────────────────
+
+/** Set attributes on a span — undefined values are skipped */
+export function setSpanAttributes(span: Span, attributes: Record<string, SpanAttributeValue | undefined | null>) {
+    for (const [key, value] of Object.entries(attributes)) {
+        if (value !== undefined && value !== null) span.attributes[key] = value;
+    }
+}
+
+export function setSpanStatus(span: Span, status: SpanStatus, message?: string) {
+    span.status = status;
+    if (message) span.statusMessage = message.slice(0, 300);
+}
+
+/** gen_ai.* attributes (OpenTelemetry GenAI conventions) plus Pathly cost/cache fields */
+export function recordModelUsage(span: Span, usage: ModelUsage) {
+    setSpanAttributes(span, {
+        'gen_ai.system': usage.provider,
+        'gen_ai.request.model': usage.model,
+        'gen_ai.usage.input_tokens': usage.inputTokens,
+        'gen_ai.usage.output_tokens': usage.outputTokens,
+        'gen_ai.usage.cache_read_input_tokens': usage.cacheReadInputTokens,
+        'gen_ai.usage.cache_creation_input_tokens': usage.cacheCreationInputTokens,
+        'pathly.cost_cents': usage.costCents,
+        'pathly.cache.outcome': usage.cacheOutcome,
+    });
+}
+
+/** The innermost open span, or null outside a trace */
+export function getActiveSpan(): Span | null {
+    return scopeStorage.getStore()?.span ?? null;
+}
+
+/**
+ * Run `fn` inside a new span. The span is a child of the active span; without
+ * one it becomes a root and its whole subtree is exported when it ends.
+ * Outside a trace `fn` still runs and receives a detached span that is never
+ * recorded — callers never need a null check.
+ */
+export async function withSpan<T>(
+    name: string,
+    options: { kind?: SpanKind; attributes?: Record<string, SpanAttributeValue | undefined | null> },
+    fn: (span: Span) => Promise<T>,
+): Promise<T> {
+    const scope = scopeStorage.getStore();
+    const parent = scope?.span ?? null;
+    const span: Span = {
+        traceId: scope?.trace.traceId ?? '',
+        spanId: randomHex(8),
+        parentSpanId: parent?.spanId,
+        name,
+        kind: options.kind ?? 'internal',
+        startTimeMs: nowMs(),
+        attributes: {},
+        status: 'unset',
+    };
+    if (options.attributes) setSpanAttributes(span, options.attributes);
+
+    if (!scope || tracingDisabled()) return fn(span);
+
+    const collector = scope.collector && parent
+        ? scope.collector
+        : { resource: scope.trace.resource, spans: [], exported: false };
+
+    try {
+        const result = await scopeStorage.run({ trace: scope.trace, span, collector }, () => fn(span));
+        if (span.status === 'unset') span.status = 'ok';
+        return result;
+    } catch (error) {
+        setSpanStatus(span, 'error', error instanceof Error ? error.message : String(error));
+        throw error;
+    } finally {
+        span.endTimeMs = nowMs();
+        await finishSpan(span, collector, !parent);
+    }
+}
+
+async function finishSpan(span: Span, collector: RootCollector, isRoot: boolean) {
+    if (collector.exported) {
+        // Child outlived its root (fire-and-forget work) — ship it on its own
+        await exportBatch({ resource: collector.resource, spans: [span] });
+        return;
+    }
+    collector.spans.push(span);
+    if (!isRoot) return;
+    collector.exported = true;
+    await exportBatch({ resource: collector.resource, spans: collector.spans });
+}
+
+/**
+ * Run `fn` inside a trace. Spans opened within become roots of this trace.
+ * The trace id is derived from `traceKey` (e.g. the Inngest run id) so every
+ * step of one run lands in the same trace across invocations.
+ */
+export function runWithTrace<T>(
+    resource: Record<string, SpanAttributeValue | undefined>,
+    traceKey: string | undefined,
+    fn: () => T,
+): T {
+    const traceId = traceKey
+        ? crypto.createHash('sha256').update(traceKey).digest('hex').slice(0, 32)
+        : randomHex(16);
+    const cleanResource: Record<string, SpanAttributeValue> = { 'service.name': SERVICE_NAME };
+    for (const [key, value] of Object.entries(resource)) {
+        if (value !== undefined) cleanResource[key] = value;
+    }
+    return scopeStorage.run({ trace: { traceId, resource: cleanResource }, span: null, collector: null }, fn);
+}
+
+// ─── Outbound HTTP ────────────────────────────────────────────────
+
+function requestUrl(input: string | URL | Request): URL | null {
+    try {
+        return new URL(typeof input === 'string' ? input : input instanceof URL ? input.href : input.url);
+    } catch {
+        return null;
+    }
+}
+
+/**
+ * Span name + attributes for an outbound request. Query strings are never
+ * recorded (SerpAPI carries api_key there).
+ */
+export function describeRequest(service: TracedService, method: string, url: URL | null) {
+    const path = url ? url.pathname.slice(0, MAX_PATH_LENGTH) : '';
+    const attributes: Record<string, SpanAttributeValue | undefined> = {
+        'http.request.method': method,
+        'server.address': url?.host,
+        'url.path': path,
+        'pathly.service': service,
+    };
+
+    if (service === 'supabase' && url) {
+        const rest = url.pathname.match(/^\/rest\/v1\/(rpc\/)?([^/]+)/);
+        if (rest) {
+            const operation = rest[1] ? 'rpc' : SUPABASE_OPERATIONS[method] ?? method.toLowerCase();
+            return {
+                name: `${operation} ${rest[2]}`,
+                attributes: {
+                    ...attributes,
+                    'db.system.name': 'postgresql',
+                    'db.operation.name': operation,
+                    'db.collection.name': rest[2],
+                },
+            };
+        }
+        const storage = url.pathname.match(/^\/storage\/v1\/object\/(?:[^/]+\/)?([^/]+)/);
+        if (storage) return { name: `storage ${storage[1]}`, attributes };
+    }
+
+    return { name: `${method} ${service}`, attributes };
+}
+
+// PostgREST verb → Supabase query-builder operation
+const SUPABASE_OPERATIONS: Record<string, string> = {
+    GET: 'select',
+    HEAD: 'count',
+    POST: 'insert',
+    PATCH: 'update',
+    DELETE: 'delete',
+};
+
+/**
+ * fetch() with a client span (method, host, path, status). Timing covers the
+ * request until response headers — body reads are attributed to the caller.
+ */
+export async function tracedFetch(
+    service: TracedService,
+    input: string | URL | Request,
+    init?: RequestInit,
+): Promise<Response> {
+    if (!scopeStorage.getStore() || tracingDisabled()) return fetch(input, init);
+
+    const method = (init?.method ?? (typeof input === 'object' && 'method' in input ? input.method : 'GET')).toUpperCase();
+    const { name, attributes } = describeRequest(service, method, requestUrl(input));
+
+    return withSpan(name, { kind: 'client', attributes }, async span => {
+        const response = await fetch(input, init);
+        setSpanAttributes(span, {
+            'http.response.status_code': response.status,
+            'http.response.body.size': Number(response.headers.get('content-length')) || undefined,
+        });
+        if (!response.ok) setSpanStatus(span, 'error', `HTTP ${response.status}`);
+        return response;
+    });
+}
+
+/** Pass as `global.fetch` to Supabase clients — every query becomes a span */
+export const supabaseTracingFetch: typeof fetch = (input, init) => tracedFetch('supabase', input as string | URL | Request, init);
+
+// ─── Inngest ──────────────────────────────────────────────────────
+
+/**
+ * Wrap an Inngest handler: every executed step.run becomes a root span
+ * `step <name>` and is exported when the step finishes (Inngest may never
+ * resolve the handler promise after a new step ran, so exporting per step is
+ * the only reliable point). Work outside step.run (e.g. status updates at the
+ * top of a handler) is traced as separate roots of the same trace.
+ *
+ * The wrapped handler is also registered under `functionId` so the replay
+ * benchmark can run it without an Inngest server (getTracedHandler).
+ */
+export function withInngestTracing<R>(functionId: string, handler: (ctx: any) => Promise<R>): (ctx: any) => Promise<R> {
+    const traced = async (ctx: any): Promise<R> => {
+        const runId: string | undefined = ctx?.runId;
+        const resource = {
+            'inngest.function.id': functionId,
+            'inngest.run.id': runId,
+            'inngest.attempt': typeof ctx?.attempt === 'number' ? ctx.attempt : undefined,
+        };
+
+        return runWithTrace(resource, runId, () => {
+            const trace = scopeStorage.getStore()!;
+            const step = ctx?.step ? traceStepTools(ctx.step, trace) : ctx?.step;
+            return handler({ ...ctx, step });
+        });
+    };
+
+    tracedHandlers.set(functionId, traced);
+    return traced;
+}
+
+function traceStepTools(step: any, scope: TraceScope) {
+    // Prototype chain keeps every other step tool (sleep, sendEvent, waitForEvent …) intact
+    const traced = Object.create(step);
+    traced.run = (idOrOptions: string | { id: string }, fn: (...args: any[]) => unknown, ...rest: unknown[]) => {
+        const id = typeof idOrOptions === 'string' ? idOrOptions : idOrOptions.id;
+        return step.run(idOrOptions, (...args: any[]) =>
+            // Inngest invokes the callback from its own execution loop — re-enter the trace explicitly
+            scopeStorage.run(scope, () => withSpan(`step ${id}`, { attributes: { 'inngest.step.id': id } },
+                async () => fn(...args))),
+            ...rest);
+    };
+    return traced;
+}
+
+/** Handler registered via withInngestTracing (replay benchmark) */
+export function getTracedHandler(functionId: string): InngestHandler | undefined {
+    return tracedHandlers.get(functionId);
+}
+
+// ─── Export ───────────────────────────────────────────────────────
+
+/** Route finished spans to a custom exporter (null restores the default) */
+export function setSpanExporter(exporter: SpanExporter | null) {
+    exporterOverride = exporter;
+}
+
+async function exportBatch(batch: SpanBatch) {
+    try {
+        if (exporterOverride) {
+            await exporterOverride(batch);
+            return;
+        }
+        const endpoint = otlpEndpoint();
+        if (endpoint) await postOtlp(endpoint, batch);
+        else console.log(formatTraceLogLine(batch));
+    } catch (error) {
+        // Telemetry must never fail a pipeline step
+        console.warn('⚠️ [Tracing] Span export failed:', error instanceof Error ? error.message : error);
+    }
+}
+
+function otlpEndpoint(): string | null {
+    const traces = process.env.OTEL_EXPORTER_OTLP_TRACES_ENDPOINT?.trim();
+    if (traces) return traces;
+    const base = process.env.OTEL_EXPORTER_OTLP_ENDPOINT?.trim();
+    return base ? `${base.replace(/\/$/, '')}/v1/traces` : null;
+}
+
+/** OTEL_EXPORTER_OTLP_HEADERS: "key1=value1,key2=value2" */
+function otlpHeaders(): Record<string, string> {
+    const headers: Record<string, string> = { 'Content-Type': 'application/json' };
+    for (const pair of (process.env.OTEL_EXPORTER_OTLP_HEADERS ?? '').split(',')) {
+        const index = pair.indexOf('=');
+        if (index > 0) headers[pair.slice(0, index).trim()] = decodeURIComponent(pair.slice(index + 1).trim());
+    }
+    return headers;
+}
+
+async function postOtlp(endpoint: string, batch: SpanBatch) {
+    const controller = new AbortController();
+    const timeoutId = setTimeout(() => controller.abort(), EXPORT_TIMEOUT_MS);
+    try {
+        // Plain fetch — the exporter must not trace itself
+        const res = await fetch(endpoint, {
+            method: 'POST',
+            headers: otlpHeaders(),
+            body: JSON.stringify(toOtlpJson(batch)),
+            signal: controller.signal,
+        });
+        if (!res.ok) console.warn(`⚠️ [Tracing] OTLP export rejected: HTTP ${res.status}`);
+    } finally {
+        clearTimeout(timeoutId);
+    }
+}
+
+function otlpValue(value: SpanAttributeValue) {
+    if (typeof value === 'boolean') return { boolValue: value };
+    if (typeof value === 'number') {
+        return Number.isInteger(value) ? { intValue: String(value) } : { doubleValue: value };
+    }
+    return { stringValue: value };
+}
+
+function otlpAttributes(attributes: Record<string, SpanAttributeValue>) {
+    return Object.entries(attributes).map(([key, value]) => ({ key, value: otlpValue(value) }));
+}
+
+function unixNano(ms: number): string {
+    const whole = Math.floor(ms);
+    return (BigInt(whole) * BigInt(1_000_000) + BigInt(Math.round((ms - whole) * 1_000_000))).toString();
+}
+
+// OTLP enums: SpanKind INTERNAL=1, CLIENT=3 — StatusCode UNSET=0, OK=1, ERROR=2
+const OTLP_KIND: Record<SpanKind, number> = { internal: 1, client: 3 };
+const OTLP_STATUS: Record<SpanStatus, number> = { unset: 0, ok: 1, error: 2 };
+
+/** OTLP/JSON ExportTraceServiceRequest for one batch */
+export function toOtlpJson(batch: SpanBatch) {
+    return {
+        resourceSpans: [{
+            resource: { attributes: otlpAttributes(batch.resource) },
+            scopeSpans: [{
+                scope: { name: SCOPE_NAME },
+                spans: batch.spans.map(span => ({
+                    traceId: span.traceId,
+                    spanId: span.spanId,
+                    ...(span.parentSpanId ? { parentSpanId: span.parentSpanId } : {}),
+                    name: span.name,
+                    kind: OTLP_KIND[span.kind],
+                    startTimeUnixNano: unixNano(span.startTimeMs),
+                    endTimeUnixNano: unixNano(span.endTimeMs ?? span.startTimeMs),
+                    attributes: otlpAttributes(span.attributes),
+                    status: {
+                        code: OTLP_STATUS[span.status],
+                        ...(span.statusMessage ? { message: span.statusMessage } : {}),
+                    },
+                })),
+            }],
+        }],
+    };
+}
+
+export function spanDurationMs(span: Span): number {
+    return +((span.endTimeMs ?? span.startTimeMs) - span.startTimeMs).toFixed(1);
+}
+
+/** Fallback export: one JSON line per finished step, parseable like `ai_cost` */
+export function formatTraceLogLine(batch: SpanBatch): string {
+    const root = batch.spans.find(span => !span.parentSpanId) ?? batch.spans[batch.spans.length - 1];
+    const sum = (key: string) => batch.spans.reduce((total, span) => {
+        const value = span.attributes[key];
+        return total + (typeof value === 'number' ? value : 0);
+    }, 0);
+
+    return JSON.stringify({
+        type: 'trace',
+        timestamp: new Date().toISOString(),
+        traceId: root?.traceId,
+        function: batch.resource['inngest.function.id'],
+        root: root?.name,
+        durationMs: root ? spanDurationMs(root) : 0,
+        status: root?.status,
+        inputTokens: sum('gen_ai.usage.input_tokens'),
+        outputTokens: sum('gen_ai.usage.output_tokens'),
+        costCents: sum('pathly.cost_cents'),
+        spans: batch.spans
+            .filter(span => span !== root)
+            .map(span => ({ name: span.name, ms: spanDurationMs(span), ...(span.status === 'error' ? { error: span.statusMessage } : {}) })),
+    });
+}
@@ -0,0 +1,25 @@
+/**
+ * Map With Concurrency — Pathly V2.0
+ * Promise.all with at most `limit` mappers in flight. Results keep input order.
+ * A rejected mapper rejects the whole call (wrap with .catch() for per-item errors).
+ */
+
+export async function mapWithConcurrency<T, R>(
+    items: readonly T[],
+    limit: number,
+    mapper: (item: T, index: number) => Promise<R>,
+): Promise<R[]> {
+    const results = new Array<R>(items.length);
+    let next = 0;
+
+    async function worker() {
+        while (next < items.length) {
+            const index = next++;
+            results[index] = await mapper(items[index], index);
+        }
+    }
+
+    const workers = Array.from({ length: Math.max(1, Math.min(limit, items.length)) }, worker);
+    await Promise.all(workers);
+    return results;
+}
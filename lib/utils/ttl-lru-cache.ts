@@ -0,0 +1,76 @@
+/**
+ * TTL LRU Cache — Pathly V2.0
+ * Bounded in-memory cache shared by the LLM response cache and the job search cache.
+ *
+ * Map iteration order is insertion order: reads re-insert an entry at the MRU
+ * end, so the first key is always the eviction candidate. Entries expire lazily
+ * on read. Bounds: entry count and (optionally) an estimated byte budget.
+ *
+ * ⚠️ Per-instance only — on serverless every cold start begins empty.
+ *    Put a shared tier (Upstash Redis) behind it where cross-instance hits matter.
+ */
+
+export interface TtlLruCacheOptions<V> {
+    maxEntries: number;
+    /** Byte budget for all entries; requires `sizeOf` */
+    maxBytes?: number;
+    /** Estimated heap size of a value in bytes */
+    sizeOf?: (value: V) => number;
+    /** Injectable clock (tests) */
+    now?: () => number;
+}
+
+export interface TtlLruCache<V> {
+    get(key: string): V | undefined;
+    set(key: string, value: V, ttlMs: number): void;
+    delete(key: string): void;
+    clear(): void;
+    readonly size: number;
+}
+
+export function createTtlLruCache<V>(options: TtlLruCacheOptions<V>): TtlLruCache<V> {
+    const { maxEntries, maxBytes = Infinity, sizeOf = () => 0, now = Date.now } = options;
+    const entries = new Map<string, { value: V; expiresAt: number; bytes: number }>();
+    let totalBytes = 0;
+
+    function remove(key: string) {
+        const entry = entries.get(key);
+        if (!entry) return;
+        totalBytes -= entry.bytes;
+        entries.delete(key);
+    }
+
+    return {
+        get(key) {
+            const entry = entries.get(key);
+            if (!entry) return undefined;
+            if (entry.expiresAt <= now()) {
+                remove(key);
+                return undefined;
+            }
+            entries.delete(key);
+            entries.set(key, entry);
+            return entry.value;
+        },
+        set(key, value, ttlMs) {
+            const bytes = sizeOf(value);
+            if (bytes > maxBytes) return;
+            remove(key);
+            entries.set(key, { value, expiresAt: now() + ttlMs, bytes });
+            totalBytes += bytes;
+            while (entries.size > maxEntries || totalBytes > maxBytes) {
+                remove(entries.keys().next().value as string);
+            }
+        },
+        delete(key) {
+            remove(key);
+        },
+        clear() {
+            entries.clear();
+            totalBytes = 0;
+        },
+        get size() {
+            return entries.size;
+        },
+    };
+}
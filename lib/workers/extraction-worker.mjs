@@ -0,0 +1,100 @@
+/**
+ * Extraction Worker — Pathly V2.0
+ * worker_threads entry for lib/services/extraction-pool.ts.
+ *
+ * Plain ESM JavaScript on purpose: it is loaded by path at runtime (not bundled),
+ * so it must run without the TypeScript/Next.js toolchain.
+ *
+ * Parsers (pdf2json, mammoth) are imported ONCE when the worker boots, not per job.
+ *
+ * Protocol (one job at a time per worker):
+ *   main → worker: { id, mimeType, bytes: ArrayBuffer }        (bytes transferred)
+ *   worker → main: { type: 'ready' }
+ *                  { type: 'page', id, index, text }          (streamed per page)
+ *                  { type: 'done', id, pageCount }
+ *                  { type: 'error', id, message }
+ *
+ * ⚠️ SYNC CONTRACT: Page text assembly mirrors extractPdfText() in
+ *    lib/services/text-extractor.ts (in-process fallback) — keep both identical.
+ */
+
+import { parentPort } from 'node:worker_threads';
+
+const DOCX_MIME_TYPES = new Set([
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/docx',
+]);
+
+const parsers = Promise.all([import('pdf2json'), import('mammoth')]).then(([pdf2json, mammoth]) => ({
+    PDFParser: pdf2json.default,
+    mammoth: mammoth.default ?? mammoth,
+}));
+
+function pageText(page) {
+    return page?.Texts?.map(t =>
+        decodeURIComponent(t.R?.map(r => r.T).join('') ?? '')
+    ).join(' ') ?? '';
+}
+
+function extractPdf(PDFParser, buffer, onPage) {
+    return new Promise((resolve, reject) => {
+        const parser = new PDFParser(null, true);
+        let streamed = 0;
+
+        // pdf2json emits each page on 'data' while parsing (null = end of document)
+        parser.on('data', page => {
+            if (Array.isArray(page?.Texts)) onPage(streamed++, pageText(page));
+        });
+
+        parser.on('pdfParser_dataReady', pdfData => {
+            try {
+                const pages = pdfData?.Pages ?? [];
+                // Parser versions without per-page events: emit the remaining pages now
+                for (let i = streamed; i < pages.length; i++) onPage(i, pageText(pages[i]));
+                resolve(Math.max(streamed, pages.length));
+            } catch {
+                reject(new Error('Failed to parse PDF content'));
+            }
+        });
+
+        parser.on('pdfParser_dataError', err => {
+            reject(new Error(`PDF parse error: ${err?.parserError ?? 'unknown'}`));
+        });
+
+        parser.parseBuffer(buffer);
+    });
+}
+
+async function runJob({ id, mimeType, bytes }) {
+    const { PDFParser, mammoth } = await parsers;
+    const buffer = Buffer.from(bytes);
+    const onPage = (index, text) => parentPort.postMessage({ type: 'page', id, index, text });
+
+    if (mimeType === 'application/pdf') {
+        return extractPdf(PDFParser, buffer, onPage);
+    }
+    if (DOCX_MIME_TYPES.has(mimeType)) {
+        const result = await mammoth.extractRawText({ buffer });
+        onPage(0, result.value);
+        return 1;
+    }
+    throw new Error(`Unsupported file type: ${mimeType}`);
+}
+
+parentPort.on('message', async job => {
+    try {
+        const pageCount = await runJob(job);
+        parentPort.postMessage({ type: 'done', id: job.id, pageCount });
+    } catch (error) {
+        parentPort.postMessage({ type: 'error', id: job.id, message: error instanceof Error ? error.message : String(error) });
+    }
+});
+
+parsers.then(
+    () => parentPort.postMessage({ type: 'ready' }),
+    error => {
+        // Without parsers this worker is useless — exit so the pool falls back in-process
+        console.error('❌ [ExtractionWorker] Parser preload failed:', error);
+        process.exit(1);
+    },
+);
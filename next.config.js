@@ -13,6 +13,12 @@ const nextConfig = {
   images: {
     domains: ['logo.clearbit.com'],
   },
+  // Document extraction worker (lib/services/extraction-pool.ts) is loaded by path
+  // at runtime — keep it and its parsers out of the bundle, but in the output trace
+  serverExternalPackages: ['pdf2json', 'mammoth'],
+  outputFileTracingIncludes: {
+    '/api/**': ['./lib/workers/**'],
+  },
   experimental: {
     serverActions: {
       allowedOrigins: (() => {
@@ -0,0 +1,164 @@
+/**
+ * Analytics Rollups Benchmark — dashboard insights from raw history vs. rollups
+ *
+ * Synthetic multi-year Pomodoro/job histories. Per dashboard load compares:
+ *   raw:     all sessions + all jobs → JSON round trip (stand-in for the
+ *            PostgREST payload) → heatmap grouping, momentum, streak, funnel
+ *   rollups: ≤365 daily rows + ≤168 hourly rows + one row per job status →
+ *            JSON round trip → the *FromRollups functions
+ * Both paths must agree (the run exits 1 otherwise). Rollup maintenance itself
+ * happens in Postgres triggers — O(1) per inserted/updated row.
+ *
+ * Run: npx tsx scripts/bench-analytics-rollups.ts [--iterations=50]
+ */
+
+import { performance } from 'perf_hooks';
+import { buildHeatmapGrid, findPeakWindow, type HeatmapCell } from '../lib/analytics/heatmap-utils';
+import { calcMomentumScore, calcStreak, generateFunnelInsightData } from '../lib/analytics/insights';
+import {
+    calcMomentumScoreFromRollups,
+    calcStreakFromRollups,
+    generateFunnelInsightFromRollups,
+    heatmapCellsFromRollups,
+    rollupJobsByStatus,
+    rollupSessionsByDay,
+    rollupSessionsByHour,
+} from '../lib/analytics/rollups';
+
+// ─── Config ───────────────────────────────────────────────────────
+
+const args = Object.fromEntries(process.argv.slice(2).map(a => a.replace(/^--/, '').split('=')));
+const ITERATIONS = parseInt(args.iterations ?? '50');
+const HISTORY_YEARS = [1, 3, 5];
+const SESSIONS_PER_ACTIVE_DAY = 6;
+const JOBS_PER_WEEK = 25;
+const NOW = new Date('2026-10-17T00:00:00.000Z');
+const DAY_MS = 86400000;
+const STATUSES = ['pending', 'processing', 'ready_for_review', 'ready_to_apply', 'submitted', 'failed', 'cv_matched'];
+
+// ─── Synthetic history ────────────────────────────────────────────
+
+interface Session {
+    started_at: string;
+    completed: boolean;
+    duration_min: number;
+    energy_level: number | null;
+}
+
+function rng(seed: number) {
+    return () => {
+        seed = (seed + 0x6D2B79F5) | 0;
+        let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+        t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+}
+
+function generateHistory(years: number) {
+    const random = rng(years);
+    const sessions: Session[] = [];
+    const totalDays = years * 365;
+
+    for (let day = totalDays; day >= 0; day--) {
+        // ~30% rest days; the last 3 weeks are an unbroken streak
+        if (day > 21 && random() < 0.3) continue;
+        const count = 1 + Math.floor(random() * SESSIONS_PER_ACTIVE_DAY);
+        for (let i = 0; i < count; i++) {
+            const hour = 7 + Math.floor(random() * 14);
+            sessions.push({
+                started_at: new Date(NOW.getTime() - day * DAY_MS + hour * 3600000 + Math.floor(random() * 3600000)).toISOString(),
+                completed: day <= 21 || random() < 0.7,
+                duration_min: random() < 0.8 ? 25 : 50,
+                energy_level: random() < 0.6 ? 1 + Math.floor(random() * 5) : null,
+            });
+        }
+    }
+
+    const jobs = Array.from({ length: Math.round(years * 52 * JOBS_PER_WEEK) }, () => ({
+        status: STATUSES[Math.floor(random() * STATUSES.length)],
+        match_score_overall: random() < 0.7 ? Math.floor(random() * 101) : null,
+    }));
+
+    return { sessions, jobs };
+}
+
+// ─── Dashboard load, both ways ────────────────────────────────────
+
+/** The pre-rollup pomodoro_heatmap view: GROUP BY weekday × hour over every session */
+function groupHeatmap(sessions: Session[]): HeatmapCell[] {
+    return heatmapCellsFromRollups(rollupSessionsByHour(sessions));
+}
+
+function rawLoad(payload: string) {
+    const { sessions, jobs } = JSON.parse(payload) as ReturnType<typeof generateHistory>;
+    return {
+        peak: findPeakWindow(buildHeatmapGrid(groupHeatmap(sessions))),
+        momentum: calcMomentumScore(sessions, jobs),
+        streak: calcStreak(sessions, NOW),
+        funnel: generateFunnelInsightData(jobs),
+    };
+}
+
+function rollupLoad(payload: string) {
+    const { daily, hourly, jobStatus } = JSON.parse(payload);
+    return {
+        peak: findPeakWindow(buildHeatmapGrid(heatmapCellsFromRollups(hourly))),
+        momentum: calcMomentumScoreFromRollups(daily, jobStatus, NOW),
+        streak: calcStreakFromRollups(daily, NOW),
+        funnel: generateFunnelInsightFromRollups(jobStatus),
+    };
+}
+
+function time(fn: () => unknown): number {
+    fn(); // warm-up
+    const start = performance.now();
+    for (let i = 0; i < ITERATIONS; i++) fn();
+    return (performance.now() - start) / ITERATIONS;
+}
+
+function run() {
+    // calcMomentumScore reads the clock — pin it so both paths see the same window
+    Date.now = () => NOW.getTime();
+
+    console.log('═══════════════════════════════════════');
+    console.log('    ANALYTICS ROLLUPS BENCHMARK');
+    console.log('═══════════════════════════════════════\n');
+
+    let mismatch = false;
+    for (const years of HISTORY_YEARS) {
+        const { sessions, jobs } = generateHistory(years);
+        const dailySince = new Date(NOW.getTime() - 365 * DAY_MS).toISOString().split('T')[0];
+        const rollups = {
+            daily: rollupSessionsByDay(sessions).filter(d => d.day >= dailySince), // same window as /api/analytics/flow
+            hourly: rollupSessionsByHour(sessions),
+            jobStatus: rollupJobsByStatus(jobs),
+        };
+
+        const rawPayload = JSON.stringify({ sessions, jobs });
+        const rollupPayload = JSON.stringify(rollups);
+        const rawRows = sessions.length + jobs.length;
+        const rollupRows = rollups.daily.length + rollups.hourly.length + rollups.jobStatus.length;
+
+        const raw = rawLoad(rawPayload);
+        const fromRollups = rollupLoad(rollupPayload);
+        const equal = JSON.stringify(raw) === JSON.stringify(fromRollups);
+        if (!equal) mismatch = true;
+
+        const rawMs = time(() => rawLoad(rawPayload));
+        const rollupMs = time(() => rollupLoad(rollupPayload));
+
+        console.log(`History: ${years}y — ${sessions.length} sessions, ${jobs.length} jobs`);
+        console.log(`  raw      ${String(rawRows).padStart(7)} rows ${(rawPayload.length / 1024).toFixed(0).padStart(6)} KB ${rawMs.toFixed(3).padStart(9)} ms/load`);
+        console.log(`  rollups  ${String(rollupRows).padStart(7)} rows ${(rollupPayload.length / 1024).toFixed(0).padStart(6)} KB ${rollupMs.toFixed(3).padStart(9)} ms/load`);
+        console.log(`  → ${(rawMs / rollupMs).toFixed(1)}x faster, ${(rawPayload.length / rollupPayload.length).toFixed(1)}x smaller payload`);
+        console.log(`  ${equal ? '✅' : '❌'} insights ${equal ? 'identical' : 'DIFFER'} (momentum ${raw.momentum}, streak ${raw.streak}, peak day ${raw.peak.day} ${raw.peak.startHour}h)\n`);
+        if (!equal) console.log('     raw:', raw, '\n     rollups:', fromRollups);
+    }
+
+    if (mismatch) {
+        console.error('❌ Rollup insights differ from raw recomputation');
+        process.exit(1);
+    }
+}
+
+run();
@@ -0,0 +1,87 @@
+/**
+ * Document Extraction Benchmark — event-loop blocking before/after the worker pool
+ *
+ * Extracts scripts/dummy-cv.pdf and scripts/dummy-cl.pdf repeatedly (4 at a time,
+ * like parallel uploads) and measures how long the main event loop is blocked:
+ *   1. in-process pdf2json (EXTRACTION_WORKERS=off — the previous behaviour)
+ *   2. worker pool (lib/services/extraction-pool.ts)
+ *   3. worker pool behind the content-hash cache (re-uploads of the same files)
+ *
+ * Event-loop delay comes from perf_hooks.monitorEventLoopDelay — p99/max is what
+ * every other request on the instance waits while a PDF is parsed.
+ *
+ * Run: npx tsx scripts/bench-document-extraction.ts
+ */
+
+import fs from 'fs';
+import path from 'path';
+import { monitorEventLoopDelay, performance } from 'perf_hooks';
+import { extractText } from '../lib/services/text-extractor';
+import { getExtractionPoolStats, shutdownExtractionPool } from '../lib/services/extraction-pool';
+import { getOrExtractDocument, resetExtractionCache } from '../lib/services/extraction-cache';
+
+const ROUNDS = 10;
+const PARALLEL = 4;
+
+const FILES = ['dummy-cv.pdf', 'dummy-cl.pdf'].map(name => ({
+    name,
+    buffer: fs.readFileSync(path.join(__dirname, name)),
+}));
+
+type Extract = (buffer: Buffer) => Promise<string>;
+
+async function measure(label: string, extract: Extract) {
+    const histogram = monitorEventLoopDelay({ resolution: 5 });
+    let pages = 0;
+    let chars = 0;
+
+    histogram.enable();
+    const start = performance.now();
+    for (let round = 0; round < ROUNDS; round++) {
+        const batch = Array.from({ length: PARALLEL }, (_, i) => FILES[i % FILES.length]);
+        const texts = await Promise.all(batch.map(file => extract(file.buffer)));
+        pages += batch.length;
+        chars += texts.reduce((sum, text) => sum + text.length, 0);
+    }
+    const wallMs = performance.now() - start;
+    histogram.disable();
+
+    const ms = (ns: number) => (ns / 1e6).toFixed(1);
+    console.log(`  ${label.padEnd(34)} wall ${wallMs.toFixed(0).padStart(6)} ms | `
+        + `loop delay p50 ${ms(histogram.percentile(50)).padStart(6)} ms, `
+        + `p99 ${ms(histogram.percentile(99)).padStart(6)} ms, `
+        + `max ${ms(histogram.max).padStart(6)} ms | ${pages} files, ${chars} chars`);
+}
+
+async function run() {
+    console.log('═══════════════════════════════════════');
+    console.log('    DOCUMENT EXTRACTION BENCHMARK');
+    console.log('═══════════════════════════════════════\n');
+    console.log(`Files: ${FILES.map(f => `${f.name} (${f.buffer.length} bytes)`).join(', ')}`);
+    console.log(`Load:  ${ROUNDS} rounds × ${PARALLEL} parallel extractions\n`);
+
+    process.env.EXTRACTION_WORKERS = 'off';
+    await measure('1. in-process (main thread)', buffer => extractText(buffer, 'application/pdf'));
+
+    delete process.env.EXTRACTION_WORKERS;
+    // Warm-up: spawn workers and preload parsers outside the measured window
+    await Promise.all(FILES.map(file => extractText(file.buffer, 'application/pdf')));
+    await measure('2. worker pool', buffer => extractText(buffer, 'application/pdf'));
+    console.log(`     pool: ${JSON.stringify(getExtractionPoolStats())}`);
+
+    resetExtractionCache();
+    await measure('3. worker pool + content-hash cache', async buffer => {
+        const { value } = await getOrExtractDocument(buffer, 'application/pdf', async () => ({
+            text: await extractText(buffer, 'application/pdf'),
+            source: 'local',
+        }));
+        return value.text;
+    });
+
+    await shutdownExtractionPool();
+}
+
+run().catch(error => {
+    console.error('❌ Benchmark failed:', error);
+    process.exit(1);
+});
@@ -0,0 +1,112 @@
+/**
+ * Phrase Matcher Benchmark — Anti-Fluff scan + ATS JD grounding
+ *
+ * Compares the previous per-pattern scans (one `includes` per blacklist entry,
+ * one `new RegExp` per keyword token) against the shared Aho-Corasick matcher
+ * and the per-JD index. Inputs are synthetic long cover letters and JDs.
+ *
+ * Run: npx tsx scripts/bench-phrase-matcher.ts
+ */
+
+import { BLACKLIST_PATTERNS, scanForFluff } from '../lib/services/anti-fluff-blacklist';
+import { KNOWN_HALLUCINATIONS, buildJDIndex, filterByVerbatimJDPresence } from '../lib/services/ats-keyword-filter';
+
+const ITERATIONS = 200;
+
+const LETTER_PARAGRAPH = `Beim Lesen eurer Ausschreibung ist mir aufgefallen, dass ihr Go-to-Market-Strategien für Deep-Tech-Themen entwickelt.
+Bei Fraunhofer FOKUS habe ich ein Partnernetzwerk mit 15 Industrieunternehmen aufgebaut und den Technologietransfer um 40% beschleunigt.
+Ich bin überzeugt, dass echter Mehrwert entsteht, wenn Teams nicht nur Ideen sammeln. Dabei schärfte meinen Blick dafür, was Kunden brauchen.
+`;
+
+const JD_PARAGRAPH = `Du entwickelst Use Cases, Go-to-Market-Initiativen und Pilotprojekte für Länder und Kommunen.
+Dabei positionierst du Cloud ERP, Daten und KI im öffentlichen Sektor und baust ein Stakeholder-Netzwerk auf.
+Erfahrung mit Datenschutz-Grundverordnung, ISO-27001 Audits und SAP S/4HANA ist wünschenswert.
+`;
+
+const KEYWORDS = [
+    'DSGVO', 'GDPR', 'ISO 27001', 'ISO 9001', 'PCI DSS', 'SOC 2', 'Cloud Computing',
+    'SAP S/4HANA', 'Go-to-Market', 'Stakeholder Management', 'Vertrieb', 'Cloud ERP',
+];
+
+// ─── Legacy implementations (pre phrase-matcher) ────────────────────────────
+
+function legacyScanForFluff(text: string): string[] {
+    const lowerText = text.toLowerCase();
+    return BLACKLIST_PATTERNS
+        .filter(({ pattern }) => lowerText.includes(pattern.toLowerCase()))
+        .map(({ pattern }) => pattern);
+}
+
+function legacyNormalize(value: string): string {
+    return value
+        .toLowerCase()
+        .normalize('NFKD')
+        .replace(/[\u0300-\u036f]/g, '')
+        .replace(/[^a-z0-9\s\-_]/g, ' ')
+        .replace(/\s+/g, ' ')
+        .trim();
+}
+
+function legacyIsTokenInJD(token: string, normalizedJD: string): boolean {
+    if (token.length < 3) return true;
+    const escaped = (value: string) => value.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+    if (token.length === 3) return new RegExp(`\\b${escaped(token)}\\b`).test(normalizedJD);
+    return new RegExp(`\\b${escaped(token.slice(0, 6))}`).test(normalizedJD);
+}
+
+// Mirrors the previous isKeywordSubstantiated() minus the equivalence-group branch
+function legacyGrounding(keywords: string[], jdText: string): string[] {
+    const normalizedJD = legacyNormalize(jdText);
+    const jdNoSeparators = normalizedJD.replace(/[-_\s]+/g, '');
+    return keywords.filter(keyword => {
+        const normalized = legacyNormalize(keyword);
+        if (!KNOWN_HALLUCINATIONS.has(normalized)) return true;
+        if (normalizedJD.includes(normalized)) return true;
+        const compact = normalized.replace(/[-_\s]+/g, '');
+        if (compact.length >= 4 && jdNoSeparators.includes(compact)) return true;
+        return normalized.split(/[\s\-_]+/).filter(t => t.length >= 3).every(t => legacyIsTokenInJD(t, normalizedJD));
+    });
+}
+
+// ─── Harness ────────────────────────────────────────────────────────────────
+
+function time(label: string, fn: () => void): number {
+    fn(); // warm-up
+    const start = performance.now();
+    for (let i = 0; i < ITERATIONS; i++) fn();
+    const perCallMs = (performance.now() - start) / ITERATIONS;
+    console.log(`  ${label.padEnd(42)} ${perCallMs.toFixed(3)} ms/call`);
+    return perCallMs;
+}
+
+function run() {
+    // Silence scanForFluff's per-call warning during timing
+    const originalWarn = console.warn;
+    console.warn = () => {};
+
+    console.log('═══════════════════════════════════════');
+    console.log('    PHRASE MATCHER BENCHMARK');
+    console.log('═══════════════════════════════════════\n');
+
+    for (const repeat of [10, 100, 500]) {
+        const letter = LETTER_PARAGRAPH.repeat(repeat);
+        const jd = JD_PARAGRAPH.repeat(repeat);
+        console.log(`Input: letter ${letter.length} chars, JD ${jd.length} chars`);
+
+        const legacyFluff = time('Anti-Fluff legacy (includes per pattern)', () => legacyScanForFluff(letter));
+        const newFluff = time('Anti-Fluff scanForFluff (automaton)', () => scanForFluff(letter));
+
+        const legacyAts = time('ATS grounding legacy (regex per token)', () => legacyGrounding(KEYWORDS, jd));
+        const newAts = time('ATS grounding (fresh JDIndex per call)', () => filterByVerbatimJDPresence(KEYWORDS, buildJDIndex(jd)));
+        time('ATS grounding (JD text → memoized getJDIndex)', () => filterByVerbatimJDPresence(KEYWORDS, jd));
+        const jdIndex = buildJDIndex(jd);
+        const reusedAts = time('ATS grounding (prebuilt JDIndex)', () => filterByVerbatimJDPresence(KEYWORDS, jdIndex));
+
+        console.log(`  → Anti-Fluff speedup: ${(legacyFluff / newFluff).toFixed(1)}x`);
+        console.log(`  → ATS speedup: ${(legacyAts / newAts).toFixed(1)}x (reused index: ${(legacyAts / reusedAts).toFixed(1)}x)\n`);
+    }
+
+    console.warn = originalWarn;
+}
+
+run();
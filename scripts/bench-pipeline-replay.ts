@@ -0,0 +1,433 @@
+/**
+ * Pipeline Replay Benchmark — step latency, tokens and cost of the Inngest pipelines
+ *
+ * Runs cv-match, extract-job, certificates and coaching-report against recorded
+ * fixtures (scripts/fixtures/replay/*.json) without an Inngest server and without
+ * live providers: every outbound request (Supabase, Anthropic, Mistral, SerpAPI,
+ * Jina, Perplexity, URL checks) is answered from the fixture after its recorded
+ * latency. Spans come from lib/tracing.ts, so the numbers are the same ones
+ * production exports — per step: wall time, DB / LLM / HTTP time, tokens, cost.
+ *
+ * Replaces the live smoke scripts (scripts/test-model-router.ts, test-e2e.ts,
+ * test-ping.ts, test-anthropic.ts): a run costs nothing, is deterministic, and
+ * a fixture failing its `expect` block (steps, unmatched requests) fails the run.
+ *
+ * Fixture: { name, function, event, expect: { steps }, interactions: [
+ *   { method, url: "host/path-prefix", status, body, latencyMs } ] }
+ * Requests match on method + host/path prefix; interactions are consumed in
+ * order, the last match is reused once exhausted. Query strings are ignored.
+ *
+ * Run:      npx tsx scripts/bench-pipeline-replay.ts [--rounds=5] [--only=extract-job] [--fast] [--verbose]
+ * Baseline: npx tsx scripts/bench-pipeline-replay.ts --update-baseline
+ * CI gate:  npx tsx scripts/bench-pipeline-replay.ts --check   (exit 1 on >20% step regression)
+ * Record:   npx tsx scripts/bench-pipeline-replay.ts --record=extract-job
+ *           (real providers from .env.local — scrub PII from the fixture before committing!)
+ */
+
+import fs from 'fs';
+import path from 'path';
+import { performance } from 'perf_hooks';
+import * as dotenv from 'dotenv';
+import { getTracedHandler, setSpanExporter, spanDurationMs, type Span } from '../lib/tracing';
+
+// ─── Config ───────────────────────────────────────────────────────
+
+const FIXTURE_DIR = path.join(__dirname, 'fixtures', 'replay');
+const BASELINE_PATH = path.join(FIXTURE_DIR, 'baseline.json');
+// A step counts as regressed when it is this much slower AND at least MIN_REGRESSION_MS slower
+const REGRESSION_RATIO = 0.2;
+const MIN_REGRESSION_MS = 5;
+
+const PIPELINES: Record<string, () => Promise<unknown>> = {
+    'analyze-cv-match': () => import('../lib/inngest/cv-match-pipeline'),
+    'extract-job': () => import('../lib/inngest/extract-job-pipeline'),
+    'generate-certificates': () => import('../lib/inngest/certificates-pipeline'),
+    'generate-coaching-report': () => import('../lib/inngest/coaching-report-pipeline'),
+};
+
+const args = process.argv.slice(2);
+const flag = (name: string) => args.includes(`--${name}`);
+const option = (name: string) => args.find(a => a.startsWith(`--${name}=`))?.split('=')[1];
+
+const ROUNDS = Math.max(1, Number(option('rounds') ?? 3));
+const FAST = flag('fast');
+const VERBOSE = flag('verbose');
+const ONLY = option('only');
+const RECORD = option('record');
+
+// ─── Types ────────────────────────────────────────────────────────
+
+interface Interaction {
+    method: string;
+    /** host + path prefix, e.g. "replay.supabase.co/rest/v1/job_queue" */
+    url: string;
+    status: number;
+    body: unknown;
+    latencyMs: number;
+}
+
+interface Fixture {
+    name: string;
+    function: string;
+    event: { name: string; data: Record<string, unknown> };
+    expect?: { steps?: string[] };
+    interactions: Interaction[];
+}
+
+interface StepStats {
+    wallMs: number;
+    dbMs: number;
+    dbCalls: number;
+    llmMs: number;
+    llmCalls: number;
+    httpMs: number;
+    httpCalls: number;
+}
+
+interface RunResult {
+    wallMs: number;
+    steps: Record<string, StepStats>;
+    executedSteps: string[];
+    spans: number;
+    inputTokens: number;
+    outputTokens: number;
+    costCents: number;
+    unmatched: string[];
+    error: string | null;
+}
+
+interface BaselineEntry {
+    wallMs: number;
+    steps: Record<string, number>;
+    inputTokens: number;
+    outputTokens: number;
+    costCents: number;
+}
+
+// ─── Replay fetch ─────────────────────────────────────────────────
+
+const print = console.log.bind(console);
+const realFetch = globalThis.fetch;
+
+let activeInteractions: Array<Interaction & { used: boolean }> = [];
+let unmatchedRequests: string[] = [];
+
+function requestKey(input: string | URL | Request, init?: RequestInit) {
+    const url = new URL(typeof input === 'string' ? input : input instanceof URL ? input.href : input.url);
+    const method = (init?.method ?? (typeof input === 'object' && 'method' in input ? input.method : 'GET')).toUpperCase();
+    return { method, target: `${url.host}${url.pathname}` };
+}
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+async function replayFetch(input: string | URL | Request, init?: RequestInit): Promise<Response> {
+    const { method, target } = requestKey(input, init);
+    const candidates = activeInteractions.filter(i => i.method === method && target.startsWith(i.url));
+    const interaction = candidates.find(i => !i.used) ?? candidates[candidates.length - 1];
+
+    if (!interaction) {
+        unmatchedRequests.push(`${method} ${target}`);
+        // 404 is never retried by the provider SDKs — the pipeline fails fast
+        return new Response(JSON.stringify({ error: `replay: no recorded interaction for ${method} ${target}` }), {
+            status: 404,
+            headers: { 'content-type': 'application/json' },
+        });
+    }
+
+    interaction.used = true;
+    if (!FAST && interaction.latencyMs > 0) await sleep(interaction.latencyMs);
+
+    const { body, status } = interaction;
+    const noBody = body === null || body === undefined || status === 204;
+    return new Response(noBody ? null : typeof body === 'string' ? body : JSON.stringify(body), {
+        status,
+        headers: { 'content-type': typeof body === 'string' ? 'text/plain' : 'application/json' },
+    });
+}
+
+/** Pass-through to the real network that appends every exchange to `sink` */
+function recordingFetch(sink: Interaction[]) {
+    return async (input: string | URL | Request, init?: RequestInit): Promise<Response> => {
+        const { method, target } = requestKey(input, init);
+        const start = performance.now();
+        const response = await realFetch(input, init);
+        const latencyMs = Math.round(performance.now() - start);
+
+        const text = await response.clone().text();
+        let body: unknown = text || null;
+        try {
+            body = text ? JSON.parse(text) : null;
+        } catch { /* keep text */ }
+        sink.push({ method, url: target, status: response.status, body, latencyMs });
+        return response;
+    };
+}
+
+// ─── Environment ──────────────────────────────────────────────────
+
+/** Fake credentials + deterministic settings — must run before any pipeline module is imported */
+function configureReplayEnv() {
+    Object.assign(process.env, {
+        NEXT_PUBLIC_SUPABASE_URL: 'https://replay.supabase.co',
+        SUPABASE_SERVICE_ROLE_KEY: 'replay-service-role-key',
+        ANTHROPIC_API_KEY: 'replay',
+        MISTRAL_API_KEY: 'replay',
+        PERPLEXITY_API_KEY: 'replay',
+        SERPAPI_KEY: 'replay',
+        JINA_READER_API_KEY: 'replay',
+        // Every round must reach the (stubbed) provider — response cache hits would hide LLM cost
+        LLM_RESPONSE_CACHE: 'off',
+    });
+    for (const key of ['HELICONE_API_KEY', 'UPSTASH_REDIS_REST_URL', 'UPSTASH_REDIS_REST_TOKEN', 'OTEL_EXPORTER_OTLP_ENDPOINT', 'OTEL_EXPORTER_OTLP_TRACES_ENDPOINT', 'TRACING']) {
+        delete process.env[key];
+    }
+}
+
+function silenceLogs() {
+    if (VERBOSE) return () => {};
+    const saved = { log: console.log, warn: console.warn, error: console.error, info: console.info };
+    console.log = console.warn = console.error = console.info = () => {};
+    return () => Object.assign(console, saved);
+}
+
+// ─── Running a pipeline ───────────────────────────────────────────
+
+/** Minimal step tools — results are JSON round-tripped like Inngest's memoized step data */
+function createReplayStep(executed: string[]) {
+    return {
+        run: async (idOrOptions: string | { id: string }, fn: () => unknown) => {
+            executed.push(typeof idOrOptions === 'string' ? idOrOptions : idOrOptions.id);
+            const result = await fn();
+            return result === undefined ? undefined : JSON.parse(JSON.stringify(result));
+        },
+        sleep: async () => {},
+        sleepUntil: async () => {},
+        sendEvent: async () => ({ ids: [] }),
+        waitForEvent: async () => null,
+    };
+}
+
+function categorize(span: Span): 'db' | 'llm' | 'http' | null {
+    if (span.attributes['pathly.service'] === 'supabase') return 'db';
+    if (span.attributes['gen_ai.operation.name']) return 'llm';
+    if (span.kind === 'client') return 'http';
+    return null;
+}
+
+function emptyStats(): StepStats {
+    return { wallMs: 0, dbMs: 0, dbCalls: 0, llmMs: 0, llmCalls: 0, httpMs: 0, httpCalls: 0 };
+}
+
+async function runFixture(fixture: Fixture, round: number): Promise<RunResult> {
+    const handler = getTracedHandler(fixture.function);
+    if (!handler) throw new Error(`No traced handler registered for "${fixture.function}"`);
+
+    activeInteractions = fixture.interactions.map(i => ({ ...i, used: false }));
+    unmatchedRequests = [];
+    const spans: Span[] = [];
+    setSpanExporter(batch => { spans.push(...batch.spans); });
+
+    const executedSteps: string[] = [];
+    const restoreLogs = silenceLogs();
+    const start = performance.now();
+    let error: string | null = null;
+    try {
+        await handler({
+            event: { ...fixture.event, id: `replay-${round}`, ts: Date.now() },
+            step: createReplayStep(executedSteps),
+            runId: `replay-${fixture.function}-${round}`,
+            attempt: 0,
+        });
+    } catch (err) {
+        error = err instanceof Error ? err.message : String(err);
+    } finally {
+        restoreLogs();
+        setSpanExporter(null);
+    }
+    const wallMs = performance.now() - start;
+
+    // Attribute every span to its step root (spans outside step.run → "(handler)")
+    const byId = new Map(spans.map(span => [span.spanId, span]));
+    const rootOf = (span: Span): Span => {
+        let current = span;
+        while (current.parentSpanId && byId.has(current.parentSpanId)) current = byId.get(current.parentSpanId)!;
+        return current;
+    };
+
+    const steps: Record<string, StepStats> = {};
+    const stepName = (root: Span) => String(root.attributes['inngest.step.id'] ?? '(handler)');
+    let inputTokens = 0;
+    let outputTokens = 0;
+    let costCents = 0;
+
+    for (const span of spans) {
+        const root = rootOf(span);
+        const name = stepName(root);
+        const stats = steps[name] ?? (steps[name] = emptyStats());
+        if (span === root) stats.wallMs += spanDurationMs(span);
+
+        const category = categorize(span);
+        if (category === 'db') { stats.dbMs += spanDurationMs(span); stats.dbCalls++; }
+        if (category === 'llm') { stats.llmMs += spanDurationMs(span); stats.llmCalls++; }
+        if (category === 'http') { stats.httpMs += spanDurationMs(span); stats.httpCalls++; }
+
+        inputTokens += Number(span.attributes['gen_ai.usage.input_tokens'] ?? 0);
+        outputTokens += Number(span.attributes['gen_ai.usage.output_tokens'] ?? 0);
+        costCents += Number(span.attributes['pathly.cost_cents'] ?? 0);
+    }
+
+    return { wallMs, steps, executedSteps, spans: spans.length, inputTokens, outputTokens, costCents, unmatched: unmatchedRequests, error };
+}
+
+// ─── Reporting ────────────────────────────────────────────────────
+
+function median(values: number[]): number {
+    const sorted = [...values].sort((a, b) => a - b);
+    const mid = Math.floor(sorted.length / 2);
+    return sorted.length % 2 ? sorted[mid] : (sorted[mid - 1] + sorted[mid]) / 2;
+}
+
+function summarize(runs: RunResult[]): BaselineEntry & { stats: Record<string, StepStats> } {
+    const stepNames = [...new Set(runs.flatMap(run => Object.keys(run.steps)))];
+    const stats: Record<string, StepStats> = {};
+    for (const name of stepNames) {
+        const pick = (key: keyof StepStats) => median(runs.map(run => run.steps[name]?.[key] ?? 0));
+        stats[name] = {
+            wallMs: pick('wallMs'), dbMs: pick('dbMs'), dbCalls: pick('dbCalls'),
+            llmMs: pick('llmMs'), llmCalls: pick('llmCalls'), httpMs: pick('httpMs'), httpCalls: pick('httpCalls'),
+        };
+    }
+    return {
+        wallMs: median(runs.map(run => run.wallMs)),
+        steps: Object.fromEntries(stepNames.map(name => [name, +stats[name].wallMs.toFixed(1)])),
+        inputTokens: runs[0].inputTokens,
+        outputTokens: runs[0].outputTokens,
+        costCents: runs[0].costCents,
+        stats,
+    };
+}
+
+function delta(current: number, base: number | undefined): string {
+    if (base === undefined) return '   (new)';
+    if (base === 0) return current === 0 ? '       ±0' : '      n/a';
+    const pct = ((current - base) / base) * 100;
+    return `${pct >= 0 ? '+' : ''}${pct.toFixed(1)}%`.padStart(9);
+}
+
+function isRegression(current: number, base: number | undefined): boolean {
+    return base !== undefined && current - base > MIN_REGRESSION_MS && current > base * (1 + REGRESSION_RATIO);
+}
+
+function checkExpectations(fixture: Fixture, runs: RunResult[]): string[] {
+    const problems: string[] = [];
+    const first = runs[0];
+    if (first.error) problems.push(`pipeline threw: ${first.error}`);
+    if (first.unmatched.length > 0) problems.push(`unmatched requests: ${[...new Set(first.unmatched)].join(', ')}`);
+    const expected = fixture.expect?.steps;
+    if (expected && expected.join(',') !== first.executedSteps.join(',')) {
+        problems.push(`steps ${JSON.stringify(first.executedSteps)} ≠ expected ${JSON.stringify(expected)}`);
+    }
+    return problems;
+}
+
+// ─── Main ─────────────────────────────────────────────────────────
+
+function loadFixtures(): Array<{ file: string; fixture: Fixture }> {
+    return fs.readdirSync(FIXTURE_DIR)
+        .filter(file => file.endsWith('.json') && file !== path.basename(BASELINE_PATH))
+        .sort()
+        .map(file => ({ file, fixture: JSON.parse(fs.readFileSync(path.join(FIXTURE_DIR, file), 'utf-8')) as Fixture }))
+        .filter(({ file, fixture }) => !ONLY || fixture.function === ONLY || file.startsWith(ONLY));
+}
+
+async function record(target: string) {
+    dotenv.config({ path: '.env.local' });
+    process.env.LLM_RESPONSE_CACHE = 'off';
+    const entry = loadFixtures().find(({ file, fixture }) => file.startsWith(target) || fixture.function === target);
+    if (!entry) throw new Error(`No fixture matching "${target}" in ${FIXTURE_DIR}`);
+
+    const interactions: Interaction[] = [];
+    globalThis.fetch = recordingFetch(interactions) as typeof fetch;
+    await PIPELINES[entry.fixture.function]();
+
+    print(`🎙️  Recording ${entry.fixture.name} against LIVE providers…`);
+    const result = await runFixture({ ...entry.fixture, interactions: [] }, 0);
+    if (result.error) print(`⚠️  Pipeline threw: ${result.error}`);
+
+    const updated: Fixture = { ...entry.fixture, expect: { steps: result.executedSteps }, interactions };
+    fs.writeFileSync(path.join(FIXTURE_DIR, entry.file), JSON.stringify(updated, null, 2) + '\n');
+    print(`✅ ${interactions.length} interactions written to ${entry.file}`);
+    print('⚠️  Recorded bodies contain real data — replace names, emails and CV text before committing.');
+}
+
+async function run() {
+    if (RECORD) return record(RECORD);
+
+    configureReplayEnv();
+    globalThis.fetch = replayFetch as typeof fetch;
+
+    const fixtures = loadFixtures();
+    const baseline: Record<string, BaselineEntry> = fs.existsSync(BASELINE_PATH)
+        ? JSON.parse(fs.readFileSync(BASELINE_PATH, 'utf-8'))
+        : {};
+
+    print('═══════════════════════════════════════');
+    print('    PIPELINE REPLAY BENCHMARK');
+    print('═══════════════════════════════════════\n');
+    print(`Fixtures: ${fixtures.length} | rounds: ${ROUNDS} (median) | latency: ${FAST ? 'off (--fast)' : 'recorded'}`);
+    if (Object.keys(baseline).length === 0) print('Baseline: none — run with --update-baseline to create one');
+    print('');
+
+    const summaries: Record<string, BaselineEntry> = {};
+    const failures: string[] = [];
+    const regressions: string[] = [];
+
+    for (const { file, fixture } of fixtures) {
+        const loader = PIPELINES[fixture.function];
+        if (!loader) {
+            failures.push(`${file}: unknown function "${fixture.function}"`);
+            continue;
+        }
+        await loader();
+
+        // Warm-up round outside the measurement (module init, SDK client construction)
+        await runFixture(fixture, -1);
+        const runs: RunResult[] = [];
+        for (let round = 0; round < ROUNDS; round++) runs.push(await runFixture(fixture, round));
+
+        const key = file.replace(/\.json$/, '');
+        const summary = summarize(runs);
+        const base = baseline[key];
+        summaries[key] = { wallMs: +summary.wallMs.toFixed(1), steps: summary.steps, inputTokens: summary.inputTokens, outputTokens: summary.outputTokens, costCents: summary.costCents };
+
+        print(`▶ ${fixture.name}  [${fixture.function}]`);
+        print(`  ${'step'.padEnd(30)} ${'wall ms'.padStart(9)} ${'db ms (n)'.padStart(12)} ${'llm ms (n)'.padStart(12)} ${'http ms (n)'.padStart(12)} ${'Δ base'.padStart(9)}`);
+        for (const [name, stats] of Object.entries(summary.stats)) {
+            const cell = (ms: number, n: number) => (n > 0 ? `${ms.toFixed(1)} (${n})` : '—').padStart(12);
+            print(`  ${name.padEnd(30)} ${stats.wallMs.toFixed(1).padStart(9)} ${cell(stats.dbMs, stats.dbCalls)} ${cell(stats.llmMs, stats.llmCalls)} ${cell(stats.httpMs, stats.httpCalls)} ${delta(stats.wallMs, base?.steps[name])}`);
+            if (isRegression(stats.wallMs, base?.steps[name])) regressions.push(`${key} › ${name}: ${base!.steps[name]} → ${stats.wallMs.toFixed(1)} ms`);
+        }
+        print(`  ${'total'.padEnd(30)} ${summary.wallMs.toFixed(1).padStart(9)} ${''.padStart(38)} ${delta(summary.wallMs, base?.wallMs)}`);
+        print(`  tokens ${summary.inputTokens} in / ${summary.outputTokens} out | cost ${summary.costCents.toFixed(2)}¢ | ${runs[0].spans} spans\n`);
+
+        if (base && (base.inputTokens !== summary.inputTokens || base.costCents !== summary.costCents)) {
+            regressions.push(`${key}: tokens/cost changed (${base.inputTokens}+${base.outputTokens} tok, ${base.costCents}¢ → ${summary.inputTokens}+${summary.outputTokens} tok, ${summary.costCents}¢)`);
+        }
+        for (const problem of checkExpectations(fixture, runs)) failures.push(`${key}: ${problem}`);
+    }
+
+    if (flag('update-baseline')) {
+        fs.writeFileSync(BASELINE_PATH, JSON.stringify({ ...baseline, ...summaries }, null, 2) + '\n');
+        print(`💾 Baseline written: ${path.relative(process.cwd(), BASELINE_PATH)}`);
+    }
+
+    for (const failure of failures) print(`❌ ${failure}`);
+    for (const regression of regressions) print(`📉 ${regression}`);
+    if (failures.length > 0 || (flag('check') && regressions.length > 0)) process.exit(1);
+    if (failures.length === 0 && regressions.length === 0) print('✅ All fixtures replayed cleanly');
+}
+
+run().catch(error => {
+    console.error('❌ Replay benchmark failed:', error);
+    process.exit(1);
+});
@@ -0,0 +1,243 @@
+-- =============================================================================
+-- Migration: analytics_rollups
+-- Purpose: Incrementally maintained per-user aggregates for the analytics page
+--          (app/api/analytics/flow → lib/analytics/rollups.ts).
+--
+-- Before: every dashboard load grouped the user's full pomodoro history
+-- (pomodoro_heatmap view) and fetched every job_queue row for the funnel, so
+-- cost grew linearly with history. Now three small tables are kept current by
+-- row triggers (+1 on insert, −old/+new on update, −1 on delete):
+--
+--   pomodoro_daily_rollups   (user, UTC day)            → streak, momentum
+--   pomodoro_hourly_rollups  (user, ISO weekday, hour)  → heatmap (≤ 168 rows)
+--   job_status_rollups       (user, status)             → funnel, momentum
+--
+-- Buckets use UTC explicitly — same keys as the TS side (toISOString()).
+-- The pomodoro_heatmap view keeps its columns and now reads the hourly rollup.
+--
+-- §3: RLS on all three tables (read own rows). Writes happen only through the
+--     SECURITY DEFINER trigger functions — clients have no write policy.
+-- =============================================================================
+
+-- ─── Tables ──────────────────────────────────────────────────────
+
+CREATE TABLE IF NOT EXISTS public.pomodoro_daily_rollups (
+  user_id          UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+  day              DATE NOT NULL,
+  session_count    INTEGER NOT NULL DEFAULT 0,
+  completed_count  INTEGER NOT NULL DEFAULT 0,
+  energy_sum       INTEGER NOT NULL DEFAULT 0,
+  energy_count     INTEGER NOT NULL DEFAULT 0,
+  updated_at       TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (user_id, day)
+);
+
+CREATE TABLE IF NOT EXISTS public.pomodoro_hourly_rollups (
+  user_id          UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+  day_of_week      SMALLINT NOT NULL CHECK (day_of_week BETWEEN 1 AND 7),
+  hour_of_day      SMALLINT NOT NULL CHECK (hour_of_day BETWEEN 0 AND 23),
+  session_count    INTEGER NOT NULL DEFAULT 0,
+  completed_count  INTEGER NOT NULL DEFAULT 0,
+  energy_sum       INTEGER NOT NULL DEFAULT 0,
+  energy_count     INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (user_id, day_of_week, hour_of_day)
+);
+
+CREATE TABLE IF NOT EXISTS public.job_status_rollups (
+  user_id            UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+  status             TEXT NOT NULL,
+  job_count          INTEGER NOT NULL DEFAULT 0,
+  match_score_sum    BIGINT NOT NULL DEFAULT 0,
+  match_score_count  INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (user_id, status)
+);
+
+ALTER TABLE public.pomodoro_daily_rollups ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "User reads own daily rollups" ON public.pomodoro_daily_rollups
+  FOR SELECT USING (auth.uid() = user_id);
+
+ALTER TABLE public.pomodoro_hourly_rollups ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "User reads own hourly rollups" ON public.pomodoro_hourly_rollups
+  FOR SELECT USING (auth.uid() = user_id);
+
+ALTER TABLE public.job_status_rollups ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "User reads own job status rollups" ON public.job_status_rollups
+  FOR SELECT USING (auth.uid() = user_id);
+
+-- ─── Incremental updaters ────────────────────────────────────────
+
+-- Adds one session to its buckets with p_sign = 1, removes it with p_sign = -1
+CREATE OR REPLACE FUNCTION apply_pomodoro_rollup(s public.pomodoro_sessions, p_sign INTEGER)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_local     TIMESTAMP := s.started_at AT TIME ZONE 'UTC';
+    v_completed INTEGER := CASE WHEN s.completed THEN p_sign ELSE 0 END;
+    v_energy    INTEGER := COALESCE(s.energy_level, 0) * p_sign;
+    v_has_energy INTEGER := CASE WHEN s.energy_level IS NOT NULL THEN p_sign ELSE 0 END;
+BEGIN
+    INSERT INTO pomodoro_daily_rollups AS r
+        (user_id, day, session_count, completed_count, energy_sum, energy_count)
+    VALUES (s.user_id, v_local::DATE, p_sign, v_completed, v_energy, v_has_energy)
+    ON CONFLICT (user_id, day) DO UPDATE SET
+        session_count   = r.session_count   + EXCLUDED.session_count,
+        completed_count = r.completed_count + EXCLUDED.completed_count,
+        energy_sum      = r.energy_sum      + EXCLUDED.energy_sum,
+        energy_count    = r.energy_count    + EXCLUDED.energy_count,
+        updated_at      = NOW();
+
+    INSERT INTO pomodoro_hourly_rollups AS r
+        (user_id, day_of_week, hour_of_day, session_count, completed_count, energy_sum, energy_count)
+    VALUES (
+        s.user_id,
+        EXTRACT(ISODOW FROM v_local)::SMALLINT,
+        EXTRACT(HOUR FROM v_local)::SMALLINT,
+        p_sign, v_completed, v_energy, v_has_energy
+    )
+    ON CONFLICT (user_id, day_of_week, hour_of_day) DO UPDATE SET
+        session_count   = r.session_count   + EXCLUDED.session_count,
+        completed_count = r.completed_count + EXCLUDED.completed_count,
+        energy_sum      = r.energy_sum      + EXCLUDED.energy_sum,
+        energy_count    = r.energy_count    + EXCLUDED.energy_count;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION apply_job_status_rollup(p_user_id UUID, p_status TEXT, p_match_score INTEGER, p_sign INTEGER)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF p_user_id IS NULL OR p_status IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO job_status_rollups AS r
+        (user_id, status, job_count, match_score_sum, match_score_count)
+    VALUES (
+        p_user_id, p_status, p_sign,
+        COALESCE(p_match_score, 0) * p_sign,
+        CASE WHEN p_match_score IS NOT NULL THEN p_sign ELSE 0 END
+    )
+    ON CONFLICT (user_id, status) DO UPDATE SET
+        job_count         = r.job_count         + EXCLUDED.job_count,
+        match_score_sum   = r.match_score_sum   + EXCLUDED.match_score_sum,
+        match_score_count = r.match_score_count + EXCLUDED.match_score_count;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION apply_pomodoro_rollup(public.pomodoro_sessions, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION apply_job_status_rollup(UUID, TEXT, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+
+-- ─── Triggers ────────────────────────────────────────────────────
+
+CREATE OR REPLACE FUNCTION trigger_pomodoro_rollups()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_pomodoro_rollup(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_pomodoro_rollup(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION trigger_job_status_rollups()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_job_status_rollup(OLD.user_id, OLD.status, OLD.match_score_overall, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_job_status_rollup(NEW.user_id, NEW.status, NEW.match_score_overall, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Only columns that feed a rollup fire on UPDATE — metadata/status writes from
+-- the pipelines that don't touch them stay trigger-free.
+DROP TRIGGER IF EXISTS trigger_pomodoro_sessions_rollups ON public.pomodoro_sessions;
+CREATE TRIGGER trigger_pomodoro_sessions_rollups
+  AFTER INSERT OR DELETE OR UPDATE OF user_id, started_at, completed, energy_level
+  ON public.pomodoro_sessions
+  FOR EACH ROW EXECUTE FUNCTION trigger_pomodoro_rollups();
+
+DROP TRIGGER IF EXISTS trigger_job_queue_status_rollups ON public.job_queue;
+CREATE TRIGGER trigger_job_queue_status_rollups
+  AFTER INSERT OR DELETE OR UPDATE OF user_id, status, match_score_overall
+  ON public.job_queue
+  FOR EACH ROW EXECUTE FUNCTION trigger_job_status_rollups();
+
+-- ─── Backfill ────────────────────────────────────────────────────
+
+INSERT INTO public.pomodoro_daily_rollups (user_id, day, session_count, completed_count, energy_sum, energy_count)
+SELECT
+  user_id,
+  (started_at AT TIME ZONE 'UTC')::DATE,
+  COUNT(*),
+  COUNT(*) FILTER (WHERE completed),
+  COALESCE(SUM(energy_level), 0),
+  COUNT(energy_level)
+FROM public.pomodoro_sessions
+GROUP BY 1, 2
+ON CONFLICT (user_id, day) DO NOTHING;
+
+INSERT INTO public.pomodoro_hourly_rollups (user_id, day_of_week, hour_of_day, session_count, completed_count, energy_sum, energy_count)
+SELECT
+  user_id,
+  EXTRACT(ISODOW FROM started_at AT TIME ZONE 'UTC')::SMALLINT,
+  EXTRACT(HOUR FROM started_at AT TIME ZONE 'UTC')::SMALLINT,
+  COUNT(*),
+  COUNT(*) FILTER (WHERE completed),
+  COALESCE(SUM(energy_level), 0),
+  COUNT(energy_level)
+FROM public.pomodoro_sessions
+GROUP BY 1, 2, 3
+ON CONFLICT (user_id, day_of_week, hour_of_day) DO NOTHING;
+
+INSERT INTO public.job_status_rollups (user_id, status, job_count, match_score_sum, match_score_count)
+SELECT
+  user_id,
+  status,
+  COUNT(*),
+  COALESCE(SUM(match_score_overall), 0),
+  COUNT(match_score_overall)
+FROM public.job_queue
+WHERE user_id IS NOT NULL AND status IS NOT NULL
+GROUP BY 1, 2
+ON CONFLICT (user_id, status) DO NOTHING;
+
+-- ─── Heatmap view (same columns, now O(168) per user) ───────────
+
+CREATE OR REPLACE VIEW public.pomodoro_heatmap AS
+SELECT
+  user_id,
+  day_of_week::INT                                               AS day_of_week,
+  hour_of_day::INT                                               AS hour_of_day,
+  session_count::BIGINT                                          AS session_count,
+  completed_count::BIGINT                                        AS completed_count,
+  ROUND(energy_sum::NUMERIC / NULLIF(energy_count, 0))           AS avg_energy
+FROM public.pomodoro_hourly_rollups
+WHERE session_count > 0;
+
+COMMENT ON TABLE public.pomodoro_daily_rollups IS
+  'Per-user UTC-day pomodoro aggregates, maintained by trigger_pomodoro_sessions_rollups.';
+COMMENT ON TABLE public.pomodoro_hourly_rollups IS
+  'Per-user ISO weekday × UTC hour pomodoro aggregates (all time). Backs pomodoro_heatmap.';
+COMMENT ON TABLE public.job_status_rollups IS
+  'Per-user job_queue counts by status (+ match score sum/count), maintained by trigger_job_queue_status_rollups.';
@@ -0,0 +1,59 @@
+-- =============================================================================
+-- Migration: bulk_merge_job_metadata
+-- Purpose: One-round-trip write-back for CV Match batch mode
+--          (lib/inngest/cv-match-pipeline.ts → analyzeCVMatchBatch).
+--
+-- The single-job pipeline re-reads metadata and writes `{...current, ...patch}`
+-- per job (2 round trips each). Batch mode merges N patches in ONE statement:
+--   metadata = COALESCE(metadata, '{}') || patch   (top-level JSONB merge —
+--   same semantics as the JS spread, done atomically inside Postgres, so
+--   concurrent writers between read and write can no longer be overwritten).
+--
+-- p_updates: JSONB array of { "id": uuid, "metadata": {...}, "status"?: text }
+--            status omitted/null → status unchanged.
+-- Returns:   number of job_queue rows updated.
+--
+-- §3: every row is additionally scoped to p_user_id.
+-- §8: service_role only — EXECUTE is revoked from anon/authenticated because
+--     SECURITY DEFINER would otherwise let a client pass any p_user_id.
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION bulk_merge_job_metadata(
+    p_user_id UUID,
+    p_updates JSONB
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_updated INTEGER;
+BEGIN
+    IF p_updates IS NULL OR jsonb_typeof(p_updates) <> 'array' THEN
+        RAISE EXCEPTION '[bulk_merge_job_metadata] p_updates must be a JSONB array';
+    END IF;
+
+    UPDATE job_queue AS j
+    SET metadata = COALESCE(j.metadata, '{}'::jsonb) || COALESCE(u.patch, '{}'::jsonb),
+        status = COALESCE(u.status, j.status)
+    FROM (
+        SELECT (elem->>'id')::UUID AS id,
+               elem->'metadata'    AS patch,
+               NULLIF(elem->>'status', '') AS status
+        FROM jsonb_array_elements(p_updates) AS elem
+    ) AS u
+    WHERE j.id = u.id
+      AND j.user_id = p_user_id;
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION bulk_merge_job_metadata(UUID, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION bulk_merge_job_metadata(UUID, JSONB) TO service_role;
+
+COMMENT ON FUNCTION bulk_merge_job_metadata(UUID, JSONB) IS
+    'Batch JSONB merge of job_queue.metadata (+ optional status) for one user. '
+    'Used by CV Match batch mode. Service role only.';